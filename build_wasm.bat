@@ -11,7 +11,7 @@ REM Create client/src/wasm directory if it doesn't exist
 if not exist "client\src\wasm" mkdir "client\src\wasm"
 
 REM Compile C++ to WebAssembly
-emcc src/board.cpp src/sudokuant.cpp src/sudokuantsystem.cpp src/colonyant.cpp src/multicolonyantsystem.cpp src/backtracksearch.cpp src/constraintpropagation.cpp src/wasm_interface.cpp -o client/src/wasm/sudoku_solver.js -I src -s WASM=1 -s EXPORTED_FUNCTIONS="[_solve_sudoku,_solve_sudoku_with_progress,_free]" -s EXPORTED_RUNTIME_METHODS="[ccall,cwrap,UTF8ToString]" -s ALLOW_MEMORY_GROWTH=1 -s INITIAL_MEMORY=67108864 -s MODULARIZE=1 -s EXPORT_ES6=1 -s EXPORT_NAME="createSudokuModule" -s ASYNCIFY=1 -s ASYNCIFY_STACK_SIZE=65536 -std=c++11 -O3
+emcc src/board.cpp src/sudokuant.cpp src/sudokuantsystem.cpp src/colonyant.cpp src/multicolonyantsystem.cpp src/backtracksearch.cpp src/constraintpropagation.cpp src/solverjson.cpp src/wasm_interface.cpp -o client/src/wasm/sudoku_solver.js -I src -s WASM=1 -s EXPORTED_FUNCTIONS="[_solve_sudoku,_solve_sudoku_with_progress,_free]" -s EXPORTED_RUNTIME_METHODS="[ccall,cwrap,UTF8ToString]" -s ALLOW_MEMORY_GROWTH=1 -s INITIAL_MEMORY=67108864 -s MODULARIZE=1 -s EXPORT_ES6=1 -s EXPORT_NAME="createSudokuModule" -s ASYNCIFY=1 -s ASYNCIFY_STACK_SIZE=65536 -std=c++11 -O3
 
 REM Check if compilation was successful
 if %ERRORLEVEL% EQU 0 (
@@ -24,6 +24,7 @@ emcc \
   src/multicolonyantsystem.cpp \
   src/backtracksearch.cpp \
   src/constraintpropagation.cpp \
+  src/solverjson.cpp \
   src/wasm_interface.cpp \
   -o client/public/sudoku_solver.js \
   -I src \
@@ -173,7 +173,8 @@ export async function solveSudoku(puzzleString, algorithm, params) {
       convThresh,
       entropyThresh,
       timeout,
-      xi
+      xi,
+      seed
     } = resolveSolverArgs(puzzleString, algorithm, params);
 
     const resultPtr = callSolverFunction(module, 'solve_sudoku', {
@@ -188,7 +189,8 @@ export async function solveSudoku(puzzleString, algorithm, params) {
       convThresh,
       entropyThresh,
       timeout,
-      xi
+      xi,
+      seed
     });
     
     // Convert pointer to string
@@ -225,7 +227,8 @@ export async function solveSudokuWithProgress(puzzleString, algorithm, params) {
       convThresh,
       entropyThresh,
       timeout,
-      xi
+      xi,
+      seed
     } = resolveSolverArgs(puzzleString, algorithm, params);
 
     const resultPtr = callSolverFunction(module, 'solve_sudoku_with_progress', {
@@ -240,7 +243,8 @@ export async function solveSudokuWithProgress(puzzleString, algorithm, params) {
       convThresh,
       entropyThresh,
       timeout,
-      xi
+      xi,
+      seed
     });
 
     const resultString = module.UTF8ToString(resultPtr);
@@ -270,6 +274,8 @@ function resolveSolverArgs(puzzleString, algorithm, params) {
   const entropyPct = requested.entropyPct ?? 92.5;
   const entropyThresh = requested.entropyThresh ?? (Math.log2(nAnts) * (entropyPct / 100));
   const timeout = requested.timeout ?? timeoutDefault;
+  // -1 lets the solver pick a seed; it is returned as result.seed for replay
+  const seed = requested.seed ?? -1;
 
   return {
     nAnts,
@@ -281,7 +287,8 @@ function resolveSolverArgs(puzzleString, algorithm, params) {
     convThresh,
     entropyThresh,
     timeout,
-    xi
+    xi,
+    seed
   };
 }
 
@@ -289,7 +296,7 @@ function callSolverFunction(module, functionName, args) {
   return module.ccall(
     functionName,
     'number',
-    ['string', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number'],
+    ['string', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number', 'number'],
     [
       args.puzzleString,
       args.algorithm,
@@ -302,7 +309,8 @@ function callSolverFunction(module, functionName, args) {
       args.convThresh,
       args.entropyThresh,
       args.timeout,
-      args.xi
+      args.xi,
+      args.seed
     ]
   );
 }
@@ -0,0 +1,160 @@
+"""
+Sequential stopping for benchmark repetitions (``--adaptive``).
+
+Instead of a fixed ``--reps`` per instance, reps run until the confidence
+intervals of the instance's success rate (Wilson score interval) and mean solve
+time (normal approximation, relative to the mean) are narrower than their
+targets, with at least ``--min-reps`` and at most ``--reps`` reps. An instance
+that is solved every time in about the same time stops after a few dozen reps;
+a hard one still gets all of them.
+
+The rule only ever looks at reps 1..k, so the stopping point k depends on the
+per-rep results alone, not on how many workers ran them or in which order they
+finished; reps past k that were already running are left out of the summary.
+(With a base seed each rep's outcome reproduces, but measured times do not
+exactly, so k can differ by a few reps between runs.)
+
+Summary CSVs of adaptive runs have two more columns: ``reps`` (k) and
+``stop_reason``, ``ci`` (both intervals met their targets) or ``max_reps``.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from pathlib import Path
+from statistics import NormalDist
+
+SUMMARY_COLUMNS = ['reps', 'stop_reason']
+
+STOP_CI = 'ci'
+STOP_MAX_REPS = 'max_reps'
+
+DEFAULT_MIN_REPS = 20
+DEFAULT_SUCCESS_WIDTH = 0.10
+DEFAULT_TIME_WIDTH = 0.5
+DEFAULT_CONFIDENCE = 0.95
+# Reps queued past the completed prefix once ``min_reps`` are done.
+DEFAULT_LOOKAHEAD = 2
+
+
+def wilson_interval(successes: int, n: int, z: float) -> tuple[float, float]:
+    """Wilson score interval of a success rate."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1.0 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n + z * z / (4.0 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+class StoppingRule:
+    """
+    Stop an instance at the first k in ``min_reps..max_reps`` for which reps
+    1..k give a success-rate interval at most ``success_width`` wide and a
+    mean-time interval at most ``time_width`` times the mean wide.
+    """
+
+    def __init__(self, max_reps: int, min_reps: int = DEFAULT_MIN_REPS,
+                 success_width: float = DEFAULT_SUCCESS_WIDTH, time_width: float = DEFAULT_TIME_WIDTH,
+                 confidence: float = DEFAULT_CONFIDENCE, lookahead: int = DEFAULT_LOOKAHEAD):
+        self.max_reps = max(1, int(max_reps))
+        self.min_reps = max(2, min(int(min_reps), self.max_reps))
+        self.success_width = float(success_width)
+        self.time_width = float(time_width)
+        self.z = NormalDist().inv_cdf(0.5 + float(confidence) / 2.0)
+        self.lookahead = max(1, int(lookahead))
+
+    def __repr__(self) -> str:
+        return (f'StoppingRule(reps {self.min_reps}..{self.max_reps}, success CI <= {self.success_width:g}, '
+                f'time CI <= {self.time_width:g} x mean)')
+
+    def _met(self, n: int, successes: int, t_sum: float, t_sq: float) -> bool:
+        lo, hi = wilson_interval(successes, n, self.z)
+        if hi - lo > self.success_width:
+            return False
+        if successes == 0:
+            return True
+        if successes < 2:
+            return False
+        mean = t_sum / successes
+        var = max(0.0, (t_sq - successes * mean * mean) / (successes - 1))
+        width = 2.0 * self.z * math.sqrt(var / successes)
+        return width <= self.time_width * mean
+
+    def decide(self, rep_map: dict) -> tuple[int, str] | None:
+        """``(k, stop_reason)`` once reps 1..k of ``rep_map`` (rep -> (success, time, ...))
+        settle the instance, else None (more reps needed)."""
+        successes = 0
+        t_sum = t_sq = 0.0
+        for k in range(1, self.max_reps + 1):
+            res = rep_map.get(k)
+            if res is None:
+                return None
+            success, t = res[0], res[1]
+            if success and not math.isnan(t):
+                successes += 1
+                t_sum += t
+                t_sq += t * t
+            if k >= self.min_reps and self._met(k, successes, t_sum, t_sq):
+                return k, STOP_CI
+        return self.max_reps, STOP_MAX_REPS
+
+    def next_reps(self, rep_map: dict, queued=()) -> list[int]:
+        """Reps to queue now (not done and not in ``queued``): the first ``min_reps``
+        at once, then ``lookahead`` past the longest completed prefix."""
+        prefix = 0
+        while prefix + 1 in rep_map:
+            prefix += 1
+        horizon = min(self.max_reps, max(self.min_reps, prefix + self.lookahead))
+        return [rep for rep in range(1, horizon + 1) if rep not in rep_map and rep not in queued]
+
+
+def settled_reps(rep_map: dict, stop: tuple[int, str] | None) -> dict:
+    """The reps a summary covers: 1..k when stopped adaptively, else all of them."""
+    if stop is None:
+        return rep_map
+    return {rep: res for rep, res in rep_map.items() if rep <= stop[0]}
+
+
+def check_summary_header(path: Path, rule: StoppingRule | None) -> None:
+    """Refuse to append adaptive rows to a summary written without their columns."""
+    if rule is None or not Path(path).exists():
+        return
+    with open(path, 'r', newline='') as f:
+        header = next(csv.reader(f), None)
+    if header and not set(SUMMARY_COLUMNS) <= set(header):
+        raise SystemExit(f'{path} was written without the adaptive columns {SUMMARY_COLUMNS}; '
+                         'use another --run/--outdir for --adaptive, or drop --adaptive to resume it.')
+
+
+def add_cli_options(ap) -> None:
+    ap.add_argument('--adaptive', action='store_true',
+                    help='Stop an instance\'s reps early once the confidence intervals of its success rate and '
+                         'mean time are narrow enough (--reps becomes the maximum)')
+    ap.add_argument('--min-reps', type=int, default=DEFAULT_MIN_REPS,
+                    help=f'With --adaptive: reps before stopping is considered (default: {DEFAULT_MIN_REPS})')
+    ap.add_argument('--ci-success-width', type=float, default=DEFAULT_SUCCESS_WIDTH,
+                    help=f'With --adaptive: target width of the success-rate interval, as a fraction '
+                         f'(default: {DEFAULT_SUCCESS_WIDTH})')
+    ap.add_argument('--ci-time-width', type=float, default=DEFAULT_TIME_WIDTH,
+                    help=f'With --adaptive: target width of the mean-time interval, relative to the mean '
+                         f'(default: {DEFAULT_TIME_WIDTH})')
+    ap.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                    help=f'With --adaptive: confidence level of both intervals (default: {DEFAULT_CONFIDENCE})')
+
+
+def rule_from_args(args) -> StoppingRule | None:
+    """The ``--adaptive`` stopping rule (``--reps`` is its maximum), or None."""
+    if not getattr(args, 'adaptive', False):
+        return None
+    return StoppingRule(args.reps, args.min_reps, args.ci_success_width, args.ci_time_width, args.confidence)
+
+
+def cli_args(args) -> list[str]:
+    """The adaptive options of ``args`` as command-line arguments for a child runner."""
+    if not getattr(args, 'adaptive', False):
+        return []
+    return ['--adaptive', '--min-reps', str(args.min_reps), '--ci-success-width', str(args.ci_success_width),
+            '--ci-time-width', str(args.ci_time_width), '--confidence', str(args.confidence)]
@@ -1,5 +1,10 @@
 """
-Single ProcessPoolExecutor for best-config CP-DCM-ACO on 9×9 / 16×16 / 25×25.
+Single shared solver pool for best-config CP-DCM-ACO on 9×9 / 16×16 / 25×25.
+
+Reps run on persistent ``sudokusolver --serve`` processes driven from one asyncio
+event loop (``AsyncSolverWorkerPool``), so no solver process or thread is started
+per rep; with ``--native`` they run in-process on the solver library
+(``sudaco_native``) from a small thread pool.
 
 **Parallel start, elastic caps:** each selected size gets up to ``--workers-per-size``
 concurrent reps at first (e.g. 2×3 sizes → 6 processes). When a size has no work
@@ -7,27 +12,62 @@ left, its capacity is added to the **first** remaining size in pipeline order
 (9×9 → 16×16 → 25×25), so e.g. when 9×9 finishes, 16×16 can run up to 4 reps at
 once if 25×25 still uses 2.
 
-**Within one puzzle file:** all reps for that file finish before reps for the next
-file on the same size (instance batches in order).
+**Longest first** (``--priority longest``, the default): all sizes share one
+queue and the pool packs reps longest-expected-first, estimated from the results
+already under ``results/`` (``run_history``), so 25×25 stragglers start early and
+the makespan approaches total work / workers. Any other priority keeps the
+per-size caps above; with ``fifo`` all reps for one puzzle file finish before reps
+for the next file on the same size (instance batches in order).
 
 CSV layout matches ``run_*x*.py`` with ``--best-config`` (best_config_ prefix).
+
+``--control-file`` grows or shrinks the pool while it runs, without stopping
+running reps (``campaign_scheduler.CapacityControl``).
+
+``--distributed URL`` runs the reps on worker agents on other machines
+(``job_queue``); this process keeps the queue and writes the CSVs.
+
+``--journal PATH`` keeps reps and summary rows in a SQLite journal
+(``job_journal``) instead of locked progress CSVs.
+
+``--adaptive`` stops an instance's reps once its success-rate and mean-time
+confidence intervals are narrow enough (``adaptive_reps``); ``--reps`` is then
+the maximum and the summary records the reps run and the stop reason.
+
+SIGTERM/SIGINT stop the pool gracefully: running reps stop early and are
+recorded as interrupted (run again on resume unless ``--keep-interrupted``).
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
 import math
 import sys
-from collections import deque
-from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 
+import adaptive_reps
 import bench_best_config
 import bench_pool_jobs
+import campaign_scheduler
+import cpu_affinity
+import job_journal
+import job_queue
+import rep_stats
+import rep_store
+import result_cache
 from run_ablation import sort_summary_csv_if_complete
 
-from bench_utils import default_binary
+from bench_utils import (
+    AsyncSolverWorkerPool,
+    SolverInterruptedError,
+    claim_cached_reps,
+    default_binary,
+    install_stop_handlers,
+    rep_seed,
+)
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -44,14 +84,22 @@ SIZE_DEFS = [
 SIZE_ORDER = [d[0] for d in SIZE_DEFS]
 
 
-def global_run_one_rep_job(job: dict) -> dict:
-    """Child: one solver call (top-level for Windows spawn)."""
-    from pathlib import Path
-    from bench_utils import run_solver
-
+async def global_run_one_rep_job(job: dict, solvers: AsyncSolverWorkerPool,
+                                 native_ex: ThreadPoolExecutor | None = None) -> dict:
+    """One solver call: in-process for ``job['native']`` (on ``native_ex``), else on a
+    persistent worker."""
     fp = Path(job['instance_path'])
-    success, t, cyc, _out = run_solver(
-        job['binary'], fp, job['alg'], job['timeout'], extra_args=job['factor_args'])
+    if job.get('native'):
+        import sudaco_native
+        loop = asyncio.get_running_loop()
+        success, t, cyc, _out = await loop.run_in_executor(
+            native_ex,
+            lambda: sudaco_native.run_solver(fp, job['alg'], job['timeout'], extra_args=job['factor_args'],
+                                             seed=job['seed'], campaign=job['campaign']))
+    else:
+        success, t, cyc, _out = await solvers.run_solver(
+            fp, job['alg'], job['timeout'], extra_args=job['factor_args'],
+            seed=job['seed'], campaign=job['campaign'])
     return {
         'size_name': job['size_name'],
         'instance': fp.name,
@@ -59,6 +107,7 @@ def global_run_one_rep_job(job: dict) -> dict:
         'success': success,
         'time': t,
         'cycles': cyc,
+        'seed': job['seed'],
     }
 
 
@@ -98,26 +147,6 @@ def _paths_for_size(size_name: str, run_suffix: str) -> tuple[Path, Path]:
     return outfile, progress_file
 
 
-def _trim_front_empty_batches(batches: dict[str, deque], sz: str) -> None:
-    q = batches[sz]
-    while q and len(q[0]) == 0:
-        q.popleft()
-
-
-def _size_has_pending_work(batches: dict[str, deque], sz: str) -> bool:
-    _trim_front_empty_batches(batches, sz)
-    return bool(batches[sz])
-
-
-def _pop_next_job(batches: dict[str, deque], sz: str) -> dict | None:
-    _trim_front_empty_batches(batches, sz)
-    if not batches[sz]:
-        return None
-    job = batches[sz][0].popleft()
-    _trim_front_empty_batches(batches, sz)
-    return job
-
-
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(
         description='Shared solver pool for best-config CP-DCM-ACO: parallel sizes, elastic worker caps.')
@@ -126,7 +155,8 @@ def main(argv: list[str] | None = None) -> int:
         type=int,
         default=2,
         help='Max concurrent reps per size; pool size = this times (selected sizes). '
-             'When a size finishes, its slots move to the next busy size (default: 2).',
+             'Unless --priority longest (one queue for all sizes), when a size finishes its slots '
+             'move to the next busy size (default: 2).',
     )
     ap.add_argument(
         '--workers',
@@ -146,6 +176,21 @@ def main(argv: list[str] | None = None) -> int:
     ap.add_argument('--reps', type=int, default=100)
     ap.add_argument('--run', type=int, default=1, help='Run index (same as run_9x9 --run)')
     ap.add_argument('--binary', default=None, help='Solver binary (default: auto)')
+    ap.add_argument('--native', action='store_true',
+                    help='Solve in-process with the native library (make libsudaco.so) instead of solver processes')
+    ap.add_argument('--seed', type=int, default=None,
+                    help='Base seed: each (instance, rep) gets a seed derived from it, so runs reproduce '
+                         'regardless of worker count (default: random; seeds are recorded in progress CSVs)')
+    ap.add_argument('--keep-interrupted', action='store_true',
+                    help='Count reps stopped by SIGTERM/SIGINT as failed reps at their elapsed time '
+                         'instead of running them again on resume')
+    result_cache.add_cli_options(ap)
+    rep_store.add_cli_options(ap)
+    campaign_scheduler.add_cli_options(ap)
+    adaptive_reps.add_cli_options(ap)
+    rep_stats.add_cli_options(ap)
+    job_queue.add_cli_options(ap)
+    job_journal.add_cli_options(ap)
     ap.add_argument(
         '--verbose',
         action='store_true',
@@ -155,11 +200,17 @@ def main(argv: list[str] | None = None) -> int:
         args = ap.parse_args(argv)
     else:
         args = ap.parse_args()
+    result_cache.enable_from_args(args)
+    rep_store.enable_from_args(args)
+    campaign_scheduler.enable_from_args(args)
+    journal = job_journal.enable_from_args(args)
 
     wps = args.workers_per_size if args.workers is None else args.workers
     workers_per_size = max(1, int(wps))
     if args.run < 1:
         ap.error('--run must be >= 1')
+    if args.distributed and args.native:
+        ap.error('Do not combine --distributed with --native')
 
     try:
         selected = _parse_sizes(args.sizes)
@@ -177,6 +228,15 @@ def main(argv: list[str] | None = None) -> int:
         print(f'ERROR: binary not found: {binary_path}', file=sys.stderr)
         return 1
 
+    solver_path = binary_path
+    if args.native:
+        import sudaco_native
+        if not sudaco_native.available():
+            print(f'ERROR: native library not loadable: {sudaco_native.default_library()} '
+                  '(build it with: make libsudaco.so)', file=sys.stderr)
+            return 1
+        solver_path = str(sudaco_native.default_library())
+
     bc_path = Path(args.best_config)
     if not bc_path.is_file():
         print(f'ERROR: best-config file not found: {bc_path}', file=sys.stderr)
@@ -185,7 +245,9 @@ def main(argv: list[str] | None = None) -> int:
     cfg = bench_best_config.load_merged_config(bc_path)
     factor_args = bench_best_config.factor_args_from_cfg(cfg)
 
-    summary_ns = SimpleNamespace(alg=ALG, reps=int(args.reps))
+    summary_ns = SimpleNamespace(alg=ALG, reps=int(args.reps), keep_interrupted=args.keep_interrupted,
+                                 tail_latency=args.tail_latency)
+    rule = adaptive_reps.rule_from_args(args)
 
     def vlog(*a, **k):
         if args.verbose:
@@ -194,6 +256,23 @@ def main(argv: list[str] | None = None) -> int:
     size_state: dict[str, dict] = {}
     instance_job_blocks: list[tuple[str, Path, list[dict]]] = []
     total_pending = 0
+    # (size, instance) -> reps queued or running (adaptive mode queues more as reps finish)
+    issued: dict[tuple[str, str], set] = {}
+
+    def make_job(size_name: str, fp: Path, rep: int) -> dict:
+        st = size_state[size_name]
+        return {
+            'binary': binary_path,
+            'instance_path': str(fp.resolve()),
+            'rep': rep,
+            'alg': ALG,
+            'timeout': st['timeout'],
+            'factor_args': list(factor_args),
+            'size_name': size_name,
+            'native': args.native,
+            'seed': rep_seed(fp.name, rep, args.seed),
+            'campaign': st['campaign'],
+        }
 
     for size_name, inst_rel, timeout, _out in SIZE_DEFS:
         if size_name not in selected_set:
@@ -205,16 +284,23 @@ def main(argv: list[str] | None = None) -> int:
             print(f'WARNING: no instances in {inst_dir}', file=sys.stderr)
             continue
 
-        completed = bench_pool_jobs._read_completed_instances_from_summary(outfile)
-        progress = bench_pool_jobs._read_progress(progress_file)
-
         summary_headers = [
             'instance', 'alg', 'alg_name', 'success_%', 'time_mean', 'time_std',
             'cycles_mean', 'cycles_std',
-        ]
-        progress_headers = ['instance', 'alg', 'alg_name', 'rep', 'success', 'time', 'cycles']
+        ] + rep_stats.summary_columns(args)
+        if rule is not None:
+            summary_headers += adaptive_reps.SUMMARY_COLUMNS
+        adaptive_reps.check_summary_header(outfile, rule)
+        rep_stats.check_summary_header(outfile, args.tail_latency)
+        # with --journal the reads below and all later writes go through the journal
+        bench_pool_jobs.open_journal(outfile, progress_file, summary_headers)
+        completed = bench_pool_jobs._read_completed_instances_from_summary(outfile)
+        progress = bench_pool_jobs._read_progress(progress_file, args.keep_interrupted)
+
         bench_pool_jobs._ensure_csv_header(outfile, summary_headers)
-        bench_pool_jobs._ensure_csv_header(progress_file, progress_headers)
+        if journal is None:
+            bench_pool_jobs._ensure_csv_header(progress_file, bench_pool_jobs.PROGRESS_HEADERS)
+        cpu_affinity.record_layout(outfile)
 
         size_state[size_name] = {
             'outfile': outfile,
@@ -225,24 +311,33 @@ def main(argv: list[str] | None = None) -> int:
             'progress': {k: dict(v) for k, v in progress.items()},
         }
 
+        campaign = str(progress_file.resolve())
+        size_state[size_name]['campaign'] = campaign
         for fp in instance_files:
             if fp.name in completed:
                 continue
             rep_map = size_state[size_name]['progress'].setdefault(fp.name, {})
-            done_reps = set(rep_map.keys())
-            jobs: list[dict] = []
-            for rep in range(1, summary_ns.reps + 1):
-                if rep in done_reps:
+            missing = [rep for rep in range(1, summary_ns.reps + 1) if rep not in rep_map]
+            if args.seed is None and missing:
+                # unseeded reps are exchangeable: use cached results of this configuration first
+                cached = claim_cached_reps(
+                    solver_path, fp, ALG, timeout, factor_args, campaign, len(missing))
+                for rep, (success, t, cyc, rseed) in zip(missing, cached):
+                    row = [fp.name, ALG, ALG_NAME, rep, 1 if success else 0, t, cyc, rseed, 0]
+                    if bench_pool_jobs._record_rep(progress_file, row, vlog):
+                        rep_map[rep] = (success, t, cyc)
+                if cached and bench_pool_jobs._try_write_summary_if_complete(
+                        outfile, progress_file, fp.name, summary_ns, ALG_NAME, vlog, rule):
+                    completed.add(fp.name)
+                    continue
+            if rule is not None:
+                if bench_pool_jobs._try_write_summary_if_complete(
+                        outfile, progress_file, fp.name, summary_ns, ALG_NAME, vlog, rule):
+                    completed.add(fp.name)
                     continue
-                jobs.append({
-                    'binary': binary_path,
-                    'instance_path': str(fp.resolve()),
-                    'rep': rep,
-                    'alg': ALG,
-                    'timeout': timeout,
-                    'factor_args': list(factor_args),
-                    'size_name': size_name,
-                })
+                missing = rule.next_reps(rep_map)
+            jobs = [make_job(size_name, fp, rep) for rep in missing if rep not in rep_map]
+            issued[(size_name, fp.name)] = {job['rep'] for job in jobs}
             if jobs:
                 instance_job_blocks.append((size_name, fp, jobs))
                 total_pending += len(jobs)
@@ -259,47 +354,35 @@ def main(argv: list[str] | None = None) -> int:
                 outfile, st['progress_file'], instance_files)
         return 0
 
-    batches: dict[str, deque] = {s: deque() for s in selected}
+    # Jobs per size, in instance order: all reps of a file are queued before the next file's.
+    groups: dict[str, list[dict]] = {s: [] for s in sizes_order}
     for size_name, _fp, jobs in instance_job_blocks:
-        batches[size_name].append(deque(jobs))
+        groups[size_name].extend(jobs)
 
-    # Keep total pool fixed by selected sizes (e.g., all sizes with 2 => always 6),
-    # then redistribute slots from sizes that are already complete at startup.
+    # Keep total pool fixed by selected sizes (e.g., all sizes with 2 => always 6);
+    # the scheduler moves the slots of a size with no work left (including sizes
+    # already complete at startup) to the first busy size in pipeline order.
     max_workers = workers_per_size * max(1, len(sizes_order))
-    max_parallel = {
-        s: workers_per_size
-        for s in selected
-    }
-    in_flight = {s: 0 for s in selected}
-
-    def redistribute_capacity(finished_sz: str, reason: str = 'finished') -> None:
-        bonus = max_parallel.get(finished_sz, 0)
-        if bonus <= 0:
-            return
-        max_parallel[finished_sz] = 0
-        for sz in sizes_order:
-            if sz == finished_sz:
-                continue
-            if _size_has_pending_work(batches, sz) or in_flight[sz] > 0:
-                max_parallel[sz] = max_parallel.get(sz, 0) + bonus
-                print(
-                    f'Size {finished_sz} {reason} — moved {bonus} worker slot(s) to {sz} '
-                    f'(max concurrent reps on {sz} is now {max_parallel[sz]}).',
-                    flush=True,
-                )
-                vlog(f'  max_parallel: {dict(max_parallel)}')
-                return
-
-    # Startup rebalance: if a selected size has no pending work at launch,
-    # move its slots immediately so remaining sizes can use the full pool.
-    for sz in sizes_order:
-        if not _size_has_pending_work(batches, sz):
-            redistribute_capacity(sz, reason='already complete at startup')
-
-    print(
-        f'Unified pool: {max_workers} solver process(es), {workers_per_size} cap per size at start, '
-        f'{total_pending} rep-run(s), {len(instance_job_blocks)} instance batch(es).'
-    )
+    longest_first = args.priority == 'longest'
+    if longest_first:
+        # One queue for all sizes: per-size caps would keep workers off the long reps.
+        groups = {'all': [job for s in sizes_order for job in groups[s]]}
+        caps = {'all': max_workers}
+    else:
+        caps = {s: workers_per_size for s in sizes_order}
+
+    if longest_first:
+        work = sum(campaign_scheduler.expected_duration(job) or 0.0 for job in groups['all'])
+        print(
+            f'Unified pool: {max_workers} solver process(es), longest expected reps first, '
+            f'{total_pending} rep-run(s), {len(instance_job_blocks)} instance batch(es); '
+            f'expected work {work:.0f} s (>= {work / max_workers:.0f} s wall).'
+        )
+    else:
+        print(
+            f'Unified pool: {max_workers} solver process(es), {workers_per_size} cap per size at start, '
+            f'{total_pending} rep-run(s), {len(instance_job_blocks)} instance batch(es).'
+        )
     print(f'Sizes (pipeline order): {", ".join(sizes_order)}')
     print(f'best-config: {bc_path}')
 
@@ -314,20 +397,62 @@ def main(argv: list[str] | None = None) -> int:
             n = by_sz.get(sz, 0)
             if n:
                 vlog(f'  Pending rep-runs {sz}: {n}')
-        vlog(f'  max_parallel (initial): {dict(max_parallel)}')
+        vlog(f'  max_parallel (initial): {dict(caps)}')
+        if rule is not None:
+            vlog(f'  Adaptive reps: {rule!r}')
+
+    scheduler = campaign_scheduler.CampaignScheduler(args.priority, max_concurrency=max_workers)
+    for group, cap in caps.items():
+        scheduler.add_group(group, cap)
+        for job in groups[group]:
+            scheduler.submit(job, group)
+
+    def queue_more(size_name: str, inst: str) -> None:
+        """Adaptive mode: queue the next reps of an instance its rule has not stopped yet."""
+        st = size_state[size_name]
+        if rule is None or inst in st['completed']:
+            return
+        queued = issued.setdefault((size_name, inst), set())
+        fp = next(f for f in st['instance_files'] if f.name == inst)
+        for rep in rule.next_reps(st['progress'].get(inst, {}), queued):
+            scheduler.submit(make_job(size_name, fp, rep), 'all' if longest_first else size_name)
+            queued.add(rep)
 
     done_count = 0
-
-    def handle_completed(fut, job_by_fut: dict) -> None:
-        nonlocal done_count
-        job = job_by_fut.pop(fut)
-        sz_done = job['size_name']
-        in_flight[sz_done] -= 1
-        try:
-            r = fut.result()
-        except Exception as e:
+    interrupted_count = 0
+    stop_signal = None
+
+    def report_transfer(finished_sz: str, to_sz: str, slots: int, cap_now: int, reason: str) -> None:
+        print(
+            f'Size {finished_sz} {reason} — moved {slots} worker slot(s) to {to_sz} '
+            f'(max concurrent reps on {to_sz} is now {cap_now}).',
+            flush=True,
+        )
+
+    def handle_completed(job: dict, r: dict | None, exc: BaseException | None) -> None:
+        nonlocal done_count, interrupted_count
+        issued.get((job['size_name'], Path(job['instance_path']).name), set()).discard(job['rep'])
+        if r is None and exc is None:
+            return  # skipped: the instance was settled while this rep was queued
+        if isinstance(exc, SolverInterruptedError) and exc.record is None:
+            vlog(f'  not started {job["size_name"]} {Path(job["instance_path"]).name} rep={job["rep"]} (stopping)')
+        elif isinstance(exc, SolverInterruptedError):
+            st = size_state[job['size_name']]
+            row = bench_pool_jobs.interrupted_progress_row(job, exc, ALG, ALG_NAME)
+            if not bench_pool_jobs._record_rep(st['progress_file'], row, vlog):
+                vlog('  ERROR: progress row not written')
+                return
+            interrupted_count += 1
+            vlog(f'  interrupted {job["size_name"]} {row[0]} rep={job["rep"]} time={row[5]}')
+            if args.keep_interrupted:
+                st['progress'].setdefault(row[0], {})[job['rep']] = (
+                    False, exc.record.get('time', math.nan), math.nan)
+                if bench_pool_jobs._try_write_summary_if_complete(
+                        st['outfile'], st['progress_file'], row[0], summary_ns, ALG_NAME, vlog, rule):
+                    st['completed'].add(row[0])
+        elif exc is not None:
             print(
-                f'ERROR {job.get("size_name")} {job.get("instance_path")} rep {job.get("rep")}: {e}',
+                f'ERROR {job.get("size_name")} {job.get("instance_path")} rep {job.get("rep")}: {exc}',
                 file=sys.stderr,
                 flush=True,
             )
@@ -350,15 +475,19 @@ def main(argv: list[str] | None = None) -> int:
                 1 if success else 0,
                 '' if math.isnan(t) else t,
                 '' if math.isnan(cyc) else cyc,
+                r['seed'],
+                0,
             ]
-            if not bench_pool_jobs._append_csv_row(progress_file, progress_row, vlog):
+            if not bench_pool_jobs._record_rep(progress_file, progress_row, vlog):
                 vlog('  ERROR: progress row not written')
 
             st['progress'].setdefault(inst, {})[rep] = (success, t, cyc)
 
             if bench_pool_jobs._try_write_summary_if_complete(
-                    outfile, progress_file, inst, summary_ns, ALG_NAME, vlog):
+                    outfile, progress_file, inst, summary_ns, ALG_NAME, vlog, rule):
                 st['completed'].add(inst)
+            else:
+                queue_more(sz, inst)
 
             done_count += 1
             if args.verbose:
@@ -368,38 +497,51 @@ def main(argv: list[str] | None = None) -> int:
                 elif done_count % 50 == 0:
                     vlog(f'  Unified pool: {done_count}/{total_pending} rep-runs done')
 
-        if (
-            in_flight[sz_done] == 0
-            and not _size_has_pending_work(batches, sz_done)
-            and sz_done in max_parallel
-        ):
-            redistribute_capacity(sz_done, reason='finished')
-
-    def submit_round(ex: ProcessPoolExecutor, job_by_fut: dict) -> None:
-        """Fair fill: one submission per size per inner sweep so 9/16/25 start together."""
-        while len(job_by_fut) < max_workers:
-            any_sub = False
-            for sz in sizes_order:
-                if in_flight[sz] < max_parallel.get(sz, 0):
-                    job = _pop_next_job(batches, sz)
-                    if job:
-                        fut = ex.submit(global_run_one_rep_job, job)
-                        job_by_fut[fut] = job
-                        in_flight[sz] += 1
-                        any_sub = True
-                if len(job_by_fut) >= max_workers:
-                    break
-            if not any_sub:
-                break
-
-    with ProcessPoolExecutor(max_workers=max_workers) as ex:
-        job_by_fut: dict = {}
-        submit_round(ex, job_by_fut)
-        while job_by_fut:
-            done, _ = wait(job_by_fut.keys(), return_when=FIRST_COMPLETED)
-            for fut in done:
-                handle_completed(fut, job_by_fut)
-            submit_round(ex, job_by_fut)
+    async def run_pool() -> None:
+        native_exs = [ThreadPoolExecutor(max_workers=max_workers)] if args.native else []
+        native_threads = max_workers
+        stop = asyncio.Event()
+        try:
+            async with job_queue.open_pool(args, binary_path, max_workers) as solvers:
+                def on_resize(n):
+                    nonlocal native_threads
+                    print(f'Pool capacity: {solvers.size} -> {n} worker(s).', flush=True)
+                    solvers.resize(n)
+                    if args.native and n > native_threads:
+                        # running solves keep their threads; new ones use the larger executor
+                        native_exs.append(ThreadPoolExecutor(max_workers=n))
+                        native_threads = n
+
+                def on_stop(signum):
+                    nonlocal stop_signal
+                    if stop_signal is None:
+                        print('Stopping: no new reps; running reps are recorded as interrupted...', flush=True)
+                    stop_signal = signum
+                    stop.set()
+                    solvers.interrupt()
+                    if args.native:
+                        import sudaco_native
+                        sudaco_native.interrupt()
+
+                async def run_job(job):
+                    if Path(job['instance_path']).name in size_state[job['size_name']]['completed']:
+                        return None
+                    return await global_run_one_rep_job(job, solvers, native_exs[-1] if args.native else None)
+
+                install_stop_handlers(on_stop)
+                await scheduler.run(
+                    run_job,
+                    on_result=handle_completed,
+                    on_transfer=report_transfer,
+                    stop=stop,
+                    control=job_queue.pool_control(solvers, args),
+                    on_resize=on_resize,
+                )
+        finally:
+            for ex in native_exs:
+                ex.shutdown()
+
+    asyncio.run(run_pool())
 
     for size_name, st in size_state.items():
         outfile = st['outfile']
@@ -416,7 +558,12 @@ def main(argv: list[str] | None = None) -> int:
         n = len(st['instance_files'])
         c = len(st['completed'])
         print(f'  {size_name}: {c}/{n} instances -> {st["outfile"]}')
+    if interrupted_count:
+        print(f'Interrupted reps recorded: {interrupted_count}'
+              + (' (counted as failures)' if args.keep_interrupted else ' (run again on resume)'))
     print(f"{'='*70}")
+    if stop_signal is not None:
+        return 128 + stop_signal
     return 0
 
 
@@ -1,18 +1,41 @@
 """
-Process-pool execution for benchmark scripts: N worker processes pull the next
-unfinished (instance, rep) job from a queue (dynamic load balancing).
-
-The parent process is the only writer to progress/summary CSVs. Child processes
-only run ``run_solver`` and return a small dict (Windows spawn-safe pickling).
+Pool execution for benchmark scripts: N workers pull the next unfinished
+(instance, rep) job from a queue (dynamic load balancing). Jobs are units of a
+``campaign_scheduler.CampaignScheduler``, started in ``args.priority`` order.
+
+An asyncio event loop drives ``pool_workers`` persistent ``sudokusolver --serve``
+processes from an ``AsyncSolverWorkerPool``, so the solver binary is started once
+per worker rather than once per repetition, and no thread is needed per worker.
+With ``native=True`` a thread pool calls the solver library in-process instead
+(``sudaco_native``), with no solver processes at all. The parent process is the
+only writer to progress/summary CSVs.
+
+``--control-file`` (``campaign_scheduler.CapacityControl``) changes the number
+of workers while the pool runs: new workers pick up queued reps at once, surplus
+ones retire when their current rep ends, and no running rep is stopped.
+
+With ``args.distributed`` the reps run on worker agents on other machines
+(``job_queue``); the number of reps in flight follows the agents' solver processes.
+
+With ``--journal`` (``job_journal``) reps and summary rows are recorded in a
+SQLite journal: completion checks are indexed queries instead of re-reading
+the progress CSV after every rep, and the progress CSV is only exported when a
+run ends incomplete.
+
+SIGTERM/SIGINT stop the pool gracefully: no new reps start, the running ones
+stop early and their partial results are written to the progress CSV with
+``interrupted`` = 1. Interrupted reps are run again on resume, or counted as
+failed reps with ``args.keep_interrupted``.
 """
 
 from __future__ import annotations
 
+import asyncio
 import csv
 import math
 import os
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 try:
@@ -26,7 +49,29 @@ except ImportError:
     except ImportError:
         HAS_FCNTL = False
 
-from bench_utils import run_solver, safe_mean, safe_std
+from adaptive_reps import (
+    SUMMARY_COLUMNS as ADAPTIVE_COLUMNS,
+    StoppingRule,
+    check_summary_header,
+    rule_from_args,
+    settled_reps,
+)
+import job_journal
+import job_queue
+import rep_stats
+from campaign_scheduler import CampaignScheduler
+from cpu_affinity import pin_mode, record_layout
+from bench_utils import (
+    AsyncSolverWorkerPool,
+    SolverInterruptedError,
+    claim_cached_reps,
+    install_stop_handlers,
+    progress_row_interrupted,
+    rep_seed,
+    run_solver_async,
+)
+
+PROGRESS_HEADERS = ['instance', 'alg', 'alg_name', 'rep', 'success', 'time', 'cycles', 'seed', 'interrupted']
 
 
 def lock_file(file_handle):
@@ -51,7 +96,16 @@ def unlock_file(file_handle):
         pass
 
 
+def open_journal(outfile: Path, progress_file: Path, summary_headers) -> job_journal.Campaign | None:
+    """Register the campaign with the ``--journal`` (None when it is off): the
+    progress and summary helpers below then go through the journal."""
+    return job_journal.open_campaign(progress_file, outfile, PROGRESS_HEADERS, summary_headers)
+
+
 def _read_completed_instances_from_summary(outfile: Path):
+    journal = job_journal.campaign(outfile)
+    if journal is not None:
+        return journal.completed()
     completed = set()
     if not outfile.exists():
         return completed
@@ -82,6 +136,13 @@ def remove_best_config_progress_if_done(
     canon = {fp.name for fp in instance_files}
     if not canon:
         return False
+    journal = job_journal.campaign(outfile)
+    if journal is not None:
+        had_file = progress_file.exists()
+        removed = journal.finish(canon)
+        if removed and had_file:
+            print(f'Progress file removed: {progress_file}')
+        return removed
     done = _read_completed_instances_from_summary(outfile)
     if done != canon:
         return False
@@ -96,7 +157,13 @@ def remove_best_config_progress_if_done(
         return False
 
 
-def _read_progress(progress_file: Path):
+def _read_progress(progress_file: Path, keep_interrupted: bool = False):
+    """instance -> {rep: (success, time, cycles)}. Reps recorded as interrupted are
+    left out (so they run again) unless ``keep_interrupted``, which counts them
+    as failures."""
+    journal = job_journal.campaign(progress_file)
+    if journal is not None:
+        return journal.progress(keep_interrupted)
     prog = {}
     if not progress_file.exists():
         return prog
@@ -112,6 +179,8 @@ def _read_progress(progress_file: Path):
                     rep = int(rep_s)
                 except ValueError:
                     continue
+                if progress_row_interrupted(row) and not keep_interrupted:
+                    continue
                 success = row.get('success', '').strip() in ('1', 'true', 'True')
                 t = math.nan
                 cyc = math.nan
@@ -163,42 +232,62 @@ def _append_csv_row(path: Path, row, vlog):
                 return False
 
 
-def _summary_row_from_rep_map(rep_map, args, alg_name):
-    successes = 0
-    times = []
-    cycles_solved = []
-    for _rep, (succ, t, cyc) in sorted(rep_map.items()):
-        if succ:
-            successes += 1
-            times.append(t)
-            if not math.isnan(cyc):
-                cycles_solved.append(cyc)
-    succ_pct = (successes / float(args.reps)) * 100.0
-    time_mean = safe_mean(times)
-    time_std = safe_std(times)
-    cycles_mean = safe_mean(cycles_solved)
-    cycles_std = safe_std(cycles_solved)
-    return [
-        None,
-        args.alg,
-        alg_name,
-        round(succ_pct, 2),
-        round(time_mean, 6) if not math.isnan(time_mean) else '',
-        round(time_std, 6) if not math.isnan(time_std) else '',
-        round(cycles_mean, 3) if not math.isnan(cycles_mean) else '',
-        round(cycles_std, 3) if not math.isnan(cycles_std) else '',
-    ]
-
-
-def _try_write_summary_if_complete(outfile: Path, progress_file: Path, instance_name, args, alg_name, vlog):
-    progress = _read_progress(progress_file)
-    rep_map = progress.get(instance_name, {})
-    if len(rep_map) < args.reps:
+def _record_rep(progress_file: Path, row, vlog):
+    """Record one progress row (``PROGRESS_HEADERS``): journaled with ``--journal``,
+    else appended to the progress CSV."""
+    journal = job_journal.campaign(progress_file)
+    if journal is not None:
+        return journal.record_rep(row)
+    return _append_csv_row(progress_file, row, vlog)
+
+
+def _summary_row(acc: rep_stats.RepStats, args, alg_name, stop=None):
+    """Summary row (instance left as None) of the reps in ``acc``; ``stop`` is the
+    adaptive ``(k, stop_reason)`` (``acc`` then holds reps 1..k) and the row ends
+    with the ``adaptive_reps.SUMMARY_COLUMNS``. With ``--tail-latency`` the
+    ``rep_stats.TAIL_COLUMNS`` come after ``cycles_std``."""
+    reps = stop[0] if stop is not None else args.reps
+    row = [None, args.alg, alg_name] + rep_stats.summary_cells(
+        acc, reps, tail=getattr(args, 'tail_latency', False))
+    if stop is not None:
+        row += [stop[0], stop[1]]
+    return row
+
+
+def _try_write_summary_if_complete(outfile: Path, progress_file: Path, instance_name, args, alg_name, vlog,
+                                   rule: StoppingRule | None = None):
+    """Write the instance's summary row once all ``args.reps`` reps are in progress
+    (with an adaptive ``rule``: once the rule stops it). True if the row exists."""
+    keep_interrupted = getattr(args, 'keep_interrupted', False)
+    journal = job_journal.campaign(progress_file)
+    if journal is not None and rule is None and not keep_interrupted:
+        # the journal's accumulator of the instance: no reps to read back
+        acc = journal.stats(instance_name)
+        if acc.reps < args.reps:
+            return False
+        row = _summary_row(acc, args, alg_name)
+        row[0] = instance_name
+        return journal.finalize(instance_name, row)
+    if journal is not None:
+        rep_map = journal.rep_map(instance_name, keep_interrupted)
+    else:
+        rep_map = _read_progress(progress_file, keep_interrupted).get(instance_name, {})
+    stop = None
+    if rule is not None:
+        stop = rule.decide(rep_map)
+        if stop is None:
+            return False
+    elif len(rep_map) < args.reps:
         return False
+    acc = rep_stats.RepStats.from_reps(settled_reps(rep_map, stop).values())
+    if journal is not None:
+        row = _summary_row(acc, args, alg_name, stop)
+        row[0] = instance_name
+        return journal.finalize(instance_name, row)
     completed = _read_completed_instances_from_summary(outfile)
     if instance_name in completed:
         return True
-    row = _summary_row_from_rep_map(rep_map, args, alg_name)
+    row = _summary_row(acc, args, alg_name, stop)
     row[0] = instance_name
     max_retries = 10
     retry_delay = 0.1
@@ -231,17 +320,50 @@ def _try_write_summary_if_complete(outfile: Path, progress_file: Path, instance_
     return False
 
 
-def run_one_rep_job(job: dict) -> dict:
-    """Child process: one solver invocation (must stay top-level for pickling)."""
+def interrupted_progress_row(job: dict, exc: SolverInterruptedError, alg, alg_name: str) -> list | None:
+    """Progress CSV row (``PROGRESS_HEADERS``) for a rep stopped by a signal, from the
+    partial result it reported; None when it reported nothing."""
+    rec = exc.record
+    if rec is None:
+        return None
+    t = float(rec.get('time', math.nan))
+    cyc = rec.get('cycles', rec.get('iterations', math.nan))
+    return [
+        Path(job['instance_path']).name,
+        alg,
+        alg_name,
+        job['rep'],
+        0,
+        '' if math.isnan(t) else t,
+        '' if cyc is None or (isinstance(cyc, float) and math.isnan(cyc)) else cyc,
+        job['seed'],
+        1,
+    ]
+
+
+async def run_one_rep_job(job: dict, solvers: AsyncSolverWorkerPool | None = None,
+                          native_ex: ThreadPoolExecutor | None = None) -> dict:
+    """One solver invocation: in-process for ``job['native']`` (on ``native_ex``),
+    else on a persistent worker from ``solvers`` when given, else a one-shot
+    subprocess."""
     fp = Path(job['instance_path'])
-    success, t, cyc, _out = run_solver(
-        job['binary'], fp, job['alg'], job['timeout'], extra_args=job['factor_args'])
+    kwargs = dict(extra_args=job['factor_args'], seed=job['seed'], campaign=job.get('campaign'))
+    if job.get('native'):
+        import sudaco_native
+        loop = asyncio.get_running_loop()
+        success, t, cyc, _out = await loop.run_in_executor(
+            native_ex, lambda: sudaco_native.run_solver(fp, job['alg'], job['timeout'], **kwargs))
+    elif solvers is not None:
+        success, t, cyc, _out = await solvers.run_solver(fp, job['alg'], job['timeout'], **kwargs)
+    else:
+        success, t, cyc, _out = await run_solver_async(job['binary'], fp, job['alg'], job['timeout'], **kwargs)
     return {
         'instance': fp.name,
         'rep': job['rep'],
         'success': success,
         'time': t,
         'cycles': cyc,
+        'seed': job['seed'],
     }
 
 
@@ -258,28 +380,82 @@ def run_benchmark_pool(
     completed_instances: set,
     progress: dict,
     vlog,
+    native: bool = False,
 ):
     """
-    Run all pending (instance, rep) jobs with ProcessPoolExecutor(pool_workers).
-    Parent writes CSVs; workers only solve.
+    Run all pending (instance, rep) jobs on ``pool_workers`` persistent solver
+    processes, or ``pool_workers`` threads calling the native library when
+    ``native``. Parent writes CSVs; workers only solve. Each job is seeded
+    with ``rep_seed(instance, rep, args.seed)``, recorded in the progress CSV.
+    Without a base seed, cached results of the configuration (see
+    ``result_cache``) are taken as reps before any job is queued.
+
+    With ``args.adaptive`` (``adaptive_reps``) an instance's reps are queued a
+    few at a time and stop once its stopping rule is met; the summary row
+    records how many reps it took and why it stopped.
     """
+    base_seed = getattr(args, 'seed', None)
+    campaign = str(Path(progress_file).resolve())
+    rule = rule_from_args(args)
+    summary_headers = [
+        'instance', 'alg', 'alg_name', 'success_%', 'time_mean', 'time_std',
+        'cycles_mean', 'cycles_std',
+    ] + rep_stats.summary_columns(args)
+    if rule is not None:
+        summary_headers += ADAPTIVE_COLUMNS
+    check_summary_header(outfile, rule)
+    rep_stats.check_summary_header(outfile, getattr(args, 'tail_latency', False))
+    journal = open_journal(outfile, progress_file, summary_headers)
+    if journal is not None:
+        # the journal (with any CSV rows imported on first use) is the state to resume from
+        completed_instances |= journal.completed()
+        progress.clear()
+        progress.update(journal.progress(getattr(args, 'keep_interrupted', False)))
+    if native:
+        import sudaco_native
+        solver_path = str(sudaco_native.default_library())
+    else:
+        solver_path = binary_path
+
+    def make_job(fp: Path, rep: int) -> dict:
+        return {
+            'binary': binary_path,
+            'instance_path': str(fp.resolve()),
+            'rep': rep,
+            'alg': args.alg,
+            'timeout': args.timeout,
+            'factor_args': list(factor_args),
+            'native': native,
+            'seed': rep_seed(fp.name, rep, base_seed),
+            'campaign': campaign,
+        }
+
     pending = []
+    issued: dict[str, set] = {}
     for fp in instance_files:
         if fp.name in completed_instances:
             continue
         rep_map = progress.setdefault(fp.name, {})
-        done = set(rep_map.keys())
-        for rep in range(1, args.reps + 1):
-            if rep in done:
+        missing = [rep for rep in range(1, args.reps + 1) if rep not in rep_map]
+        if base_seed is None and missing:
+            cached = claim_cached_reps(solver_path, fp, args.alg, args.timeout, factor_args, campaign, len(missing))
+            for rep, (success, t, cyc, rseed) in zip(missing, cached):
+                row = [fp.name, args.alg, alg_name, rep, 1 if success else 0, t, cyc, rseed, 0]
+                if _record_rep(progress_file, row, vlog):
+                    rep_map[rep] = (success, t, cyc)
+            if cached and _try_write_summary_if_complete(outfile, progress_file, fp.name, args, alg_name, vlog, rule):
+                completed_instances.add(fp.name)
+                continue
+        if rule is not None:
+            if _try_write_summary_if_complete(outfile, progress_file, fp.name, args, alg_name, vlog, rule):
+                completed_instances.add(fp.name)
                 continue
-            pending.append({
-                'binary': binary_path,
-                'instance_path': str(fp.resolve()),
-                'rep': rep,
-                'alg': args.alg,
-                'timeout': args.timeout,
-                'factor_args': list(factor_args),
-            })
+            missing = rule.next_reps(rep_map)
+        for rep in missing:
+            if rep in rep_map:
+                continue
+            pending.append(make_job(fp, rep))
+            issued.setdefault(fp.name, set()).add(rep)
 
     if not pending:
         vlog('Pool mode: nothing pending.')
@@ -292,61 +468,143 @@ def run_benchmark_pool(
             inst = fp.name
             if inst in completed_instances:
                 continue
-            if _try_write_summary_if_complete(outfile, progress_file, inst, args, alg_name, vlog):
+            if _try_write_summary_if_complete(outfile, progress_file, inst, args, alg_name, vlog, rule):
                 completed_instances.add(inst)
                 repaired += 1
         if repaired:
             vlog(f'Pool mode recovery: wrote {repaired} missing summary row(s) from progress.')
     else:
-        vlog(f'Pool mode: {pool_workers} worker process(es), {len(pending)} (instance, rep) job(s) queued')
+        kind = 'in-process native solver thread(s)' if native else 'persistent solver process(es)'
+        vlog(f'Pool mode: {pool_workers} {kind}, {len(pending)} (instance, rep) job(s) queued')
+        if rule is not None:
+            vlog(f'Adaptive reps: {rule!r}')
+        layout_file = record_layout(outfile)
+        if layout_file is not None:
+            vlog(f'CPU pinning ({pin_mode()}): layout recorded in {layout_file}')
 
-    summary_headers = [
-        'instance', 'alg', 'alg_name', 'success_%', 'time_mean', 'time_std',
-        'cycles_mean', 'cycles_std',
-    ]
-    progress_headers = ['instance', 'alg', 'alg_name', 'rep', 'success', 'time', 'cycles']
     _ensure_csv_header(outfile, summary_headers)
-    _ensure_csv_header(progress_file, progress_headers)
+    if journal is None:
+        _ensure_csv_header(progress_file, PROGRESS_HEADERS)
+
+    files_by_name = {fp.name: fp for fp in instance_files}
+    scheduler = CampaignScheduler(getattr(args, 'priority', 'fifo'))
+    scheduler.add_group('pool', pool_workers)
+    for job in pending:
+        scheduler.submit(job, 'pool')
+
+    def queue_more(inst: str) -> None:
+        """Adaptive mode: queue the next reps of an instance its rule has not stopped yet."""
+        if rule is None or inst in completed_instances:
+            return
+        queued = issued.setdefault(inst, set())
+        for rep in rule.next_reps(progress.get(inst, {}), queued):
+            scheduler.submit(make_job(files_by_name[inst], rep), 'pool')
+            queued.add(rep)
 
     done_count = 0
-    if pending:
-        with ProcessPoolExecutor(max_workers=pool_workers) as ex:
-            future_to_rep = {ex.submit(run_one_rep_job, job): job for job in pending}
-            for fut in as_completed(future_to_rep):
-                job = future_to_rep[fut]
-                try:
-                    r = fut.result()
-                except Exception as e:
-                    vlog(f'ERROR job {job["instance_path"]} rep {job["rep"]}: {e}')
-                    continue
+    interrupted_count = 0
+    keep_interrupted = getattr(args, 'keep_interrupted', False)
+    stop_signal = None
+
+    def handle_completed(job: dict, r: dict | None, exc: BaseException | None) -> None:
+        nonlocal done_count, interrupted_count
+        issued.get(Path(job['instance_path']).name, set()).discard(job['rep'])
+        if r is None and exc is None:
+            return  # skipped: the instance was settled while this rep was queued
+        if isinstance(exc, SolverInterruptedError):
+            row = interrupted_progress_row(job, exc, args.alg, alg_name)
+            if row is None or not _record_rep(progress_file, row, vlog):
+                vlog(f'INTERRUPTED job {job["instance_path"]} rep {job["rep"]}: {exc} (not recorded)')
+                return
+            interrupted_count += 1
+            vlog(f'  INTERRUPTED {row[0]} rep {job["rep"]} after {row[5]} s; recorded as interrupted')
+            if keep_interrupted:
+                progress.setdefault(row[0], {})[job['rep']] = (False, exc.record.get('time', math.nan), math.nan)
+                if _try_write_summary_if_complete(outfile, progress_file, row[0], args, alg_name, vlog, rule):
+                    completed_instances.add(row[0])
+            return
+        if exc is not None:
+            vlog(f'ERROR job {job["instance_path"]} rep {job["rep"]}: {exc}')
+            return
+
+        inst = r['instance']
+        rep = r['rep']
+        success = r['success']
+        t = r['time']
+        cyc = r['cycles']
+
+        progress_row = [
+            inst,
+            args.alg,
+            alg_name,
+            rep,
+            1 if success else 0,
+            '' if math.isnan(t) else t,
+            '' if math.isnan(cyc) else cyc,
+            r['seed'],
+            0,
+        ]
+        if not _record_rep(progress_file, progress_row, vlog):
+            vlog('  ERROR: progress row not written')
+
+        rm = progress.setdefault(inst, {})
+        rm[rep] = (success, t, cyc)
+
+        if _try_write_summary_if_complete(outfile, progress_file, inst, args, alg_name, vlog, rule):
+            completed_instances.add(inst)
+        else:
+            queue_more(inst)
+
+        done_count += 1
+        if args.verbose and done_count % 50 == 0:
+            vlog(f'  Pool progress: {done_count}/{len(pending)} jobs finished')
+
+    async def run_pool() -> None:
+        # Serve workers start lazily, so in native mode no solver process is spawned.
+        native_exs = [ThreadPoolExecutor(max_workers=pool_workers)] if native else []
+        native_threads = pool_workers
+        stop = asyncio.Event()
+        try:
+            async with job_queue.open_pool(args, binary_path, pool_workers) as solvers:
+                def on_resize(n):
+                    nonlocal native_threads
+                    print(f'Pool capacity: {solvers.size} -> {n} worker(s)', flush=True)
+                    solvers.resize(n)
+                    if native and n > native_threads:
+                        # running solves keep their threads; new ones use the larger executor
+                        native_exs.append(ThreadPoolExecutor(max_workers=n))
+                        native_threads = n
+
+                def on_stop(signum):
+                    nonlocal stop_signal
+                    if stop_signal is None:
+                        print('Stopping: no new reps; running reps are recorded as interrupted...', flush=True)
+                    stop_signal = signum
+                    stop.set()
+                    solvers.interrupt()
+                    if native:
+                        import sudaco_native
+                        sudaco_native.interrupt()
+
+                async def run_job(job):
+                    if Path(job['instance_path']).name in completed_instances:
+                        return None
+                    return await run_one_rep_job(job, solvers, native_exs[-1] if native else None)
+
+                install_stop_handlers(on_stop)
+                await scheduler.run(
+                    run_job,
+                    on_result=handle_completed,
+                    stop=stop,
+                    control=job_queue.pool_control(solvers, args),
+                    on_resize=on_resize,
+                )
+        finally:
+            for ex in native_exs:
+                ex.shutdown()
 
-                inst = r['instance']
-                rep = r['rep']
-                success = r['success']
-                t = r['time']
-                cyc = r['cycles']
-
-                progress_row = [
-                    inst,
-                    args.alg,
-                    alg_name,
-                    rep,
-                    1 if success else 0,
-                    '' if math.isnan(t) else t,
-                    '' if math.isnan(cyc) else cyc,
-                ]
-                if not _append_csv_row(progress_file, progress_row, vlog):
-                    vlog('  ERROR: progress row not written')
-
-                rm = progress.setdefault(inst, {})
-                rm[rep] = (success, t, cyc)
-
-                if _try_write_summary_if_complete(outfile, progress_file, inst, args, alg_name, vlog):
-                    completed_instances.add(inst)
-
-                done_count += 1
-                if args.verbose and done_count % 50 == 0:
-                    vlog(f'  Pool progress: {done_count}/{len(pending)} jobs finished')
+    if pending:
+        asyncio.run(run_pool())
 
     total_instances = len(instance_files)
     from run_ablation import sort_summary_csv_if_complete
@@ -360,7 +618,12 @@ def run_benchmark_pool(
     print(f'Completed (pool). Results saved to: {outfile}')
     print(f'Total instances: {total_instances}')
     print(f'Completed: {len(completed_instances)}/{total_instances}')
+    if interrupted_count:
+        print(f'Interrupted reps recorded: {interrupted_count}'
+              + (' (counted as failures)' if keep_interrupted else ' (run again on resume)'))
     if len(completed_instances) < total_instances:
         print(f'Remaining: {total_instances - len(completed_instances)}')
         print('Re-run with the same arguments to resume.')
     print(f"{'='*70}")
+    if stop_signal is not None:
+        raise SystemExit(128 + stop_signal)
@@ -6,13 +6,28 @@ and general instance sets.  It is intended to be imported by small wrapper
 scripts that handle the command line interface for each benchmark type.
 """
 
+import asyncio
 import csv
+import json
 import math
 import os
+import queue
 import re
+import signal
+import struct
 import subprocess
+import tempfile
+import threading
+import time
+import zlib
 from pathlib import Path
-from statistics import mean, pstdev
+
+import cpu_affinity
+import group_stats
+import job_queue
+import rep_store
+import result_cache
+from campaign_scheduler import solver_slot, solver_slot_async
 
 
 class SolverInterruptedError(RuntimeError):
@@ -22,8 +37,85 @@ class SolverInterruptedError(RuntimeError):
 
     Used so benchmark harnesses can avoid writing bogus failures when the user
     abruptly terminates a running instance/rep.
+
+    When the solver was stopped by SIGTERM/SIGINT it still reports its partial
+    result (best fill, cycles, elapsed time, ``"interrupted": true``); that
+    record is kept in ``record`` so the rep can be logged as interrupted.
     """
 
+    def __init__(self, message, record=None):
+        super().__init__(message)
+        self.record = record
+
+
+# Wall-clock backstop on top of the solver's own --timeout: a run still going
+# after hard_timeout_for(timeout) seconds is sent SIGTERM, then SIGKILL if it
+# has not exited TERMINATE_GRACE seconds later.
+HARD_TIMEOUT_FACTOR = 1.1
+HARD_TIMEOUT_SLACK = 5.0
+TERMINATE_GRACE = 2.0
+
+
+def hard_timeout_for(timeout):
+    """Wall-clock limit (s) for one solver run with a ``--timeout`` budget of ``timeout``."""
+    return float(timeout) * HARD_TIMEOUT_FACTOR + HARD_TIMEOUT_SLACK
+
+
+def terminate_process(proc, grace=TERMINATE_GRACE):
+    """SIGTERM ``proc``, escalating to SIGKILL after ``grace`` seconds; returns its exit status."""
+    if proc.poll() is None:
+        try:
+            proc.terminate()
+        except OSError:
+            pass
+        try:
+            return proc.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return proc.wait()
+
+
+class _Watchdog:
+    """Terminate ``proc`` (see :func:`terminate_process`) unless :meth:`feed` is
+    called at least every ``seconds``. ``fired`` tells whether it did."""
+
+    def __init__(self, proc, seconds):
+        self.proc = proc
+        self.seconds = seconds
+        self.fired = False
+        self._cond = threading.Condition()
+        self._deadline = time.monotonic() + seconds
+        self._stopped = False
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def _watch(self):
+        with self._cond:
+            while not self._stopped:
+                remaining = self._deadline - time.monotonic()
+                if remaining <= 0:
+                    self.fired = True
+                    break
+                self._cond.wait(remaining)
+        if self.fired:
+            terminate_process(self.proc)
+
+    def feed(self):
+        with self._cond:
+            self._deadline = time.monotonic() + self.seconds
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
 
 def default_binary():
     """Guess a sensible default solver binary depending on the platform."""
@@ -39,18 +131,183 @@ def default_binary():
         return './sudokusolver'
 
 
-def run_solver(binary, file_path, alg, timeout, extra_args=None):
-    """Invoke the solver and parse its output."""
-    args = [binary, '--file', str(file_path), '--alg', str(alg), '--timeout', str(timeout), '--verbose']
+# Fixed-size record written per run by ``--format binary`` (see WriteBinaryRecord
+# in src/solvermain.cpp).
+RESULT_RECORD = struct.Struct('<iBBHiifffffffQI')
+RESULT_RECORD_FIELDS = (
+    'rep', 'success', 'interrupted', 'cells_filled', 'cycles', 'cp_calls', 'time',
+    'cp_initial', 'cp_ant', 'dcm_aco', 'cooperative_game', 'pheromone_fusion',
+    'public_path', 'solution_hash', 'seed',
+)
+
+
+def rep_seed(instance, rep, base_seed=None):
+    """Solver seed (32-bit) for one repetition of one instance.
+
+    With ``base_seed`` the seed is derived from ``(base_seed, instance, rep)``
+    alone, so a campaign reproduces regardless of worker count or job order.
+    Without it a fresh random seed is drawn; record it to replay the run.
+    """
+    if base_seed is None:
+        return int.from_bytes(os.urandom(4), 'little')
+    return zlib.crc32(f'{base_seed}:{instance}:{rep}'.encode())
+
+
+def _solver_job_args(file_path, alg, timeout, extra_args=None, output_format='json', seed=None):
+    """Command line options (without the binary) for one solver run."""
+    args = ['--file', str(file_path), '--alg', str(alg), '--timeout', str(timeout),
+            '--format', output_format]
+    if seed is not None:
+        args += ['--seed', str(int(seed))]
     if extra_args:
-        args.extend(extra_args)
-    solver_returncode: int | None = None
+        args.extend(str(a) for a in extra_args)
+    return args
+
+
+def parse_result_record(out):
+    """Return the last ``--format json`` record in ``out`` as a dict, or None."""
+    for ln in reversed(out.splitlines()):
+        ln = ln.strip()
+        if ln.startswith('{'):
+            try:
+                return json.loads(ln)
+            except ValueError:
+                return None
+    return None
+
+
+def unpack_result_record(data, offset=0):
+    """Decode one ``--format binary`` record into a dict like the JSON record."""
+    rec = dict(zip(RESULT_RECORD_FIELDS, RESULT_RECORD.unpack_from(data, offset)))
+    rec['success'] = bool(rec['success'])
+    rec['interrupted'] = bool(rec['interrupted'])
+    return rec
+
+
+def _interrupted_error(rec, file_path):
+    return SolverInterruptedError(
+        f"Solver stopped by a signal after {rec.get('time')} s "
+        f"({rec.get('cells_filled', rec.get('cellsFilled'))} cells filled) for file {file_path}.",
+        record=rec)
+
+
+def _cache_config(solver_path, file_path, alg, timeout, extra_args):
+    """``(cache, config key)`` when a result cache is enabled, else ``(None, None)``."""
+    cache = result_cache.active()
+    if cache is None:
+        return None, None
     try:
-        out = subprocess.check_output(args, stderr=subprocess.STDOUT, universal_newlines=True)
-    except subprocess.CalledProcessError as e:
-        out = e.output
-        solver_returncode = e.returncode
+        return cache, result_cache.config_key(solver_path, file_path, alg, timeout, extra_args)
+    except OSError:
+        # solver looked up on PATH, or instance unreadable: run uncached
+        return None, None
+
 
+def _cached_result(cache, config, seed):
+    """``(success, elapsed, cycles, out)`` from the result cache, or None on a miss."""
+    if cache is None:
+        return None
+    rec = cache.get(config, seed)
+    if rec is None:
+        return None
+    return rec['success'], float(rec['time']), rec['cycles'], json.dumps(rec)
+
+
+def _result_from_output(cache, config, campaign, out, file_path, returncode, killed_after=None):
+    """Parse one run's output into ``(success, elapsed, cycles, out)``, caching its JSON record.
+
+    ``killed_after`` is the hard timeout when the harness had to kill the run; a
+    killed run without a record counts as a failure after that many seconds.
+    """
+    rec = parse_result_record(out)
+    if rec is not None and rec.get('interrupted'):
+        # partial result: never cached; a hard-timeout kill is still a failure
+        if killed_after is not None:
+            return False, float(rec['time']), rec['cycles'], out
+        raise _interrupted_error(rec, file_path)
+    if rec is not None:
+        if cache is not None:
+            cache.put(config, rec, campaign)
+        return rec['success'], float(rec['time']), rec['cycles'], out
+    if killed_after is not None:
+        return False, float(killed_after), math.nan, out
+    return parse_solver_output(out, file_path, returncode)
+
+
+def _solve_cached(solver_path, file_path, alg, timeout, extra_args, seed, campaign, run):
+    """Serve one run from the result cache, or ``run()`` it (returning
+    ``(out, returncode, killed_after)``) and cache its JSON record."""
+    cache, config = _cache_config(solver_path, file_path, alg, timeout, extra_args)
+    result = _cached_result(cache, config, seed)
+    if result is None:
+        out, returncode, killed_after = run()
+        result = _result_from_output(cache, config, campaign, out, file_path, returncode, killed_after)
+    return rep_store.keep(result, file_path, alg, timeout, extra_args, seed, campaign)
+
+
+def run_solver(binary, file_path, alg, timeout, extra_args=None, seed=None, campaign=None, hard_timeout=None):
+    """Invoke the solver and return ``(success, elapsed, cycles, out)``.
+
+    The solver is asked for one JSON record (``--format json``); the text
+    parser is only used for binaries that predate structured output. ``seed``
+    makes the run reproducible (see :func:`rep_seed`). With a result cache
+    enabled, a seeded run already in the cache is not solved again; new
+    results are cached, and claimed by ``campaign`` when given (see
+    :func:`claim_cached_reps`).
+
+    A solver still running after ``hard_timeout`` seconds (default:
+    :func:`hard_timeout_for` ``timeout``) is terminated, then killed, and the
+    run counts as a failure taking ``hard_timeout`` seconds.
+
+    Like every solver run started here, it first waits for a machine-wide
+    solver slot (see ``campaign_scheduler``) and, with ``--pin``, is bound to
+    that slot's CPUs (see ``cpu_affinity``). Under a ``--distributed``
+    launcher (``$SUDACO_COORDINATOR``) the run goes to a worker agent instead
+    (see ``job_queue``).
+    """
+    limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+    coordinator = job_queue.active_url()
+
+    def run():
+        if coordinator is not None:
+            return job_queue.solve_remote(
+                coordinator, job_queue.job_payload(file_path, alg, timeout, extra_args, seed, limit))
+        args = [binary] + _solver_job_args(file_path, alg, timeout, extra_args, seed=seed)
+        with solver_slot() as cpus, subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                                     universal_newlines=True) as proc:
+            cpu_affinity.pin(proc.pid, cpus)
+            try:
+                out, _ = proc.communicate(timeout=limit)
+            except subprocess.TimeoutExpired:
+                terminate_process(proc)
+                out, _ = proc.communicate()
+                return out, proc.returncode, limit
+        return out, proc.returncode or None, None
+    return _solve_cached(binary, file_path, alg, timeout, extra_args, seed, campaign, run)
+
+
+def claim_cached_reps(solver_path, file_path, alg, timeout, extra_args, campaign, n):
+    """Up to ``n`` cached results of this configuration that ``campaign`` has not
+    used yet, as ``(success, elapsed, cycles, seed)``.
+
+    For campaigns without a base seed, whose reps are exchangeable samples: each
+    cached result is handed to a campaign at most once. Empty when no result
+    cache is enabled.
+    """
+    cache, config = _cache_config(solver_path, file_path, alg, timeout, extra_args)
+    if cache is None:
+        return []
+    claimed = cache.claim(config, campaign, n)
+    for rec in claimed:
+        rep_store.keep_record(rec, file_path, alg, timeout, extra_args, campaign=campaign)
+    return [
+        (bool(rec['success']), float(rec['time']), rec.get('cycles', rec.get('iterations')), rec['seed'])
+        for rec in claimed
+    ]
+
+
+def parse_solver_output(out, file_path, solver_returncode=None):
+    """Parse text solver output into ``(success, elapsed, cycles, out)``."""
     # Parse output. Verbose format:
     #   - "Number of cycles (multi): N" then either "failed in time X" or "Solution:" + grid + "solved in X", then cp_* lines.
     # Old format: success flag 0/1 on one line, time float on next.
@@ -138,6 +395,539 @@ def run_solver(binary, file_path, alg, timeout, extra_args=None):
     return success, elapsed, cycles, out
 
 
+def run_solver_batch(binary, file_path, alg, timeout, reps, extra_args=None, seed=None, on_result=None,
+                     seeds=None, campaign=None, hard_timeout=None):
+    """Run ``reps`` repetitions of one instance in a single solver process.
+
+    The solver parses the file and runs initial constraint propagation once,
+    then solves ``reps`` times on fresh solver state (``--reps``), streaming one
+    binary record per rep. With ``seeds`` rep i (from 0) uses ``seeds[i]``;
+    otherwise, with ``seed``, rep i uses seed ``seed + i``. Seeded reps found
+    in the result cache are not solved again (see :func:`run_solver`).
+
+    ``on_result(i, success, elapsed, cycles)`` is called as each rep finishes
+    (i from 0, cached reps first), so callers can persist reps before the batch
+    completes. Returns the list of ``(success, elapsed, cycles)`` in rep order.
+    Raises :class:`SolverInterruptedError` if the solver exits before all reps
+    are reported; reps already passed to ``on_result`` are complete.
+
+    A rep that runs past ``hard_timeout`` seconds (see :func:`run_solver`) is
+    killed and counted as a failure; the remaining reps continue in a new
+    solver process.
+    """
+    limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+    if seeds is None and seed is not None:
+        seeds = [int(seed) + i for i in range(reps)]
+    results = [None] * reps
+    done = 0
+
+    def deliver(i, rec):
+        nonlocal done
+        rep_store.keep_record(rec, file_path, alg, timeout, extra_args,
+                              seeds[i] if seeds is not None else None, campaign)
+        if on_result is not None:
+            on_result(i, rec['success'], rec['time'], rec['cycles'])
+        results[i] = (rec['success'], rec['time'], rec['cycles'])
+        done += 1
+
+    cache, config = _cache_config(binary, file_path, alg, timeout, extra_args)
+    todo = list(range(reps))
+    if cache is not None and seeds is not None:
+        todo = []
+        for i in range(reps):
+            rec = cache.get(config, seeds[i])
+            if rec is None:
+                todo.append(i)
+            else:
+                deliver(i, rec)
+    partial = None  # record of a rep stopped by a signal
+    while todo:
+        args = [binary] + _solver_job_args(file_path, alg, timeout, extra_args, output_format='binary')
+        args += ['--reps', str(len(todo))]
+        if seeds is not None:
+            args += ['--seeds', ','.join(str(int(seeds[i])) for i in todo)]
+        with solver_slot() as cpus, subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc, \
+                _Watchdog(proc, limit) as dog:
+            cpu_affinity.pin(proc.pid, cpus)
+            while todo:
+                data = proc.stdout.read(RESULT_RECORD.size)
+                if len(data) < RESULT_RECORD.size:
+                    break
+                dog.feed()
+                rec = unpack_result_record(data)
+                if rec['interrupted']:
+                    partial = rec
+                    break
+                if cache is not None:
+                    cache.put(config, rec, campaign)
+                deliver(todo.pop(0), rec)
+            err = proc.stderr.read().decode(errors='replace').strip()
+        if not (dog.fired and todo):
+            break
+        # killed on the hard timeout: that rep failed, the rest run in a new process
+        deliver(todo.pop(0), partial or {'success': False, 'time': float(limit), 'cycles': math.nan})
+        partial = None
+    if partial is not None:
+        raise _interrupted_error(partial, file_path)
+    if done < reps:
+        raise SolverInterruptedError(
+            f"Solver subprocess stopped after {done}/{reps} reps "
+            f"(returncode={proc.returncode}) for file {file_path}."
+            + (f" stderr: {err}" if err else '')
+        )
+    return results
+
+
+def run_solver_multi(binary, file_paths, alg, timeout, reps=1, extra_args=None, seeds=None, on_result=None,
+                     hard_timeout=None):
+    """Solve several instances in order in one solver process (``--list``).
+
+    Every instance runs ``reps`` times with the same options and timeout.
+    ``seeds`` optionally maps each path to its per-rep seeds. Results stream
+    back as each rep finishes: ``on_result(path, rep, success, elapsed, cycles)``
+    with rep from 1. An instance the solver cannot read counts as ``reps``
+    failures. Returns ``{path: [(success, elapsed, cycles), ...]}`` in input
+    order; raises :class:`SolverInterruptedError` if the solver stops early.
+    A rep that runs past ``hard_timeout`` seconds (see :func:`run_solver`) is
+    killed and counted as a failure, and the rest of the list is solved anew.
+    """
+    limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+    paths = [Path(fp) for fp in file_paths]
+    by_name = {str(fp): fp for fp in paths}
+    results = {fp: [] for fp in paths}
+    fd, list_path = tempfile.mkstemp(prefix='sudoku_list_', suffix='.txt', text=True)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for fp in paths:
+                seed_field = ''
+                if seeds is not None and seeds.get(fp):
+                    # trailing comma: always a per-rep list, even for one rep
+                    seed_field = ' ' + ','.join(str(int(x)) for x in seeds[fp]) + ','
+                f.write(f'{fp}{seed_field}\n')
+        args = [binary, '--list', list_path, '--alg', str(alg), '--timeout', str(timeout),
+                '--format', 'json', '--reps', str(int(reps))]
+        if extra_args:
+            args.extend(str(a) for a in extra_args)
+        partial = None  # record of a rep stopped by a signal
+        with solver_slot() as cpus, subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                                     universal_newlines=True) as proc, _Watchdog(proc, limit) as dog:
+            cpu_affinity.pin(proc.pid, cpus)
+            for ln in proc.stdout:
+                dog.feed()
+                if not ln.startswith('{'):
+                    continue
+                try:
+                    rec = json.loads(ln)
+                except ValueError:
+                    continue
+                fp = by_name.get(rec.get('instance'))
+                if fp is None:
+                    continue
+                if rec.get('interrupted'):
+                    partial = rec
+                    continue
+                if 'error' in rec:
+                    outcomes = [(False, math.nan, math.nan)] * int(reps)
+                else:
+                    outcomes = [(rec['success'], float(rec['time']), rec['cycles'])]
+                    rep_store.keep_record(rec, fp, alg, timeout, extra_args)
+                    cache, config = _cache_config(binary, fp, alg, timeout, extra_args)
+                    if cache is not None:
+                        cache.put(config, rec)
+                for success, t, cyc in outcomes:
+                    results[fp].append((success, t, cyc))
+                    if on_result is not None:
+                        on_result(fp, len(results[fp]), success, t, cyc)
+            err = proc.stderr.read().strip()
+    finally:
+        os.unlink(list_path)
+    if dog.fired:
+        _resume_killed_multi(binary, paths, results, alg, timeout, reps, extra_args, seeds, on_result, limit)
+    elif partial is not None:
+        raise _interrupted_error(partial, partial['instance'])
+    done = sum(len(v) for v in results.values())
+    if done < len(paths) * reps:
+        raise SolverInterruptedError(
+            f"Solver subprocess stopped after {done}/{len(paths) * reps} runs "
+            f"(returncode={proc.returncode}) for list of {len(paths)} file(s)."
+            + (f" stderr: {err}" if err else '')
+        )
+    return results
+
+
+def _resume_killed_multi(binary, paths, results, alg, timeout, reps, extra_args, seeds, on_result, limit):
+    """After a hard-timeout kill in :func:`run_solver_multi`: fail the rep that was
+    running, finish its instance with :func:`run_solver_batch` and the instances
+    after it with a new ``--list`` process, filling ``results`` in place."""
+    left = [fp for fp in paths if len(results[fp]) < reps]
+    if not left:
+        return
+
+    def report(fp, success, t, cyc):
+        results[fp].append((success, t, cyc))
+        if on_result is not None:
+            on_result(fp, len(results[fp]), success, t, cyc)
+
+    current, rest = left[0], left[1:]
+    report(current, False, float(limit), math.nan)
+    remaining = reps - len(results[current])
+    if remaining > 0:
+        cur_seeds = seeds.get(current) if seeds is not None else None
+        run_solver_batch(
+            binary, current, alg, timeout, remaining, extra_args=extra_args,
+            seeds=cur_seeds[len(results[current]):] if cur_seeds else None, hard_timeout=limit,
+            on_result=lambda _i, success, t, cyc: report(current, success, t, cyc))
+    if rest:
+        run_solver_multi(
+            binary, rest, alg, timeout, reps, extra_args=extra_args, seeds=seeds, hard_timeout=limit,
+            on_result=lambda fp, _rep, success, t, cyc: report(fp, success, t, cyc))
+
+
+# Must match SERVE_END_MARKER in src/solvermain.cpp.
+SERVE_END_MARKER = '@@end'
+
+
+def _quote_serve_token(token):
+    return f'"{token}"' if any(c.isspace() for c in token) else token
+
+
+class _ServeWorker:
+    """One long-lived ``sudokusolver --serve`` process."""
+
+    def __init__(self, binary):
+        self.binary = binary
+        self.proc = None
+
+    def _ensure_started(self):
+        if self.proc is None or self.proc.poll() is not None:
+            self.proc = subprocess.Popen(
+                [self.binary, '--serve'],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+                bufsize=1,
+            )
+
+    def run(self, job_args, hard_timeout, cpus=None):
+        """Send one job line and collect its output up to the end marker,
+        with the worker bound to ``cpus`` (see ``cpu_affinity``) when given.
+
+        Returns ``(out, returncode, killed_after)``; returncode is None while the
+        worker is still alive, otherwise the exit status of the process that died
+        mid-job. A job still running after ``hard_timeout`` seconds kills the
+        worker (it restarts on the next job) and sets ``killed_after``.
+        """
+        self._ensure_started()
+        cpu_affinity.pin(self.proc.pid, cpus)
+        line = ' '.join(_quote_serve_token(a) for a in job_args)
+        try:
+            self.proc.stdin.write(line + '\n')
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return '', self.proc.wait(), None
+        out_lines = []
+        with _Watchdog(self.proc, hard_timeout) as dog:
+            for ln in self.proc.stdout:
+                if ln.rstrip('\r\n') == SERVE_END_MARKER:
+                    return ''.join(out_lines), None, None
+                out_lines.append(ln)
+        # EOF before the marker: the worker exited (killed, crashed, Ctrl+C).
+        return ''.join(out_lines), self.proc.wait(), hard_timeout if dog.fired else None
+
+    def close(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+
+class SolverWorkerPool:
+    """Keep ``size`` persistent solver processes and hand jobs to idle ones.
+
+    Each worker runs ``binary --serve`` and solves one job per input line, so a
+    benchmark pays the process start-up once per worker instead of once per
+    repetition. ``run_solver`` is thread-safe and returns the same tuple as the
+    module-level :func:`run_solver`; call it from up to ``size`` threads.
+    A worker that dies mid-job is restarted on its next use and the job raises
+    :class:`SolverInterruptedError`, as a killed one-shot solver would; one
+    killed for running past its hard timeout fails the job as in :func:`run_solver`.
+    """
+
+    def __init__(self, binary, size):
+        self.binary = str(binary)
+        self.size = max(1, int(size))
+        self._idle = queue.Queue()
+        self._workers = []
+        for _ in range(self.size):
+            w = _ServeWorker(self.binary)
+            self._workers.append(w)
+            self._idle.put(w)
+
+    def run_solver(self, file_path, alg, timeout, extra_args=None, seed=None, campaign=None, hard_timeout=None):
+        limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+
+        def run():
+            with solver_slot() as cpus:
+                worker = self._idle.get()
+                try:
+                    return worker.run(_solver_job_args(file_path, alg, timeout, extra_args, seed=seed), limit, cpus)
+                finally:
+                    self._idle.put(worker)
+        return _solve_cached(self.binary, file_path, alg, timeout, extra_args, seed, campaign, run)
+
+    def close(self):
+        for w in self._workers:
+            w.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+async def terminate_process_async(proc, grace=TERMINATE_GRACE):
+    """:func:`terminate_process` for an asyncio subprocess."""
+    if proc.returncode is None:
+        try:
+            proc.terminate()
+        except ProcessLookupError:
+            pass
+        try:
+            return await asyncio.wait_for(proc.wait(), timeout=grace)
+        except asyncio.TimeoutError:
+            proc.kill()
+    return await proc.wait()
+
+
+async def run_solver_async(binary, file_path, alg, timeout, extra_args=None, seed=None, campaign=None,
+                           hard_timeout=None):
+    """Coroutine version of :func:`run_solver`: the solver runs as a child of the
+    event loop, so one orchestrator can drive many solver processes without a
+    thread or interpreter per job."""
+    limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+    cache, config = _cache_config(binary, file_path, alg, timeout, extra_args)
+    hit = _cached_result(cache, config, seed)
+    if hit is not None:
+        return rep_store.keep(hit, file_path, alg, timeout, extra_args, seed, campaign)
+    chunks = []
+    killed_after = None
+    async with solver_slot_async() as cpus:
+        proc = await asyncio.create_subprocess_exec(
+            binary, *_solver_job_args(file_path, alg, timeout, extra_args, seed=seed),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+        cpu_affinity.pin(proc.pid, cpus)
+
+        async def read_all():
+            while chunk := await proc.stdout.read(1 << 16):
+                chunks.append(chunk)
+            await proc.wait()
+
+        try:
+            await asyncio.wait_for(read_all(), timeout=limit)
+        except asyncio.TimeoutError:
+            await terminate_process_async(proc)
+            chunks.append(await proc.stdout.read())
+            killed_after = limit
+    returncode = proc.returncode if proc.returncode != 0 else None
+    out = b''.join(chunks).decode(errors='replace')
+    result = _result_from_output(cache, config, campaign, out, file_path, returncode, killed_after)
+    return rep_store.keep(result, file_path, alg, timeout, extra_args, seed, campaign)
+
+
+class _AsyncServeWorker:
+    """One long-lived ``sudokusolver --serve`` process driven from the event loop."""
+
+    def __init__(self, binary):
+        self.binary = binary
+        self.proc = None
+
+    async def _ensure_started(self):
+        if self.proc is None or self.proc.returncode is not None:
+            self.proc = await asyncio.create_subprocess_exec(
+                self.binary, '--serve',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=2**20,
+            )
+
+    async def run(self, job_args, hard_timeout, cpus=None):
+        """As :meth:`_ServeWorker.run`: ``(out, returncode, killed_after)``."""
+        await self._ensure_started()
+        cpu_affinity.pin(self.proc.pid, cpus)
+        line = ' '.join(_quote_serve_token(a) for a in job_args)
+        try:
+            self.proc.stdin.write((line + '\n').encode())
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            return '', await self.proc.wait(), None
+        out_lines = []
+
+        async def read_job():
+            while True:
+                raw = await self.proc.stdout.readline()
+                if not raw:
+                    # EOF before the marker: the worker exited (killed, crashed, Ctrl+C).
+                    return await self.proc.wait()
+                ln = raw.decode(errors='replace')
+                if ln.rstrip('\r\n') == SERVE_END_MARKER:
+                    return None
+                out_lines.append(ln)
+
+        try:
+            returncode = await asyncio.wait_for(read_job(), timeout=hard_timeout)
+        except asyncio.TimeoutError:
+            return ''.join(out_lines), await terminate_process_async(self.proc), hard_timeout
+        return ''.join(out_lines), returncode, None
+
+    async def close(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            await asyncio.wait_for(self.proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            await terminate_process_async(self.proc)
+        self.proc = None
+
+
+class AsyncSolverWorkerPool:
+    """:class:`SolverWorkerPool` for asyncio: ``size`` persistent solver processes
+    served from one event loop, no threads. ``await pool.run_solver(...)`` returns
+    the same tuple as :func:`run_solver`. Use as ``async with``.
+    :meth:`resize` grows or shrinks the pool while jobs run.
+    """
+
+    def __init__(self, binary, size):
+        self.binary = str(binary)
+        self.size = max(1, int(size))
+        self._workers = [_AsyncServeWorker(self.binary) for _ in range(self.size)]
+        self._idle = None
+        self._stopping = False
+        self._surplus = 0
+        self._closing = []
+
+    def resize(self, size):
+        """Change the number of solver processes to ``size`` without touching
+        running jobs: new workers are available at once (their processes start
+        on first use), surplus ones are closed as soon as they are idle."""
+        size = max(1, int(size))
+        if size > self.size:
+            grow = size - self.size
+            kept = min(grow, self._surplus)
+            self._surplus -= kept
+            for _ in range(grow - kept):
+                w = _AsyncServeWorker(self.binary)
+                self._workers.append(w)
+                if self._idle is not None:
+                    self._idle.put_nowait(w)
+        elif self._idle is None:
+            del self._workers[size:]  # none started yet
+        else:
+            self._surplus += self.size - size
+            while self._surplus > 0 and not self._idle.empty():
+                self._retire(self._idle.get_nowait())
+        self.size = size
+
+    def _retire(self, worker):
+        self._surplus -= 1
+        self._workers.remove(worker)
+        self._closing.append(asyncio.ensure_future(worker.close()))
+
+    def _release(self, worker):
+        if self._surplus > 0:
+            self._retire(worker)
+        else:
+            self._idle.put_nowait(worker)
+
+    async def run_solver(self, file_path, alg, timeout, extra_args=None, seed=None, campaign=None,
+                         hard_timeout=None):
+        limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+        cache, config = _cache_config(self.binary, file_path, alg, timeout, extra_args)
+        result = _cached_result(cache, config, seed)
+        if result is None:
+            out, returncode, killed_after = await self.run_job(
+                _solver_job_args(file_path, alg, timeout, extra_args, seed=seed), limit)
+            result = _result_from_output(cache, config, campaign, out, file_path, returncode, killed_after)
+        return rep_store.keep(result, file_path, alg, timeout, extra_args, seed, campaign)
+
+    async def run_job(self, job_args, hard_timeout):
+        """Run one raw solver job line on an idle worker: ``(out, returncode,
+        killed_after)`` as :meth:`_ServeWorker.run`, unparsed and uncached."""
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for w in self._workers:
+                self._idle.put_nowait(w)
+        async with solver_slot_async() as cpus:
+            if self._stopping:
+                raise SolverInterruptedError(f'Pool stopped before running {" ".join(job_args)}.')
+            worker = await self._idle.get()
+            try:
+                return await worker.run(job_args, hard_timeout, cpus)
+            finally:
+                self._release(worker)
+
+    def interrupt(self, sig=signal.SIGTERM):
+        """Send ``sig`` to every live worker: a running job stops at its next
+        deadline check and reports a partial, interrupted result; the worker
+        then exits (and is restarted if used again). Jobs still waiting for a
+        solver slot raise :class:`SolverInterruptedError` without running."""
+        self._stopping = True
+        for w in self._workers:
+            if w.proc is not None and w.proc.returncode is None:
+                try:
+                    w.proc.send_signal(sig)
+                except ProcessLookupError:
+                    pass
+
+    async def close(self):
+        await asyncio.gather(*(w.close() for w in self._workers), *self._closing)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+def install_stop_handlers(on_stop):
+    """Call ``on_stop(signum)`` from the running event loop on SIGTERM/SIGINT,
+    instead of dying mid-write. A no-op where the loop cannot handle signals
+    (Windows), which keeps the default Ctrl+C behaviour."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, on_stop, sig)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass
+
+
+def progress_row_interrupted(row):
+    """Whether a progress CSV row (``csv.DictReader``) is a rep stopped by a signal.
+    Progress files started before the ``interrupted`` column existed get the
+    newer columns past their header: ``interrupted`` alone after a ``seed``
+    column, else ``seed, interrupted``."""
+    flag = row.get('interrupted')
+    if flag is None:
+        extra = row.get(None) or []
+        index = 0 if 'seed' in row else 1
+        flag = extra[index] if len(extra) > index else ''
+    return str(flag).strip() == '1'
+
+
 def detect_size_from_file(file_path: Path) -> int | None:
     """Detect Sudoku size by mimicking the C++ reader logic.
 
@@ -206,17 +996,12 @@ def scan_general_groups(base):
 
 
 def safe_mean(vals):
-    vals = [v for v in vals if not math.isnan(v)]
-    if not vals:
-        return math.nan
-    return mean(vals)
+    return group_stats.nanmean(vals)
 
 
 def safe_std(vals):
-    vals = [v for v in vals if not math.isnan(v)]
-    if len(vals) < 2:
-        return 0.0 if len(vals) == 1 else math.nan
-    return pstdev(vals)
+    """Population std of the non-NaN values (0.0 for one value, NaN for none)."""
+    return group_stats.nanstd(vals)
 
 
 def write_csv(path, headers, rows):
@@ -227,25 +1012,37 @@ def write_csv(path, headers, rows):
         for r in rows:
             w.writerow(r)
 
-def run_logic(algs, logic_dir, binary, timeout, reps_logic, vlog, extra_args=None):
-    """Run benchmarks on logic-solvable instances."""
+def run_logic(algs, logic_dir, binary, timeout, reps_logic, vlog, extra_args=None, seed=None):
+    """Run benchmarks on logic-solvable instances.
+
+    Instances sharing a size-specific timeout are solved in one solver process
+    (:func:`run_solver_multi`). ``seed`` is a base seed; each rep then gets
+    :func:`rep_seed` of it.
+    """
     logic_rows = []
     logic_headers = ['alg', 'instance', 'success_%', 'time_mean', 'time_std', 'cycles_mean']
     logic_files = scan_logic_instances(logic_dir)
     TIMEOUT_MAP = {6: 3, 9: 5, 12: 10, 16: 20, 25: 120}
+    # Size-specific timeout per file
+    by_timeout = {}
+    for fp in logic_files:
+        by_timeout.setdefault(TIMEOUT_MAP.get(detect_size_from_file(fp), timeout), []).append(fp)
+    seeds = None
+    if seed is not None:
+        seeds = {fp: [rep_seed(fp.name, r + 1, seed) for r in range(reps_logic)] for fp in logic_files}
     for alg in algs:
-        for idx, fp in enumerate(logic_files, start=1):
-            vlog(f"[logic-solvable] alg={alg} instance {idx}/{len(logic_files)}: {fp.name}")
+        vlog(f"[logic-solvable] alg={alg} instances={len(logic_files)}")
+        outcomes = {}
+        for per_timeout, files in by_timeout.items():
+            outcomes.update(run_solver_multi(
+                binary, files, alg, per_timeout, reps=reps_logic, extra_args=extra_args, seeds=seeds,
+                on_result=lambda fp, r, *_res: vlog(f"  - {fp.name} rep {r}/{reps_logic}")))
+        for fp in logic_files:
             successes = 0
             times = []
             cycles_solved = []
-            for r in range(reps_logic):
-                vlog(f"  - rep {r+1}/{reps_logic}")
-                # Size-specific timeout per file
-                sz = detect_size_from_file(fp)
-                per_timeout = TIMEOUT_MAP.get(sz, timeout)
-                _, t, cyc, out = run_solver(binary, fp, alg, per_timeout, extra_args=extra_args)
-                if "solved in" in out.lower():
+            for success, t, cyc in outcomes[fp]:
+                if success:
                     successes += 1
                     times.append(t)
                     if not math.isnan(cyc):
@@ -261,13 +1058,14 @@ def run_logic(algs, logic_dir, binary, timeout, reps_logic, vlog, extra_args=Non
                 cycles_mean_val,
             ])
             vlog(
-                f"  => success%={round(succ_pct,2)} time_mean={round(safe_mean(times),6)} "
+                f"  => {fp.name}: success%={round(succ_pct,2)} time_mean={round(safe_mean(times),6)} "
                 f"time_std={round(safe_std(times),6)} cycles_mean={cycles_mean_val}"
             )
     return logic_headers, logic_rows
 
 
-def run_general(algs, gen_dir, binary, timeout, vlog, group_filter=None, file_filter=None, extra_args=None):
+def run_general(algs, gen_dir, binary, timeout, vlog, group_filter=None, file_filter=None, extra_args=None,
+                seed=None):
     """Run benchmarks on general instances.
 
     Args:
@@ -278,6 +1076,9 @@ def run_general(algs, gen_dir, binary, timeout, vlog, group_filter=None, file_fi
         vlog: Verbose logging callback.
         group_filter: Optional callable(size, frac) -> bool to select groups.
         file_filter: Optional callable(size, frac, path) -> bool to select files.
+        seed: Optional base seed; each file then runs with :func:`rep_seed`.
+
+    Each (size, F%) group is solved in one solver process (:func:`run_solver_multi`).
     """
     gen_rows = []
     gen_headers = ['alg', 'puzzle', 'F%', 'solution_rate', 'time_mean', 'time_std', 'cycles_mean']
@@ -297,11 +1098,20 @@ def run_general(algs, gen_dir, binary, timeout, vlog, group_filter=None, file_fi
             solved = 0
             times = []
             cycles_solved = []
-            for i, fp in enumerate(selected_files, start=1):
-                __, t, cyc, out = run_solver(binary, fp, alg, timeout, extra_args=extra_args)
-                suffix = "" if "solved in" in out.lower() else " (failed)"
-                vlog(f"  - file {i}/{total}: {fp.name}{suffix}")
-                if "solved in" in out.lower():
+            seeds = None
+            if seed is not None:
+                seeds = {fp: [rep_seed(fp.name, 1, seed)] for fp in selected_files}
+            position = {fp: i for i, fp in enumerate(selected_files, start=1)}
+
+            def log_file(fp, _rep, success, _t, _cyc):
+                suffix = "" if success else " (failed)"
+                vlog(f"  - file {position[fp]}/{total}: {fp.name}{suffix}")
+
+            outcomes = run_solver_multi(
+                binary, selected_files, alg, timeout, extra_args=extra_args, seeds=seeds, on_result=log_file)
+            for fp in selected_files:
+                success, t, cyc = outcomes[fp][0]
+                if success:
                     solved += 1
                     times.append(t)
                     if not math.isnan(cyc):
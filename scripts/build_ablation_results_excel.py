@@ -19,6 +19,12 @@ Timeout sheet:
   CP-DCM-ACO uses the same aggregates as the best_config workbook section (CSV or
   best_config_workbook_aggregate.json); ACO from aggregated CP-ACS CSVs (alg 0), with
   all sizes preferring ``*_CP-ACS (100reps).csv`` when present.
+
+The per-file aggregates of those CSVs are kept in the consolidation cache
+(scripts/consolidation_cache.py); only new or changed files are parsed again.
+
+Sheets are streamed through scripts/excel_export.py; ``--sheet`` regenerates one
+sheet of an existing workbook without rewriting the other.
 """
 
 from __future__ import annotations
@@ -29,12 +35,13 @@ import json
 import math
 from collections import defaultdict
 from pathlib import Path
-from statistics import mean
 from typing import Dict, List, Optional
 
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
+import consolidation_cache
+import excel_export
+import group_stats
+import rep_store
+from excel_export import SheetWriter, styled
 
 
 SIZE_ORDER = ["9x9", "16x16", "25x25"]
@@ -63,13 +70,8 @@ PARAMETER_GROUPS = [
     ("Dynamic Collaborative Mechanism", ["convThresh", "entropyPct"]),
 ]
 
-THIN_BORDER = Border(
-    left=Side(style="thin"),
-    right=Side(style="thin"),
-    top=Side(style="thin"),
-    bottom=Side(style="thin"),
-)
-
+# Per-instance statistics averaged into the workbook's aggregate rows.
+STAT_COLUMNS = ("success_%", "time_mean", "time_std", "cycles_mean")
 
 def as_float(value) -> float:
     try:
@@ -87,7 +89,8 @@ def same_value(cell_val, target_val) -> bool:
 
 def read_csv_dicts(path: Path) -> List[Dict[str, str]]:
     with path.open(newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
+        # with --rep-store, per-instance statistics are recomputed from the stored reps
+        return list(rep_store.summary_rows(path, csv.DictReader(f)))
 
 
 def load_param_groups(consolidated_csv: Path) -> Dict[str, List[dict]]:
@@ -98,6 +101,30 @@ def load_param_groups(consolidated_csv: Path) -> Dict[str, List[dict]]:
     return groups
 
 
+def _unique_instance_columns(path: Path, keys=()) -> dict:
+    """Typed columns (``group_stats.columns``) of a per-instance CSV, keeping the first
+    row of each instance (defensive dedupe)."""
+    with path.open(newline="", encoding="utf-8") as f:
+        # with --rep-store, per-instance statistics are recomputed from the stored reps
+        rows = rep_store.summary_rows(path, csv.DictReader(f))
+        cols = group_stats.columns(rows, ("instance", *keys), STAT_COLUMNS)
+    if not len(cols["instance"]):
+        return cols
+    first = sorted(group_stats.GroupBy(cols["instance"]).first_rows().tolist())
+    return {k: v[first] for k, v in cols.items()}
+
+
+def _best_config_partial(path: Path) -> dict:
+    cols = _unique_instance_columns(path)
+    return {
+        "success_mean": group_stats.nanmean(cols["success_%"]),
+        "time_mean_mean": group_stats.nanmean(cols["time_mean"]),
+        "time_std_mean": group_stats.nanmean(cols["time_std"]),
+        "cycles_mean_mean": group_stats.nanmean(cols["cycles_mean"]),
+        "instances": len(cols["instance"]),
+    }
+
+
 def load_best_config_aggregates(results_root: Path) -> Dict[str, dict]:
     files = {
         "9x9": results_root / "9x9" / "best_config_results_9x9_CP-DCM-ACO.csv",
@@ -108,19 +135,7 @@ def load_best_config_aggregates(results_root: Path) -> Dict[str, dict]:
     for size, path in files.items():
         if not path.exists():
             continue
-        rows = read_csv_dicts(path)
-        # Defensive dedupe by instance
-        by_instance = {}
-        for row in rows:
-            by_instance.setdefault(row["instance"], row)
-        uniq = list(by_instance.values())
-        out[size] = {
-            "success_mean": mean(float(x["success_%"]) for x in uniq),
-            "time_mean_mean": mean(float(x["time_mean"]) for x in uniq),
-            "time_std_mean": mean(float(x["time_std"]) for x in uniq),
-            "cycles_mean_mean": mean(float(x["cycles_mean"]) for x in uniq),
-            "instances": len(uniq),
-        }
+        out[size] = consolidation_cache.partial("workbook-best-config", path, _best_config_partial)
 
     # Fallback when CSVs were removed: results/ablation/best_config_workbook_aggregate.json
     agg_json = results_root / "ablation" / "best_config_workbook_aggregate.json"
@@ -142,30 +157,28 @@ def load_best_config_aggregates(results_root: Path) -> Dict[str, dict]:
     return out
 
 
+def _timeout_record(summary_file: Path) -> Optional[dict]:
+    cols = _unique_instance_columns(summary_file, ("param_value", "puzzle_size", "alg", "alg_name"))
+    if not len(cols["instance"]):
+        return None
+    return {
+        "param_value": float(cols["param_value"][0]),
+        "puzzle_size": str(cols["puzzle_size"][0]),
+        "alg": int(cols["alg"][0]),
+        "alg_name": str(cols["alg_name"][0]),
+        "success_mean": group_stats.nanmean(cols["success_%"]),
+        "time_mean_mean": group_stats.nanmean(cols["time_mean"]),
+        "time_std_mean": group_stats.nanmean(cols["time_std"]),
+        "cycles_mean_mean": group_stats.nanmean(cols["cycles_mean"]),
+    }
+
+
 def load_timeout_groups(timeout_dir: Path) -> Dict[tuple, List[dict]]:
     timeout_records: List[dict] = []
     for summary_file in sorted(timeout_dir.rglob("*_summary.csv")):
-        rows = read_csv_dicts(summary_file)
-        if not rows:
-            continue
-        # Defensive dedupe by instance
-        by_instance = {}
-        for row in rows:
-            by_instance.setdefault(row["instance"], row)
-        uniq = list(by_instance.values())
-        first = uniq[0]
-        timeout_records.append(
-            {
-                "param_value": float(first["param_value"]),
-                "puzzle_size": first["puzzle_size"],
-                "alg": int(first["alg"]),
-                "alg_name": first["alg_name"],
-                "success_mean": mean(float(x["success_%"]) for x in uniq),
-                "time_mean_mean": mean(float(x["time_mean"]) for x in uniq),
-                "time_std_mean": mean(float(x["time_std"]) for x in uniq),
-                "cycles_mean_mean": mean(float(x["cycles_mean"]) for x in uniq),
-            }
-        )
+        record = consolidation_cache.partial("workbook-timeout", summary_file, _timeout_record)
+        if record is not None:
+            timeout_records.append(record)
 
     grouped: Dict[tuple, List[dict]] = defaultdict(list)
     for row in timeout_records:
@@ -201,19 +214,6 @@ def load_default_ablation_timeout_cp_dcm_from_best_config(
     return out
 
 
-def _mean_csv_numeric(rows: List[dict], key: str) -> float:
-    vals: List[float] = []
-    for r in rows:
-        raw = (r.get(key) or "").strip()
-        if raw == "":
-            continue
-        try:
-            vals.append(float(raw))
-        except ValueError:
-            continue
-    return mean(vals) if vals else float("nan")
-
-
 def _resolve_aco_default_timeout_csv(results_root: Path, size: str) -> Optional[Path]:
     rel = results_root / size
     for name in ACO_DEFAULT_TIMEOUT_CSV_CANDIDATES.get(size, []):
@@ -223,6 +223,14 @@ def _resolve_aco_default_timeout_csv(results_root: Path, size: str) -> Optional[
     return None
 
 
+def _aco_default_means(path: Path) -> Optional[List[float]]:
+    cols = _unique_instance_columns(path, ("alg",))
+    aco = group_stats.to_float(cols["alg"]) == 0
+    if not aco.any():
+        return None
+    return [group_stats.nanmean(cols[key][aco]) for key in STAT_COLUMNS]
+
+
 def load_default_ablation_timeout_aco(results_root: Path) -> List[dict]:
     """
     ACO (alg 0): use per-instance CP-ACS CSVs (alg 0) at ablation wall timeouts; see
@@ -233,18 +241,10 @@ def load_default_ablation_timeout_aco(results_root: Path) -> List[dict]:
         path = _resolve_aco_default_timeout_csv(results_root, size)
         if path is None:
             continue
-        rows = read_csv_dicts(path)
-        by_instance: Dict[str, dict] = {}
-        for row in rows:
-            by_instance.setdefault(row["instance"], row)
-        uniq = list(by_instance.values())
-        uniq = [r for r in uniq if int(float(r.get("alg", -1))) == 0]
-        if not uniq:
+        means = consolidation_cache.partial("workbook-aco-default", path, _aco_default_means)
+        if means is None:
             continue
-        sm = _mean_csv_numeric(uniq, "success_%")
-        tmm = _mean_csv_numeric(uniq, "time_mean")
-        tsm = _mean_csv_numeric(uniq, "time_std")
-        cmm = _mean_csv_numeric(uniq, "cycles_mean")
+        sm, tmm, tsm, cmm = means
         if any(math.isnan(x) for x in (sm, tmm, tsm, cmm)):
             continue
         wall_s = float(ABLATION_WALL_TIMEOUT_S[size])
@@ -291,178 +291,79 @@ def merge_ablation_default_timeout_rows(
                 existing.append(row)
 
 
-def style_table_headers(ws, row_1: int, row_2: int, max_col: int) -> None:
-    for col in range(1, max_col + 1):
-        ws.cell(row=row_1, column=col).font = Font(bold=True)
-        ws.cell(row=row_2, column=col).font = Font(bold=True)
-        ws.cell(row=row_1, column=col).alignment = Alignment(horizontal="center", vertical="center")
-        ws.cell(row=row_2, column=col).alignment = Alignment(horizontal="center", vertical="center")
-
+METRIC_HEADERS = ["success_rate", "time_mean", "time_std", "iter_mean"]
+METRIC_KEYS = ["success_mean", "time_mean_mean", "time_std_mean", "cycles_mean_mean"]
 
-def apply_border_box(ws, min_row: int, max_row: int, min_col: int, max_col: int) -> None:
-    for r in range(min_row, max_row + 1):
-        for c in range(min_col, max_col + 1):
-            ws.cell(row=r, column=c).border = THIN_BORDER
+PARAMETER_SHEET = "Parameter tuning results"
+TIMEOUT_SHEET = "Timeout results"
+# Columns are sized to their longest value, up to this width.
+MAX_COLUMN_WIDTH = 22
 
 
-def write_group_header(ws, start_row: int, title: str, max_col: int = 13) -> int:
-    ws.cell(row=start_row, column=1, value=title)
-    ws.cell(row=start_row, column=1).font = Font(bold=True, size=18)
-    ws.cell(row=start_row, column=1).fill = PatternFill("solid", fgColor="E2F0D9")
-    ws.cell(row=start_row, column=1).alignment = Alignment(horizontal="center", vertical="center")
-    ws.merge_cells(start_row=start_row, start_column=1, end_row=start_row, end_column=max_col)
-    ws.row_dimensions[start_row].height = 30
-    return start_row + 1
+def metric_cells(item: Optional[dict], style: str) -> list:
+    """The four metric cells of an aggregate (blank cells without one)."""
+    if not item:
+        return [styled(None, style)] * len(METRIC_KEYS)
+    return [styled(round(float(item[key]), 5), style) for key in METRIC_KEYS]
 
 
-def write_standard_section(ws, start_row: int, section_title: str, rows: List[dict]) -> int:
-    ws.cell(row=start_row, column=1, value=section_title)
-    ws.cell(row=start_row, column=1).font = Font(bold=True)
-    ws.cell(row=start_row, column=1).fill = PatternFill("solid", fgColor="D9E1F2")
+def write_group_header(sheet: SheetWriter, title: str, max_col: int = 13) -> None:
+    row = sheet.append([styled(title, "group")], height=30)
+    sheet.merge(row, 1, row, max_col)
 
-    hdr1 = start_row + 1
-    hdr2 = start_row + 2
-    ws.cell(row=hdr1, column=1, value="Parameter Value")
-    ws.merge_cells(start_row=hdr1, start_column=1, end_row=hdr2, end_column=1)
 
-    col = 2
-    for size in SIZE_ORDER:
-        ws.cell(row=hdr1, column=col, value=size)
-        ws.merge_cells(start_row=hdr1, start_column=col, end_row=hdr1, end_column=col + 3)
-        ws.cell(row=hdr2, column=col, value="success_rate")
-        ws.cell(row=hdr2, column=col + 1, value="time_mean")
-        ws.cell(row=hdr2, column=col + 2, value="time_std")
-        ws.cell(row=hdr2, column=col + 3, value="iter_mean")
-        col += 4
+def write_standard_section(sheet: SheetWriter, section_title: str, rows: List[dict], best_value=None) -> None:
+    """One parameter's table; the first row whose value matches ``best_value``
+    (from best_config.json) is bold."""
+    sheet.append([styled(section_title, "section")])
 
-    style_table_headers(ws, hdr1, hdr2, 13)
+    hdr1 = sheet.append(["Parameter Value"] + [v for size in SIZE_ORDER for v in (size, None, None, None)],
+                        style="header")
+    sheet.append([None] + METRIC_HEADERS * len(SIZE_ORDER), style="header")
+    sheet.merge(hdr1, 1, hdr1 + 1, 1)
+    for i in range(len(SIZE_ORDER)):
+        sheet.merge(hdr1, 2 + 4 * i, hdr1, 5 + 4 * i)
 
     by_param: Dict[str, Dict[str, dict]] = defaultdict(dict)
     for row in rows:
         by_param[str(row["param_value"])][row["puzzle_size"]] = row
 
     param_values = sorted(by_param.keys(), key=as_float)
-    row_idx = hdr2 + 1
+    bolded = best_value is None
     for pv in param_values:
-        ws.cell(row=row_idx, column=1, value=as_float(pv) if pv.replace(".", "", 1).isdigit() else pv)
-        col = 2
-        for size in SIZE_ORDER:
-            item = by_param[pv].get(size)
-            if item:
-                ws.cell(row=row_idx, column=col, value=round(float(item["success_mean"]), 5))
-                ws.cell(row=row_idx, column=col + 1, value=round(float(item["time_mean_mean"]), 5))
-                ws.cell(row=row_idx, column=col + 2, value=round(float(item["time_std_mean"]), 5))
-                ws.cell(row=row_idx, column=col + 3, value=round(float(item["cycles_mean_mean"]), 5))
-            col += 4
-        row_idx += 1
-
-    # Border only the actual table (headers + data), not the section title row.
-    apply_border_box(ws, hdr1, row_idx - 1, 1, 13)
-    return row_idx + 1
-
-
-def apply_best_config_bolding(ws, best_config: Dict[str, float]) -> None:
-    # For each parameter section, clear data-row bold then bold exactly one row from best_config.json
-    for param_name, target_value in best_config.items():
-        section_row = None
-        for r in range(1, ws.max_row + 1):
-            if ws.cell(r, 1).value == param_name:
-                section_row = r
-                break
-        if section_row is None:
-            continue
+        value = as_float(pv) if pv.replace(".", "", 1).isdigit() else pv
+        style = "cell"
+        if not bolded and same_value(value, best_value):
+            style = "cell-bold"
+            bolded = True
+        sheet.append([styled(value, style)]
+                     + [c for size in SIZE_ORDER for c in metric_cells(by_param[pv].get(size), style)])
+    sheet.skip()
 
-        data_start = section_row + 3
-        data_end = data_start
-        while data_end <= ws.max_row and ws.cell(data_end, 1).value not in (None, ""):
-            data_end += 1
-        data_end -= 1
-
-        for r in range(data_start, data_end + 1):
-            for c in range(1, 14):
-                ws.cell(r, c).font = Font(bold=False)
-
-        target_row = None
-        for r in range(data_start, data_end + 1):
-            if same_value(ws.cell(r, 1).value, target_value):
-                target_row = r
-                break
-        if target_row is None:
-            continue
 
-        for c in range(1, 14):
-            ws.cell(target_row, c).font = Font(bold=True)
-
-
-def write_best_config_section(ws, start_row: int, best_config_agg: Dict[str, dict]) -> int:
+def write_best_config_section(sheet: SheetWriter, best_config_agg: Dict[str, dict]) -> None:
     """Metrics only: no Parameter Value column (aligns with B–M blocks above)."""
     last_metric_col = len(SIZE_ORDER) * 4
-    ws.cell(row=start_row, column=1, value="best_config (CP-DCM-ACO)")
-    ws.cell(row=start_row, column=1).font = Font(bold=True)
-    ws.cell(row=start_row, column=1).fill = PatternFill("solid", fgColor="FCE4D6")
-    ws.cell(row=start_row, column=1).alignment = Alignment(horizontal="center", vertical="center")
-    ws.merge_cells(
-        start_row=start_row,
-        start_column=1,
-        end_row=start_row,
-        end_column=last_metric_col,
-    )
+    row = sheet.append([styled("best_config (CP-DCM-ACO)", "section-accent")])
+    sheet.merge(row, 1, row, last_metric_col)
 
-    hdr1 = start_row + 1
-    hdr2 = start_row + 2
-    col = 1
-    for size in SIZE_ORDER:
-        ws.cell(row=hdr1, column=col, value=size)
-        ws.merge_cells(start_row=hdr1, start_column=col, end_row=hdr1, end_column=col + 3)
-        ws.cell(row=hdr2, column=col, value="success_rate")
-        ws.cell(row=hdr2, column=col + 1, value="time_mean")
-        ws.cell(row=hdr2, column=col + 2, value="time_std")
-        ws.cell(row=hdr2, column=col + 3, value="iter_mean")
-        col += 4
-
-    style_table_headers(ws, hdr1, hdr2, last_metric_col)
-
-    row_idx = hdr2 + 1
-    col = 1
-    for size in SIZE_ORDER:
-        item = best_config_agg.get(size)
-        if item:
-            ws.cell(row=row_idx, column=col, value=round(item["success_mean"], 5))
-            ws.cell(row=row_idx, column=col + 1, value=round(item["time_mean_mean"], 5))
-            ws.cell(row=row_idx, column=col + 2, value=round(item["time_std_mean"], 5))
-            ws.cell(row=row_idx, column=col + 3, value=round(item["cycles_mean_mean"], 5))
-        col += 4
-    for c in range(1, last_metric_col + 1):
-        ws.cell(row=row_idx, column=c).alignment = Alignment(horizontal="center", vertical="center")
-
-    # Border only the table block (headers + data), not the title row.
-    apply_border_box(ws, hdr1, row_idx, 1, last_metric_col)
-    return row_idx + 2
-
-
-def write_timeout_section_split_param(ws, start_row: int, section_title: str, rows: List[dict]) -> int:
-    ws.cell(row=start_row, column=1, value=section_title)
-    ws.cell(row=start_row, column=1).font = Font(bold=True)
-    ws.cell(row=start_row, column=1).fill = PatternFill("solid", fgColor="D9E1F2")
-
-    hdr1 = start_row + 1
-    hdr2 = start_row + 2
-    # Each size block is 5 columns:
-    # [Parameter Value][success_rate][time_mean][time_std][iter_mean]
-    # Size label should span only metric columns (exclude Parameter Value column).
-    block_start = {"9x9": 1, "16x16": 6, "25x25": 11}
+    hdr1 = sheet.append([v for size in SIZE_ORDER for v in (size, None, None, None)], style="header")
+    sheet.append(METRIC_HEADERS * len(SIZE_ORDER), style="header")
+    for i in range(len(SIZE_ORDER)):
+        sheet.merge(hdr1, 1 + 4 * i, hdr1, 4 + 4 * i)
+    sheet.append([c for size in SIZE_ORDER for c in metric_cells(best_config_agg.get(size), "cell-center")])
+    sheet.skip()
 
-    for size in SIZE_ORDER:
-        s = block_start[size]
-        ws.cell(row=hdr1, column=s + 1, value=size)
-        ws.merge_cells(start_row=hdr1, start_column=s + 1, end_row=hdr1, end_column=s + 4)
-        ws.cell(row=hdr2, column=s, value="Parameter Value")
-        ws.cell(row=hdr2, column=s + 1, value="success_rate")
-        ws.cell(row=hdr2, column=s + 2, value="time_mean")
-        ws.cell(row=hdr2, column=s + 3, value="time_std")
-        ws.cell(row=hdr2, column=s + 4, value="iter_mean")
 
-    style_table_headers(ws, hdr1, hdr2, 15)
+def write_timeout_section_split_param(sheet: SheetWriter, section_title: str, rows: List[dict]) -> None:
+    """Each size block is 5 columns: [Parameter Value][success_rate][time_mean][time_std][iter_mean];
+    the size label spans only the metric columns."""
+    sheet.append([styled(section_title, "section")])
+
+    hdr1 = sheet.append([v for size in SIZE_ORDER for v in (None, size, None, None, None)], style="header")
+    sheet.append(["Parameter Value", *METRIC_HEADERS] * len(SIZE_ORDER), style="header")
+    for i in range(len(SIZE_ORDER)):
+        sheet.merge(hdr1, 2 + 5 * i, hdr1, 5 + 5 * i)
 
     by_size = {size: [] for size in SIZE_ORDER}
     for row in rows:
@@ -471,98 +372,88 @@ def write_timeout_section_split_param(ws, start_row: int, section_title: str, ro
         by_size[size].sort(key=lambda x: x["param_value"])
 
     max_len = max(len(by_size[size]) for size in SIZE_ORDER)
-    row_idx = hdr2 + 1
     for i in range(max_len):
+        cells = []
         for size in SIZE_ORDER:
-            s = block_start[size]
             if i >= len(by_size[size]):
+                cells += [styled(None, "cell")] * 5
                 continue
             item = by_size[size][i]
-            ws.cell(row=row_idx, column=s, value=item["param_value"])
-            ws.cell(row=row_idx, column=s + 1, value=round(float(item["success_mean"]), 5))
-            ws.cell(row=row_idx, column=s + 2, value=round(float(item["time_mean_mean"]), 5))
-            ws.cell(row=row_idx, column=s + 3, value=round(float(item["time_std_mean"]), 5))
-            ws.cell(row=row_idx, column=s + 4, value=round(float(item["cycles_mean_mean"]), 5))
-        row_idx += 1
-
-    # Border only the table (headers + data), not the section title row.
-    apply_border_box(ws, hdr1, row_idx - 1, 1, 15)
-    return row_idx + 1
-
-
-def autofit_columns(ws) -> None:
-    for col_idx in range(1, ws.max_column + 1):
-        max_len = 0
-        for row_idx in range(1, ws.max_row + 1):
-            value = ws.cell(row=row_idx, column=col_idx).value
-            if value is None:
-                continue
-            max_len = max(max_len, len(str(value)))
-        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 2, 22)
-
+            cells += [styled(item["param_value"], "cell")] + metric_cells(item, "cell")
+        sheet.append(cells)
+    sheet.skip()
 
-def build_workbook(repo_root: Path, output_path: Path) -> None:
-    results_root = repo_root / "results"
-    ablation_root = results_root / "ablation"
 
-    consolidated_csv = ablation_root / "consolidated_ablation_summary.csv"
-    timeout_dir = ablation_root / "timeout"
-    best_cfg_path = ablation_root / "best_config.json"
-
-    param_groups = load_param_groups(consolidated_csv)
-    best_config_agg = load_best_config_aggregates(results_root)
-    timeout_groups = load_timeout_groups(timeout_dir)
-    merge_ablation_default_timeout_rows(timeout_groups, best_config_agg, results_root)
-    best_cfg = json.loads(best_cfg_path.read_text(encoding="utf-8"))
+def write_parameter_sheet(ws, param_groups: Dict[str, List[dict]], best_cfg: Dict[str, float],
+                          best_config_agg: Dict[str, dict]) -> None:
+    sheet = SheetWriter(ws, autofit=MAX_COLUMN_WIDTH)
+    row = sheet.append([styled("ABLATION - PARAMETER TUNING (AVERAGE OF AVERAGES)", "title")])
+    sheet.merge(row, 1, row, 13)
+    sheet.skip()
 
-    wb = Workbook()
-    wb.remove(wb.active)
+    def write_param(param_name):
+        param_rows = sorted(param_groups[param_name], key=lambda x: as_float(x["param_value"]))
+        write_standard_section(sheet, param_name, param_rows, best_cfg.get(param_name))
 
-    # Sheet 1: parameter tuning
-    ws1 = wb.create_sheet("Parameter tuning results")
-    ws1["A1"] = "ABLATION - PARAMETER TUNING (AVERAGE OF AVERAGES)"
-    ws1["A1"].font = Font(bold=True, size=13)
-    ws1.merge_cells("A1:M1")
-    ws1["A1"].alignment = Alignment(horizontal="center")
-
-    row_ptr = 3
     assigned = set()
     for group_title, group_params in PARAMETER_GROUPS:
         params_in_group = [p for p in group_params if p in param_groups]
         if not params_in_group:
             continue
-        row_ptr = write_group_header(ws1, row_ptr, group_title, max_col=13)
+        write_group_header(sheet, group_title, max_col=13)
         for param_name in params_in_group:
-            param_rows = sorted(param_groups[param_name], key=lambda x: as_float(x["param_value"]))
-            row_ptr = write_standard_section(ws1, row_ptr, param_name, param_rows)
+            write_param(param_name)
             assigned.add(param_name)
 
     # Fallback for any parameters not explicitly mapped into ACS/DCM groups.
     unmapped = sorted([p for p in param_groups.keys() if p not in assigned])
     if unmapped:
-        row_ptr = write_group_header(ws1, row_ptr, "Other parameters", max_col=13)
+        write_group_header(sheet, "Other parameters", max_col=13)
         for param_name in unmapped:
-            param_rows = sorted(param_groups[param_name], key=lambda x: as_float(x["param_value"]))
-            row_ptr = write_standard_section(ws1, row_ptr, param_name, param_rows)
+            write_param(param_name)
 
-    apply_best_config_bolding(ws1, best_cfg)
-    write_best_config_section(ws1, row_ptr, best_config_agg)
-    autofit_columns(ws1)
+    write_best_config_section(sheet, best_config_agg)
+    sheet.close()
 
-    # Sheet 2: timeout
-    ws2 = wb.create_sheet("Timeout results")
-    ws2["A1"] = "ABLATION - TIMEOUT (AVERAGE OF AVERAGES)"
-    ws2["A1"].font = Font(bold=True, size=13)
-    ws2.merge_cells("A1:O1")
-    ws2["A1"].alignment = Alignment(horizontal="center")
 
-    row_ptr = 3
+def write_timeout_sheet(ws, timeout_groups: Dict[tuple, List[dict]]) -> None:
+    sheet = SheetWriter(ws, autofit=MAX_COLUMN_WIDTH)
+    row = sheet.append([styled("ABLATION - TIMEOUT (AVERAGE OF AVERAGES)", "title")])
+    sheet.merge(row, 1, row, 15)
+    sheet.skip()
     for (alg, alg_name), rows in sorted(timeout_groups.items(), key=lambda x: x[0][0]):
-        section = f"timeout - {alg_name} (alg={alg})"
-        row_ptr = write_timeout_section_split_param(ws2, row_ptr, section, rows)
-    autofit_columns(ws2)
+        write_timeout_section_split_param(sheet, f"timeout - {alg_name} (alg={alg})", rows)
+    sheet.close()
+
 
-    wb.save(output_path)
+def build_workbook(repo_root: Path, output_path: Path, sheets=None) -> None:
+    """Write the workbook; with ``sheets`` (sheet titles) only those sheets are
+    regenerated and the others kept as they are in ``output_path``."""
+    results_root = repo_root / "results"
+    ablation_root = results_root / "ablation"
+
+    consolidated_csv = ablation_root / "consolidated_ablation_summary.csv"
+    timeout_dir = ablation_root / "timeout"
+    best_cfg_path = ablation_root / "best_config.json"
+    wanted = set(sheets or (PARAMETER_SHEET, TIMEOUT_SHEET))
+
+    best_config_agg = load_best_config_aggregates(results_root)
+    writers = []
+    if PARAMETER_SHEET in wanted:
+        param_groups = load_param_groups(consolidated_csv)
+        best_cfg = json.loads(best_cfg_path.read_text(encoding="utf-8"))
+        writers.append((PARAMETER_SHEET,
+                        lambda ws: write_parameter_sheet(ws, param_groups, best_cfg, best_config_agg)))
+    if TIMEOUT_SHEET in wanted:
+        timeout_groups = load_timeout_groups(timeout_dir)
+        merge_ablation_default_timeout_rows(timeout_groups, best_config_agg, results_root)
+        writers.append((TIMEOUT_SHEET, lambda ws: write_timeout_sheet(ws, timeout_groups)))
+
+    if sheets is None:
+        excel_export.save_workbook(output_path, writers)
+        return
+    for title, write in writers:
+        excel_export.update_sheet(output_path, title, write)
 
 
 def main():
@@ -577,7 +468,18 @@ def main():
         default=None,
         help="Output workbook path (default: <repo>/results/ablation/ablation_results.xlsx).",
     )
+    parser.add_argument(
+        "--sheet",
+        action="append",
+        choices=[PARAMETER_SHEET, TIMEOUT_SHEET],
+        default=None,
+        help="Regenerate only this sheet of an existing workbook (repeatable; default: write all sheets).",
+    )
+    rep_store.add_cli_options(parser)
+    consolidation_cache.add_cli_options(parser)
     args = parser.parse_args()
+    rep_store.enable_from_args(args)
+    consolidation_cache.enable_from_args(args)
 
     repo_root = Path(args.repo_root).resolve()
     if args.output:
@@ -585,7 +487,7 @@ def main():
     else:
         output_path = repo_root / "results" / "ablation" / "ablation_results.xlsx"
 
-    build_workbook(repo_root, output_path)
+    build_workbook(repo_root, output_path, args.sheet)
     print(f"Workbook written to: {output_path}")
 
 
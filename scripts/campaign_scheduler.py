@@ -0,0 +1,494 @@
+"""
+One scheduler for every benchmark campaign.
+
+Work is queued as units: job dicts describing one (campaign, config, instance,
+rep) solve (see ``unit_key``) plus whatever the runner needs. Two layers share
+the machine between campaigns:
+
+- ``CampaignScheduler`` runs one process's units from a single asyncio loop:
+  one global queue ordered by a pluggable priority (by default ``longest``:
+  longest expected run time first, from past results), per-group concurrency caps
+  (e.g. per puzzle size or per algorithm), the slots of a group with no
+  work left moved to the next busy group, and a capacity that a control file
+  (``CapacityControl``) can change while units run.
+- ``solver_slot()`` / ``solver_slot_async()`` hold one slot of every active
+  ``SlotPool`` while a solver runs (``bench_utils`` and ``sudaco_native`` do
+  this around each solve). A slot pool is a directory of lock files, so all
+  benchmark processes on the machine, whatever campaign or launcher started
+  them, together never run more solvers than it has slots.
+
+The machine pool has ``os.cpu_count()`` slots unless ``$SUDACO_SLOTS`` (or
+``--slots``) says otherwise; 0 turns it off. With ``--pin`` (``cpu_affinity``)
+each machine slot stands for fixed CPUs and the solver holding it is bound to
+them; the pool then defaults to the number of slots of the pinning layout. A launcher can give the processes
+it starts a tighter shared budget on top with ``$SUDACO_CAMPAIGN_SLOTS``
+(``N@directory``)::
+
+    import campaign_scheduler
+    env = campaign_scheduler.campaign_slots_env(8, 'results/.slots/cp_run1')
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+import cpu_affinity
+
+try:
+    import msvcrt
+    HAS_MSVCRT = True
+except ImportError:
+    HAS_MSVCRT = False
+    try:
+        import fcntl
+        HAS_FCNTL = True
+    except ImportError:
+        HAS_FCNTL = False
+
+ENV_SLOTS = 'SUDACO_SLOTS'
+ENV_SLOT_DIR = 'SUDACO_SLOT_DIR'
+ENV_CAMPAIGN_SLOTS = 'SUDACO_CAMPAIGN_SLOTS'
+
+# Waiting for a slot polls the lock files, backing off up to this interval.
+SLOT_POLL_MIN = 0.02
+SLOT_POLL_MAX = 0.5
+
+# A running scheduler checks its capacity control file this often (seconds).
+CONTROL_POLL = 1.0
+
+
+def _try_lock(fh) -> bool:
+    try:
+        if HAS_MSVCRT:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        elif HAS_FCNTL:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fh) -> None:
+    try:
+        if HAS_MSVCRT:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        elif HAS_FCNTL:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+
+
+class SlotPool:
+    """
+    ``n`` slots shared by every process (and thread) that uses the same
+    ``directory``. A slot is an exclusive lock on ``slot-<i>.lock``; the OS
+    drops it when its holder exits, so a crashed process never leaks one.
+    With a ``layout`` (CPU sets by slot index), ``cpus(slot)`` gives the CPUs
+    a held slot stands for.
+    """
+
+    def __init__(self, n: int, directory, layout=()):
+        self.n = max(1, int(n))
+        self.directory = Path(directory)
+        self.layout = tuple(layout)
+
+    def __repr__(self) -> str:
+        return f'SlotPool({self.n}, {str(self.directory)!r})'
+
+    def try_acquire(self):
+        """A held slot (pass it to ``release``), or None when all are taken."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for i in range(self.n):
+            fh = open(self.directory / f'slot-{i}.lock', 'a+b')
+            if _try_lock(fh):
+                fh.slot_index = i
+                return fh
+            fh.close()
+        return None
+
+    def acquire(self):
+        delay = SLOT_POLL_MIN
+        while True:
+            slot = self.try_acquire()
+            if slot is not None:
+                return slot
+            time.sleep(delay)
+            delay = min(SLOT_POLL_MAX, delay * 2)
+
+    async def acquire_async(self):
+        delay = SLOT_POLL_MIN
+        while True:
+            slot = self.try_acquire()
+            if slot is not None:
+                return slot
+            await asyncio.sleep(delay)
+            delay = min(SLOT_POLL_MAX, delay * 2)
+
+    def cpus(self, slot) -> tuple | None:
+        if not self.layout:
+            return None
+        return self.layout[slot.slot_index % len(self.layout)]
+
+    @staticmethod
+    def release(slot) -> None:
+        _unlock(slot)
+        slot.close()
+
+
+def default_slot_dir() -> Path:
+    return Path(os.environ.get(ENV_SLOT_DIR) or Path(tempfile.gettempdir()) / 'sudaco-slots')
+
+
+def machine_slots() -> int:
+    """Slots in the machine-wide pool (0: no machine-wide limit)."""
+    raw = os.environ.get(ENV_SLOTS, '').strip()
+    if raw:
+        return max(0, int(raw))
+    return len(cpu_affinity.slot_layout()) or os.cpu_count() or 1
+
+
+def campaign_slots_env(n: int, directory) -> dict:
+    """Environment for child processes that share a budget of ``n`` solver slots."""
+    env = os.environ.copy()
+    env[ENV_CAMPAIGN_SLOTS] = f'{int(n)}@{Path(directory).resolve()}'
+    return env
+
+
+_pools_lock = threading.Lock()
+_pools_key = None
+_pools: list[SlotPool] = []
+
+
+def active_pools() -> list[SlotPool]:
+    """Slot pools a solver run must hold, in acquisition order (campaign first,
+    so a process waiting on its campaign's budget holds no machine slot)."""
+    global _pools_key, _pools
+    key = (os.environ.get(ENV_CAMPAIGN_SLOTS), os.environ.get(ENV_SLOTS), os.environ.get(ENV_SLOT_DIR),
+           cpu_affinity.pin_mode())
+    with _pools_lock:
+        if key != _pools_key:
+            pools = []
+            if key[0]:
+                n, _, directory = key[0].partition('@')
+                pools.append(SlotPool(int(n), directory))
+            n = machine_slots()
+            if n > 0:
+                pools.append(SlotPool(n, default_slot_dir(), cpu_affinity.slot_layout()))
+            _pools_key, _pools = key, pools
+        return list(_pools)
+
+
+@contextmanager
+def solver_slot():
+    """Hold one slot of every active pool for the duration of a solver run;
+    yields the CPUs to pin the solver to (``cpu_affinity.pin``), or None."""
+    held = []
+    cpus = None
+    try:
+        for pool in active_pools():
+            held.append(pool.acquire())
+            cpus = pool.cpus(held[-1]) or cpus
+        yield cpus
+    finally:
+        for slot in reversed(held):
+            SlotPool.release(slot)
+
+
+@asynccontextmanager
+async def solver_slot_async():
+    held = []
+    cpus = None
+    try:
+        for pool in active_pools():
+            held.append(await pool.acquire_async())
+            cpus = pool.cpus(held[-1]) or cpus
+        yield cpus
+    finally:
+        for slot in reversed(held):
+            SlotPool.release(slot)
+
+
+class CapacityControl:
+    """
+    Pool capacity set at runtime through a control file holding one integer:
+    write a new number (``write_capacity``, or ``echo 8 > pool.workers``) and a
+    running ``CampaignScheduler`` polling it grows or shrinks to that many
+    concurrent units without touching the running ones.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._seen = None
+
+    def poll(self) -> int | None:
+        """The capacity in the file if it changed since the last poll, else None."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._seen:
+            return None
+        self._seen = stamp
+        try:
+            return max(1, int(self.path.read_text().strip()))
+        except (OSError, ValueError):
+            return None
+
+
+def write_capacity(path, n: int) -> None:
+    """Set the capacity in a control file (atomically, so a poll never reads half of it)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp.write_text(f'{int(n)}\n')
+    os.replace(tmp, path)
+
+
+def unit_key(job: dict) -> tuple:
+    """``(campaign, config, instance, rep)`` of a job dict; ``instance_path`` and
+    ``factor_args`` stand in for ``instance`` and ``config`` when those are absent."""
+    instance = job.get('instance')
+    if instance is None and job.get('instance_path') is not None:
+        instance = Path(job['instance_path']).name
+    config = job.get('config')
+    if config is None:
+        config = ' '.join(str(a) for a in job.get('factor_args') or ())
+    return job.get('campaign'), config, instance, job.get('rep')
+
+
+def expected_duration(job: dict) -> float | None:
+    """Expected seconds for a unit from the results already under ``results/``
+    (``run_history``; keys ``alg``, ``timeout`` and ``size_name`` are used when
+    present), or None when nothing is known."""
+    import run_history
+    instance = unit_key(job)[2]
+    size = job.get('size_name')
+    if size is None and job.get('instance_path') is not None:
+        size = run_history.size_of_path(job['instance_path'])
+    return run_history.default_history().expected(instance, job.get('alg'), job.get('timeout'), size)
+
+
+# Priorities map a unit to a sort key; lower keys start first, ties in
+# submission order.
+PRIORITIES = {
+    # submission order
+    'fifo': lambda job: 0,
+    # rep 1 of every queued instance, then rep 2, ...: partial results cover all instances early
+    'breadth': lambda job: unit_key(job)[3] or 0,
+    # longest expected run time first (LPT): stragglers start early, the tail packs with short units
+    'longest': lambda job: -(expected_duration(job) or 0.0),
+}
+
+
+def register_priority(name: str, key) -> None:
+    PRIORITIES[name] = key
+
+
+def get_priority(priority):
+    """A priority key function from a ``PRIORITIES`` name, or the callable itself."""
+    if callable(priority):
+        return priority
+    try:
+        return PRIORITIES[priority]
+    except KeyError:
+        raise ValueError(f'unknown priority {priority!r} (known: {", ".join(sorted(PRIORITIES))})') from None
+
+
+class CampaignScheduler:
+    """
+    Run units from one event loop: a global queue ordered by ``priority``,
+    per-group caps, at most ``max_concurrency`` (default: the sum of the caps)
+    units at once.
+
+    When a group has no units queued and none running, its slots move to the
+    first group, in ``add_group`` order, that is still busy; each move is
+    reported as ``on_transfer(from_group, to_group, slots, cap_after, reason)``.
+    Units may be submitted while the scheduler runs (e.g. from ``on_result``).
+    """
+
+    def __init__(self, priority='fifo', max_concurrency: int | None = None):
+        self.priority = get_priority(priority)
+        self.max_concurrency = max_concurrency
+        self._order: list = []
+        self._queued: dict = {}
+        self._cap: dict = {}
+        self._in_flight: dict = {}
+        self._seq = itertools.count()
+
+    def add_group(self, name, cap: int) -> None:
+        if name not in self._cap:
+            self._order.append(name)
+            self._queued[name] = []
+            self._cap[name] = 0
+            self._in_flight[name] = 0
+        self._cap[name] += int(cap)
+
+    def submit(self, job: dict, group=None) -> None:
+        """Queue one unit in ``group`` (default: ``job['group']``)."""
+        if group is None:
+            group = job.get('group')
+        if group not in self._cap:
+            raise KeyError(f'unknown group {group!r}; add_group() it first')
+        heapq.heappush(self._queued[group], (self.priority(job), next(self._seq), job))
+
+    def pending(self, group=None) -> int:
+        if group is not None:
+            return len(self._queued[group])
+        return sum(len(q) for q in self._queued.values())
+
+    def caps(self) -> dict:
+        return dict(self._cap)
+
+    def _first_busy(self, exclude=None):
+        for g in self._order:
+            if g != exclude and (self._queued[g] or self._in_flight[g] > 0):
+                return g
+        return None
+
+    def _transfer(self, done_group, reason, on_transfer) -> None:
+        slots = self._cap[done_group]
+        if slots <= 0:
+            return
+        g = self._first_busy(exclude=done_group)
+        if g is not None:
+            self._cap[done_group] = 0
+            self._cap[g] += slots
+            if on_transfer is not None:
+                on_transfer(done_group, g, slots, self._cap[g], reason)
+
+    def resize(self, n: int) -> None:
+        """Run at most ``n`` units at once from now on. Growth also raises the cap
+        of the first busy group by the difference; running units are never
+        stopped, so after a shrink the surplus drains as they finish."""
+        n = max(1, int(n))
+        limit = self.max_concurrency if self.max_concurrency is not None else sum(self._cap.values())
+        if n > limit:
+            g = self._first_busy() or (self._order[0] if self._order else None)
+            if g is not None:
+                self._cap[g] += n - limit
+        self.max_concurrency = n
+
+    def _next_group(self):
+        """Group of the best queued unit among groups below their cap, or None."""
+        best = None
+        for g in self._order:
+            q = self._queued[g]
+            if q and self._in_flight[g] < self._cap[g] and (best is None or q[0][:2] < self._queued[best][0][:2]):
+                best = g
+        return best
+
+    async def run(self, run_job, on_result=None, on_transfer=None, stop=None,
+                  control=None, on_resize=None) -> None:
+        """Run queued units until none are left. ``run_job(job)`` is a coroutine
+        function; ``on_result(job, result, exc)`` is called as each finishes
+        (``exc`` is the exception it raised, else None). Once the ``stop`` event
+        (an ``asyncio.Event``) is set no further units start; running ones are
+        awaited. A ``CapacityControl`` is polled every ``CONTROL_POLL`` seconds;
+        a new capacity is applied with ``resize`` and passed to ``on_resize(n)``
+        (e.g. to grow the solver pool first)."""
+        if self.max_concurrency is None:
+            self.max_concurrency = sum(self._cap.values())
+        for g in self._order:
+            if not self._queued[g]:
+                self._transfer(g, 'already complete at startup', on_transfer)
+        running = {}
+        while True:
+            n = control.poll() if control is not None else None
+            if n is not None and n != self.max_concurrency:
+                if on_resize is not None:
+                    on_resize(n)
+                self.resize(n)
+            while len(running) < self.max_concurrency and not (stop is not None and stop.is_set()):
+                g = self._next_group()
+                if g is None:
+                    break
+                _key, _seq, job = heapq.heappop(self._queued[g])
+                running[asyncio.ensure_future(run_job(job))] = (g, job)
+                self._in_flight[g] += 1
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, timeout=CONTROL_POLL if control is not None else None,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                g, job = running.pop(task)
+                self._in_flight[g] -= 1
+                exc = task.exception()
+                if on_result is not None:
+                    on_result(job, None if exc is not None else task.result(), exc)
+                if not self._queued[g] and self._in_flight[g] == 0:
+                    self._transfer(g, 'finished', on_transfer)
+
+    def simulate(self, duration, on_finish=None) -> float:
+        """Run the queued units on a virtual clock instead: each takes
+        ``duration(job)`` seconds, and units start in the order ``run`` would start
+        them (same priority, caps and slot moves). Consumes the queue and returns
+        the makespan in seconds; ``on_finish(job, end)`` is called as each ends."""
+        if self.max_concurrency is None:
+            self.max_concurrency = sum(self._cap.values())
+        for g in self._order:
+            if not self._queued[g]:
+                self._transfer(g, 'already complete at startup', None)
+        now = 0.0
+        running: list = []
+        while True:
+            while len(running) < self.max_concurrency:
+                g = self._next_group()
+                if g is None:
+                    break
+                _key, seq, job = heapq.heappop(self._queued[g])
+                heapq.heappush(running, (now + max(0.0, float(duration(job))), seq, g, job))
+                self._in_flight[g] += 1
+            if not running:
+                return now
+            now, _seq, g, job = heapq.heappop(running)
+            self._in_flight[g] -= 1
+            if on_finish is not None:
+                on_finish(job, now)
+            if not self._queued[g] and self._in_flight[g] == 0:
+                self._transfer(g, 'finished', None)
+
+
+def add_cli_options(ap, priority: bool = True, default_priority: str = 'longest') -> None:
+    """``--priority NAME`` (scheduling scripts only) / ``--slots N`` for the benchmark scripts."""
+    if priority:
+        ap.add_argument('--priority', default=default_priority, choices=sorted(PRIORITIES),
+                        help=f'Order in which queued (instance, rep) units start; longest = longest '
+                             f'expected run time first, estimated from results/ (default: {default_priority})')
+        ap.add_argument('--control-file', default=None,
+                        help='Capacity control file: write a new worker count into it to grow or shrink the '
+                             'running pool without stopping running solves (checked every second)')
+    ap.add_argument('--slots', type=int, default=None,
+                    help=f'Solver runs allowed at once across all benchmark processes on this machine '
+                         f'(also ${ENV_SLOTS}; default: CPU count, or the pinning layout\'s slots; 0 = no limit)')
+    ap.add_argument('--pin', default=None, choices=cpu_affinity.MODES,
+                    help=f'Bind each solver to the CPUs of its machine slot: cpu = one logical CPU '
+                         f'(hyperthread siblings last), physical = one physical core, numa = the cores of '
+                         f'one NUMA node (also ${cpu_affinity.ENV_PIN}; default: off)')
+
+
+def enable_from_args(args) -> None:
+    """Export ``--slots``/``--pin`` so solver runs of this process and its children share them."""
+    if getattr(args, 'slots', None) is not None:
+        os.environ[ENV_SLOTS] = str(max(0, int(args.slots)))
+    cpu_affinity.enable(getattr(args, 'pin', None))
+    if cpu_affinity.pin_mode() != 'off' and machine_slots() == 0:
+        print('WARNING: --pin needs the machine slot pool (--slots 0 turns it off); solvers are not pinned.',
+              file=sys.stderr)
+
+
+def control_from_args(args) -> CapacityControl | None:
+    """The ``--control-file`` capacity control, or None."""
+    path = getattr(args, 'control_file', None)
+    return CapacityControl(path) if path else None
@@ -9,6 +9,11 @@ Input:
       param_value,puzzle_size,instance,alg,alg_name,
       success_%,time_mean,time_std,cycles_mean,cycles_std
 
+With --rep-store DIR the per-instance statistics of those rows are
+recomputed from the reps kept in the columnar rep store (scripts/rep_store.py).
+Each CSV is reduced to a partial aggregate that is cached per file
+(scripts/consolidation_cache.py), so a re-run parses only new or changed CSVs.
+
 Output:
   results/ablation/consolidated_ablation_summary.csv
     One row per (param_name, param_value, puzzle_size, alg, alg_name) with:
@@ -20,10 +25,15 @@ Output:
       - cycles_std_mean: average of cycles_std over instances
 """
 
+import argparse
 import csv
 import math
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
+
+import consolidation_cache
+import group_stats
+import rep_store
 
 
 ABLATION_DIR = Path("results") / "ablation"
@@ -47,14 +57,6 @@ DEFAULTS = {
 PARAM_NAMES = list(DEFAULTS.keys())
 
 
-def safe_mean(values: List[float]) -> float:
-  """Return arithmetic mean of non-NaN values, or NaN if none."""
-  vals = [v for v in values if not math.isnan(v)]
-  if not vals:
-    return math.nan
-  return sum(vals) / len(vals)
-
-
 def parse_float(field: str) -> float:
   """Parse a string to float, returning NaN on failure/empty."""
   if field is None:
@@ -83,12 +85,51 @@ def fmt(value: float, places: int = 5) -> str:
   return s
 
 
-def collect_groups() -> Dict[Tuple[str, str, str, str, str], Dict[str, List[float]]]:
+GroupKey = Tuple[str, str, str, str, str]
+Groups = Dict[GroupKey, dict]
+
+KEYS = ("param_value", "puzzle_size", "alg", "alg_name")
+METRICS = ("success_%", "time_mean", "time_std", "cycles_mean", "cycles_std")
+
+
+def summary_partial(csv_file: Path) -> Dict[str, dict]:
+  """
+  Partial aggregate of one summary CSV, by "param_value|puzzle_size|alg|alg_name":
+  the number of rows and [count, sum] of the non-NaN values of each metric.
+  """
+  with open(csv_file, "r", newline="") as f:
+    cols = group_stats.columns(rep_store.summary_rows(csv_file, csv.DictReader(f)), KEYS, METRICS)
+  if not len(cols["alg"]):
+    return {}
+  by = group_stats.GroupBy(*(cols[k] for k in KEYS))
+  sizes = by.size()
+  counts = {m: by.count(cols[m]) for m in METRICS}
+  sums = {m: by.sum(cols[m]) for m in METRICS}
+  return {
+    "|".join(label): {
+      "instances": int(sizes[j]),
+      **{m: [int(counts[m][j]), float(sums[m][j])] for m in METRICS},
+    }
+    for j, label in enumerate(by.labels)
+  }
+
+
+def merge_partial(groups: Groups, key: GroupKey, part: dict) -> None:
+  g = groups.setdefault(key, {"instances": 0, **{m: [0, 0.0] for m in METRICS}})
+  g["instances"] += part["instances"]
+  for m in METRICS:
+    g[m] = consolidation_cache.merge_moments(g[m], part[m])
+
+
+def collect_groups() -> Groups:
   """
   Scan all ablation summary CSVs and group rows by:
     (param_name, param_value, puzzle_size, alg, alg_name)
+
+  Each file is reduced to a partial aggregate once; unchanged files are served
+  from the consolidation cache (scripts/consolidation_cache.py).
   """
-  groups: Dict[Tuple[str, str, str, str, str], Dict[str, List[float]]] = {}
+  groups: Groups = {}
 
   if not ABLATION_DIR.exists():
     print(f"No ablation directory found at {ABLATION_DIR}")
@@ -103,45 +144,20 @@ def collect_groups() -> Dict[Tuple[str, str, str, str, str], Dict[str, List[floa
 
     for csv_file in sorted(param_dir.glob("*_summary.csv")):
       try:
-        with open(csv_file, "r", newline="") as f:
-          reader = csv.DictReader(f)
-          for row in reader:
-            param_value = (row.get("param_value") or "").strip()
-            puzzle_size = (row.get("puzzle_size") or "").strip()
-            alg = (row.get("alg") or "").strip()
-            alg_name = (row.get("alg_name") or "").strip()
-
-            key = (param_name, param_value, puzzle_size, alg, alg_name)
-            g = groups.setdefault(
-              key,
-              {
-                "instances": 0,
-                "success_%": [],
-                "time_mean": [],
-                "time_std": [],
-                "cycles_mean": [],
-                "cycles_std": [],
-              },
-            )
-
-            g["instances"] += 1
-            g["success_%"].append(parse_float(row.get("success_%")))
-            g["time_mean"].append(parse_float(row.get("time_mean")))
-            g["time_std"].append(parse_float(row.get("time_std")))
-            g["cycles_mean"].append(parse_float(row.get("cycles_mean")))
-            g["cycles_std"].append(parse_float(row.get("cycles_std")))
+        partial = consolidation_cache.partial("ablation-summary", csv_file, summary_partial)
       except FileNotFoundError:
         continue
       except Exception as e:
         print(f"Warning: failed to read {csv_file}: {e}")
         continue
+      for key, part in partial.items():
+        param_value, puzzle_size, alg, alg_name = key.split("|")
+        merge_partial(groups, (param_name, param_value, puzzle_size, alg, alg_name), part)
 
   return groups
 
 
-def add_default_runs(
-  groups: Dict[Tuple[str, str, str, str, str], Dict[str, List[float]]]
-) -> None:
+def add_default_runs(groups: Groups) -> None:
   """
   Also fold in the default CP-DCM-ACO runs from:
     results/9x9/results_9x9_CP-DCM-ACO.csv
@@ -169,45 +185,23 @@ def add_default_runs(
       continue
 
     try:
-      with open(csv_path, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-          puzzle_size = size_name
-          alg = (row.get("alg") or "").strip()
-          alg_name = (row.get("alg_name") or "").strip()
-
-          for param_name in PARAM_NAMES:
-            default_val = DEFAULTS.get(param_name)
-            if default_val is None:
-              continue
-
-            key = (param_name, str(default_val), puzzle_size, alg, alg_name)
-            g = groups.setdefault(
-              key,
-              {
-                "instances": 0,
-                "success_%": [],
-                "time_mean": [],
-                "time_std": [],
-                "cycles_mean": [],
-                "cycles_std": [],
-              },
-            )
-
-            g["instances"] += 1
-            g["success_%"].append(parse_float(row.get("success_%")))
-            g["time_mean"].append(parse_float(row.get("time_mean")))
-            g["time_std"].append(parse_float(row.get("time_std")))
-            g["cycles_mean"].append(parse_float(row.get("cycles_mean")))
-            g["cycles_std"].append(parse_float(row.get("cycles_std")))
+      partial = consolidation_cache.partial("ablation-summary", csv_path, summary_partial)
     except FileNotFoundError:
       continue
     except Exception as e:
       print(f"Warning: failed to read default results from {csv_path}: {e}")
       continue
 
+    for key, part in partial.items():
+      _param_value, _puzzle_size, alg, alg_name = key.split("|")
+      for param_name in PARAM_NAMES:
+        default_val = DEFAULTS.get(param_name)
+        if default_val is None:
+          continue
+        merge_partial(groups, (param_name, str(default_val), size_name, alg, alg_name), part)
 
-def write_consolidated_csv(groups: Dict[Tuple[str, str, str, str, str], Dict[str, List[float]]]) -> None:
+
+def write_consolidated_csv(groups: Groups) -> None:
   OUT_CSV.parent.mkdir(parents=True, exist_ok=True)
 
   headers = [
@@ -242,11 +236,11 @@ def write_consolidated_csv(groups: Dict[Tuple[str, str, str, str, str], Dict[str
     for (param_name, param_value, puzzle_size, alg, alg_name), stats in sorted(
       groups.items(), key=sort_key
     ):
-      success_mean = safe_mean(stats["success_%"])
-      time_mean_mean = safe_mean(stats["time_mean"])
-      time_std_mean = safe_mean(stats["time_std"])
-      cycles_mean_mean = safe_mean(stats["cycles_mean"])
-      cycles_std_mean = safe_mean(stats["cycles_std"])
+      success_mean = consolidation_cache.moments_mean(stats["success_%"])
+      time_mean_mean = consolidation_cache.moments_mean(stats["time_mean"])
+      time_std_mean = consolidation_cache.moments_mean(stats["time_std"])
+      cycles_mean_mean = consolidation_cache.moments_mean(stats["cycles_mean"])
+      cycles_std_mean = consolidation_cache.moments_mean(stats["cycles_std"])
 
       row = [
         param_name,
@@ -267,6 +261,13 @@ def write_consolidated_csv(groups: Dict[Tuple[str, str, str, str, str], Dict[str
 
 
 def main() -> None:
+  ap = argparse.ArgumentParser(description="Consolidate ablation summary CSVs into mean-of-means rows.")
+  rep_store.add_cli_options(ap)
+  consolidation_cache.add_cli_options(ap)
+  args = ap.parse_args()
+  rep_store.enable_from_args(args)
+  consolidation_cache.enable_from_args(args)
+
   groups = collect_groups()
   # Also include the default CP-DCM-ACO runs as a baseline value
   add_default_runs(groups)
@@ -274,6 +275,10 @@ def main() -> None:
     print("No summary CSVs found to consolidate.")
     return
   write_consolidated_csv(groups)
+  cache = consolidation_cache.active()
+  if cache is not None:
+    print(f"Consolidation cache: {cache.misses} of {cache.hits + cache.misses} CSVs re-read")
+    cache.save()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Per-file cache of the partial aggregates the consolidation scripts compute.
+
+``consolidate_ablation_summaries.collect_groups``,
+``run_ablation.compute_best_config_overall``,
+``run_algo_timeout_comparison.collect_timeout_aggregates`` and the loaders of
+``build_ablation_results_excel`` reduce every summary CSV under ``results/`` to a
+small partial aggregate (per group: row count, and count and sum of the non-NaN
+values of each metric) and merge those. The partials are kept in
+``results/.consolidation_cache.json``, one entry per (kind, file):
+
+- an entry is reused while the file's size and mtime are unchanged;
+- otherwise the file's sha256 is compared, so a touched but identical file is
+  not parsed again;
+- otherwise the file is re-read and its entry replaced.
+
+Re-running a consolidation after one new summary landed therefore parses only
+that file. With a rep store (``--rep-store``) the statistics come from the stored
+reps, so entries also carry the number of stored reps of the file's campaigns;
+reps landing for one campaign re-read only that campaign's summary.
+
+``$SUDACO_CONSOLIDATION_CACHE`` (or ``--consolidation-cache FILE``) moves the
+cache file; ``off`` disables it::
+
+    python scripts/consolidate_ablation_summaries.py --consolidation-cache off
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import math
+import os
+import threading
+from pathlib import Path
+
+import rep_store
+import result_cache
+
+ENV_FILE = 'SUDACO_CONSOLIDATION_CACHE'
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_FILE = REPO_ROOT / 'results' / '.consolidation_cache.json'
+VERSION = 1
+
+
+def merge_moments(a: list, b: list) -> list:
+    """Merge two ``[count, sum]`` partial means (of the non-NaN values)."""
+    return [a[0] + b[0], a[1] + b[1]]
+
+
+def moments_mean(m: list) -> float:
+    """Mean of a ``[count, sum]`` partial, NaN when it holds no values."""
+    return m[1] / m[0] if m[0] else math.nan
+
+
+def _store_salt(file_path) -> str:
+    """The active rep store and how many of its reps feed ``file_path``: new reps
+    of one campaign invalidate only the entries of that campaign's summary."""
+    store = rep_store.active()
+    if store is None:
+        return ''
+    return f'{store.directory}:{rep_store.summary_rep_count(file_path)}'
+
+
+class ConsolidationCache:
+    """Partials by ``kind|path``, validated against the file's size, mtime and hash."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = self._read()
+        self.touched: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get('version') != VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def partial(self, kind: str, file_path, compute):
+        """``compute(file_path)`` (a JSON-serializable value), or its cached value
+        while the file is unchanged. Exceptions of ``compute`` propagate and
+        nothing is cached for the file."""
+        p = Path(file_path)
+        rel = rep_store._rel(p)
+        key = f'{kind}|{rel}'
+        st = p.stat()
+        salt = _store_salt(p)
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is not None and entry['salt'] == salt:
+            if entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                self.hits += 1
+                return entry['value']
+            if entry['size'] == st.st_size and entry['sha256'] == result_cache.file_digest(p):
+                with self._lock:
+                    entry['mtime_ns'] = st.st_mtime_ns
+                    self.touched.add(key)
+                self.hits += 1
+                return entry['value']
+        # hashed before parsing: a file rewritten meanwhile fails the size/mtime
+        # check next time instead of matching a stale value
+        digest = result_cache.file_digest(p)
+        value = compute(p)
+        with self._lock:
+            self.entries[key] = {
+                'path': rel,
+                'size': st.st_size,
+                'mtime_ns': st.st_mtime_ns,
+                'sha256': digest,
+                'salt': salt,
+                'value': value,
+            }
+            self.touched.add(key)
+        self.misses += 1
+        return value
+
+    def save(self) -> None:
+        """Merge this process's new entries into the cache file; entries of files
+        that no longer exist are dropped."""
+        with self._lock:
+            if not self.touched:
+                return
+            entries = self._read()
+            entries.update({k: self.entries[k] for k in self.touched})
+            self.touched.clear()
+        entries = {k: v for k, v in entries.items() if (REPO_ROOT / v['path']).exists()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': VERSION, 'entries': entries}, f)
+        os.replace(tmp, self.path)
+
+
+_active: ConsolidationCache | None = None
+_active_lock = threading.Lock()
+
+
+def enable(path) -> ConsolidationCache | None:
+    """Use the cache file ``path`` (``off`` disables caching), also for the
+    consolidation processes started from here."""
+    os.environ[ENV_FILE] = str(path) if str(path) == 'off' else str(Path(path).resolve())
+    return active()
+
+
+def active() -> ConsolidationCache | None:
+    """The cache configured by the environment (default
+    ``results/.consolidation_cache.json``), or None when it is off."""
+    global _active
+    path = os.environ.get(ENV_FILE) or str(DEFAULT_FILE)
+    if path == 'off':
+        return None
+    with _active_lock:
+        if _active is None or _active.path != Path(path):
+            if _active is not None:
+                _active.save()
+            _active = ConsolidationCache(path)
+            atexit.register(_active.save)
+        return _active
+
+
+def partial(kind: str, file_path, compute):
+    """``compute(file_path)`` through the active cache."""
+    cache = active()
+    if cache is None:
+        return compute(Path(file_path))
+    return cache.partial(kind, file_path, compute)
+
+
+def save() -> None:
+    if _active is not None:
+        _active.save()
+
+
+def add_cli_options(ap) -> None:
+    """``--consolidation-cache FILE`` for the consolidation scripts."""
+    ap.add_argument('--consolidation-cache', default=None, metavar='FILE',
+                    help=f'Per-file partial aggregates of the summary CSVs (also ${ENV_FILE}; '
+                         'default: results/.consolidation_cache.json, "off" re-reads every file)')
+
+
+def enable_from_args(args) -> ConsolidationCache | None:
+    if getattr(args, 'consolidation_cache', None):
+        return enable(args.consolidation_cache)
+    return active()
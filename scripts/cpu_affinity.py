@@ -0,0 +1,200 @@
+"""
+CPU pinning of solver runs (``--pin``).
+
+Timing columns mix algorithm cost with contention when two solvers share a
+core or a hyperthread pair. With pinning on, every solver run is bound to the
+CPUs of the machine-wide solver slot it holds (``campaign_scheduler``): slot
+``i`` always maps to the same CPUs, and slots are exclusive across all
+benchmark processes on the machine, so concurrent solvers never share a core
+however many launchers are running. Modes:
+
+- ``cpu``: one slot per logical CPU; the first hardware thread of every
+  physical core comes first, hyperthread siblings only after all cores are used.
+- ``physical``: one slot per physical core, bound to its first hardware thread;
+  siblings stay idle.
+- ``numa``: one slot per physical core, bound to the first hardware threads of
+  all cores of its NUMA node (the OS may move a solver within its node, never
+  across nodes).
+
+Slots are numbered node by node (in ``cpu`` mode: first threads, then
+siblings, each node by node), so a partly used pool stays on one node. The
+machine pool defaults to the number of slots of the layout. Pinning needs
+``os.sched_setaffinity`` (Linux); elsewhere it is off.
+
+Launchers append the layout to ``cpu_layout.jsonl`` in their output directory
+(or ``<results>.cpu_layout.jsonl`` next to a results CSV), one JSON line per run.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import socket
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+ENV_PIN = 'SUDACO_PIN'
+
+MODES = ('off', 'cpu', 'physical', 'numa')
+
+SYS_CPU = Path('/sys/devices/system/cpu')
+SYS_NODE = Path('/sys/devices/system/node')
+
+LAYOUT_FILE = 'cpu_layout.jsonl'
+
+
+def supported() -> bool:
+    return hasattr(os, 'sched_setaffinity') and hasattr(os, 'sched_getaffinity')
+
+
+def parse_cpulist(text: str) -> list[int]:
+    """CPUs of a sysfs list such as ``0-3,8-11``."""
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        lo, _, hi = part.partition('-')
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def _read_int(path: Path) -> int | None:
+    try:
+        return int(path.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def read_topology(cpus=None) -> dict:
+    """
+    ``{node: {core: [cpus]}}`` of ``cpus`` (default: the CPUs this process may
+    run on), cores keyed ``(package, core_id)``. CPUs without sysfs topology
+    count as their own core on node 0.
+    """
+    if cpus is None:
+        cpus = os.sched_getaffinity(0) if supported() else range(os.cpu_count() or 1)
+    node_of = {}
+    for node_dir in sorted(SYS_NODE.glob('node[0-9]*')):
+        try:
+            for cpu in parse_cpulist((node_dir / 'cpulist').read_text()):
+                node_of[cpu] = int(node_dir.name[4:])
+        except (OSError, ValueError):
+            continue
+    topo: dict = {}
+    for cpu in sorted(cpus):
+        base = SYS_CPU / f'cpu{cpu}' / 'topology'
+        core_id = _read_int(base / 'core_id')
+        package = _read_int(base / 'physical_package_id')
+        core = (package, core_id) if core_id is not None else (None, -1 - cpu)
+        topo.setdefault(node_of.get(cpu, 0), {}).setdefault(core, []).append(cpu)
+    return {node: topo[node] for node in sorted(topo)}
+
+
+def build_layout(mode: str, topo: dict) -> list[tuple[int, ...]]:
+    """CPU set of each slot, by slot index (empty when ``mode`` is off)."""
+    if mode == 'cpu':
+        depth = max((len(threads) for cores in topo.values() for threads in cores.values()), default=0)
+        return [(threads[k],) for k in range(depth)
+                for cores in topo.values() for threads in cores.values() if len(threads) > k]
+    if mode == 'physical':
+        return [(threads[0],) for cores in topo.values() for threads in cores.values()]
+    if mode == 'numa':
+        layout = []
+        for cores in topo.values():
+            node_cpus = tuple(threads[0] for threads in cores.values())
+            layout.extend(node_cpus for _ in cores)
+        return layout
+    return []
+
+
+def pin_mode() -> str:
+    """The active mode (``$SUDACO_PIN``); ``off`` where pinning is unsupported."""
+    mode = os.environ.get(ENV_PIN, '').strip().lower() or 'off'
+    if mode not in MODES or not supported():
+        return 'off'
+    return mode
+
+
+@functools.lru_cache(maxsize=None)
+def _layout(mode: str) -> tuple:
+    return tuple(build_layout(mode, read_topology()))
+
+
+def slot_layout() -> tuple:
+    """CPU sets of the machine pool's slots under the active mode (empty: no pinning)."""
+    return _layout(pin_mode())
+
+
+def pin(pid: int, cpus) -> None:
+    """Bind process ``pid`` (0: the calling thread) to ``cpus``; a process that
+    already exited, or ``cpus`` None, is left alone."""
+    if not cpus:
+        return
+    try:
+        os.sched_setaffinity(pid, cpus)
+    except (OSError, AttributeError):
+        pass
+
+
+@contextmanager
+def pinned(cpus):
+    """Bind the calling thread to ``cpus`` for the ``with`` block, then give it
+    back the CPUs it had before; ``cpus`` None leaves it alone."""
+    if not cpus or not supported():
+        yield
+        return
+    saved = os.sched_getaffinity(0)
+    pin(0, cpus)
+    try:
+        yield
+    finally:
+        pin(0, saved)
+
+
+def layout_record(slots: int) -> dict:
+    """The active layout as recorded with the results."""
+    mode = pin_mode()
+    topo = read_topology()
+    layout = slot_layout()
+    used = [list(layout[i % len(layout)]) for i in range(slots)] if layout else []
+    return {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'host': socket.gethostname(),
+        'mode': mode,
+        'cpus': sum(len(threads) for cores in topo.values() for threads in cores.values()),
+        'cores': sum(len(cores) for cores in topo.values()),
+        'nodes': {str(node): sorted(cpu for threads in cores.values() for cpu in threads)
+                  for node, cores in topo.items()},
+        'slots': slots,
+        'slot_cpus': used,
+    }
+
+
+def record_layout(path) -> Path | None:
+    """
+    Append the active layout to the layout file of ``path`` (a results CSV or
+    an output directory); nothing when pinning is off.
+    """
+    if pin_mode() == 'off':
+        return None
+    from campaign_scheduler import machine_slots
+    path = Path(path)
+    target = path / LAYOUT_FILE if path.is_dir() or not path.suffix else path.with_suffix('.' + LAYOUT_FILE)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(layout_record(machine_slots())) + '\n')
+    return target
+
+
+def enable(mode: str | None) -> None:
+    """Export ``mode`` so solver runs of this process and its children use it."""
+    if mode is None:
+        return
+    if mode != 'off' and not supported():
+        print(f'WARNING: --pin {mode} needs os.sched_setaffinity (Linux); solvers are not pinned.',
+              file=sys.stderr)
+        mode = 'off'
+    os.environ[ENV_PIN] = mode
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Streaming Excel export shared by the report builders.
+
+Sheets are written with openpyxl's write-only worksheets: ``SheetWriter.append``
+sends each row to the file as it is written, so a workbook never holds its
+cells in memory. Cells are formatted with the named styles of ``STYLES``
+(``styled(value, 'header')``, or a default style for a whole row) instead of
+per-cell font, fill and border objects.
+
+Every workbook written here registers the same styles in the same order, so
+its styles part is identical. ``replace_sheet`` relies on that to regenerate one
+sheet of an existing workbook: the new sheet's XML part replaces the old one
+in the zip and the other sheets are copied without being parsed.
+``update_sheet`` falls back to loading the workbook with openpyxl when it was
+written some other way.
+
+Column widths and frozen panes precede the rows in a sheet's XML: they are
+given when the ``SheetWriter`` is created. ``autofit=N`` sizes columns to their
+longest value (at most N) and keeps the rows, as plain values, until ``close``;
+long per-instance tables pass fixed ``widths`` and stream.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+from typing import NamedTuple
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+
+_THIN = Side(style='thin')
+_BOX = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_CENTER = Alignment(horizontal='center', vertical='center')
+
+
+def _fill(rgb: str) -> PatternFill:
+    return PatternFill('solid', fgColor=rgb)
+
+
+# Named styles by key; the workbook style names are ``STYLE_PREFIX + key``.
+# Styles without a font use the workbook default (Calibri 11).
+STYLES = {
+    'title': dict(font=Font(bold=True, size=13), alignment=Alignment(horizontal='center')),
+    'group': dict(font=Font(bold=True, size=18), fill=_fill('E2F0D9'), alignment=_CENTER),
+    'section': dict(font=Font(bold=True), fill=_fill('D9E1F2')),
+    'section-accent': dict(font=Font(bold=True), fill=_fill('FCE4D6'), alignment=_CENTER),
+    'bold': dict(font=Font(bold=True)),
+    'header': dict(font=Font(bold=True), alignment=_CENTER, border=_BOX),
+    'header-fill': dict(font=Font(bold=True), fill=_fill('D9E1F2'), border=_BOX),
+    'header-dark': dict(font=Font(bold=True, color='FFFFFF', size=11), fill=_fill('366092'),
+                        alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+                        border=_BOX),
+    'cell': dict(border=_BOX),
+    'cell-bold': dict(font=Font(bold=True), border=_BOX),
+    'cell-center': dict(alignment=_CENTER, border=_BOX),
+    'cell-highlight': dict(fill=_fill('FFF2CC'), alignment=_CENTER, border=_BOX),
+    'total-label': dict(font=Font(bold=True, size=11), fill=_fill('E7E6E6'),
+                        alignment=Alignment(horizontal='left', vertical='center'), border=_BOX),
+    'total-value': dict(font=Font(bold=True, size=11), fill=_fill('E7E6E6'), alignment=_CENTER, border=_BOX),
+    'total-fill': dict(fill=_fill('E7E6E6'), border=_BOX),
+}
+STYLE_PREFIX = 'report '
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_STYLES_PART = 'xl/styles.xml'
+
+
+class Styled(NamedTuple):
+    value: object
+    style: str | None
+
+
+def styled(value, style: str | None) -> Styled:
+    """A cell value with the named style ``style`` (a ``STYLES`` key; None: unstyled)."""
+    return Styled(value, style)
+
+
+def _register_styles(wb: Workbook) -> None:
+    for key, spec in STYLES.items():
+        name = STYLE_PREFIX + key
+        if name in wb.named_styles:
+            continue
+        style = NamedStyle(name=name, **{'font': DEFAULT_FONT, **spec})
+        wb.add_named_style(style)
+        # register the cell format now rather than on first use, so style ids
+        # (and the styles part) do not depend on which styles a workbook uses
+        wb._cell_styles.add(style.as_tuple())
+
+
+def new_workbook() -> Workbook:
+    """Empty write-only workbook with the ``STYLES`` registered."""
+    wb = Workbook(write_only=True)
+    _register_styles(wb)
+    return wb
+
+
+class SheetWriter:
+    """Rows of one worksheet, written top to bottom.
+
+    ``widths`` maps column letters or 1-based indexes to widths; ``autofit``
+    instead sizes every column to ``min(longest value + 2, autofit)``.
+    ``freeze`` is the top-left unfrozen cell (e.g. ``'A3'``). Call ``close`` once
+    the last row is written.
+    """
+
+    def __init__(self, ws, widths=None, autofit: int | None = None, freeze: str | None = None):
+        self.ws = ws
+        self.row_idx = 0
+        self._streaming = getattr(ws.parent, 'write_only', False)
+        self._rows: list | None = [] if autofit else None
+        self._autofit = autofit
+        self._merges: list[CellRange] = []
+        if freeze:
+            ws.freeze_panes = freeze
+        for col, width in (widths or {}).items():
+            letter = get_column_letter(col) if isinstance(col, int) else col
+            ws.column_dimensions[letter].width = width
+
+    def append(self, values=(), style: str | None = None, height: float | None = None) -> int:
+        """Write the next row: ``values`` are plain or ``styled``; plain ones (None
+        included) get ``style``. Returns the row number."""
+        self.row_idx += 1
+        if self._rows is not None:
+            self._rows.append((list(values), style, height))
+        else:
+            self._write(self.row_idx, values, style, height)
+        return self.row_idx
+
+    def skip(self, n: int = 1) -> None:
+        """Leave ``n`` empty rows."""
+        for _ in range(n):
+            self.append()
+
+    def merge(self, min_row: int, min_col: int, max_row: int, max_col: int) -> None:
+        self._merges.append(CellRange(min_col=min_col, min_row=min_row, max_col=max_col, max_row=max_row))
+
+    def close(self) -> None:
+        rows, self._rows = self._rows, None
+        if rows is not None:
+            lengths: dict[int, int] = {}
+            for values, _style, _height in rows:
+                for col, v in enumerate(values, 1):
+                    value = v.value if isinstance(v, Styled) else v
+                    n = len(str(value)) if value is not None else 0
+                    lengths[col] = max(lengths.get(col, 0), n)
+            for col, n in lengths.items():
+                self.ws.column_dimensions[get_column_letter(col)].width = min(n + 2, self._autofit)
+            for row_idx, (values, style, height) in enumerate(rows, 1):
+                self._write(row_idx, values, style, height)
+        for rng in self._merges:
+            if self._streaming:
+                self.ws.merged_cells.add(rng)
+            else:
+                self.ws.merge_cells(rng.coord)
+        self._merges = []
+
+    def _write(self, row_idx: int, values, style, height) -> None:
+        if height is not None:
+            self.ws.row_dimensions[row_idx].height = height
+        cells = [v if isinstance(v, Styled) else Styled(v, style) for v in values]
+        if self._streaming:
+            out = []
+            for value, st in cells:
+                if st is None:
+                    out.append(value)
+                    continue
+                cell = WriteOnlyCell(self.ws, value=value)
+                cell.style = STYLE_PREFIX + st
+                out.append(cell)
+            self.ws.append(out)
+            return
+        for col, (value, st) in enumerate(cells, 1):
+            cell = self.ws.cell(row=row_idx, column=col, value=value)
+            if st is not None:
+                cell.style = STYLE_PREFIX + st
+
+
+def _save(wb: Workbook, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    wb.save(str(tmp))
+    os.replace(tmp, path)
+
+
+def save_workbook(path, sheets) -> None:
+    """Write a workbook of ``sheets``, ``(title, write)`` pairs where ``write(ws)``
+    fills the write-only worksheet ``ws`` (through a ``SheetWriter``)."""
+    wb = new_workbook()
+    for title, write in sheets:
+        write(wb.create_sheet(title))
+    _save(wb, Path(path))
+
+
+def _sheet_part(zf: zipfile.ZipFile, title: str) -> str | None:
+    """Zip member of the worksheet ``title``, or None."""
+    rid = None
+    for sheet in ET.fromstring(zf.read('xl/workbook.xml')).iter(f'{{{_MAIN_NS}}}sheet'):
+        if sheet.get('name') == title:
+            rid = sheet.get(f'{{{_REL_NS}}}id')
+    if rid is None:
+        return None
+    for rel in ET.fromstring(zf.read('xl/_rels/workbook.xml.rels')):
+        if rel.get('Id') == rid:
+            target = rel.get('Target', '')
+            return target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+    return None
+
+
+def replace_sheet(path, title: str, write) -> bool:
+    """Regenerate the sheet ``title`` of the workbook at ``path`` with ``write``
+    (as in ``save_workbook``), leaving the other sheets as they are. False, with
+    nothing changed, when the workbook is missing, has no such sheet or was not
+    written by this module."""
+    path = Path(path)
+    if not path.exists():
+        return False
+    wb = new_workbook()
+    write(wb.create_sheet(title))
+    buf = io.BytesIO()
+    wb.save(buf)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with zipfile.ZipFile(buf) as new, zipfile.ZipFile(path) as old:
+            part = _sheet_part(old, title)
+            if part is None or old.read(_STYLES_PART) != new.read(_STYLES_PART):
+                return False
+            folder, name = part.rsplit('/', 1)
+            if f'{folder}/_rels/{name}.rels' in old.namelist():
+                return False  # the old sheet has drawings, comments or links of its own
+            sheet_xml = new.read(_sheet_part(new, title))
+            with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as out:
+                for info in old.infolist():
+                    out.writestr(info, sheet_xml if info.filename == part else old.read(info))
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        tmp.unlink(missing_ok=True)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def update_sheet(path, title: str, write) -> None:
+    """``replace_sheet``; a new workbook when ``path`` does not exist; else (a
+    workbook written some other way, or without the sheet) the workbook is
+    loaded and saved with openpyxl, the sheet replaced in place or added last."""
+    path = Path(path)
+    if replace_sheet(path, title, write):
+        return
+    if not path.exists():
+        save_workbook(path, [(title, write)])
+        return
+    wb = load_workbook(str(path))
+    _register_styles(wb)
+    index = None
+    if title in wb.sheetnames:
+        index = wb.sheetnames.index(title)
+        del wb[title]
+    write(wb.create_sheet(title, index))
+    _save(wb, path)
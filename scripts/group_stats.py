@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Grouped statistics over typed NumPy columns, for the report builders.
+
+Summary and run CSVs are loaded into typed columns (``columns``/``read_csv``): key
+columns as string arrays, statistics as float64 with blank or unparsable cells
+as NaN. ``GroupBy`` factorizes one or more key columns into group codes once;
+its reductions (``size``, ``count``, ``sum``, ``mean``, ``std``, ``min``, ``max``,
+``quantile``, ``success_rate``) are ``np.bincount`` or sort based, one pass over
+a column for all groups together::
+
+    cols = group_stats.read_csv(path, keys=('param_value', 'alg'), values=('success_%', 'time_mean'))
+    by = group_stats.GroupBy(cols['param_value'], cols['alg'])
+    for (pv, alg), succ, n in zip(by.labels, by.mean(cols['success_%']), by.size()):
+        ...
+
+NaN conventions are those of the summary CSVs: NaN values are skipped, a group
+without values gives NaN, and the population std of a single value is 0 (with
+``ddof=1``, NaN below two values). ``nanmean``/``nanstd``/``nanmin``/``nanmax``
+apply the same rules to one sequence (``bench_utils.safe_mean``/``safe_std``).
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+
+import numpy as np
+
+
+def to_float(values) -> np.ndarray:
+    """float64 array of ``values``; None, blank and unparsable entries become NaN."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fiub':
+        return values.astype(np.float64, copy=False)
+    values = list(values)
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+    out = np.empty(len(values), dtype=np.float64)
+    for i, v in enumerate(values):
+        try:
+            out[i] = float(v)
+        except (TypeError, ValueError):
+            out[i] = math.nan
+    return out
+
+
+def columns(rows, keys=(), values=()) -> dict:
+    """Typed columns of dict ``rows`` (e.g. a ``csv.DictReader``): ``keys`` as
+    stripped strings, ``values`` as float64 (``to_float``)."""
+    raw = {name: [] for name in (*keys, *values)}
+    for row in rows:
+        for name, col in raw.items():
+            col.append(row.get(name))
+    out = {k: np.array([(v or '').strip() for v in raw[k]], dtype=str) for k in keys}
+    out.update({v: to_float(raw[v]) for v in values})
+    return out
+
+
+def read_csv(path, keys=(), values=()) -> dict:
+    with open(path, 'r', newline='') as f:
+        return columns(csv.DictReader(f), keys, values)
+
+
+class GroupBy:
+    """Rows grouped by the distinct combinations of the key arrays ``keys``.
+
+    ``labels`` lists the groups' key tuples in sorted order, ``codes`` maps each
+    row to its group; every reduction returns one value per group in that order.
+    """
+
+    def __init__(self, *keys):
+        if not keys:
+            raise ValueError('GroupBy needs at least one key column')
+        uniques = []
+        code = np.zeros(len(keys[0]), dtype=np.int64)
+        for key in keys:
+            uniq, inv = np.unique(np.asarray(key), return_inverse=True)
+            code = code * max(1, len(uniq)) + inv.ravel()
+            uniques.append(uniq)
+        groups, codes = np.unique(code, return_inverse=True)
+        self.codes = codes.ravel()
+        self.ngroups = len(groups)
+        labels = []
+        for uniq in reversed(uniques):
+            n = max(1, len(uniq))
+            labels.append(uniq[groups % n])
+            groups = groups // n
+        self.labels = list(zip(*(col.tolist() for col in reversed(labels))))
+
+    def __len__(self) -> int:
+        return self.ngroups
+
+    def _bincount(self, weights=None) -> np.ndarray:
+        return np.bincount(self.codes, weights=weights, minlength=self.ngroups)
+
+    def size(self) -> np.ndarray:
+        """Rows per group."""
+        return self._bincount()
+
+    def count(self, values) -> np.ndarray:
+        """Non-NaN values per group."""
+        return self._bincount(~np.isnan(to_float(values))).astype(np.int64)
+
+    def sum(self, values) -> np.ndarray:
+        x = to_float(values)
+        return self._bincount(np.where(np.isnan(x), 0.0, x))
+
+    def mean(self, values) -> np.ndarray:
+        x = to_float(values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sum(x) / self.count(x)
+
+    def std(self, values, ddof: int = 0) -> np.ndarray:
+        """Two-pass standard deviation; NaN for groups with ``ddof`` values or fewer."""
+        x = to_float(values)
+        ok = ~np.isnan(x)
+        cnt = self.count(x)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.sum(x) / cnt
+            dev = np.where(ok, x - mean[self.codes], 0.0)
+            var = self._bincount(dev * dev) / (cnt - ddof)
+        return np.where(cnt > ddof, np.sqrt(np.maximum(var, 0.0)), math.nan)
+
+    def success_rate(self, success) -> np.ndarray:
+        """Percentage of truthy ``success`` values per group."""
+        return 100.0 * self.mean(np.asarray(success, dtype=np.float64))
+
+    def _starts(self) -> np.ndarray:
+        """Offset of each group in the rows sorted by group."""
+        starts = np.zeros(self.ngroups, dtype=np.int64)
+        np.cumsum(self.size()[:-1], out=starts[1:])
+        return starts
+
+    def _sorted(self, x: np.ndarray):
+        """``x`` sorted by (group, value) with NaN last in each group, and each
+        group's offset into it."""
+        return x[np.lexsort((x, self.codes))], self._starts()
+
+    def quantile(self, values, q) -> np.ndarray:
+        """Linearly interpolated quantile ``q`` (0..1) of the non-NaN values per
+        group, as ``np.quantile``."""
+        x = to_float(values)
+        xs, starts = self._sorted(x)
+        cnt = self.count(x)
+        pos = q * np.maximum(cnt - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, np.maximum(cnt - 1, 0))
+        frac = pos - lo
+        if not len(xs):
+            return np.full(self.ngroups, math.nan)
+        a = xs[np.minimum(starts + lo, len(xs) - 1)]
+        b = xs[np.minimum(starts + hi, len(xs) - 1)]
+        return np.where(cnt > 0, a + (b - a) * frac, math.nan)
+
+    def min(self, values) -> np.ndarray:
+        return self.quantile(values, 0.0)
+
+    def max(self, values) -> np.ndarray:
+        return self.quantile(values, 1.0)
+
+    def first_rows(self) -> np.ndarray:
+        """Index of each group's first row (e.g. dedupe by instance, first wins)."""
+        order = np.lexsort((np.arange(len(self.codes)), self.codes))
+        return order[self._starts()]
+
+    def last_rows(self) -> np.ndarray:
+        """Index of each group's last row (dedupe, last wins)."""
+        order = np.lexsort((np.arange(len(self.codes)), self.codes))
+        return order[np.cumsum(self.size()) - 1]
+
+
+def _clean(values) -> np.ndarray:
+    x = to_float(values)
+    return x[~np.isnan(x)]
+
+
+def nanmean(values) -> float:
+    """Mean of the non-NaN values (exactly rounded sum, as ``statistics.mean``), NaN
+    when there are none."""
+    x = _clean(values)
+    return math.fsum(x) / len(x) if len(x) else math.nan
+
+
+def nanstd(values, ddof: int = 0) -> float:
+    """Standard deviation of the non-NaN values (population by default: 0 for one
+    value), NaN with ``ddof`` values or fewer."""
+    x = _clean(values)
+    if len(x) <= ddof:
+        return math.nan
+    return float(np.std(x, ddof=ddof))
+
+
+def nanmin(values) -> float:
+    x = _clean(values)
+    return float(x.min()) if len(x) else math.nan
+
+
+def nanmax(values) -> float:
+    x = _clean(values)
+    return float(x.max()) if len(x) else math.nan
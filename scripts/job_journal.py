@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Transactional job journal (``--journal PATH``): per-rep progress and summary
+rows of benchmark campaigns in one SQLite database, instead of progress CSVs
+guarded by advisory file locks.
+
+A campaign is one (progress CSV, summary CSV) pair of a runner. Its reps are
+keyed ``(campaign, instance, rep)``; recording a rep is one insert, and a rep
+result replaces only an ``interrupted`` row of the same rep. Completion checks,
+resume and progress cleanup are indexed queries, so they cost the same on the
+last instance of a campaign as on the first. Each instance also keeps a
+``rep_stats.RepStats`` of its finished reps, updated in the transaction that
+records a rep, so summary statistics are read back without its reps. Writing an instance's summary row
+is one transaction: the row is journaled and appended to the summary CSV while
+the database write lock is held, so concurrent workers never duplicate a row.
+
+The CSVs stay the output format. The summary CSV is kept current as instances
+finish; the progress CSV is exported when a run ends with the campaign
+incomplete, and removed (with the campaign's reps) once every instance has its
+summary. A campaign opened for the first time imports any progress and summary
+CSVs already on disk, so a CSV-era run resumes under the journal.
+
+Enable it for this process and the runners it starts with ``--journal PATH``
+(or ``$SUDACO_JOURNAL``). Export every campaign's CSVs from a journal with::
+
+    python scripts/job_journal.py export results/journal.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import rep_stats
+
+ENV_JOURNAL = 'SUDACO_JOURNAL'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    campaign TEXT PRIMARY KEY,
+    progress_csv TEXT NOT NULL,
+    summary_csv TEXT NOT NULL,
+    progress_headers TEXT NOT NULL,
+    summary_headers TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reps (
+    campaign TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    rep INTEGER NOT NULL,
+    success INTEGER NOT NULL,
+    time REAL,
+    cycles REAL,
+    interrupted INTEGER NOT NULL,
+    fields TEXT NOT NULL,
+    PRIMARY KEY (campaign, instance, rep)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stats (
+    campaign TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    PRIMARY KEY (campaign, instance)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS summaries (
+    campaign TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    fields TEXT NOT NULL,
+    PRIMARY KEY (campaign, instance)
+) WITHOUT ROWID;
+"""
+
+
+def _float_or_none(value):
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(v) else v
+
+
+def _truthy(value) -> bool:
+    return str(value).strip() in ('1', 'true', 'True')
+
+
+def _nan(value) -> float:
+    return math.nan if value is None else value
+
+
+def _rebuild_stats(db, campaign: str | None = None) -> None:
+    """Recompute the ``stats`` rows of ``campaign`` (default: every campaign) from its reps."""
+    where, params = ('WHERE campaign = ?', (campaign,)) if campaign is not None else ('', ())
+    db.execute(f'DELETE FROM stats {where}', params)
+    accs: dict = {}
+    for camp, inst, success, t, cyc in db.execute(
+            'SELECT campaign, instance, success, time, cycles FROM reps '
+            f'{where} {"AND" if where else "WHERE"} interrupted = 0', params):
+        accs.setdefault((camp, inst), rep_stats.RepStats()).add(bool(success), _nan(t), _nan(cyc))
+    db.executemany('INSERT INTO stats (campaign, instance, fields) VALUES (?, ?, ?)',
+                   [(camp, inst, acc.to_json()) for (camp, inst), acc in accs.items()])
+
+
+class Journal:
+    """SQLite journal file; safe across threads and processes."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self.transaction() as db:
+            new_stats = db.execute("SELECT 1 FROM sqlite_master WHERE name = 'stats'").fetchone() is None
+            for statement in _SCHEMA.split(';'):
+                if statement.strip():
+                    db.execute(statement)
+            if new_stats:
+                # journal from before the stats table: accumulate the reps it holds
+                _rebuild_stats(db)
+
+    @contextmanager
+    def transaction(self):
+        """One write transaction, exclusive across processes until it commits."""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def campaign(self, progress_file, summary_file, progress_headers, summary_headers) -> Campaign:
+        """The campaign of ``progress_file``/``summary_file``, registered (and its
+        existing CSVs imported) on first use."""
+        camp = Campaign(self, progress_file, summary_file, progress_headers, summary_headers)
+        with self.transaction() as db:
+            known = db.execute('SELECT 1 FROM campaigns WHERE campaign = ?', (camp.key,)).fetchone()
+            db.execute(
+                'INSERT INTO campaigns (campaign, progress_csv, summary_csv, progress_headers, summary_headers) '
+                'VALUES (?, ?, ?, ?, ?) ON CONFLICT (campaign) DO UPDATE SET '
+                'summary_csv = excluded.summary_csv, progress_headers = excluded.progress_headers, '
+                'summary_headers = excluded.summary_headers',
+                (camp.key, str(camp.progress_file), str(camp.summary_file),
+                 json.dumps(camp.progress_headers), json.dumps(camp.summary_headers)))
+            if known is None:
+                camp._import_csvs(db)
+        return camp
+
+    def campaigns(self) -> list[Campaign]:
+        return [Campaign(self, p, s, json.loads(ph), json.loads(sh)) for p, s, ph, sh in self.query(
+            'SELECT progress_csv, summary_csv, progress_headers, summary_headers FROM campaigns '
+            'ORDER BY campaign')]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class Campaign:
+    """Reps and summary rows of one (progress CSV, summary CSV) pair. Rows are
+    lists in ``progress_headers`` / ``summary_headers`` order, as in the CSVs."""
+
+    def __init__(self, journal: Journal, progress_file, summary_file, progress_headers, summary_headers):
+        self.journal = journal
+        self.progress_file = Path(progress_file).resolve()
+        self.summary_file = Path(summary_file).resolve()
+        self.key = str(self.progress_file)
+        self.progress_headers = list(progress_headers)
+        self.summary_headers = list(summary_headers)
+
+    def _rep_values(self, row) -> tuple:
+        rec = dict(zip(self.progress_headers, row))
+        return (self.key, str(rec['instance']), int(rec['rep']), 1 if _truthy(rec.get('success')) else 0,
+                _float_or_none(rec.get('time')), _float_or_none(rec.get('cycles')),
+                1 if _truthy(rec.get('interrupted', '')) else 0,
+                json.dumps(['' if v is None else v for v in row]))
+
+    def _insert_rep(self, db, row, stats: bool = True) -> None:
+        # a rep result replaces an interrupted row of that rep, never a finished one
+        values = self._rep_values(row)
+        cur = db.execute(
+            'INSERT INTO reps (campaign, instance, rep, success, time, cycles, interrupted, fields) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (campaign, instance, rep) DO UPDATE SET '
+            'success = excluded.success, time = excluded.time, cycles = excluded.cycles, '
+            'interrupted = excluded.interrupted, fields = excluded.fields WHERE reps.interrupted = 1',
+            values)
+        _key, instance, _rep, success, t, cyc, interrupted, _fields = values
+        if not stats or cur.rowcount <= 0 or interrupted:
+            return
+        # interrupted reps are not in the stats, so a finished rep is counted exactly once
+        acc = self._stats(db, instance)
+        acc.add(bool(success), _nan(t), _nan(cyc))
+        db.execute('INSERT INTO stats (campaign, instance, fields) VALUES (?, ?, ?) '
+                   'ON CONFLICT (campaign, instance) DO UPDATE SET fields = excluded.fields',
+                   (self.key, instance, acc.to_json()))
+
+    def _stats(self, db, instance: str) -> rep_stats.RepStats:
+        row = db.execute('SELECT fields FROM stats WHERE campaign = ? AND instance = ?',
+                         (self.key, instance)).fetchone()
+        return rep_stats.RepStats.from_json(row[0]) if row else rep_stats.RepStats()
+
+    def _insert_summary(self, db, instance: str, row) -> bool:
+        cur = db.execute(
+            'INSERT OR IGNORE INTO summaries (campaign, instance, seq, fields) VALUES '
+            '(?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM summaries WHERE campaign = ?), ?)',
+            (self.key, instance, self.key, json.dumps(['' if v is None else v for v in row])))
+        return cur.rowcount > 0
+
+    def _import_csvs(self, db) -> None:
+        for path, headers, is_progress in ((self.progress_file, self.progress_headers, True),
+                                           (self.summary_file, self.summary_headers, False)):
+            if not path.exists():
+                continue
+            with open(path, 'r', newline='') as f:
+                for rec in csv.DictReader(f):
+                    if not rec.get('instance'):
+                        continue
+                    row = [rec.get(h) or '' for h in headers]
+                    try:
+                        if is_progress:
+                            self._insert_rep(db, row, stats=False)
+                        else:
+                            self._insert_summary(db, rec['instance'], row)
+                    except ValueError:
+                        continue  # malformed row (e.g. a torn last line)
+        _rebuild_stats(db, self.key)
+
+    def record_rep(self, row) -> bool:
+        """Journal one rep (a progress CSV row)."""
+        with self.journal.transaction() as db:
+            self._insert_rep(db, row)
+        return True
+
+    def rep_map(self, instance: str, keep_interrupted: bool = False) -> dict:
+        """{rep: (success, time, cycles)} of ``instance``; interrupted reps are left
+        out (they run again) unless ``keep_interrupted``."""
+        return {rep: (bool(success), _nan(t), _nan(cyc)) for rep, success, t, cyc in self.journal.query(
+            'SELECT rep, success, time, cycles FROM reps WHERE campaign = ? AND instance = ? '
+            'AND (interrupted = 0 OR ?)', (self.key, instance, 1 if keep_interrupted else 0))}
+
+    def stats(self, instance: str) -> rep_stats.RepStats:
+        """``rep_stats.RepStats`` of ``instance``'s finished (not interrupted) reps,
+        without reading them."""
+        with self.journal._lock:
+            return self._stats(self.journal._conn, instance)
+
+    def progress(self, keep_interrupted: bool = False) -> dict:
+        """instance -> ``rep_map(instance)`` for every instance with reps."""
+        prog: dict = {}
+        for inst, rep, success, t, cyc in self.journal.query(
+                'SELECT instance, rep, success, time, cycles FROM reps WHERE campaign = ? '
+                'AND (interrupted = 0 OR ?)', (self.key, 1 if keep_interrupted else 0)):
+            prog.setdefault(inst, {})[rep] = (bool(success), _nan(t), _nan(cyc))
+        return prog
+
+    def completed(self) -> set:
+        """Instances with a summary row."""
+        return {inst for (inst,) in self.journal.query(
+            'SELECT instance FROM summaries WHERE campaign = ?', (self.key,))}
+
+    def finalize(self, instance: str, row) -> bool:
+        """Write ``instance``'s summary row unless it has one; the journal insert and
+        the summary CSV append are one transaction. True once the row exists."""
+        with self.journal.transaction() as db:
+            if self._insert_summary(db, instance, row):
+                new_file = not self.summary_file.exists() or self.summary_file.stat().st_size == 0
+                with open(self.summary_file, 'a', newline='') as f:
+                    w = csv.writer(f)
+                    if new_file:
+                        w.writerow(self.summary_headers)
+                    w.writerow(row)
+        return True
+
+    def finish(self, instance_names) -> bool:
+        """End of a run: when every one of ``instance_names`` has a summary row, drop
+        the campaign's reps and its progress CSV (True); else export the progress CSV."""
+        names = set(instance_names)
+        if names and names <= self.completed():
+            with self.journal.transaction() as db:
+                db.execute('DELETE FROM reps WHERE campaign = ?', (self.key,))
+                db.execute('DELETE FROM stats WHERE campaign = ?', (self.key,))
+            if self.progress_file.exists():
+                self.progress_file.unlink()
+            return True
+        self.export_progress()
+        return False
+
+    def _write_csv(self, path: Path, headers, rows) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(tmp, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(headers)
+            w.writerows(rows)
+        os.replace(tmp, path)
+
+    def export_progress(self) -> Path | None:
+        """Write the progress CSV from the journal (nothing when it has no reps)."""
+        rows = self.journal.query(
+            'SELECT fields FROM reps WHERE campaign = ? ORDER BY instance, rep', (self.key,))
+        if not rows:
+            return None
+        self._write_csv(self.progress_file, self.progress_headers, (json.loads(r) for (r,) in rows))
+        return self.progress_file
+
+    def export_summary(self, order=None) -> Path | None:
+        """Rewrite the summary CSV from the journal, in ``order`` of instance names
+        when given (others after), else in completion order."""
+        rows = self.journal.query(
+            'SELECT instance, fields FROM summaries WHERE campaign = ? ORDER BY seq', (self.key,))
+        if not rows:
+            return None
+        rank = {name: i for i, name in enumerate(order or ())}
+        rows.sort(key=lambda r: rank.get(r[0], len(rank)))
+        self._write_csv(self.summary_file, self.summary_headers, (json.loads(f) for _inst, f in rows))
+        return self.summary_file
+
+
+_active: Journal | None = None
+_active_lock = threading.Lock()
+_campaigns: dict[str, Campaign] = {}
+
+
+def enable(path) -> Journal:
+    """Turn the journal on for this process and, through the environment, for the
+    runners it starts."""
+    os.environ[ENV_JOURNAL] = str(Path(path).resolve())
+    return active()
+
+
+def active() -> Journal | None:
+    """The journal configured by the environment, or None when it is off."""
+    global _active
+    path = os.environ.get(ENV_JOURNAL)
+    if not path:
+        return None
+    with _active_lock:
+        if _active is None or _active.path != Path(path):
+            _active = Journal(path)
+            _campaigns.clear()
+        return _active
+
+
+def open_campaign(progress_file, summary_file, progress_headers, summary_headers) -> Campaign | None:
+    """Register the campaign of a progress/summary CSV pair with the active journal
+    (None when it is off); ``campaign()`` of either path returns it afterwards."""
+    journal = active()
+    if journal is None:
+        return None
+    camp = journal.campaign(progress_file, summary_file, progress_headers, summary_headers)
+    _campaigns[str(camp.progress_file)] = _campaigns[str(camp.summary_file)] = camp
+    return camp
+
+
+def campaign(path) -> Campaign | None:
+    """The open campaign whose progress or summary CSV is ``path``, if any."""
+    if not _campaigns:
+        return None
+    return _campaigns.get(str(Path(path).resolve()))
+
+
+def add_cli_options(ap) -> None:
+    ap.add_argument('--journal', default=None, metavar='PATH',
+                    help=f'Keep rep progress and summary rows in the SQLite journal PATH (also ${ENV_JOURNAL}) '
+                         'instead of locked progress CSVs; the CSVs are written as exports')
+
+
+def enable_from_args(args) -> Journal | None:
+    if getattr(args, 'journal', None):
+        return enable(args.journal)
+    return active()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Export or inspect a benchmark job journal.')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('export', help='Write the summary CSV and (if incomplete) the progress CSV of every campaign')
+    p.add_argument('journal')
+    p = sub.add_parser('status', help='Reps and summary rows per campaign')
+    p.add_argument('journal')
+    args = ap.parse_args(argv)
+
+    if not Path(args.journal).exists():
+        print(f'ERROR: journal not found: {args.journal}', file=sys.stderr)
+        return 1
+    journal = Journal(args.journal)
+    for camp in journal.campaigns():
+        if args.cmd == 'export':
+            written = [p for p in (camp.export_summary(), camp.export_progress()) if p is not None]
+            print('\n'.join(str(p) for p in written) or f'{camp.key}: empty')
+        else:
+            (n_reps,), = journal.query('SELECT COUNT(*) FROM reps WHERE campaign = ?', (camp.key,))
+            print(f'{camp.key}: {n_reps} rep(s) in progress, {len(camp.completed())} instance(s) summarized')
+    journal.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+"""
+Solver runs on other machines: one coordinator holding the job queue, N worker
+agents pulling jobs from it (``--distributed``).
+
+The coordinator is the launcher itself. ``bench_pool_jobs`` (``run_9x9.py
+--pool-workers``), ``bench_global_pool`` and the parallel
+``run_algo_timeout_comparison`` grid use a ``Coordinator`` in place of their
+local solver pool. ``run_ablation_parallel`` hosts one for its ``run_ablation``
+children, whose solver runs go through it via ``$SUDACO_COORDINATOR``. Results
+come back to the launcher, which stays the only CSV writer. Agents run where the
+repository is checked out and built:
+
+    # on each lab machine (16 solver processes each)
+    python scripts/job_queue.py worker --connect tcp://coordinator-host:7777 --workers 16
+    # on the coordinator
+    python scripts/run_9x9.py --alg 2 --pool-workers 16 --distributed tcp://0.0.0.0:7777
+    python scripts/run_ablation_parallel.py --distributed tcp://0.0.0.0:7777
+
+Transports: ``tcp://HOST:PORT`` (JSON lines; the coordinator listens, agents
+connect and reconnect), or ``sqlite:PATH`` for single-host testing (every process
+opens the same WAL-mode SQLite file; no server).
+
+A job is leased to one agent for ``LEASE_SECONDS`` and the agent's heartbeats
+extend its leases. A lease that expires (agent died, machine unplugged) goes back
+to the queue, and a result delivered for a lease that was already requeued is
+ignored. Each lease change is one SQLite transaction, so two agents never run
+the same lease. An agent stopped by SIGTERM/SIGINT hands its running jobs back;
+they run again elsewhere. The coordinator's concurrency follows the solver
+processes of the agents with a live heartbeat. The puzzle text travels with the
+job; the solver binary is each agent's own build, so build the same commit
+everywhere.
+
+Every request to a ``tcp://`` coordinator carries ``$SUDACO_QUEUE_TOKEN``, and
+the coordinator drops connections whose token does not match its own. Without a
+token the coordinator only listens on loopback, so set the same token on the
+coordinator and on every agent to accept agents from other machines.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+ENV_COORDINATOR = 'SUDACO_COORDINATOR'
+ENV_TOKEN = 'SUDACO_QUEUE_TOKEN'
+
+LEASE_SECONDS = 60.0
+HEARTBEAT_SECONDS = 10.0
+# Result polling of the coordinator / of sqlite clients (seconds).
+POLL_SECONDS = 0.2
+# An idle agent's lease request waits this long for new jobs.
+LEASE_WAIT = 5.0
+RECONNECT_SECONDS = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    token INTEGER NOT NULL DEFAULT 0,
+    expires REAL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+CREATE TABLE IF NOT EXISTS workers (
+    name TEXT PRIMARY KEY,
+    slots INTEGER NOT NULL,
+    seen REAL NOT NULL
+);
+"""
+
+
+def parse_url(url: str) -> tuple:
+    """``('tcp', host, port)`` or ``('sqlite', path)``."""
+    if url.startswith('tcp://'):
+        host, _, port = url[len('tcp://'):].rpartition(':')
+        if not host or not port.isdigit():
+            raise ValueError(f'expected tcp://HOST:PORT, got {url!r}')
+        return 'tcp', host.strip('[]'), int(port)
+    if url.startswith('sqlite:'):
+        return 'sqlite', url[len('sqlite:'):]
+    raise ValueError(f'unknown queue URL {url!r} (tcp://HOST:PORT or sqlite:PATH)')
+
+
+def queue_token() -> str | None:
+    """The shared secret of ``tcp://`` coordinators and their agents (``$SUDACO_QUEUE_TOKEN``)."""
+    return os.environ.get(ENV_TOKEN) or None
+
+
+def _is_loopback(host: str) -> bool:
+    return host == 'localhost' or host.startswith('127.') or host == '::1'
+
+
+def local_url(url: str) -> str:
+    """The URL a process on the coordinator's host connects to (wildcard binds become loopback)."""
+    kind, *addr = parse_url(url)
+    if kind == 'tcp' and addr[0] in ('0.0.0.0', '::', '*'):
+        return f'tcp://127.0.0.1:{addr[1]}'
+    return url
+
+
+class JobStore:
+    """The queue: jobs with leases, workers with heartbeats, in one SQLite database."""
+
+    def __init__(self, path=':memory:'):
+        self.path = str(path)
+        self.db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        if self.path != ':memory:':
+            self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA)
+
+    @contextmanager
+    def _tx(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        self.db.execute('COMMIT')
+
+    def close(self) -> None:
+        self.db.close()
+
+    def reset(self) -> None:
+        """Drop the jobs of an earlier coordinator session."""
+        with self._tx():
+            self.db.execute('DELETE FROM jobs')
+
+    def submit(self, payload: dict) -> int:
+        with self._tx():
+            return self.db.execute('INSERT INTO jobs (payload) VALUES (?)', (json.dumps(payload),)).lastrowid
+
+    def requeue_expired(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        with self._tx():
+            return self.db.execute(
+                "UPDATE jobs SET state = 'queued', worker = NULL WHERE state = 'leased' AND expires < ?",
+                (now,)).rowcount
+
+    def lease(self, worker: str, n: int) -> list[dict]:
+        """Lease up to ``n`` queued jobs to ``worker``: ``[{id, token, job}]``."""
+        now = time.time()
+        leases = []
+        with self._tx():
+            self.db.execute(
+                "UPDATE jobs SET state = 'queued', worker = NULL WHERE state = 'leased' AND expires < ?", (now,))
+            rows = self.db.execute(
+                "SELECT id, token, payload FROM jobs WHERE state = 'queued' ORDER BY id LIMIT ?",
+                (max(0, int(n)),)).fetchall()
+            for job_id, token, payload in rows:
+                self.db.execute(
+                    "UPDATE jobs SET state = 'leased', worker = ?, token = ?, expires = ? WHERE id = ?",
+                    (worker, token + 1, now + LEASE_SECONDS, job_id))
+                leases.append({'id': job_id, 'token': token + 1, 'job': json.loads(payload)})
+        return leases
+
+    def heartbeat(self, worker: str, slots: int, leases=()) -> list[int]:
+        """Record a live ``worker`` with ``slots`` solver processes and extend its
+        ``(id, token)`` leases; return the ids it no longer holds."""
+        now = time.time()
+        revoked = []
+        with self._tx():
+            self.db.execute('INSERT OR REPLACE INTO workers (name, slots, seen) VALUES (?, ?, ?)',
+                            (worker, int(slots), now))
+            for job_id, token in leases:
+                n = self.db.execute(
+                    "UPDATE jobs SET expires = ? WHERE id = ? AND token = ? AND worker = ? AND state = 'leased'",
+                    (now + LEASE_SECONDS, job_id, token, worker)).rowcount
+                if not n:
+                    revoked.append(job_id)
+        return revoked
+
+    def complete(self, job_id: int, token: int, result: dict) -> bool:
+        """Store the result of a lease; False when the lease is no longer held."""
+        with self._tx():
+            return self.db.execute(
+                "UPDATE jobs SET state = 'done', result = ? WHERE id = ? AND token = ? AND state = 'leased'",
+                (json.dumps(result), job_id, token)).rowcount > 0
+
+    def release(self, job_id: int, token: int) -> bool:
+        """Hand a leased job back to the queue unfinished."""
+        with self._tx():
+            return self.db.execute(
+                "UPDATE jobs SET state = 'queued', worker = NULL WHERE id = ? AND token = ? AND state = 'leased'",
+                (job_id, token)).rowcount > 0
+
+    def take_results(self, ids) -> list[tuple[int, dict]]:
+        """Results of the finished jobs among ``ids``, each handed out once."""
+        ids = list(ids)
+        out = []
+        with self._tx():
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                marks = ','.join('?' * len(chunk))
+                out += self.db.execute(
+                    f"SELECT id, result FROM jobs WHERE state = 'done' AND id IN ({marks})", chunk).fetchall()
+            self.db.executemany("UPDATE jobs SET state = 'collected' WHERE id = ?", [(job_id,) for job_id, _ in out])
+        return [(job_id, json.loads(result)) for job_id, result in out]
+
+    def cancel(self, ids=None) -> None:
+        """Withdraw queued and leased jobs (all, or ``ids``); agents drop them on their next heartbeat."""
+        with self._tx():
+            if ids is None:
+                self.db.execute("UPDATE jobs SET state = 'cancelled' WHERE state IN ('queued', 'leased')")
+            else:
+                self.db.executemany(
+                    "UPDATE jobs SET state = 'cancelled' WHERE id = ? AND state IN ('queued', 'leased')",
+                    [(job_id,) for job_id in ids])
+
+    def capacity(self) -> int:
+        """Solver processes of the agents with a heartbeat within one lease period."""
+        row = self.db.execute('SELECT COALESCE(SUM(slots), 0) FROM workers WHERE seen > ?',
+                              (time.time() - LEASE_SECONDS,)).fetchone()
+        return int(row[0])
+
+
+def job_payload(file_path, alg, timeout, extra_args, seed, hard_timeout) -> dict:
+    """One solver run as sent to an agent (the puzzle text travels with it)."""
+    file_path = Path(file_path)
+    return {
+        'instance': file_path.name,
+        'puzzle': file_path.read_text(),
+        'alg': alg,
+        'timeout': timeout,
+        'extra_args': [str(a) for a in extra_args or ()],
+        'seed': seed,
+        'hard_timeout': hard_timeout,
+    }
+
+
+def _result_tuple(result: dict):
+    if 'error' in result:
+        raise RuntimeError(f"agent {result.get('worker')}: {result['error']}")
+    return result['out'], result['returncode'], result['killed_after']
+
+
+class _AgentCapacity:
+    """``CapacityControl`` stand-in: the solver processes of the live agents."""
+
+    def __init__(self, store: JobStore):
+        self.store = store
+        self._seen = None
+
+    def poll(self) -> int | None:
+        n = self.store.capacity()
+        if n <= 0 or n == self._seen:
+            return None
+        self._seen = n
+        return n
+
+
+class Coordinator:
+    """
+    The job queue and result ingestion, used by a launcher as its solver pool:
+    ``await coordinator.run_solver(...)`` returns the same tuple as
+    ``AsyncSolverWorkerPool.run_solver`` once an agent has run the job. Use as
+    ``async with``; with a ``tcp://`` URL it listens for agents (and ``solve``
+    requests of child runners) while open.
+    """
+
+    def __init__(self, url: str, binary=None, size: int = 1):
+        from bench_utils import SolverInterruptedError
+        self._interrupted = SolverInterruptedError
+        self.url = url
+        self.binary = str(binary)
+        self.size = max(1, int(size))
+        kind, *addr = parse_url(url)
+        self._addr = addr if kind == 'tcp' else None
+        self.store = JobStore(':memory:' if kind == 'tcp' else addr[0])
+        self.store.reset()
+        self._waiting: dict[int, asyncio.Future] = {}
+        self._submitted = None
+        self._stopping = False
+        self._server = None
+        self._ingester = None
+        self._clients: dict = {}
+        self._token = queue_token()
+
+    def capacity_control(self) -> _AgentCapacity:
+        return _AgentCapacity(self.store)
+
+    def resize(self, size) -> None:
+        # capacity follows the agents; nothing to start or stop here
+        self.size = max(1, int(size))
+
+    async def solve(self, payload: dict) -> tuple:
+        """Queue one job and wait for an agent's ``(out, returncode, killed_after)``."""
+        if self._stopping:
+            raise self._interrupted(f"Coordinator stopped before solving {payload['instance']}.")
+        job_id = self.store.submit(payload)
+        fut = asyncio.get_running_loop().create_future()
+        self._waiting[job_id] = fut
+        self._submitted.set()
+        self._submitted = asyncio.Event()
+        try:
+            return _result_tuple(await fut)
+        except asyncio.CancelledError:
+            self.store.cancel([job_id])
+            raise
+        finally:
+            self._waiting.pop(job_id, None)
+
+    async def run_solver(self, file_path, alg, timeout, extra_args=None, seed=None, campaign=None,
+                         hard_timeout=None):
+        import rep_store
+        from bench_utils import _cache_config, _cached_result, _result_from_output, hard_timeout_for
+        limit = hard_timeout_for(timeout) if hard_timeout is None else hard_timeout
+        cache, config = _cache_config(self.binary, file_path, alg, timeout, extra_args)
+        result = _cached_result(cache, config, seed)
+        if result is None:
+            out, returncode, killed_after = await self.solve(
+                job_payload(file_path, alg, timeout, extra_args, seed, limit))
+            result = _result_from_output(cache, config, campaign, out, file_path, returncode, killed_after)
+        return rep_store.keep(result, file_path, alg, timeout, extra_args, seed, campaign)
+
+    def interrupt(self, sig=None) -> None:
+        """Withdraw every waiting job: they raise ``SolverInterruptedError`` and
+        are not recorded; agents finish or drop their copies, results unused."""
+        self._stopping = True
+        self.store.cancel(list(self._waiting))
+        for job_id, fut in list(self._waiting.items()):
+            if not fut.done():
+                fut.set_exception(self._interrupted(f'Coordinator stopped while job {job_id} was queued.'))
+
+    def _ingest(self) -> None:
+        if not self._waiting:
+            return
+        for job_id, result in self.store.take_results(list(self._waiting)):
+            fut = self._waiting.get(job_id)
+            if fut is not None and not fut.done():
+                fut.set_result(result)
+
+    async def _ingest_loop(self) -> None:
+        while True:
+            await asyncio.sleep(POLL_SECONDS)
+            self.store.requeue_expired()
+            self._ingest()
+
+    async def _lease(self, msg: dict) -> list[dict]:
+        deadline = time.monotonic() + min(float(msg.get('wait') or 0.0), LEASE_WAIT)
+        while True:
+            submitted = self._submitted
+            leases = self.store.lease(msg['worker'], msg['n'])
+            remaining = deadline - time.monotonic()
+            if leases or remaining <= 0 or self._stopping:
+                return leases
+            try:
+                await asyncio.wait_for(submitted.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _solve_for_client(self, msg: dict, reader) -> dict:
+        """``solve`` request of a child runner; withdrawn if it disconnects first."""
+        task = asyncio.ensure_future(self.solve(msg['job']))
+        gone = asyncio.ensure_future(reader.read())
+        done, _ = await asyncio.wait({task, gone}, return_when=asyncio.FIRST_COMPLETED)
+        if task not in done:
+            task.cancel()  # withdraws the job
+            return {}
+        gone.cancel()
+        await asyncio.gather(gone, return_exceptions=True)
+        try:
+            out, returncode, killed_after = task.result()
+        except self._interrupted as e:
+            return {'interrupted': str(e)}
+        except Exception as e:  # noqa: BLE001 - reported to the child
+            return {'error': str(e)}
+        return {'result': {'out': out, 'returncode': returncode, 'killed_after': killed_after}}
+
+    async def _dispatch(self, msg: dict, reader) -> dict:
+        op = msg.get('op')
+        if op == 'lease':
+            self.store.heartbeat(msg['worker'], msg.get('slots', msg['n']))
+            return {'leases': await self._lease(msg)}
+        if op == 'heartbeat':
+            return {'revoked': self.store.heartbeat(msg['worker'], msg['slots'], msg.get('leases', ()))}
+        if op == 'complete':
+            ok = self.store.complete(msg['id'], msg['token'], msg['result'])
+            self._ingest()
+            return {'ok': ok}
+        if op == 'release':
+            return {'ok': self.store.release(msg['id'], msg['token'])}
+        if op == 'solve':
+            return await self._solve_for_client(msg, reader)
+        return {'error': f'unknown op {op!r}'}
+
+    def _authorized(self, msg: dict) -> bool:
+        if self._token is None:
+            return True
+        auth = msg.get('auth')
+        return isinstance(auth, str) and hmac.compare_digest(auth.encode(), self._token.encode())
+
+    async def _handle(self, reader, writer) -> None:
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while not self._stopping and (line := await reader.readline()):
+                msg = json.loads(line)
+                if not self._authorized(msg):
+                    writer.write((json.dumps({'error': f'unauthorized (check ${ENV_TOKEN})'}) + '\n').encode())
+                    await writer.drain()
+                    break
+                resp = await self._dispatch(msg, reader)
+                writer.write((json.dumps(resp) + '\n').encode())
+                await writer.drain()
+                if msg.get('op') == 'solve':
+                    break  # one job per child connection
+        except (ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            self._clients.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def __aenter__(self):
+        self._submitted = asyncio.Event()
+        self._ingester = asyncio.ensure_future(self._ingest_loop())
+        if self._addr is not None:
+            host, port = self._addr
+            if self._token is None and not _is_loopback(host):
+                print(f'Coordinator: ${ENV_TOKEN} is not set; listening on loopback only '
+                      f'(agents on other machines need the same token)', flush=True)
+                host = '127.0.0.1'
+            self._server = await asyncio.start_server(self._handle, host, port, limit=2**24)
+            print(f'Coordinator listening on tcp://{host}:{port}', flush=True)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._server is not None:
+            self._server.close()
+            self._stopping = True
+            self._submitted.set()  # waiting lease requests return empty
+            for writer in list(self._clients.values()):
+                writer.close()  # idle connections see EOF
+            await asyncio.gather(*self._clients, return_exceptions=True)
+        self._ingester.cancel()
+        self.store.cancel()
+        self.store.close()
+
+
+def open_pool(args, binary, size):
+    """The launcher's solver pool: a ``Coordinator`` with ``--distributed``, else
+    an ``AsyncSolverWorkerPool`` of ``size`` local solver processes."""
+    if getattr(args, 'distributed', None):
+        return Coordinator(args.distributed, binary, size)
+    from bench_utils import AsyncSolverWorkerPool
+    return AsyncSolverWorkerPool(binary, size)
+
+
+def pool_control(solvers, args):
+    """Capacity control of a pool from ``open_pool``: the live agents' solver
+    processes when distributed, else ``--control-file``."""
+    if isinstance(solvers, Coordinator):
+        return solvers.capacity_control()
+    from campaign_scheduler import control_from_args
+    return control_from_args(args)
+
+
+def add_cli_options(ap) -> None:
+    ap.add_argument('--distributed', default=None, metavar='URL',
+                    help='Run solves on worker agents (scripts/job_queue.py worker) instead of local '
+                         'processes; this process coordinates: tcp://HOST:PORT to listen on, or '
+                         'sqlite:PATH for agents on this host')
+
+
+# --- child runners (run_ablation under run_ablation_parallel --distributed) ---
+
+def active_url() -> str | None:
+    return os.environ.get(ENV_COORDINATOR) or None
+
+
+def coordinator_env(url: str) -> dict:
+    """Environment for child runners whose solver runs go through the coordinator at ``url``."""
+    env = os.environ.copy()
+    env[ENV_COORDINATOR] = local_url(url)
+    return env
+
+
+_stores: dict[str, JobStore] = {}
+
+
+def solve_remote(url: str, payload: dict) -> tuple:
+    """Blocking ``(out, returncode, killed_after)`` of one job run through the
+    coordinator at ``url``; ``SolverInterruptedError`` when it was withdrawn."""
+    from bench_utils import SolverInterruptedError
+    kind, *addr = parse_url(url)
+    if kind == 'sqlite':
+        store = _stores.get(addr[0])
+        if store is None:
+            store = _stores[addr[0]] = JobStore(addr[0])
+        job_id = store.submit(payload)
+        while True:
+            results = store.take_results([job_id])
+            if results:
+                return _result_tuple(results[0][1])
+            time.sleep(POLL_SECONDS)
+    with socket.create_connection(tuple(addr)) as sock, sock.makefile('rwb') as f:
+        f.write((json.dumps({'op': 'solve', 'job': payload, 'auth': queue_token()}) + '\n').encode())
+        f.flush()
+        resp = json.loads(f.readline() or b'{}')
+    if 'result' in resp:
+        return _result_tuple(resp['result'])
+    if 'error' in resp:
+        raise RuntimeError(f"coordinator: {resp['error']}")
+    raise SolverInterruptedError(resp.get('interrupted') or f"Coordinator at {url} withdrew {payload['instance']}.")
+
+
+# --- worker agent ---
+
+class _SqliteClient:
+    def __init__(self, path: str):
+        self.store = JobStore(path)
+
+    async def lease(self, worker, slots, n, wait):
+        deadline = time.monotonic() + wait
+        while True:
+            self.store.heartbeat(worker, slots)
+            leases = self.store.lease(worker, n)
+            if leases or time.monotonic() >= deadline:
+                return leases
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def heartbeat(self, worker, slots, leases):
+        return self.store.heartbeat(worker, slots, leases)
+
+    async def complete(self, job_id, token, result):
+        return self.store.complete(job_id, token, result)
+
+    async def release(self, job_id, token):
+        return self.store.release(job_id, token)
+
+    async def close(self):
+        self.store.close()
+
+
+class _TcpClient:
+    """Requests over a small pool of connections, so a waiting lease request
+    never holds up a result."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self._idle = []
+        self._token = queue_token()
+
+    async def _call(self, msg: dict) -> dict:
+        msg = dict(msg, auth=self._token)
+        conn = self._idle.pop() if self._idle else await asyncio.open_connection(self.host, self.port, limit=2**24)
+        reader, writer = conn
+        try:
+            writer.write((json.dumps(msg) + '\n').encode())
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('coordinator closed the connection')
+        except BaseException:
+            writer.close()
+            raise
+        resp = json.loads(line)
+        if 'error' in resp:
+            writer.close()
+            raise ConnectionError(f"coordinator: {resp['error']}")
+        self._idle.append(conn)
+        return resp
+
+    async def lease(self, worker, slots, n, wait):
+        return (await self._call({'op': 'lease', 'worker': worker, 'slots': slots, 'n': n, 'wait': wait}))['leases']
+
+    async def heartbeat(self, worker, slots, leases):
+        return (await self._call({'op': 'heartbeat', 'worker': worker, 'slots': slots,
+                                  'leases': [list(x) for x in leases]}))['revoked']
+
+    async def complete(self, job_id, token, result):
+        return (await self._call({'op': 'complete', 'id': job_id, 'token': token, 'result': result}))['ok']
+
+    async def release(self, job_id, token):
+        return (await self._call({'op': 'release', 'id': job_id, 'token': token}))['ok']
+
+    async def close(self):
+        for _reader, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+
+def connect(url: str):
+    kind, *addr = parse_url(url)
+    return _SqliteClient(addr[0]) if kind == 'sqlite' else _TcpClient(*addr)
+
+
+def _instance_file(root: Path, job: dict) -> Path:
+    """The job's puzzle as a local file (one per distinct puzzle text). Only the
+    base name of the job's ``instance`` is used, so the file stays under ``root``."""
+    name = Path(str(job['instance'])).name
+    if name in ('', '.', '..'):
+        raise ValueError(f"invalid instance name {job['instance']!r}")
+    digest = hashlib.sha1(job['puzzle'].encode()).hexdigest()[:16]
+    path = root / digest / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(job['puzzle'])
+        os.replace(tmp, path)
+    return path
+
+
+async def run_agent(url: str, binary, workers: int, name: str | None = None) -> None:
+    """Lease jobs from the coordinator at ``url`` and run them on ``workers``
+    persistent solver processes until SIGTERM/SIGINT."""
+    from bench_utils import (
+        AsyncSolverWorkerPool, SolverInterruptedError, _solver_job_args, install_stop_handlers)
+    name = name or f'{socket.gethostname()}-{os.getpid()}'
+    workers = max(1, int(workers))
+    client = connect(url)
+    held: dict[int, int] = {}
+    running: set = set()
+    stop = asyncio.Event()
+    inst_root = Path(tempfile.mkdtemp(prefix='sudaco-agent-'))
+
+    async def report(call, *a):
+        try:
+            await call(*a)
+        except (OSError, ConnectionError) as e:
+            print(f'[{name}] could not reach the coordinator ({e}); its lease will expire', flush=True)
+
+    async with AsyncSolverWorkerPool(binary, workers) as pool:
+        def on_stop(_signum):
+            print(f'[{name}] stopping: running jobs go back to the queue', flush=True)
+            stop.set()
+            pool.interrupt()
+
+        async def run_one(lease):
+            job_id, token, job = lease['id'], lease['token'], lease['job']
+            try:
+                path = _instance_file(inst_root, job)
+                out, returncode, killed_after = await pool.run_job(
+                    _solver_job_args(path, job['alg'], job['timeout'], job['extra_args'], seed=job['seed']),
+                    job['hard_timeout'])
+                result = {'out': out, 'returncode': returncode, 'killed_after': killed_after, 'worker': name}
+            except SolverInterruptedError:
+                result = None
+            except Exception as e:  # noqa: BLE001 - reported to the coordinator
+                result = {'error': f'{type(e).__name__}: {e}', 'worker': name}
+            try:
+                if held.get(job_id) != token:
+                    return  # revoked meanwhile
+                if result is None or stop.is_set():
+                    await report(client.release, job_id, token)
+                else:
+                    await report(client.complete, job_id, token, result)
+            finally:
+                held.pop(job_id, None)
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(HEARTBEAT_SECONDS)
+                try:
+                    for job_id in await client.heartbeat(name, workers, list(held.items())):
+                        held.pop(job_id, None)
+                except (OSError, ConnectionError):
+                    pass
+
+        install_stop_handlers(on_stop)
+        beat = asyncio.ensure_future(heartbeat())
+        print(f'[{name}] {workers} solver process(es), queue {url}', flush=True)
+        last_error = None
+        try:
+            while not stop.is_set():
+                free = workers - len(running)
+                if free <= 0:
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                try:
+                    leases = await client.lease(name, workers, free, LEASE_WAIT)
+                except (OSError, ConnectionError) as e:
+                    if str(e) != last_error:
+                        print(f'[{name}] cannot lease jobs ({e}); retrying', flush=True)
+                        last_error = str(e)
+                    await asyncio.sleep(RECONNECT_SECONDS)
+                    continue
+                last_error = None
+                for lease in leases:
+                    if stop.is_set():
+                        await report(client.release, lease['id'], lease['token'])
+                        continue
+                    held[lease['id']] = lease['token']
+                    task = asyncio.ensure_future(run_one(lease))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+            if running:
+                await asyncio.wait(running)
+        finally:
+            beat.cancel()
+            await client.close()
+            shutil.rmtree(inst_root, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Worker agent for launchers run with --distributed.')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    w = sub.add_parser('worker', help='Run jobs from a coordinator')
+    w.add_argument('--connect', required=True, metavar='URL',
+                   help='Coordinator: tcp://HOST:PORT, or sqlite:PATH on the coordinator host')
+    w.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                   help='Solver processes on this machine (default: CPU count)')
+    w.add_argument('--binary', default=None, help='Solver binary (default: auto)')
+    w.add_argument('--name', default=None, help='Agent name (default: HOST-PID)')
+    import campaign_scheduler
+    campaign_scheduler.add_cli_options(w, priority=False)
+    args = ap.parse_args(argv)
+    campaign_scheduler.enable_from_args(args)
+    from bench_utils import default_binary
+    binary = args.binary or default_binary()
+    if not Path(binary).exists():
+        print(f'ERROR: binary not found: {binary}', file=sys.stderr)
+        return 1
+    asyncio.run(run_agent(args.connect, str(Path(binary).resolve()), args.workers, args.name))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Run a multi-stage benchmark campaign as a dependency graph.
+
+Each stage (a benchmark run, a consolidation such as
+``consolidate_ablation_summaries.py`` or ``build_ablation_results_excel.py``) is a
+``Node``: a script command plus the files it reads (``inputs``) and writes
+(``outputs``), as paths or glob patterns relative to the repository. A node
+depends on every node whose outputs match one of its inputs, on the nodes named
+in ``after``, and on earlier-declared nodes writing the same output (two writers
+of one workbook never run at once). Nodes whose dependencies are done run
+concurrently, as units of one ``campaign_scheduler.CampaignScheduler``
+(``--max-stages`` at once), and all their children share one budget of
+``--workers`` solver slots (``$SUDACO_CAMPAIGN_SLOTS``), so two benchmark stages
+running side by side split the CPUs instead of oversubscribing them.
+
+Benchmark nodes (``always``) are started every time: the runners resume from
+their own progress/summary files. Consolidation nodes are skipped while their
+inputs (content hash of every matched file, the command and the script itself)
+are unchanged since their last successful run and their outputs exist; the
+fingerprints are kept in ``results/.pipeline/<pipeline>.json``::
+
+    python scripts/pipeline.py login --dry-run
+    python scripts/pipeline.py ablation --size 9 --reps 20
+    python scripts/pipeline.py cp-comparison --run-end 3 --workers 8
+    python scripts/pipeline.py full --only timeout-excel
+
+Each node's output goes to ``logs/pipeline/<pipeline>/<node>.log``. A failed node
+blocks the nodes depending on it; the others carry on. Other stages can be
+declared the same way, e.g. ``create_comparison_excel.py`` on a combined CSV::
+
+    Node('comparison-excel', ['scripts/create_comparison_excel.py', 'results/combined.csv',
+                              '-o', 'results/comparison.xlsx'],
+         inputs=['results/combined.csv'], outputs=['results/comparison.xlsx'])
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime as _dt
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import campaign_scheduler  # noqa: E402
+from bench_utils import install_stop_handlers  # noqa: E402
+
+STATE_DIR = Path('results') / '.pipeline'
+SLOT_DIR = Path('results') / '.slots'
+LOG_DIR = Path('logs') / 'pipeline'
+
+SIZES = [('9', '9x9'), ('16', '16x16'), ('25', '25x25')]
+ABLATION_SUMMARIES = 'results/ablation/*/*_summary.csv'
+TIMEOUT_SUMMARIES = 'results/ablation/timeout/*/*_summary.csv'
+BEST_CONFIG = 'results/ablation/best_config.json'
+ABLATION_EXCEL = 'results/ablation/ablation_results.xlsx'
+
+
+class Node:
+    """One stage: ``cmd`` is a script and its arguments, run with this interpreter
+    from the repository root."""
+
+    def __init__(self, name: str, cmd: list[str], inputs=(), outputs=(), after=(),
+                 always: bool = False):
+        self.name = name
+        self.cmd = [str(c) for c in cmd]
+        self.inputs = [str(p) for p in inputs]
+        self.outputs = [str(p) for p in outputs]
+        self.after = list(after)
+        self.always = always
+
+    def __repr__(self) -> str:
+        return f'Node({self.name!r})'
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """Whether two path patterns can name the same file (``*`` stays within one
+    directory level unless the pattern uses ``**``)."""
+    if '**' in a or '**' in b:
+        return a == b or fnmatch.fnmatchcase(a, b) or fnmatch.fnmatchcase(b, a)
+    pa, pb = a.split('/'), b.split('/')
+    return len(pa) == len(pb) and all(
+        x == y or fnmatch.fnmatchcase(x, y) or fnmatch.fnmatchcase(y, x) for x, y in zip(pa, pb))
+
+
+def resolve(nodes: list[Node]) -> dict[str, list[str]]:
+    """Dependencies of each node, by name. Raises ValueError on unknown names or cycles."""
+    names = [n.name for n in nodes]
+    if len(set(names)) != len(names):
+        raise ValueError(f'duplicate node names in {names}')
+    deps: dict[str, list[str]] = {}
+    for i, node in enumerate(nodes):
+        unknown = [a for a in node.after if a not in names]
+        if unknown:
+            raise ValueError(f'{node.name}: unknown node(s) in after: {unknown}')
+        found = list(node.after)
+        for j, other in enumerate(nodes):
+            if other is node or other.name in found:
+                continue
+            reads = any(_overlaps(i_, o) for i_ in node.inputs for o in other.outputs)
+            same_output = j < i and any(_overlaps(o, p) for o in node.outputs for p in other.outputs)
+            if reads or same_output:
+                found.append(other.name)
+        deps[node.name] = found
+
+    state = dict.fromkeys(names, 0)  # 0 new, 1 on stack, 2 done
+
+    def visit(name, path):
+        if state[name] == 1:
+            raise ValueError('dependency cycle: ' + ' -> '.join(path[path.index(name):] + [name]))
+        if state[name] == 0:
+            state[name] = 1
+            for d in deps[name]:
+                visit(d, path + [name])
+            state[name] = 2
+    for name in names:
+        visit(name, [])
+    return deps
+
+
+def _expand(patterns) -> list[str]:
+    """Existing files matched by ``patterns``, sorted (relative to the repository
+    where they are inside it)."""
+    found = set()
+    for pattern in patterns:
+        for p in glob.glob(str(REPO_ROOT / pattern), recursive=True):
+            if os.path.isfile(p):
+                try:
+                    found.add(Path(p).relative_to(REPO_ROOT).as_posix())
+                except ValueError:
+                    found.add(Path(p).as_posix())
+    return sorted(found)
+
+
+class State:
+    """Fingerprints of the last successful run of each node, plus file digests
+    (reused while a file's size and mtime are unchanged)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.nodes: dict = {}
+        self.files: dict = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.nodes = data.get('nodes', {})
+            self.files = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    def digest(self, rel: str) -> str:
+        st = os.stat(REPO_ROOT / rel)
+        cached = self.files.get(rel)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha1()
+        with open(REPO_ROOT / rel, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        self.files[rel] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def fingerprint(self, node: Node) -> str:
+        h = hashlib.sha1(json.dumps(node.cmd).encode())
+        scripts = [c for c in node.cmd if c.endswith('.py') and (REPO_ROOT / c).is_file()]
+        for rel in sorted(set(_expand(node.inputs)) | set(scripts)):
+            h.update(f'\0{rel}\0{self.digest(rel)}'.encode())
+        return h.hexdigest()
+
+    def record(self, node: Node, fingerprint: str) -> None:
+        self.nodes[node.name] = {
+            'fingerprint': fingerprint,
+            'finished': _dt.datetime.now().isoformat(timespec='seconds'),
+        }
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'nodes': self.nodes, 'files': self.files}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+class Pipeline:
+    def __init__(self, name: str, nodes: list[Node]):
+        self.name = name
+        self.nodes = {n.name: n for n in nodes}
+        self.deps = resolve(nodes)
+        self.state = State(REPO_ROOT / STATE_DIR / f'{name}.json')
+
+    def select(self, only) -> list[str]:
+        """Node names to run: ``only`` and everything they depend on (default: all)."""
+        if not only:
+            return list(self.nodes)
+        unknown = [n for n in only if n not in self.nodes]
+        if unknown:
+            raise ValueError(f'unknown node(s) {unknown}; pipeline {self.name} has {list(self.nodes)}')
+        wanted = set()
+        stack = list(only)
+        while stack:
+            name = stack.pop()
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.deps[name])
+        return [n for n in self.nodes if n in wanted]
+
+    def stale(self, node: Node, force=False) -> tuple[str | None, str | None]:
+        """``(reason to run or None, current fingerprint)``."""
+        if node.always:
+            return 'benchmark (resumes)', None
+        fp = self.state.fingerprint(node)
+        if force:
+            return 'forced', fp
+        missing = [o for o in node.outputs if not _expand([o])]
+        if missing:
+            return f'missing {missing[0]}', fp
+        last = self.state.nodes.get(node.name, {}).get('fingerprint')
+        if last is None:
+            return 'no previous run', fp
+        if last != fp:
+            return 'inputs changed', fp
+        return None, fp
+
+    def describe(self, names, force=()) -> None:
+        for name in names:
+            node = self.nodes[name]
+            reason, _fp = self.stale(node, name in force)
+            deps = ', '.join(self.deps[name]) or '-'
+            print(f'{name:<28} {"run: " + reason if reason else "up to date":<34} after: {deps}')
+            print(f'{"":<28} {" ".join(node.cmd)}')
+
+    async def run(self, names, workers: int, max_stages: int, log_dir: Path, force=()) -> int:
+        """Run ``names`` in dependency order; returns the number of failed or blocked nodes."""
+        selected = set(names)
+        waiting = {n: {d for d in self.deps[n] if d in selected} for n in names}
+        failed: list[str] = []
+        blocked: list[str] = []
+        procs: dict = {}
+        stop = asyncio.Event()
+        log_dir = REPO_ROOT / log_dir
+        log_dir.mkdir(parents=True, exist_ok=True)
+        env = os.environ.copy()
+        if workers > 0:
+            env = campaign_scheduler.campaign_slots_env(workers, REPO_ROOT / SLOT_DIR / f'pipeline_{self.name}')
+        env.setdefault('PYTHONUNBUFFERED', '1')
+
+        scheduler = campaign_scheduler.CampaignScheduler('fifo', max_concurrency=max_stages)
+        scheduler.add_group('stages', max_stages)
+
+        def submit_ready():
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                scheduler.submit({'campaign': self.name, 'config': name, 'instance': None, 'rep': 0,
+                                  'node': self.nodes[name]}, 'stages')
+
+        async def run_node(job):
+            node = job['node']
+            reason, fp = self.stale(node, node.name in force)
+            if reason is None:
+                _log(f'{node.name}: up to date, skipped')
+                return 0, None
+            _log(f'{node.name}: start ({reason})')
+            cmd = [sys.executable, '-u'] + node.cmd
+            log_path = log_dir / f'{node.name}.log'
+            with open(log_path, 'a', encoding='utf-8', newline='\n') as fh:
+                fh.write(f"\n{'=' * 80}\n[{_dt.datetime.now().isoformat(timespec='seconds')}] "
+                         f"CMD: {' '.join(cmd)}\n{'=' * 80}\n")
+                fh.flush()
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, cwd=str(REPO_ROOT), stdout=fh, stderr=asyncio.subprocess.STDOUT, env=env,
+                    creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+                procs[node.name] = proc
+                try:
+                    rc = await proc.wait()
+                finally:
+                    procs.pop(node.name, None)
+            _log(f'{node.name}: exit code {rc} (log: {log_path})')
+            return rc, fp
+
+        def on_result(job, result, exc):
+            node = job['node']
+            rc, fp = result if exc is None else (None, None)
+            if exc is not None:
+                _log(f'{node.name}: failed to run: {exc}')
+            if rc == 0:
+                if fp is not None:
+                    self.state.record(node, fp)
+                for deps in waiting.values():
+                    deps.discard(node.name)
+                if not stop.is_set():
+                    submit_ready()
+                return
+            failed.append(node.name)
+            lost = {node.name}
+            changed = True
+            while changed:
+                changed = False
+                for name, deps in list(waiting.items()):
+                    if deps & lost:
+                        lost.add(name)
+                        blocked.append(name)
+                        del waiting[name]
+                        changed = True
+
+        def on_stop(signum):
+            _log(f'signal {signum}: stopping; running stages are asked to finish their current reps')
+            stop.set()
+            for proc in procs.values():
+                try:
+                    proc.send_signal(signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+        install_stop_handlers(on_stop)
+        submit_ready()
+        await scheduler.run(run_node, on_result=on_result, stop=stop)
+        self.state.save()
+        if blocked:
+            _log(f'not run (a dependency failed): {", ".join(blocked)}')
+        not_started = len(waiting) + scheduler.pending()
+        if stop.is_set() and not_started:
+            _log(f'stopped with {not_started} stage(s) not started')
+        return len(failed) + len(blocked) + (not_started if stop.is_set() else 0)
+
+
+def _log(msg: str) -> None:
+    print(f"[{_dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {msg}", flush=True)
+
+
+def _sizes(args) -> list[tuple[str, str]]:
+    return [s for s in SIZES if not getattr(args, 'size', None) or s[0] == args.size]
+
+
+def ablation_nodes(args) -> list[Node]:
+    """Ablation runs, then the consolidated CSV and the workbook (with best_config.json)."""
+    # reports are refreshed after every finished (param, value, size); the final
+    # consolidation stages below then only merge cached per-file aggregates
+    cmd = ['scripts/run_ablation_parallel.py', '--reps', args.reps, '--no-consolidate', '--refresh-reports']
+    if args.size:
+        cmd += ['--size', args.size]
+    if args.max_jobs:
+        cmd += ['--max-jobs', args.max_jobs]
+    return [
+        Node('ablation-runs', cmd, inputs=['instances/*/*.txt'], outputs=[ABLATION_SUMMARIES], always=True),
+        Node('ablation-summary', ['scripts/consolidate_ablation_summaries.py'],
+             inputs=[ABLATION_SUMMARIES, 'results/*/results_*_CP-DCM-ACO.csv'],
+             outputs=['results/ablation/consolidated_ablation_summary.csv']),
+        Node('ablation-excel', ['scripts/run_ablation.py', '--consolidate', '--quiet'],
+             inputs=[ABLATION_SUMMARIES], outputs=[BEST_CONFIG, ABLATION_EXCEL]),
+    ]
+
+
+def login_nodes(args) -> list[Node]:
+    """``run_login_pipeline``: best-config pool and timeout study side by side,
+    then the timeout workbooks."""
+    log_dir = Path('logs') / 'timeout_comparison'
+    return [
+        Node('best-config', ['scripts/run_best_config_global_pool.py', '--workers-per-size',
+                             args.workers_per_size, '--verbose'],
+             inputs=[BEST_CONFIG], outputs=['results/*/best_config_results_*.csv'], always=True),
+        Node('timeout-runs', ['scripts/run_algo_timeout_comparison.py', '--workers-per-alg',
+                              args.workers_per_alg, '--verbose', '--log-dir', log_dir, '--no-consolidate'],
+             inputs=[BEST_CONFIG], outputs=[TIMEOUT_SUMMARIES], always=True),
+        Node('timeout-excel', ['scripts/run_algo_timeout_comparison.py', '--consolidate', '--log-dir', log_dir],
+             inputs=[TIMEOUT_SUMMARIES],
+             outputs=['results/ablation/timeout/timeout_comparison.xlsx', ABLATION_EXCEL]),
+    ]
+
+
+def full_nodes(args) -> list[Node]:
+    """Ablation, then (on its best_config.json) the login pipeline, then the
+    ablation workbook rebuilt with the best-config and timeout results."""
+    return ablation_nodes(args) + login_nodes(args) + [
+        Node('results-excel', ['scripts/build_ablation_results_excel.py'],
+             inputs=[ABLATION_SUMMARIES, TIMEOUT_SUMMARIES, 'results/*/best_config_results_*.csv'],
+             outputs=[ABLATION_EXCEL]),
+    ]
+
+
+def cp_comparison_nodes(args) -> list[Node]:
+    """``run_cp_comparison_repeats``: one node per (size, run, algorithm) and per
+    (size, run) of the DCM-ACO 9-ants phase, then the summary workbook."""
+    nodes = []
+    for size_arg, size in _sizes(args):
+        for run in range(args.run_start, args.run_end + 1):
+            suffix = f'_run{run}' if run > 1 else ''
+            for alg, alg_name in ((0, 'CP-ACS'), (2, 'CP-DCM-ACO')):
+                nodes.append(Node(
+                    f'cp-{size}-alg{alg}-run{run}',
+                    [f'scripts/run_{size}.py', '--alg', alg, '--run', run, '--reps', args.reps,
+                     '--pool-workers', args.pool_workers, '--outdir', f'results/{size}'],
+                    inputs=[f'instances/{size}/*.txt'],
+                    outputs=[f'results/{size}/results_{size}_{alg_name}{suffix}.csv'], always=True))
+            if not args.skip_dcm9ants_phase:
+                nodes.append(Node(
+                    f'cp-{size}-dcm9-run{run}',
+                    [f'scripts/run_{size}.py', '--alg', 2, '--run', run, '--reps', 1,
+                     '--pool-workers', args.pool_workers, '--outdir', f'results/{size}/dcm_9ants',
+                     '--nAnts', 3, '--numACS', 2],
+                    inputs=[f'instances/{size}/*.txt'],
+                    outputs=[f'results/{size}/dcm_9ants/results_{size}_*{suffix}.csv'], always=True))
+    cmd = ['scripts/run_cp_comparison_repeats.py', '--consolidate-only',
+           '--run-start', args.run_start, '--run-end', args.run_end]
+    for size_arg, _size in _sizes(args):
+        cmd += ['--size', size_arg]
+    nodes.append(Node('cp-excel', cmd,
+                      inputs=['results/*/results_*.csv', 'results/*/dcm_9ants/results_*.csv'],
+                      outputs=['results/cp_comparison_summary.xlsx']))
+    return nodes
+
+
+PIPELINES = {
+    'ablation': ablation_nodes,
+    'login': login_nodes,
+    'full': full_nodes,
+    'cp-comparison': cp_comparison_nodes,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description='Run benchmark campaign stages as a dependency graph.')
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--workers', type=int, default=None,
+                        help='Solver slots shared by all stages (default: the machine slots; 0: no shared budget)')
+    common.add_argument('--max-stages', type=int, default=4, help='Stages running at once (default: 4)')
+    common.add_argument('--only', action='append', default=[], metavar='NODE',
+                        help='Run only this node and what it depends on (repeatable)')
+    common.add_argument('--force', action='append', default=[], metavar='NODE',
+                        help='Rerun this consolidation even if its inputs are unchanged (repeatable)')
+    common.add_argument('--log-dir', default=None, help='Per-node logs (default: logs/pipeline/<pipeline>)')
+    common.add_argument('--dry-run', action='store_true', help='Print the nodes and what would run')
+    sub = ap.add_subparsers(dest='pipeline', required=True)
+
+    def ablation_options(p):
+        p.add_argument('--reps', type=int, default=100)
+        p.add_argument('--size', choices=[s for s, _n in SIZES], default=None)
+        p.add_argument('--max-jobs', type=int, default=None, help='run_ablation_parallel --max-jobs')
+
+    def login_options(p):
+        p.add_argument('--workers-per-size', type=int, default=2)
+        p.add_argument('--workers-per-alg', type=int, default=4)
+
+    ablation_options(sub.add_parser('ablation', parents=[common], help=ablation_nodes.__doc__))
+    login_options(sub.add_parser('login', parents=[common], help=login_nodes.__doc__))
+    p = sub.add_parser('full', parents=[common], help=full_nodes.__doc__)
+    ablation_options(p)
+    login_options(p)
+    p = sub.add_parser('cp-comparison', parents=[common], help=cp_comparison_nodes.__doc__)
+    p.add_argument('--run-start', type=int, default=1)
+    p.add_argument('--run-end', type=int, default=5)
+    p.add_argument('--reps', type=int, default=1)
+    p.add_argument('--pool-workers', type=int, default=4)
+    p.add_argument('--size', choices=[s for s, _n in SIZES], default=None)
+    p.add_argument('--skip-dcm9ants-phase', action='store_true')
+    return ap
+
+
+def main(argv=None) -> int:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    try:
+        pipeline = Pipeline(args.pipeline, PIPELINES[args.pipeline](args))
+        names = pipeline.select(args.only)
+    except ValueError as e:
+        ap.error(str(e))
+    unknown = [n for n in args.force if n not in pipeline.nodes]
+    if unknown:
+        ap.error(f'--force: unknown node(s) {unknown}')
+    if args.dry_run:
+        pipeline.describe(names, set(args.force))
+        return 0
+    workers = campaign_scheduler.machine_slots() if args.workers is None else max(0, args.workers)
+    log_dir = Path(args.log_dir) if args.log_dir else LOG_DIR / args.pipeline
+    _log(f'Pipeline {args.pipeline}: {len(names)} node(s), {workers or "unlimited"} solver slot(s), '
+         f'{args.max_stages} stage(s) at once')
+    bad = asyncio.run(pipeline.run(names, workers, max(1, args.max_stages), log_dir, set(args.force)))
+    _log(f'Pipeline {args.pipeline} done' + (f': {bad} node(s) failed or not run' if bad else ''))
+    return 1 if bad else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Dry-run planner: expected cost of a benchmark campaign before launching it.
+
+Builds the units a launcher would queue (nothing is solved), prices each one
+from the results already under ``results/`` (``run_history``: per-instance
+success rate and mean solve time, so a rep is expected to take
+``p * min(t, T) + (1 - p) * T`` at timeout ``T``) and replays them through
+``campaign_scheduler.CampaignScheduler.simulate`` with the launcher's worker
+count, groups and ``--priority``. Reports total CPU time, wall-clock makespan
+and the configurations that dominate the cost:
+
+    python scripts/plan_campaign.py login-pipeline
+    python scripts/plan_campaign.py best-config --reps 50,100 --workers-per-size 1,2,4
+    python scripts/plan_campaign.py ablation --size 25 --max-jobs 8 --remaining
+    python scripts/plan_campaign.py timeout --workers-per-alg 4 --derive-timeouts
+    python scripts/plan_campaign.py pool --size 16 --alg 0 --pool-workers 8
+
+Comma-separated ``--reps`` and worker counts are swept (one table row each).
+``--remaining`` leaves out instances whose summary rows already exist, as a
+resumed launcher would. Ablation configurations are priced from their own
+summary/progress CSVs where they exist, else from all runs of the instance.
+Instances without any history are priced at the full timeout. Solver start-up
+and CSV writing are not included, so short-timeout campaigns run a little longer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import campaign_scheduler  # noqa: E402
+import run_history  # noqa: E402
+
+SIZE_ARGS = {'9': '9x9', '16': '16x16', '25': '25x25'}
+ALG_NAMES = {0: 'CP-ACS', 2: 'CP-DCM-ACO'}
+
+
+def _int_list(text: str) -> list[int]:
+    try:
+        values = [int(v) for v in text.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected N or N,M,...: {text!r}') from None
+    if not values or min(values) < 1:
+        raise argparse.ArgumentTypeError(f'expected positive integers: {text!r}')
+    return values
+
+
+def format_seconds(s: float) -> str:
+    if s < 120:
+        return f'{s:.0f} s'
+    if s < 2 * 3600:
+        return f'{s / 60:.1f} min'
+    if s < 2 * 86400:
+        return f'{s / 3600:.1f} h'
+    return f'{s / 86400:.1f} d'
+
+
+def _instances(size_dir) -> list[Path]:
+    return sorted((REPO_ROOT / size_dir).glob('*.txt'))
+
+
+def _completed(summary_file: Path, remaining: bool) -> set:
+    if not remaining:
+        return set()
+    from run_ablation import read_completed_from_summary
+    return read_completed_from_summary(summary_file)
+
+
+class Plan:
+    """Units of one campaign, in phases that run one after another (each phase is
+    one scheduler run). A unit is a scheduler job dict plus ``cost`` (expected
+    seconds) and ``label`` (the configuration it belongs to)."""
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.phases: list[tuple[str, dict, list]] = []
+        self.unknown = 0
+
+    def phase(self, name: str, caps: dict) -> list:
+        units: list = []
+        self.phases.append((name, dict(caps), units))
+        return units
+
+    def rep_cost(self, hist: run_history.RunHistory, instance: str, alg, timeout, size: str) -> float:
+        if hist.expected(instance, alg, None, size) is None:
+            self.unknown += 1
+        return hist.expected(instance, alg, timeout, size)
+
+    def cpu_seconds(self) -> float:
+        return sum(u['cost'] for _name, _caps, units in self.phases for u in units)
+
+    def units(self) -> int:
+        return sum(len(units) for _name, _caps, units in self.phases)
+
+    def slots(self) -> int:
+        return max((sum(caps.values()) for _name, caps, _units in self.phases), default=1)
+
+    def makespan(self) -> float:
+        total = 0.0
+        for _name, caps, units in self.phases:
+            scheduler = campaign_scheduler.CampaignScheduler(self.priority)
+            for group, cap in caps.items():
+                scheduler.add_group(group, cap)
+            for unit in units:
+                scheduler.submit(unit, unit['group'])
+            total += scheduler.simulate(lambda job: job['cost'])
+        return total
+
+    def by_label(self) -> list[tuple[str, float]]:
+        cost: dict[str, float] = {}
+        for _name, _caps, units in self.phases:
+            for u in units:
+                cost[u['label']] = cost.get(u['label'], 0.0) + u['cost']
+        return sorted(cost.items(), key=lambda kv: -kv[1])
+
+
+def _rep_units(plan: Plan, units: list, hist, fp: Path, alg, timeout, size: str, reps: int,
+               group, label: str, campaign: str) -> None:
+    cost = plan.rep_cost(hist, fp.name, alg, timeout, size)
+    for rep in range(1, reps + 1):
+        units.append({
+            'campaign': campaign, 'config': label, 'instance': fp.name, 'instance_path': str(fp),
+            'rep': rep, 'alg': alg, 'timeout': timeout, 'size_name': size,
+            'cost': cost, 'label': label, 'group': group,
+        })
+
+
+def plan_pool(args, hist) -> Plan:
+    """``run_<size>.py --pool-workers N``: one pool, every (instance, rep)."""
+    from bench_global_pool import SIZE_DEFS
+    size = SIZE_ARGS[args.size]
+    _name, inst_dir, default_timeout, outdir = next(d for d in SIZE_DEFS if d[0] == size)
+    timeout = args.timeout or default_timeout
+    alg_name = ALG_NAMES[args.alg]
+    run_suffix = f'_run{args.run}' if args.run > 1 else ''
+    summary = REPO_ROOT / outdir / f'results_{size}_{alg_name}{run_suffix}.csv'
+    plan = Plan(args.priority)
+    units = plan.phase(size, {'pool': args.pool_workers})
+    done = _completed(summary, args.remaining)
+    for fp in _instances(inst_dir):
+        if fp.name not in done:
+            _rep_units(plan, units, hist, fp, args.alg, timeout, size, args.reps, 'pool',
+                       f'{alg_name} {size}', str(summary))
+    return plan
+
+
+def plan_best_config(args, hist) -> Plan:
+    """``bench_global_pool``: all sizes in one pool, per-size caps unless ``longest``."""
+    from bench_global_pool import ALG, SIZE_DEFS, _parse_sizes, _paths_for_size
+    sizes = [d for d in SIZE_DEFS if d[0] in set(_parse_sizes(args.sizes))]
+    run_suffix = f'_run{args.run}' if args.run > 1 else ''
+    plan = Plan(args.priority)
+    longest = args.priority == 'longest'
+    caps = ({'all': args.workers_per_size * len(sizes)} if longest
+            else {d[0]: args.workers_per_size for d in sizes})
+    units = plan.phase('best-config', caps)
+    for size, inst_dir, timeout, _outdir in sizes:
+        outfile, _progress = _paths_for_size(size, run_suffix)
+        done = _completed(outfile, args.remaining)
+        for fp in _instances(inst_dir):
+            if fp.name not in done:
+                _rep_units(plan, units, hist, fp, ALG, timeout, size, args.reps,
+                           'all' if longest else size, f'best-config {size}', str(outfile))
+    return plan
+
+
+def plan_timeout(args, hist, plan: Plan | None = None) -> Plan:
+    """``run_algo_timeout_comparison``: one phase per size, slots per algorithm
+    (``--workers-per-alg 1``: one rep at a time)."""
+    from run_algo_timeout_comparison import ALGORITHMS, DEFAULT_OUTDIR, TIMEOUTS_PER_SIZE, _timeout_paths
+    from run_ablation import SIZE_CONFIGS
+    plan = plan or Plan(args.priority)
+    outdir = REPO_ROOT / DEFAULT_OUTDIR
+    algs = [a for a in ALGORITHMS if args.alg is None or a[0] == args.alg]
+    for size, size_cfg in SIZE_CONFIGS.items():
+        if args.size and SIZE_ARGS[args.size] != size:
+            continue
+        timeouts = TIMEOUTS_PER_SIZE.get(size, [])
+        if args.derive_timeouts:
+            timeouts = [max(timeouts)]
+        serial = args.workers_per_alg == 1
+        caps = {'serial': 1} if serial else {alg: args.workers_per_alg for alg, _n in algs}
+        units = plan.phase(f'timeout {size}', caps)
+        for alg, alg_name in algs:
+            for t in timeouts:
+                _progress, summary = _timeout_paths(outdir, alg, t, size)
+                done = _completed(summary, args.remaining)
+                for fp in _instances(size_cfg['dir']):
+                    if fp.name not in done:
+                        _rep_units(plan, units, hist, fp, alg, t, size, args.reps,
+                                   'serial' if serial else alg, f'{alg_name} {t}s {size}', str(summary))
+    return plan
+
+
+def plan_ablation(args, hist) -> Plan:
+    """``run_ablation_parallel``: one unit per worker task (its instance share of
+    one (param, value, size) run, solved rep after rep)."""
+    from run_ablation import ABLATION_DIR, ALG, PARAM_TESTS, SIZE_CONFIGS, format_param_value
+    plan = Plan(args.priority)
+    units = plan.phase('ablation', {'ablation': args.max_jobs})
+    outdir = REPO_ROOT / ABLATION_DIR
+    for param, pcfg in PARAM_TESTS.items():
+        if args.param and param != args.param:
+            continue
+        for size, size_cfg in SIZE_CONFIGS.items():
+            if args.size and SIZE_ARGS[args.size] != size:
+                continue
+            instances = _instances(size_cfg['dir'])
+            for value in pcfg['values']:
+                val_str = format_param_value(param, value)
+                summary = outdir / param / f'{val_str}_{size}_summary.csv'
+                # this configuration's own runs first, then every run of the instance
+                cfg_hist = run_history.RunHistory(fallback=hist)
+                cfg_hist.load_file(summary)
+                cfg_hist.load_file(outdir / param / f'{val_str}_{size}_progress.csv')
+                done = _completed(summary, args.remaining)
+                label = f'{param}={val_str} {size}'
+                for wid in range(args.workers_per_value):
+                    cost = sum(plan.rep_cost(cfg_hist, fp.name, ALG, size_cfg['timeout'], size) * args.reps
+                               for i, fp in enumerate(instances)
+                               if i % args.workers_per_value == wid and fp.name not in done)
+                    if cost > 0:
+                        units.append({'campaign': f'{param}={value}', 'config': size, 'size_name': size,
+                                      'instance': None, 'rep': wid, 'cost': cost, 'label': label,
+                                      'group': 'ablation'})
+    return plan
+
+
+def plan_login_pipeline(args, hist) -> Plan:
+    """``run_login_pipeline``: best-config global pool, then the timeout comparison."""
+    plan = plan_best_config(argparse.Namespace(**{**vars(args), 'sizes': 'all'}), hist)
+    return plan_timeout(argparse.Namespace(**{**vars(args), 'alg': None, 'size': None,
+                                              'derive_timeouts': False}), hist, plan)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description='Expected CPU time and makespan of a benchmark campaign (dry run).')
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--reps', type=_int_list, default=[100],
+                        help='Repetitions per instance; N,M,... compares several (default: 100)')
+    common.add_argument('--priority', default='longest', choices=sorted(campaign_scheduler.PRIORITIES),
+                        help='Scheduling policy of the launcher (default: longest)')
+    common.add_argument('--remaining', action='store_true',
+                        help='Leave out instances whose summary rows already exist (resume)')
+    common.add_argument('--top', type=int, default=10, help='Costliest configurations to list (default: 10)')
+    sub = ap.add_subparsers(dest='campaign', required=True)
+
+    p = sub.add_parser('pool', parents=[common], help='run_9x9/16x16/25x25.py --pool-workers')
+    p.add_argument('--size', choices=sorted(SIZE_ARGS), required=True)
+    p.add_argument('--alg', type=int, choices=sorted(ALG_NAMES), default=2)
+    p.add_argument('--timeout', type=int, default=None, help='Per-run timeout (default: the runner\'s)')
+    p.add_argument('--run', type=int, default=1)
+    p.add_argument('--pool-workers', type=_int_list, default=[4])
+    p.set_defaults(build=plan_pool, sweep=('pool_workers',))
+
+    p = sub.add_parser('best-config', parents=[common], help='run_best_config_global_pool.py / bench_global_pool')
+    p.add_argument('--sizes', default='all')
+    p.add_argument('--run', type=int, default=1)
+    p.add_argument('--workers-per-size', type=_int_list, default=[2])
+    p.set_defaults(build=plan_best_config, sweep=('workers_per_size',))
+
+    p = sub.add_parser('timeout', parents=[common], help='run_algo_timeout_comparison.py')
+    p.add_argument('--size', choices=sorted(SIZE_ARGS), default=None)
+    p.add_argument('--alg', type=int, choices=sorted(ALG_NAMES), default=None)
+    p.add_argument('--derive-timeouts', action='store_true')
+    p.add_argument('--workers-per-alg', type=_int_list, default=[1])
+    p.set_defaults(build=plan_timeout, sweep=('workers_per_alg',))
+
+    p = sub.add_parser('ablation', parents=[common], help='run_ablation_parallel.py')
+    p.add_argument('--param', default=None)
+    p.add_argument('--size', choices=sorted(SIZE_ARGS), default=None)
+    p.add_argument('--max-jobs', type=_int_list, default=[8])
+    p.add_argument('--workers-per-value', type=int, default=2)
+    p.set_defaults(build=plan_ablation, sweep=('max_jobs',))
+
+    p = sub.add_parser('login-pipeline', parents=[common], help='run_login_pipeline.py (best-config, then timeouts)')
+    p.add_argument('--run', type=int, default=1)
+    p.add_argument('--workers-per-size', type=_int_list, default=[2])
+    p.add_argument('--workers-per-alg', type=_int_list, default=[4])
+    p.set_defaults(build=plan_login_pipeline, sweep=('workers_per_size', 'workers_per_alg'))
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    hist = run_history.default_history()
+    print(f'History: {len(hist)} (instance, alg) estimate(s) from {REPO_ROOT / "results"}')
+
+    names = ('reps',) + args.sweep
+    header = '  '.join(f'{n.replace("_", "-"):>16}' for n in names)
+    print(f'\n{header}  {"units":>9}  {"CPU time":>10}  {"makespan":>10}  {"speedup":>7}  {"busy":>5}')
+    first = None
+    for values in itertools.product(*(getattr(args, n) for n in names)):
+        point = argparse.Namespace(**{**vars(args), **dict(zip(names, values))})
+        plan = args.build(point, hist)
+        cpu, span = plan.cpu_seconds(), plan.makespan()
+        speedup = cpu / span if span > 0 else 0.0
+        cols = '  '.join(f'{v:>16}' for v in values)
+        print(f'{cols}  {plan.units():>9}  {format_seconds(cpu):>10}  {format_seconds(span):>10}  '
+              f'{speedup:>7.1f}  {speedup / plan.slots():>5.0%}')
+        first = first or plan
+    if first.unknown:
+        print(f'\n{first.unknown} instance price(s) without history: full timeout assumed.')
+
+    total = first.cpu_seconds()
+    if total > 0:
+        print(f'\nCostliest configurations (reps={args.reps[0]}, CPU time):')
+        for label, cost in first.by_label()[:max(0, args.top)]:
+            print(f'  {label:<32} {format_seconds(cost):>10}  {cost / total:>6.1%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Streaming per-instance statistics of benchmark reps.
+
+The runners summarize an instance's reps as success %, mean/std of the solve
+time and of the cycles of solved reps. ``RepStats`` accumulates those one rep at
+a time without keeping the samples:
+
+- ``Moments``: count, mean and sum of squared deviations (Welford), mergeable
+  with Chan's parallel update, so the statistics of two workers' reps combine
+  exactly;
+- ``QuantileSketch``: solve times in logarithmic buckets of relative width
+  ``2 * RELATIVE_ACCURACY`` (as DDSketch), so any quantile is within 1% of a
+  solve time of that rank; sketches merge by adding bucket counts.
+
+An accumulator serializes to a small JSON object (``to_json``/``from_json``).
+The job journal keeps one per instance next to its reps, so resuming an
+instance or merging the reps of several workers does not re-read them.
+
+With ``--tail-latency`` the summary CSVs get three more columns after
+``cycles_std``: ``time_p50``, ``time_p90`` and ``time_p99`` of the solved reps.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import math
+from pathlib import Path
+
+TAIL_COLUMNS = ['time_p50', 'time_p90', 'time_p99']
+TAIL_QUANTILES = (0.5, 0.9, 0.99)
+
+RELATIVE_ACCURACY = 0.01
+
+
+class Moments:
+    """Count, mean and M2 (sum of squared deviations) of a stream of values."""
+
+    __slots__ = ('n', 'mu', 'm2')
+
+    def __init__(self, n: int = 0, mu: float = 0.0, m2: float = 0.0):
+        self.n = n
+        self.mu = mu
+        self.m2 = m2
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mu
+        self.mu += delta / self.n
+        self.m2 += delta * (x - self.mu)
+
+    def merge(self, other: Moments) -> None:
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mu - self.mu
+        self.mu += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    def mean(self) -> float:
+        """Mean, NaN without values."""
+        return self.mu if self.n else math.nan
+
+    def std(self, ddof: int = 0) -> float:
+        """Standard deviation (population by default: 0 for one value), NaN with
+        ``ddof`` values or fewer, as ``bench_utils.safe_std``."""
+        if self.n <= ddof:
+            return math.nan
+        return math.sqrt(max(0.0, self.m2) / (self.n - ddof))
+
+    def to_list(self) -> list:
+        return [self.n, self.mu, self.m2]
+
+    @classmethod
+    def from_list(cls, values) -> Moments:
+        n, mu, m2 = values
+        return cls(int(n), float(mu), float(m2))
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch of positive values: value x is counted in
+    bucket ``ceil(log(x) / log(gamma))``; zero and negative values in ``zeros``.
+    The exact minimum and maximum bound every estimate."""
+
+    __slots__ = ('bins', 'zeros', 'count', 'min', 'max')
+
+    _gamma = (1.0 + RELATIVE_ACCURACY) / (1.0 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+
+    def __init__(self):
+        self.bins: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x: float) -> None:
+        if x > 0.0:
+            key = math.ceil(math.log(x) / self._log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + 1
+        else:
+            self.zeros += 1
+        self.count += 1
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def merge(self, other: QuantileSketch) -> None:
+        for key, c in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + c
+        self.zeros += other.zeros
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the value of rank ``q * (count - 1)`` (0 <= q <= 1), NaN
+        when empty."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if seen > rank:
+            return self.min
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2.0 * self._gamma ** key / (self._gamma + 1.0)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'bins': {str(k): c for k, c in self.bins.items()},
+            'zeros': self.zeros,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> QuantileSketch:
+        sketch = cls()
+        sketch.bins = {int(k): int(c) for k, c in data.get('bins', {}).items()}
+        sketch.zeros = int(data.get('zeros', 0))
+        sketch.count = sketch.zeros + sum(sketch.bins.values())
+        if sketch.count:
+            sketch.min = float(data['min'])
+            sketch.max = float(data['max'])
+        return sketch
+
+
+class RepStats:
+    """Summary statistics of one instance's reps: rep and success counts,
+    ``Moments`` of the solve time and cycles of solved reps (NaN values left
+    out, as in the summary CSVs) and a ``QuantileSketch`` of those times."""
+
+    __slots__ = ('reps', 'successes', 'time', 'cycles', 'time_sketch')
+
+    def __init__(self):
+        self.reps = 0
+        self.successes = 0
+        self.time = Moments()
+        self.cycles = Moments()
+        self.time_sketch = QuantileSketch()
+
+    def add(self, success: bool, t: float, cyc: float) -> None:
+        """Count one finished rep."""
+        self.reps += 1
+        if not success:
+            return
+        self.successes += 1
+        if not math.isnan(t):
+            self.time.add(t)
+            self.time_sketch.add(t)
+        if not math.isnan(cyc):
+            self.cycles.add(cyc)
+
+    def merge(self, other: RepStats) -> None:
+        self.reps += other.reps
+        self.successes += other.successes
+        self.time.merge(other.time)
+        self.cycles.merge(other.cycles)
+        self.time_sketch.merge(other.time_sketch)
+
+    @classmethod
+    def from_reps(cls, results) -> RepStats:
+        """Accumulator of ``(success, time, cycles, ...)`` rep results, e.g. the
+        values of a runner's ``rep_map``."""
+        acc = cls()
+        for res in results:
+            acc.add(res[0], res[1], res[2])
+        return acc
+
+    def success_pct(self, n_reps: int | None = None) -> float:
+        """Success rate in percent of ``n_reps`` (default: the reps counted)."""
+        n = self.reps if n_reps is None else n_reps
+        return (self.successes / float(n)) * 100.0 if n else math.nan
+
+    def time_quantile(self, q: float) -> float:
+        return self.time_sketch.quantile(q)
+
+    def to_dict(self) -> dict:
+        return {
+            'reps': self.reps,
+            'successes': self.successes,
+            'time': self.time.to_list(),
+            'cycles': self.cycles.to_list(),
+            'time_sketch': self.time_sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RepStats:
+        acc = cls()
+        acc.reps = int(data['reps'])
+        acc.successes = int(data['successes'])
+        acc.time = Moments.from_list(data['time'])
+        acc.cycles = Moments.from_list(data['cycles'])
+        acc.time_sketch = QuantileSketch.from_dict(data['time_sketch'])
+        return acc
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> RepStats:
+        return cls.from_dict(json.loads(text))
+
+
+def _cell(value: float, ndigits: int):
+    return round(value, ndigits) if not math.isnan(value) else ''
+
+
+def summary_cells(acc: RepStats, n_reps: int, tail: bool = False) -> list:
+    """The ``success_%``, ``time_mean``, ``time_std``, ``cycles_mean`` and
+    ``cycles_std`` cells of a summary row over ``n_reps`` reps, followed by the
+    ``TAIL_COLUMNS`` cells when ``tail``."""
+    cells = [
+        round(acc.success_pct(n_reps), 2),
+        _cell(acc.time.mean(), 6),
+        _cell(acc.time.std(), 6),
+        _cell(acc.cycles.mean(), 3),
+        _cell(acc.cycles.std(), 3),
+    ]
+    if tail:
+        cells += [_cell(acc.time_quantile(q), 6) for q in TAIL_QUANTILES]
+    return cells
+
+
+def summary_columns(args) -> list[str]:
+    """``TAIL_COLUMNS`` with ``--tail-latency``, else none."""
+    return list(TAIL_COLUMNS) if getattr(args, 'tail_latency', False) else []
+
+
+def check_summary_header(path: Path, tail: bool) -> None:
+    """Refuse to append tail-latency rows to a summary written without their columns."""
+    if not tail or not Path(path).exists():
+        return
+    with open(path, 'r', newline='') as f:
+        header = next(csv.reader(f), None)
+    if header and not set(TAIL_COLUMNS) <= set(header):
+        raise SystemExit(f'{path} was written without the tail-latency columns {TAIL_COLUMNS}; '
+                         'use another --run/--outdir for --tail-latency, or drop --tail-latency to resume it.')
+
+
+def add_cli_options(ap) -> None:
+    ap.add_argument('--tail-latency', action='store_true',
+                    help='Add the median, p90 and p99 solve time of the solved reps to the summary rows '
+                         f'({", ".join(TAIL_COLUMNS)}; estimated within {RELATIVE_ACCURACY * 100:g}%%)')
+
+
+def cli_args(args) -> list[str]:
+    """``--tail-latency`` of ``args`` for a child runner."""
+    return ['--tail-latency'] if getattr(args, 'tail_latency', False) else []
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Columnar store of every solver run, for consolidation.
+
+Progress CSVs are deleted once an instance's summary row exists, and the
+summaries keep only means and standard deviations. With a rep store enabled,
+every solver run of the benchmark scripts (including reps served from or
+claimed in the result cache) is also kept as one row of typed NumPy columns:
+
+- ``campaign``, ``instance``, ``config``: int32 codes into string tables (the
+  campaign's progress file, the instance file name, and the algorithm, timeout
+  and normalized solver options as JSON)
+- ``seed``, ``success``, ``time``, ``cycles``, ``cells_filled``, ``cp_calls``
+- ``cp_initial``, ``cp_ant``, ``dcm_aco``, ``cooperative_game``,
+  ``pheromone_fusion``, ``public_path``: CP and DCM phase times of the record
+
+Each process buffers its rows and writes them as an ``.npz`` shard under
+``shards/`` (every ``SHARD_ROWS`` rows or ``FLUSH_SECONDS``, and at exit),
+announced by one line in ``shards.jsonl``. ``compact`` folds the shards into one
+``.npy`` file per column under ``columns-<generation>/``, described by
+``manifest.json``; ``RepStore.load`` memory-maps those and appends the shards
+written since, so aggregating millions of reps reads only the columns it uses.
+
+Enable it for a benchmark script and the processes it starts with
+``--rep-store DIR`` (or ``$SUDACO_REP_STORE``); the consolidation scripts take the
+same option and then compute the per-instance statistics of the summary CSVs
+from the stored reps::
+
+    python scripts/run_ablation_parallel.py --rep-store results/.reps
+    python scripts/rep_store.py compact results/.reps
+    python scripts/consolidate_ablation_summaries.py --rep-store results/.reps
+    python scripts/rep_store.py summary results/.reps --campaign '*nAnts*'
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import csv
+import fnmatch
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import group_stats
+import result_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ENV_DIR = 'SUDACO_REP_STORE'
+MANIFEST = 'manifest.json'
+SHARD_LOG = 'shards.jsonl'
+SHARD_ROWS = 4096
+FLUSH_SECONDS = 60.0
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+TABLES = ('campaign', 'instance', 'config')
+VALUES = (
+    ('seed', 'i8'), ('success', '?'), ('time', 'f8'), ('cycles', 'f8'),
+    ('cells_filled', 'i4'), ('cp_calls', 'i8'),
+    ('cp_initial', 'f4'), ('cp_ant', 'f4'), ('dcm_aco', 'f4'), ('cooperative_game', 'f4'),
+    ('pheromone_fusion', 'f4'), ('public_path', 'f4'),
+)
+COLUMNS = TABLES + tuple(name for name, _dtype in VALUES)
+
+# Statistics columns of the summary CSVs, rounded as the runners write them.
+SUMMARY_STATS = (('success_%', 2), ('time_mean', 6), ('time_std', 6), ('cycles_mean', 3), ('cycles_std', 3))
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError('the rep store needs numpy (pip install numpy)')
+
+
+def _rel(path) -> str:
+    """Repository-relative POSIX path where possible, so stores move with the repo."""
+    p = Path(path).resolve()
+    try:
+        return p.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+
+def config_label(alg, timeout, extra_args=None) -> str:
+    return json.dumps({'alg': int(alg), 'timeout': float(timeout),
+                       'args': result_cache.normalize_args(extra_args)}, sort_keys=True)
+
+
+def summary_file_for(progress_file) -> Path:
+    """Summary CSV of a campaign, from its progress file: ``<x>_progress.csv`` ->
+    ``<x>_summary.csv`` (ablation, timeout study), ``progress_<size>_<alg>...`` ->
+    ``results_<size>_<alg>...`` (``run_<size>.py``, best-config pool)."""
+    p = Path(progress_file)
+    if p.name.endswith('_progress.csv'):
+        return p.with_name(p.name[:-len('_progress.csv')] + '_summary.csv')
+    return p.with_name(p.name.replace('progress_', 'results_', 1))
+
+
+def _num(value, missing=math.nan):
+    try:
+        return missing if value is None else type(missing)(value)
+    except (TypeError, ValueError):
+        return missing
+
+
+def _values(rec: dict, seed) -> tuple:
+    seed = rec.get('seed', seed)
+    return (
+        _num(seed, -1), bool(rec.get('success')), _num(rec.get('time')),
+        _num(rec.get('cycles', rec.get('iterations'))),
+        _num(rec.get('cells_filled', rec.get('cellsFilled')), -1), _num(rec.get('cp_calls'), -1),
+        _num(rec.get('cp_initial')), _num(rec.get('cp_ant')), _num(rec.get('dcm_aco')),
+        _num(rec.get('cooperative_game')), _num(rec.get('pheromone_fusion')), _num(rec.get('public_path')),
+    )
+
+
+class RepTable:
+    """Loaded rows: ``columns`` maps each name in ``COLUMNS`` to an array (memory-
+    mapped where it comes from the compacted generation), ``tables`` maps
+    ``campaign``/``instance``/``config`` to the strings their codes index."""
+
+    def __init__(self, columns: dict, tables: dict):
+        self.columns = columns
+        self.tables = tables
+
+    def __len__(self) -> int:
+        return len(self.columns['success'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def codes(self, table: str, pattern: str):
+        """Codes of the ``table`` strings matching the glob ``pattern``."""
+        return np.array([i for i, s in enumerate(self.tables[table]) if fnmatch.fnmatchcase(s, pattern)],
+                        dtype=np.int32)
+
+    def where(self, mask) -> RepTable:
+        return RepTable({k: np.asarray(v)[mask] for k, v in self.columns.items()}, self.tables)
+
+    def _code(self, names) -> np.ndarray:
+        """One int64 per row combining the table codes of ``names``."""
+        code = np.zeros(len(self), dtype=np.int64)
+        for name in names:
+            code = code * max(1, len(self.tables[name])) + np.asarray(self[name], dtype=np.int64)
+        return code
+
+    def distinct(self) -> RepTable:
+        """Rows with one row per seeded (campaign, instance, config, seed): a rep
+        kept twice (e.g. rerun after its progress row was lost) counts once."""
+        seed = np.asarray(self['seed'])
+        group = self._code(TABLES)
+        order = np.lexsort((seed, group))
+        g, s_ = group[order], seed[order]
+        dup = np.zeros(len(order), dtype=bool)
+        dup[1:] = (g[1:] == g[:-1]) & (s_[1:] == s_[:-1]) & (s_[1:] >= 0)
+        if not dup.any():
+            return self
+        return self.where(np.sort(order[~dup]))
+
+    def instance_stats(self) -> dict:
+        """``{(campaign, instance): {n, successes, success_%, time_mean, time_std,
+        cycles_mean, cycles_std}}`` over the distinct reps; time and cycles over
+        solved reps (population std, as the summary CSVs)."""
+        t = self.distinct()
+        if not len(t):
+            return {}
+        by = group_stats.GroupBy(t._code(('campaign', 'instance')))
+        success = np.asarray(t['success'], dtype=bool)
+        stats = {'n': by.size(), 'successes': by.sum(success), 'success_%': by.success_rate(success)}
+        for col in ('time', 'cycles'):
+            x = np.where(success, np.asarray(t[col], dtype=np.float64), np.nan)
+            stats[f'{col}_mean'] = by.mean(x)
+            stats[f'{col}_std'] = by.std(x)
+        campaigns, instances = self.tables['campaign'], self.tables['instance']
+        n_inst = max(1, len(instances))
+        return {
+            (campaigns[code // n_inst], instances[code % n_inst]): {name: values[j].item()
+                                                                     for name, values in stats.items()}
+            for j, (code,) in enumerate(by.labels)
+        }
+
+
+class RepStore:
+    """Shard writer and reader for one store directory; safe across threads and
+    processes (each process writes its own shards)."""
+
+    def __init__(self, directory):
+        _require_numpy()
+        self.directory = Path(directory)
+        (self.directory / 'shards').mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._rows: list[tuple] = []
+        self._last_flush = time.monotonic()
+        self._seq = 0
+        self._prefix = f'{socket.gethostname()}-{os.getpid()}-{int(time.time())}'
+        atexit.register(self.flush)
+
+    def add(self, file_path, alg, timeout, extra_args, campaign, rec: dict, seed=None) -> None:
+        """Keep one solver record (JSON/binary record dict, or at least
+        ``success``/``time``/``cycles``)."""
+        row = (_rel(campaign) if campaign else '', Path(file_path).name,
+               config_label(alg, timeout, extra_args)) + _values(rec, seed)
+        with self._lock:
+            self._rows.append(row)
+            due = len(self._rows) >= SHARD_ROWS or time.monotonic() - self._last_flush >= FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as one shard."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            self._last_flush = time.monotonic()
+            if not rows:
+                return
+            self._seq += 1
+            name = f'{self._prefix}-{self._seq:05d}.npz'
+            arrays = {}
+            cols = list(zip(*rows))
+            for i, table in enumerate(TABLES):
+                strings = sorted(set(cols[i]))
+                index = {s: j for j, s in enumerate(strings)}
+                arrays[table] = np.array([index[s] for s in cols[i]], dtype=np.int32)
+                arrays[f'{table}_table'] = np.array(strings, dtype=str)
+            for i, (col, dtype) in enumerate(VALUES, start=len(TABLES)):
+                arrays[col] = np.array(cols[i], dtype=dtype)
+            path = self.directory / 'shards' / name
+            tmp = path.with_name(name + '.tmp')
+            with open(tmp, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, path)
+            with open(self.directory / SHARD_LOG, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'shard': name, 'rows': len(rows)}) + '\n')
+
+    def manifest(self) -> dict:
+        try:
+            with open(self.directory / MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'generation': 0, 'rows': 0, 'tables': {t: [] for t in TABLES}, 'log_offset': 0}
+
+    def _pending(self, offset: int) -> tuple[list[str], int]:
+        """Shards announced in ``shards.jsonl`` after byte ``offset``, and the new offset."""
+        try:
+            with open(self.directory / SHARD_LOG, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+        complete = data[:data.rfind(b'\n') + 1]
+        names = [json.loads(ln)['shard'] for ln in complete.decode('utf-8').splitlines() if ln.strip()]
+        return names, offset + len(complete)
+
+    def load(self, columns=COLUMNS) -> RepTable:
+        """All rows: the compacted generation memory-mapped, then the shards written since."""
+        for attempt in range(3):
+            try:
+                manifest = self.manifest()
+                names, _offset = self._pending(manifest['log_offset'])
+                return self._load(tuple(columns), manifest, names)
+            except FileNotFoundError:
+                # a compaction replaced the generation or merged shards meanwhile
+                if attempt == 2:
+                    raise
+        raise AssertionError('unreachable')
+
+    def _load(self, columns: tuple, manifest: dict, names: list[str]) -> RepTable:
+        tables = {t: list(manifest['tables'][t]) for t in TABLES}
+        index = {t: {s: i for i, s in enumerate(tables[t])} for t in TABLES}
+        dtypes = dict(VALUES)
+        parts: dict = {c: [] for c in columns}
+        if manifest['rows']:
+            gen = self.directory / f"columns-{manifest['generation']}"
+            for c in columns:
+                parts[c].append(np.load(gen / f'{c}.npy', mmap_mode='r'))
+        for name in names:
+            with np.load(self.directory / 'shards' / name) as shard:
+                for c in columns:
+                    if c in TABLES:
+                        local = [index[c].setdefault(s, len(index[c])) for s in shard[f'{c}_table'].tolist()]
+                        parts[c].append(np.asarray(local, dtype=np.int32)[shard[c]])
+                    else:
+                        parts[c].append(shard[c])
+        for t in TABLES:
+            tables[t] = list(index[t])
+        out = {}
+        for c in columns:
+            if len(parts[c]) == 1:
+                out[c] = parts[c][0]
+            elif parts[c]:
+                out[c] = np.concatenate(parts[c])
+            else:
+                out[c] = np.zeros(0, dtype=np.int32 if c in TABLES else dtypes[c])
+        return RepTable(out, tables)
+
+    def compact(self) -> int:
+        """Fold the shards written so far into a new column generation; returns
+        the number of rows in it. Writers may keep adding shards meanwhile."""
+        lock_path = self.directory / 'compact.lock'
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            raise RuntimeError(f'another compaction is running (remove {lock_path} if it is stale)') from None
+        try:
+            manifest = self.manifest()
+            names, offset = self._pending(manifest['log_offset'])
+            if not names:
+                return manifest['rows']
+            manifest_now = dict(manifest, log_offset=offset)
+            table = self._load(COLUMNS, manifest, names)
+            gen = manifest['generation'] + 1
+            gen_dir = self.directory / f'columns-{gen}'
+            gen_dir.mkdir(exist_ok=True)
+            for c in COLUMNS:
+                np.save(gen_dir / f'{c}.npy', np.ascontiguousarray(table[c]))
+            manifest_now.update(generation=gen, rows=len(table), tables=table.tables,
+                                compacted=time.strftime('%Y-%m-%d %H:%M:%S'))
+            tmp = self.directory / (MANIFEST + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(manifest_now, f)
+            os.replace(tmp, self.directory / MANIFEST)
+            for name in names:
+                (self.directory / 'shards' / name).unlink(missing_ok=True)
+            old = self.directory / f"columns-{manifest['generation']}"
+            if old.is_dir():
+                for p in old.iterdir():
+                    p.unlink()
+                old.rmdir()
+            return len(table)
+        finally:
+            os.close(fd)
+            lock_path.unlink(missing_ok=True)
+
+    def status(self) -> dict:
+        manifest = self.manifest()
+        names, _offset = self._pending(manifest['log_offset'])
+        return {'compacted_rows': manifest['rows'], 'generation': manifest['generation'],
+                'pending_shards': len(names), 'campaigns': len(manifest['tables']['campaign'])}
+
+
+_active: RepStore | None = None
+_active_lock = threading.Lock()
+_stats: dict | None = None
+
+
+def enable(directory) -> RepStore:
+    """Turn the store on for this process and, through the environment, for the
+    benchmark processes it starts."""
+    os.environ[ENV_DIR] = str(Path(directory).resolve())
+    return active()
+
+
+def active() -> RepStore | None:
+    """The store configured by the environment, or None when it is off."""
+    global _active
+    directory = os.environ.get(ENV_DIR)
+    if not directory:
+        return None
+    with _active_lock:
+        if _active is None or _active.directory != Path(directory):
+            _active = RepStore(directory)
+        return _active
+
+
+def keep(result, file_path, alg, timeout, extra_args=None, seed=None, campaign=None):
+    """Pass a solver result ``(success, elapsed, cycles, out)`` through, adding it
+    to the active store (from the JSON record in ``out`` when there is one)."""
+    store = active()
+    if store is not None:
+        rec = None
+        out = result[3] if len(result) > 3 else None
+        if isinstance(out, str):
+            from bench_utils import parse_result_record
+            rec = parse_result_record(out)
+        if not isinstance(rec, dict) or 'success' not in rec:
+            rec = {'success': result[0], 'time': result[1], 'cycles': result[2]}
+        store.add(file_path, alg, timeout, extra_args, campaign, rec, seed)
+    return result
+
+
+def keep_record(rec: dict, file_path, alg, timeout, extra_args=None, seed=None, campaign=None) -> None:
+    """Add one solver record dict to the active store, if any."""
+    store = active()
+    if store is not None:
+        store.add(file_path, alg, timeout, extra_args, campaign, rec, seed)
+
+
+def _summary_stats(store: RepStore) -> dict:
+    """``{summary: [rows, {instance: stats}]}`` of the store's campaigns, loaded
+    once per process (call with ``_active_lock`` held)."""
+    global _stats
+    if _stats is None:
+        table = store.load(('campaign', 'instance', 'config', 'seed', 'success', 'time', 'cycles'))
+        campaigns = table.tables['campaign']
+        counts = np.bincount(np.asarray(table['campaign']), minlength=len(campaigns))
+        by_summary: dict = {}
+        for campaign, n in zip(campaigns, counts.tolist()):
+            if campaign and n:
+                by_summary.setdefault(_rel(summary_file_for(REPO_ROOT / campaign)), [0, {}])[0] += n
+        for (campaign, instance), st in table.instance_stats().items():
+            if campaign:
+                by_summary[_rel(summary_file_for(REPO_ROOT / campaign))][1][instance] = st
+        _stats = by_summary
+    return _stats
+
+
+def summary_rows(summary_file, rows):
+    """Rows of a summary CSV (``csv.DictReader`` rows) with the statistics columns
+    recomputed from the active store for the instances it holds reps of; other
+    rows pass unchanged. Without a store this returns ``rows`` itself."""
+    store = active()
+    if store is None:
+        return rows
+    with _active_lock:
+        stats = _summary_stats(store).get(_rel(summary_file), [0, {}])[1]
+    if not stats:
+        return rows
+    return _with_stats(rows, stats)
+
+
+def summary_rep_count(summary_file) -> int:
+    """Reps of the active store whose campaign writes ``summary_file``, in the
+    same snapshot ``summary_rows`` uses (0 without a store)."""
+    store = active()
+    if store is None:
+        return 0
+    with _active_lock:
+        return _summary_stats(store).get(_rel(summary_file), [0, {}])[0]
+
+
+def _with_stats(rows, stats):
+    for row in rows:
+        st = stats.get((row.get('instance') or '').strip())
+        if st is not None:
+            row = dict(row)
+            for col, places in SUMMARY_STATS:
+                value = st[col]
+                row[col] = '' if math.isnan(value) else str(round(value, places))
+        yield row
+
+
+def add_cli_options(ap) -> None:
+    """``--rep-store DIR`` for the benchmark and consolidation scripts."""
+    ap.add_argument('--rep-store', default=None, metavar='DIR',
+                    help=f'Keep every solver run in the columnar rep store DIR (also ${ENV_DIR}); '
+                         'consolidation scripts compute summary statistics from it')
+
+
+def enable_from_args(args) -> RepStore | None:
+    if getattr(args, 'rep_store', None):
+        return enable(args.rep_store)
+    return active()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Columnar rep store: compact shards, show status, summarize.')
+    sub = ap.add_subparsers(dest='cmd', required=True)
+    p = sub.add_parser('compact', help='Fold written shards into the memory-mapped column files')
+    p.add_argument('store')
+    p = sub.add_parser('status', help='Rows, generation and pending shards')
+    p.add_argument('store')
+    p = sub.add_parser('summary', help='Per-(campaign, instance) statistics, as the summary CSVs')
+    p.add_argument('store')
+    p.add_argument('--campaign', default='*', help='Glob on the campaign (progress file) path')
+    p.add_argument('--csv', default=None, help='Write to this CSV instead of stdout')
+    args = ap.parse_args(argv)
+    _require_numpy()
+    store = RepStore(args.store)
+    if args.cmd == 'compact':
+        started = time.perf_counter()
+        rows = store.compact()
+        print(f'{rows} row(s) in {store.directory} ({time.perf_counter() - started:.2f} s)')
+        return 0
+    if args.cmd == 'status':
+        for key, value in store.status().items():
+            print(f'{key}: {value}')
+        return 0
+    started = time.perf_counter()
+    table = store.load(('campaign', 'instance', 'config', 'seed', 'success', 'time', 'cycles'))
+    table = table.where(np.isin(table['campaign'], table.codes('campaign', args.campaign)))
+    stats = table.instance_stats()
+    headers = ['campaign', 'instance', 'reps'] + [col for col, _places in SUMMARY_STATS]
+    out = open(args.csv, 'w', newline='') if args.csv else sys.stdout
+    try:
+        w = csv.writer(out)
+        w.writerow(headers)
+        for (campaign, instance), st in sorted(stats.items()):
+            w.writerow([campaign, instance, st['n']] + [
+                '' if math.isnan(st[col]) else round(st[col], places) for col, places in SUMMARY_STATS])
+    finally:
+        if args.csv:
+            out.close()
+    print(f'{len(table)} rep(s), {len(stats)} (campaign, instance) group(s) in '
+          f'{time.perf_counter() - started:.2f} s', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
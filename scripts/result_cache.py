@@ -0,0 +1,294 @@
+"""
+Content-addressed on-disk cache of solver results.
+
+A result is keyed by what determines it: a hash of the solver binary (or
+native library), a hash of the instance file contents, the algorithm, the
+normalized solver options, the timeout and the seed. ``bench_utils.run_solver``
+and friends consult the cache when one is enabled, so a rep that any campaign
+already ran with the same seed is not solved again (e.g. the default-config
+baseline shared by every ablation parameter).
+
+Results with the seed left out of the key form a pool of exchangeable samples
+of one configuration. A campaign that does not fix seeds can ``claim`` cached
+samples instead of running new reps; each sample is handed to a campaign at
+most once, so reps within a campaign stay independent.
+
+The index is a SQLite file in the cache directory. When its payload grows past
+``max_bytes`` the least recently used results are evicted; the running payload
+total is kept in the index, updated in the same transaction as each insert and
+eviction.
+
+Enable it for this process and any harness processes it spawns with::
+
+    import result_cache
+    result_cache.enable('results/.solver_cache', max_bytes=512 * 2**20)
+
+or by setting ``$SUDACO_RESULT_CACHE`` (and optionally
+``$SUDACO_RESULT_CACHE_MAX_MB``). ``off`` disables it, also for the processes
+started from here.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+ENV_DIR = 'SUDACO_RESULT_CACHE'
+ENV_MAX_MB = 'SUDACO_RESULT_CACHE_MAX_MB'
+DEFAULT_MAX_BYTES = 256 * 2**20
+INDEX_NAME = 'index.sqlite'
+
+# Options that are part of the key on their own, or do not affect the result.
+_NON_RESULT_OPTIONS = {'file', 'puzzle', 'alg', 'timeout', 'seed', 'seeds', 'reps',
+                       'format', 'solution', 'verbose', 'showinitial'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    config TEXT NOT NULL,
+    seed INTEGER,
+    success INTEGER NOT NULL,
+    time REAL,
+    cycles REAL,
+    record TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_config ON results (config);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS claims (
+    campaign TEXT NOT NULL,
+    result_id INTEGER NOT NULL,
+    PRIMARY KEY (campaign, result_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+"""
+
+_hash_memo: dict[tuple, str] = {}
+_hash_lock = threading.Lock()
+
+
+def file_digest(path) -> str:
+    """sha256 of a file's contents, memoized on (path, size, mtime)."""
+    p = Path(path)
+    st = p.stat()
+    memo_key = (str(p.resolve()), st.st_size, st.st_mtime_ns)
+    with _hash_lock:
+        digest = _hash_memo.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(p, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _hash_lock:
+            _hash_memo[memo_key] = digest
+    return digest
+
+
+def _normalize_value(value: str) -> str:
+    try:
+        return repr(float(value))
+    except ValueError:
+        return value
+
+
+def normalize_args(extra_args) -> list[tuple[str, str]]:
+    """Solver options as sorted ``(name, value)`` pairs; later duplicates win, as in
+    solvermain, and numeric spellings (``0.9`` / ``0.90``) compare equal."""
+    opts = {}
+    tokens = [str(a) for a in (extra_args or [])]
+    for i, tok in enumerate(tokens):
+        if not tok.startswith('--') or len(tok) <= 2:
+            continue
+        name = tok[2:]
+        if name in _NON_RESULT_OPTIONS:
+            continue
+        has_value = i + 1 < len(tokens) and not tokens[i + 1].startswith('--')
+        opts[name] = _normalize_value(tokens[i + 1]) if has_value else '1'
+    return sorted(opts.items())
+
+
+def config_key(solver_path, file_path, alg, timeout, extra_args=None) -> str:
+    """Key of a configuration: everything that determines a result except the seed."""
+    parts = {
+        'solver': file_digest(solver_path),
+        'instance': file_digest(file_path),
+        'alg': int(alg),
+        'timeout': float(timeout),
+        'args': normalize_args(extra_args),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def result_key(config: str, seed) -> str:
+    return f'{config}:{int(seed)}'
+
+
+class ResultCache:
+    """SQLite-indexed result store in ``directory``; safe across threads and processes."""
+
+    def __init__(self, directory, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.directory / INDEX_NAME), timeout=60,
+                                     check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        # indexes created before the running total was kept: count them once
+        self._conn.execute('INSERT OR IGNORE INTO meta (id, bytes) '
+                           'SELECT 0, COALESCE(SUM(size), 0) FROM results')
+
+    def get(self, config: str, seed):
+        """Cached record dict for ``(config, seed)``, or None."""
+        if seed is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT id, record FROM results WHERE key = ?', (result_key(config, seed),)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE results SET last_used = ? WHERE id = ?', (time.time(), row[0]))
+        return json.loads(row[1])
+
+    def put(self, config: str, record: dict, campaign: str | None = None) -> None:
+        """Store a solver record (must carry its ``seed``). With ``campaign`` the
+        result also counts as claimed by that campaign."""
+        seed = record.get('seed')
+        if seed is None:
+            return
+        record = {k: v for k, v in record.items() if k != 'rep'}
+        payload = json.dumps(record, sort_keys=True)
+        size = len(payload) + len(config) + 64
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                old = self._conn.execute(
+                    'SELECT size FROM results WHERE key = ?', (result_key(config, seed),)).fetchone()
+                # upsert in place: the row keeps its id, so its claims stay attached
+                self._conn.execute(
+                    'INSERT INTO results '
+                    '(key, config, seed, success, time, cycles, record, size, last_used) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET config = excluded.config, seed = excluded.seed, '
+                    'success = excluded.success, time = excluded.time, cycles = excluded.cycles, '
+                    'record = excluded.record, size = excluded.size, last_used = excluded.last_used',
+                    (result_key(config, seed), config, int(seed), 1 if record.get('success') else 0,
+                     record.get('time'), record.get('cycles'), payload, size, time.time()))
+                self._conn.execute('UPDATE meta SET bytes = bytes + ? WHERE id = 0',
+                                   (size - (old[0] if old else 0),))
+                if campaign is not None:
+                    self._conn.execute(
+                        'INSERT OR IGNORE INTO claims (campaign, result_id) '
+                        'SELECT ?, id FROM results WHERE key = ?',
+                        (campaign, result_key(config, seed)))
+                self._evict_locked()
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def claim(self, config: str, campaign: str, n: int) -> list[dict]:
+        """Hand up to ``n`` cached records of ``config`` not yet used by ``campaign``
+        to it, oldest first."""
+        if n <= 0:
+            return []
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._conn.execute(
+                    'SELECT id, record FROM results WHERE config = ? AND id NOT IN '
+                    '(SELECT result_id FROM claims WHERE campaign = ?) ORDER BY id LIMIT ?',
+                    (config, campaign, int(n))).fetchall()
+                now = time.time()
+                for rid, _record in rows:
+                    self._conn.execute('INSERT INTO claims (campaign, result_id) VALUES (?, ?)',
+                                       (campaign, rid))
+                    self._conn.execute('UPDATE results SET last_used = ? WHERE id = ?', (now, rid))
+                self._conn.execute('COMMIT')
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+        return [json.loads(record) for _rid, record in rows]
+
+    def _evict_locked(self) -> None:
+        total = self._conn.execute('SELECT bytes FROM meta WHERE id = 0').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # evict down to 90% so a full cache does not evict on every insert
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for rid, size in self._conn.execute('SELECT id, size FROM results ORDER BY last_used'):
+            victims.append((rid,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany('DELETE FROM results WHERE id = ?', victims)
+        self._conn.executemany('DELETE FROM claims WHERE result_id = ?', victims)
+        self._conn.execute('UPDATE meta SET bytes = bytes - ? WHERE id = 0', (freed,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+            total = self._conn.execute('SELECT bytes FROM meta WHERE id = 0').fetchone()[0]
+        return {'results': n, 'bytes': total, 'max_bytes': self.max_bytes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_active: ResultCache | None = None
+_active_lock = threading.Lock()
+
+
+def enable(directory, max_bytes: int | None = None) -> ResultCache:
+    """Turn the cache on for this process and, through the environment, for the
+    harness processes it starts (``off`` turns it off)."""
+    os.environ[ENV_DIR] = str(directory) if str(directory) == 'off' else str(Path(directory).resolve())
+    if max_bytes is not None:
+        os.environ[ENV_MAX_MB] = str(max_bytes / 2**20)
+    return active()
+
+
+def active() -> ResultCache | None:
+    """The cache configured by the environment, or None when caching is off."""
+    global _active
+    directory = os.environ.get(ENV_DIR)
+    if not directory or directory == 'off':
+        return None
+    max_mb = os.environ.get(ENV_MAX_MB)
+    max_bytes = int(float(max_mb) * 2**20) if max_mb else DEFAULT_MAX_BYTES
+    with _active_lock:
+        if _active is None or _active.directory != Path(directory) or _active.max_bytes != max_bytes:
+            _active = ResultCache(directory, max_bytes)
+        return _active
+
+
+def add_cli_options(ap) -> None:
+    """``--result-cache DIR`` / ``--result-cache-mb N`` for the benchmark scripts."""
+    ap.add_argument('--result-cache', default=None, metavar='DIR',
+                    help=f'Reuse solver results cached in DIR (also ${ENV_DIR}); '
+                         'fixed-seed reps already run are skipped, "off" disables the cache')
+    ap.add_argument('--result-cache-mb', type=float, default=None,
+                    help=f'Result cache size limit in MB, least recently used evicted first '
+                         f'(default: {DEFAULT_MAX_BYTES // 2**20})')
+
+
+def enable_from_args(args) -> ResultCache | None:
+    if getattr(args, 'result_cache', None):
+        max_mb = getattr(args, 'result_cache_mb', None)
+        return enable(args.result_cache, None if max_mb is None else int(max_mb * 2**20))
+    return active()
@@ -43,13 +43,23 @@ except ImportError:
     except ImportError:
         HAS_FCNTL = False
 
+import adaptive_reps
 import bench_best_config
+import campaign_scheduler
+import job_journal
+import job_queue
+import rep_stats
+import rep_store
+import result_cache
 
 from bench_utils import (
+    SolverInterruptedError,
+    claim_cached_reps,
     default_binary,
+    progress_row_interrupted,
+    rep_seed,
     run_solver,
-    safe_mean,
-    safe_std,
+    run_solver_batch,
 )
 
 
@@ -100,8 +110,9 @@ def _read_completed_instances_from_summary(outfile: Path):
     return completed
 
 
-def _read_progress(progress_file: Path):
-    """Read per-rep progress.
+def _read_progress(progress_file: Path, keep_interrupted: bool = False):
+    """Read per-rep progress. Reps recorded as interrupted (stopped by a signal)
+    are left out so they run again, unless ``keep_interrupted`` counts them as failures.
 
     Returns:
         dict[str, dict[int, tuple[bool, float, float]]]
@@ -123,6 +134,8 @@ def _read_progress(progress_file: Path):
                     rep = int(rep_s)
                 except ValueError:
                     continue
+                if progress_row_interrupted(row) and not keep_interrupted:
+                    continue
                 success = row.get('success', '').strip() in ('1', 'true', 'True')
                 t = math.nan
                 cyc = math.nan
@@ -173,35 +186,13 @@ def _append_csv_row(path: Path, row, vlog):
 
 def _summary_row_from_rep_map(rep_map, args, alg_name):
     """Compute summary row from a full rep_map (for multi-worker when we re-read progress)."""
-    successes = 0
-    times = []
-    cycles_solved = []
-    for _rep, (succ, t, cyc) in sorted(rep_map.items()):
-        if succ:
-            successes += 1
-            times.append(t)
-            if not math.isnan(cyc):
-                cycles_solved.append(cyc)
-    succ_pct = (successes / float(args.reps)) * 100.0
-    time_mean = safe_mean(times)
-    time_std = safe_std(times)
-    cycles_mean = safe_mean(cycles_solved)
-    cycles_std = safe_std(cycles_solved)
-    return [
-        None,
-        args.alg,
-        alg_name,
-        round(succ_pct, 2),
-        round(time_mean, 6) if not math.isnan(time_mean) else '',
-        round(time_std, 6) if not math.isnan(time_std) else '',
-        round(cycles_mean, 3) if not math.isnan(cycles_mean) else '',
-        round(cycles_std, 3) if not math.isnan(cycles_std) else '',
-    ]
+    acc = rep_stats.RepStats.from_reps(rep_map.values())
+    return [None, args.alg, alg_name] + rep_stats.summary_cells(acc, args.reps, tail=args.tail_latency)
 
 
 def _try_write_summary_if_complete(outfile: Path, progress_file: Path, instance_name, args, alg_name, vlog):
     """If this instance has args.reps in progress file, write summary row once (thread-safe)."""
-    progress = _read_progress(progress_file)
+    progress = _read_progress(progress_file, args.keep_interrupted)
     rep_map = progress.get(instance_name, {})
     if len(rep_map) < args.reps:
         return False
@@ -256,6 +247,23 @@ def main():
     ap.add_argument('--pool-workers', type=int, default=None,
                     help='Child processes with shared job queue (unfinished reps). '
                          'Mutually exclusive with --num-workers > 1 or non-zero --worker-id.')
+    ap.add_argument('--native', action='store_true',
+                    help='With --pool-workers: solve in-process with the native library (make libsudaco.so)')
+    ap.add_argument('--batch-reps', type=int, default=10,
+                    help='Reps solved per solver process in the serial loop (default: 10; 1 = one process per rep)')
+    ap.add_argument('--seed', type=int, default=None,
+                    help='Base seed: each (instance, rep) gets a seed derived from it, so results reproduce '
+                         'regardless of workers or batching (default: random; seeds are recorded in the progress CSV)')
+    ap.add_argument('--keep-interrupted', action='store_true',
+                    help='Count reps stopped by SIGTERM/SIGINT as failed reps at their elapsed time '
+                         'instead of running them again on resume')
+    result_cache.add_cli_options(ap)
+    rep_store.add_cli_options(ap)
+    campaign_scheduler.add_cli_options(ap)
+    adaptive_reps.add_cli_options(ap)
+    rep_stats.add_cli_options(ap)
+    job_queue.add_cli_options(ap)
+    job_journal.add_cli_options(ap)
     ap.add_argument('--verbose', action='store_true', help='Print progress while running instances')
     # Factor overrides (optional)
     ap.add_argument('--nAnts', type=int, help='Override nAnts (int)')
@@ -271,6 +279,10 @@ def main():
         help='Load hyperparameters from ablation best_config.json (default path if flag has no value). '
              'Requires --alg 2. Output: best_config_results_16x16_*.csv under --outdir')
     args = ap.parse_args()
+    result_cache.enable_from_args(args)
+    rep_store.enable_from_args(args)
+    campaign_scheduler.enable_from_args(args)
+    journal = job_journal.enable_from_args(args)
     if args.run < 1:
         ap.error('--run must be >= 1')
     if args.best_config is not None and args.alg != 2:
@@ -279,6 +291,8 @@ def main():
         ap.error('--worker-id must be in 0..num-workers-1')
     if args.num_workers < 1:
         ap.error('--num-workers must be >= 1')
+    if args.batch_reps < 1:
+        ap.error('--batch-reps must be >= 1')
     if args.pool_workers is not None:
         if args.pool_workers < 1:
             ap.error('--pool-workers must be >= 1')
@@ -286,6 +300,16 @@ def main():
             ap.error('Do not combine --pool-workers with --num-workers > 1')
         if args.worker_id != 0:
             ap.error('Do not combine --pool-workers with non-zero --worker-id')
+    if args.native and args.pool_workers is None:
+        ap.error('--native requires --pool-workers')
+    if args.adaptive and args.pool_workers is None:
+        ap.error('--adaptive requires --pool-workers')
+    if args.distributed and args.pool_workers is None:
+        ap.error('--distributed requires --pool-workers')
+    if args.distributed and args.native:
+        ap.error('Do not combine --distributed with --native')
+    if journal is not None and args.pool_workers is None:
+        ap.error('--journal requires --pool-workers')
 
     binary = args.binary
     instances_dir = Path(args.instances)
@@ -309,7 +333,7 @@ def main():
 
     # Read existing summary + per-rep progress
     completed_instances = _read_completed_instances_from_summary(outfile)
-    progress = _read_progress(progress_file)
+    progress = _read_progress(progress_file, args.keep_interrupted)
     if completed_instances:
         vlog(f"Auto-resuming: Found {len(completed_instances)} completed instance(s) in summary CSV")
     if progress:
@@ -360,11 +384,17 @@ def main():
 
     # Summary CSV (one row per instance, only when all reps are finished)
     summary_headers = ['instance', 'alg', 'alg_name', 'success_%', 'time_mean', 'time_std', 'cycles_mean', 'cycles_std']
+    summary_headers += rep_stats.summary_columns(args)
+    rep_stats.check_summary_header(outfile, args.tail_latency)
+    if args.adaptive:
+        summary_headers += adaptive_reps.SUMMARY_COLUMNS
+        adaptive_reps.check_summary_header(outfile, adaptive_reps.rule_from_args(args))
     _ensure_csv_header(outfile, summary_headers)
 
     # Progress CSV (one row per rep)
-    progress_headers = ['instance', 'alg', 'alg_name', 'rep', 'success', 'time', 'cycles']
-    _ensure_csv_header(progress_file, progress_headers)
+    progress_headers = ['instance', 'alg', 'alg_name', 'rep', 'success', 'time', 'cycles', 'seed', 'interrupted']
+    if journal is None:
+        _ensure_csv_header(progress_file, progress_headers)
 
     if args.pool_workers is not None:
         import bench_pool_jobs
@@ -380,6 +410,7 @@ def main():
             completed_instances=completed_instances,
             progress={k: dict(v) for k, v in progress.items()},
             vlog=vlog,
+            native=args.native,
         )
         return
 
@@ -394,30 +425,17 @@ def main():
         rep_map = progress.get(fp.name, {})
         done_reps = set(rep_map.keys())
 
-        successes = 0
-        times = []
-        cycles_solved = []
-        for _rep, (succ, t, cyc) in sorted(rep_map.items()):
-            if succ:
-                successes += 1
-                times.append(t)
-                if not math.isnan(cyc):
-                    cycles_solved.append(cyc)
+        acc = rep_stats.RepStats.from_reps(rep_map.values())
 
         if done_reps:
             vlog(f"[{idx}/{total_instances}] {fp.name} [RESUME reps={len(done_reps)}/{args.reps}]")
         else:
             vlog(f"[{idx}/{total_instances}] {fp.name}")
 
-        my_reps = list(range(args.worker_id + 1, args.reps + 1, args.num_workers))
-        for rep in my_reps:
-            if rep in done_reps:
-                continue
+        def record_rep(rep, success, t, cyc, seed, interrupted=False):
             if args.verbose and rep % 10 == 0:
                 vlog(f"  Rep {rep}/{args.reps}")
 
-            success, t, cyc, out = run_solver(binary, fp, args.alg, args.timeout, extra_args=factor_args)
-
             progress_row = [
                 fp.name,
                 args.alg,
@@ -426,45 +444,68 @@ def main():
                 1 if success else 0,
                 '' if math.isnan(t) else t,
                 '' if math.isnan(cyc) else cyc,
+                seed,
+                1 if interrupted else 0,
             ]
             if not _append_csv_row(progress_file, progress_row, vlog):
                 vlog("  ERROR: Could not write progress row; continuing anyway.")
+            if interrupted and not args.keep_interrupted:
+                return
 
             rep_map[rep] = (success, t, cyc)
             done_reps.add(rep)
-            if success:
-                successes += 1
-                times.append(t)
-                if not math.isnan(cyc):
-                    cycles_solved.append(cyc)
+            acc.add(success, t, cyc)
 
             if args.num_workers > 1 and _try_write_summary_if_complete(
                     outfile, progress_file, fp.name, args, alg_name, vlog):
                 completed_instances.add(fp.name)
                 vlog(f"  => instance complete (summary written by this worker)")
 
+        my_reps = list(range(args.worker_id + 1, args.reps + 1, args.num_workers))
+        pending_reps = [rep for rep in my_reps if rep not in done_reps]
+        campaign = str(progress_file.resolve())
+        if args.seed is None:
+            # Unseeded reps are exchangeable: take cached results of this configuration first.
+            cached = claim_cached_reps(binary, fp, args.alg, args.timeout, factor_args, campaign, len(pending_reps))
+            for rep, (success, t, cyc, rseed) in zip(pending_reps, cached):
+                record_rep(rep, success, t, cyc, rseed)
+            pending_reps = pending_reps[len(cached):]
+        # Claim --batch-reps reps per solver process; the solver reads the
+        # instance and runs initial CP once per block instead of once per rep.
+        for start in range(0, len(pending_reps), args.batch_reps):
+            block = pending_reps[start:start + args.batch_reps]
+            seeds = [rep_seed(fp.name, rep, args.seed) for rep in block]
+            finished = set()
+            try:
+                if len(block) == 1:
+                    success, t, cyc, _out = run_solver(
+                        binary, fp, args.alg, args.timeout, extra_args=factor_args, seed=seeds[0], campaign=campaign)
+                    record_rep(block[0], success, t, cyc, seeds[0])
+                else:
+                    def on_result(i, success, t, cyc):
+                        finished.add(i)
+                        record_rep(block[i], success, t, cyc, seeds[i])
+                    run_solver_batch(
+                        binary, fp, args.alg, args.timeout, len(block), extra_args=factor_args, seeds=seeds,
+                        campaign=campaign, on_result=on_result)
+            except SolverInterruptedError as e:
+                # The solver was stopped by a signal: keep its partial rep as interrupted and stop here.
+                if e.record is not None:
+                    i = min(set(range(len(block))) - finished)
+                    t = float(e.record.get('time', math.nan))
+                    cyc = float(e.record.get('cycles', math.nan))
+                    record_rep(block[i], False, t, cyc, seeds[i], interrupted=True)
+                print(f"Interrupted at {fp.name}: {e} Re-run with the same arguments to resume.", flush=True)
+                raise SystemExit(1)
+
         if args.num_workers == 1 and len(done_reps) < args.reps:
             vlog(f"  => partial progress saved ({len(done_reps)}/{args.reps} reps).")
             progress[fp.name] = rep_map
             continue
 
         if args.num_workers == 1 and len(done_reps) >= args.reps:
-            succ_pct = (successes / float(args.reps)) * 100.0
-            time_mean = safe_mean(times)
-            time_std = safe_std(times)
-            cycles_mean = safe_mean(cycles_solved)
-            cycles_std = safe_std(cycles_solved)
-
-            summary_row = [
-                fp.name,
-                args.alg,
-                alg_name,
-                round(succ_pct, 2),
-                round(time_mean, 6) if not math.isnan(time_mean) else '',
-                round(time_std, 6) if not math.isnan(time_std) else '',
-                round(cycles_mean, 3) if not math.isnan(cycles_mean) else '',
-                round(cycles_std, 3) if not math.isnan(cycles_std) else '',
-            ]
+            summary_row = [fp.name, args.alg, alg_name] + rep_stats.summary_cells(
+                acc, args.reps, tail=args.tail_latency)
 
             written = _append_csv_row(outfile, summary_row, vlog)
             if written:
@@ -473,9 +514,9 @@ def main():
                 vlog(f"  ERROR: Could not write result to CSV file!")
 
             vlog(
-                f"  => success%={round(succ_pct, 2)} "
-                f"time_mean={round(time_mean, 6) if not math.isnan(time_mean) else 'N/A'} "
-                f"cycles_mean={round(cycles_mean, 3) if not math.isnan(cycles_mean) else 'N/A'} "
+                f"  => success%={summary_row[3]} "
+                f"time_mean={summary_row[4] if summary_row[4] != '' else 'N/A'} "
+                f"cycles_mean={summary_row[6] if summary_row[6] != '' else 'N/A'} "
                 f"[Saved]"
             )
         elif args.num_workers > 1 and fp.name not in completed_instances:
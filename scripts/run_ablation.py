@@ -15,6 +15,8 @@ use ``python scripts/run_algo_timeout_comparison.py`` for that.
 
 Each puzzle is run 100 times (configurable via --reps) for each parameter value.
 The script supports resume: if interrupted, re-running picks up where it left off.
+With ``--journal PATH`` per-rep progress and summary rows are kept in a SQLite
+journal (``job_journal``); the CSVs are written from it.
 
 Usage:
   python scripts/run_ablation.py                                # Run all parameters, all sizes
@@ -48,7 +50,21 @@ except ImportError:
     except ImportError:
         HAS_FCNTL = False
 
-from bench_utils import default_binary, run_solver, safe_mean, safe_std
+import adaptive_reps
+import campaign_scheduler
+import consolidation_cache
+import group_stats
+import job_journal
+import rep_stats
+import rep_store
+import result_cache
+from bench_utils import (
+    claim_cached_reps,
+    default_binary,
+    rep_seed,
+    run_solver,
+    run_solver_batch,
+)
 
 # ============================================================
 # Configuration
@@ -118,7 +134,7 @@ SUMMARY_HEADERS = [
 ]
 
 PROGRESS_HEADERS = [
-    'instance', 'rep', 'success', 'time', 'cycles',
+    'instance', 'rep', 'success', 'time', 'cycles', 'seed',
 ]
 
 
@@ -185,8 +201,27 @@ def append_csv_row(path, row):
     return False
 
 
+def record_progress_row(progress_file, row):
+    """Record one rep: journaled with ``--journal``, else appended to the progress CSV."""
+    journal = job_journal.campaign(progress_file)
+    if journal is not None:
+        return journal.record_rep(row)
+    return append_csv_row(progress_file, row)
+
+
+def write_summary_row(summary_file, instance_name, row):
+    """Append an instance's summary row (once per instance with ``--journal``)."""
+    journal = job_journal.campaign(summary_file)
+    if journal is not None:
+        return journal.finalize(instance_name, row)
+    return append_csv_row(summary_file, row)
+
+
 def read_progress(progress_file):
     """Read per-rep progress → dict[instance_name → dict[rep → (success, time, cycles)]]"""
+    journal = job_journal.campaign(progress_file)
+    if journal is not None:
+        return journal.progress()
     prog = {}
     if not progress_file.exists():
         return prog
@@ -223,6 +258,9 @@ def read_progress(progress_file):
 
 
 def read_completed_from_summary(summary_file):
+    journal = job_journal.campaign(summary_file)
+    if journal is not None:
+        return journal.completed()
     completed = set()
     if not summary_file.exists():
         return completed
@@ -361,6 +399,13 @@ def delete_ablation_progress_if_summary_done(
     tag: str,
 ):
     """Delete progress CSV when the summary lists every expected instance."""
+    journal = job_journal.campaign(summary_file)
+    if journal is not None and all_instance_names:
+        # also drops the journaled reps, or exports the progress CSV while incomplete
+        had_file = progress_file.exists()
+        if journal.finish(all_instance_names) and had_file:
+            vlog(f'  [{tag}] Summary complete; removed {progress_file.name}')
+        return
     if not summary_file.exists() or not all_instance_names:
         return
     completed = read_completed_from_summary(summary_file)
@@ -381,8 +426,18 @@ def delete_ablation_progress_if_summary_done(
 
 def run_ablation_test(binary, param_name, param_value, size_name, size_cfg,
                       reps, outdir, vlog, timeout_override=None,
-                      worker_id: int = 0, num_workers: int = 1):
-    """Run all instances for one (param, value, size) combo. Returns summary rows."""
+                      worker_id: int = 0, num_workers: int = 1,
+                      batch_reps: int = 10, seed=None, rule=None, tail: bool = False):
+    """Run all instances for one (param, value, size) combo. Returns summary rows.
+
+    Pending reps are solved ``batch_reps`` at a time per solver process
+    (``run_solver_batch``); each rep is still written to progress as it finishes.
+    With a base ``seed`` every value of a parameter sees the same per-(instance,
+    rep) seeds, so configurations are compared on common random numbers.
+    With an ``adaptive_reps.StoppingRule`` an instance stops once the rule is met
+    (``reps`` is its maximum) and its summary row records the reps and the reason.
+    With ``tail`` the rows carry the ``rep_stats.TAIL_COLUMNS`` after ``cycles_std``.
+    """
 
     val_str = format_param_value(param_name, param_value)
     tag = f'{param_name}={val_str} [{size_name}]'
@@ -403,6 +458,9 @@ def run_ablation_test(binary, param_name, param_value, size_name, size_cfg,
         return []
 
     all_instance_names = {fp.name for fp in instances_all}
+    summary_headers = (SUMMARY_HEADERS + (rep_stats.TAIL_COLUMNS if tail else [])
+                       + (adaptive_reps.SUMMARY_COLUMNS if rule else []))
+    journal = job_journal.open_campaign(progress_file, summary_file, PROGRESS_HEADERS, summary_headers)
 
     # Partition instances deterministically across workers so each worker handles
     # a disjoint subset of instances (prevents duplicate summary rows).
@@ -434,9 +492,12 @@ def run_ablation_test(binary, param_name, param_value, size_name, size_cfg,
 
     progress = read_progress(progress_file)
 
-    ensure_csv_header(summary_file, SUMMARY_HEADERS)
+    adaptive_reps.check_summary_header(summary_file, rule)
+    rep_stats.check_summary_header(summary_file, tail)
+    ensure_csv_header(summary_file, summary_headers)
     # Only create progress.csv when we actually need to resume/continue work.
-    ensure_csv_header(progress_file, PROGRESS_HEADERS)
+    if journal is None:
+        ensure_csv_header(progress_file, PROGRESS_HEADERS)
 
     subset_names = {fp.name for fp in instances}
     completed_in_subset = completed.intersection(subset_names)
@@ -455,64 +516,81 @@ def run_ablation_test(binary, param_name, param_value, size_name, size_cfg,
         rep_map = progress.get(fp.name, {})
         done_reps = set(rep_map.keys())
 
-        successes = 0
-        times = []
-        cycles_solved = []
-        for _r, (succ, t, cyc) in sorted(rep_map.items()):
-            if succ:
-                successes += 1
-                times.append(t)
-                if not math.isnan(cyc):
-                    cycles_solved.append(cyc)
+        # the journal keeps the instance's accumulator; the progress CSV is re-read
+        acc = journal.stats(fp.name) if journal is not None else rep_stats.RepStats.from_reps(rep_map.values())
 
         status = f'RESUME {len(done_reps)}/{reps}' if done_reps else ''
         vlog(f'  [{tag}] ({idx}/{total}) {fp.name} {status}')
 
-        for rep in range(1, reps + 1):
-            if rep in done_reps:
-                continue
-
-            success, t, cyc, out = run_solver(binary, fp, ALG, timeout, extra_args=extra_args)
-
+        def record_rep(rep, success, t, cyc, rseed):
             status_str = 'OK' if success else 'FAIL'
             t_str = f'{t:.4f}s' if not math.isnan(t) else 'N/A'
             vlog(f'    Rep {rep}/{reps}: {status_str} (time={t_str})')
 
             prog_row = [fp.name, rep, 1 if success else 0,
                         '' if math.isnan(t) else t,
-                        '' if math.isnan(cyc) else cyc]
-            append_csv_row(progress_file, prog_row)
+                        '' if math.isnan(cyc) else cyc, rseed]
+            record_progress_row(progress_file, prog_row)
 
             rep_map[rep] = (success, t, cyc)
             done_reps.add(rep)
-            if success:
-                successes += 1
-                times.append(t)
-                if not math.isnan(cyc):
-                    cycles_solved.append(cyc)
+            acc.add(success, t, cyc)
+
+        pending_reps = [rep for rep in range(1, reps + 1) if rep not in done_reps]
+        campaign = str(progress_file.resolve())
+        if seed is None:
+            # Unseeded reps are exchangeable: take cached results of this configuration first.
+            cached = claim_cached_reps(binary, fp, ALG, timeout, extra_args, campaign, len(pending_reps))
+            for rep, (success, t, cyc, rseed) in zip(pending_reps, cached):
+                record_rep(rep, success, t, cyc, rseed)
+            pending_reps = pending_reps[len(cached):]
+
+        def run_block(block):
+            seeds = [rep_seed(fp.name, rep, seed) for rep in block]
+            if len(block) == 1:
+                success, t, cyc, _out = run_solver(
+                    binary, fp, ALG, timeout, extra_args=extra_args, seed=seeds[0], campaign=campaign)
+                record_rep(block[0], success, t, cyc, seeds[0])
+            else:
+                run_solver_batch(
+                    binary, fp, ALG, timeout, len(block), extra_args=extra_args, seeds=seeds,
+                    campaign=campaign,
+                    on_result=lambda i, success, t, cyc: record_rep(block[i], success, t, cyc, seeds[i]))
+
+        stop = None
+        if rule is None:
+            for start in range(0, len(pending_reps), max(1, batch_reps)):
+                run_block(pending_reps[start:start + max(1, batch_reps)])
+        else:
+            # a few reps at a time, until reps 1..k settle the instance
+            while (stop := rule.decide(rep_map)) is None:
+                block = rule.next_reps(rep_map)[:max(1, batch_reps)]
+                if not block:
+                    break
+                run_block(block)
+                if not any(rep in rep_map for rep in block):
+                    break  # the solver recorded nothing; leave the instance partial
 
-        if len(done_reps) < reps:
+        incomplete = stop is None if rule is not None else len(done_reps) < reps
+        if incomplete:
             vlog(f'    => partial ({len(done_reps)}/{reps})')
             progress[fp.name] = rep_map
             continue
 
-        succ_pct = (successes / float(reps)) * 100.0
-        tm = safe_mean(times)
-        ts = safe_std(times)
-        cm = safe_mean(cycles_solved)
-        cs = safe_std(cycles_solved)
-
-        row = [
-            param_value, size_name, fp.name,
-            ALG, ALG_NAME,
-            round(succ_pct, 2),
-            round(tm, 6) if not math.isnan(tm) else '',
-            round(ts, 6) if not math.isnan(ts) else '',
-            round(cm, 3) if not math.isnan(cm) else '',
-            round(cs, 3) if not math.isnan(cs) else '',
-        ]
-
-        if append_csv_row(summary_file, row):
+        n_reps = reps
+        if stop is not None:
+            n_reps = stop[0]
+            acc = rep_stats.RepStats.from_reps(adaptive_reps.settled_reps(rep_map, stop).values())
+
+        succ_pct = acc.success_pct(n_reps)
+        tm = acc.time.mean()
+        cm = acc.cycles.mean()
+
+        row = [param_value, size_name, fp.name, ALG, ALG_NAME] + rep_stats.summary_cells(acc, n_reps, tail=tail)
+        if stop is not None:
+            row += [stop[0], stop[1]]
+
+        if write_summary_row(summary_file, fp.name, row):
             completed.add(fp.name)
             summary_rows.append(row)
             completed_now = read_completed_from_summary(summary_file)
@@ -521,7 +599,8 @@ def run_ablation_test(binary, param_name, param_value, size_name, size_cfg,
                 delete_ablation_progress_if_summary_done(
                     progress_file, summary_file, all_instance_names, vlog, tag)
             vlog(f'    => success%={round(succ_pct,2)} '
-                 f'time_mean={round(tm,6) if not math.isnan(tm) else "N/A"} '
+                 + (f'reps={stop[0]} ({stop[1]}) ' if stop is not None else '')
+                 + f'time_mean={round(tm,6) if not math.isnan(tm) else "N/A"} '
                  f'cycles_mean={round(cm,3) if not math.isnan(cm) else "N/A"}')
         else:
             vlog(f'    ERROR: Could not write summary for {fp.name}')
@@ -542,6 +621,44 @@ def _coerce_param_for_config(param_name, value_str):
     return float(s)
 
 
+def _best_config_partial(csv_file, alg_num, size_name=None, by_value=True):
+    """
+    Partial aggregate of one summary CSV for ``compute_best_config_overall``: per
+    ``param_value`` (a single ``''`` group with ``by_value=False``), the row count and
+    [count, sum] of the non-NaN ``success_%`` and ``time_mean`` values over the rows of
+    algorithm ``alg_num`` (and ``size_name``).
+    """
+    cols = group_stats.read_csv(csv_file, keys=('alg', 'puzzle_size', 'param_value'),
+                                values=('success_%', 'time_mean'))
+    keep = cols['alg'] == str(alg_num)
+    if size_name is not None:
+        keep &= cols['puzzle_size'] == size_name
+    if by_value:
+        keep &= cols['param_value'] != ''
+    if not keep.any():
+        return {}
+    # every kept row has the same alg: one group when not split by value
+    by = group_stats.GroupBy(cols['param_value' if by_value else 'alg'][keep])
+    rows = by.size()
+    moments = {}
+    for name, col in (('succ', 'success_%'), ('time', 'time_mean')):
+        x = cols[col][keep]
+        moments[name] = (by.count(x), by.sum(x))
+    return {
+        (label if by_value else ''): {
+            'rows': int(rows[j]),
+            **{name: [int(cnt[j]), float(total[j])] for name, (cnt, total) in moments.items()}}
+        for j, (label,) in enumerate(by.labels)
+    }
+
+
+def _merge_best_config_partial(agg, pv, part):
+    data = agg.setdefault(pv, {'rows': 0, 'succ': [0, 0.0], 'time': [0, 0.0]})
+    data['rows'] += part['rows']
+    data['succ'] = consolidation_cache.merge_moments(data['succ'], part['succ'])
+    data['time'] = consolidation_cache.merge_moments(data['time'], part['time'])
+
+
 def _append_default_baseline_instances(agg, param_name, alg_num):
     """
     Same instance-level source as ``consolidate_ablation_summaries.add_default_runs``:
@@ -558,16 +675,13 @@ def _append_default_baseline_instances(agg, param_name, alg_num):
         if not bench.exists():
             continue
         try:
-            with open(bench, 'r', newline='') as f:
-                for row in csv.DictReader(f):
-                    if str(row.get('alg', '')).strip() != str(alg_num):
-                        continue
-                    sp = parse_floatish(row.get('success_%'))
-                    tm = parse_floatish(row.get('time_mean'))
-                    agg[key]['succ'].append(sp)
-                    agg[key]['time'].append(tm)
+            partial = consolidation_cache.partial(
+                f'best-config-default-alg{alg_num}', bench,
+                lambda f: _best_config_partial(f, alg_num, by_value=False))
         except Exception:
             continue
+        for part in partial.values():
+            _merge_best_config_partial(agg, key, part)
 
 
 def _default_baseline_summary_rows(param_name):
@@ -622,13 +736,11 @@ def compute_best_config_overall(outdir, alg_num='2'):
       detail_rows: one row per parameter (for Excel), including ``n_instances``.
       best_config: single dict (same keys as DEFAULTS).
     """
-    from collections import defaultdict
-
     detail_rows = []
     best_config = dict(DEFAULTS)
 
     for param_name, pcfg in PARAM_TESTS.items():
-        agg = defaultdict(lambda: {'succ': [], 'time': []})
+        agg = {}
         param_dir = outdir / param_name
         if param_dir.exists():
             for csv_file in sorted(param_dir.glob('*_summary.csv')):
@@ -636,21 +748,14 @@ def compute_best_config_overall(outdir, alg_num='2'):
                 if sz not in SIZE_CONFIGS:
                     continue
                 try:
-                    with open(csv_file, 'r', newline='') as f:
-                        for row in csv.DictReader(f):
-                            if str(row.get('alg', '')).strip() != str(alg_num):
-                                continue
-                            if (row.get('puzzle_size') or '').strip() != sz:
-                                continue
-                            pv = str(row.get('param_value', '')).strip()
-                            if not pv:
-                                continue
-                            sp = parse_floatish(row.get('success_%'))
-                            tm = parse_floatish(row.get('time_mean'))
-                            agg[pv]['succ'].append(sp)
-                            agg[pv]['time'].append(tm)
+                    # unchanged summaries are served from the consolidation cache
+                    partial = consolidation_cache.partial(
+                        f'best-config-alg{alg_num}', csv_file,
+                        lambda f, sz=sz: _best_config_partial(f, alg_num, sz))
                 except Exception:
                     continue
+                for pv, part in partial.items():
+                    _merge_best_config_partial(agg, pv, part)
 
         _append_default_baseline_instances(agg, param_name, alg_num)
 
@@ -660,8 +765,8 @@ def compute_best_config_overall(outdir, alg_num='2'):
         best_pv = None
         best_key = None
         for pv, data in agg.items():
-            ms = safe_mean(data['succ'])
-            mt = safe_mean(data['time'])
+            ms = consolidation_cache.moments_mean(data['succ'])
+            mt = consolidation_cache.moments_mean(data['time'])
             mt_key = mt if not math.isnan(mt) else float('inf')
             key = (ms, -mt_key)
             if best_key is None or key > best_key:
@@ -673,9 +778,9 @@ def compute_best_config_overall(outdir, alg_num='2'):
 
         coerced = _coerce_param_for_config(param_name, best_pv)
         best_config[param_name] = coerced
-        ms = safe_mean(agg[best_pv]['succ'])
-        mt = safe_mean(agg[best_pv]['time'])
-        n_inst = len(agg[best_pv]['succ'])
+        ms = consolidation_cache.moments_mean(agg[best_pv]['succ'])
+        mt = consolidation_cache.moments_mean(agg[best_pv]['time'])
+        n_inst = agg[best_pv]['rows']
         detail_rows.append({
             'param_name': param_name,
             'label': pcfg['label'],
@@ -778,7 +883,24 @@ def main():
                     help='Worker index for partitioning instance set (0-based)')
     ap.add_argument('--num-workers', type=int, default=1,
                     help='Number of workers partitioning one (param,value,size) job')
+    ap.add_argument('--batch-reps', type=int, default=10,
+                    help='Reps solved per solver process (default: 10; 1 = one process per rep)')
+    ap.add_argument('--seed', type=int, default=None,
+                    help='Base seed for per-(instance, rep) solver seeds (default: random; '
+                         'seeds are recorded in the progress CSVs)')
+    result_cache.add_cli_options(ap)
+    rep_store.add_cli_options(ap)
+    consolidation_cache.add_cli_options(ap)
+    campaign_scheduler.add_cli_options(ap, priority=False)
+    adaptive_reps.add_cli_options(ap)
+    rep_stats.add_cli_options(ap)
+    job_journal.add_cli_options(ap)
     args = ap.parse_args()
+    result_cache.enable_from_args(args)
+    rep_store.enable_from_args(args)
+    consolidation_cache.enable_from_args(args)
+    campaign_scheduler.enable_from_args(args)
+    job_journal.enable_from_args(args)
 
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
@@ -884,7 +1006,9 @@ def main():
                 run_ablation_test(
                     binary, param_name, value, size_name, size_cfg,
                     args.reps, outdir, vlog,
-                    worker_id=worker_id, num_workers=num_workers)
+                    worker_id=worker_id, num_workers=num_workers,
+                    batch_reps=args.batch_reps, seed=args.seed,
+                    rule=adaptive_reps.rule_from_args(args), tail=args.tail_latency)
 
     if not args.no_consolidate:
         vlog(f'\n{"="*70}')
@@ -9,21 +9,43 @@ Each (param,value,size) run is split deterministically across `--workers-per-val
 workers using `--worker-id/--num-workers`, so no two workers write the same
 instance summary rows.
 
-The scheduler is global: when any worker finishes, it immediately takes the
-next pending worker-task (from any parameter/value run), keeping the CPU busy.
+Worker tasks are units of one ``campaign_scheduler.CampaignScheduler``: when any
+worker finishes, the next pending worker-task (from any parameter/value run, in
+``--priority`` order) starts, keeping the CPU busy. Solver runs of all workers
+share the machine-wide solver slots, so other campaigns running at the same
+time are not oversubscribed. ``--control-file`` changes the number of concurrent
+worker tasks while they run.
+
+With ``--refresh-reports`` the consolidated CSV and the workbook are rebuilt
+whenever all workers of one (param,value,size) run are done, not only at the
+end; the consolidation cache (``scripts/consolidation_cache.py``) keeps each
+rebuild to the summaries that changed.
+
+With ``--distributed URL`` this process hosts a ``job_queue.Coordinator`` and the
+workers' solver runs go to worker agents on other machines; the number of
+concurrent worker tasks then follows the agents' solver processes.
 """
 
 import argparse
+import asyncio
 import csv
 import os
 import subprocess
 import sys
-import time
 from pathlib import Path
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import adaptive_reps  # noqa: E402
+import campaign_scheduler  # noqa: E402
+import cpu_affinity  # noqa: E402
+import job_journal  # noqa: E402
+import job_queue  # noqa: E402
+import rep_stats  # noqa: E402
+import rep_store  # noqa: E402
 
 # Import config from the main runner (constants only; no main execution).
 from scripts.run_ablation import PARAM_TESTS, SIZE_CONFIGS  # noqa: E402
@@ -97,9 +119,22 @@ def main():
                     help="Number of worker partitions per (param,value,size) run (default: 2)")
     ap.add_argument("--log-dir", default=str(Path("logs") / "ablation_parallel"),
                     help="Per-job log directory")
-    ap.add_argument("--poll-seconds", type=float, default=1.0,
-                    help="How often to poll running processes")
+    ap.add_argument("--no-consolidate", action="store_true",
+                    help="Skip the Excel consolidation after the worker tasks (scripts/pipeline.py runs it as its own stage)")
+    ap.add_argument("--refresh-reports", action="store_true",
+                    help="Rebuild the consolidated CSV and the workbook after every finished "
+                         "(param,value,size) run (only new summaries are re-read)")
+    campaign_scheduler.add_cli_options(ap)
+    adaptive_reps.add_cli_options(ap)
+    rep_stats.add_cli_options(ap)
+    job_queue.add_cli_options(ap)
+    job_journal.add_cli_options(ap)
+    rep_store.add_cli_options(ap)
     args = ap.parse_args()
+    campaign_scheduler.enable_from_args(args)
+    # exported to the environment: the workers journal their reps there too
+    job_journal.enable_from_args(args)
+    rep_store.enable_from_args(args)
 
     workers_per_value = max(1, int(args.workers_per_value))
 
@@ -112,6 +147,7 @@ def main():
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
     ablation_outdir = outdir
+    cpu_affinity.record_layout(outdir)
 
     log_dir = Path(args.log_dir)
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -133,7 +169,16 @@ def main():
                     # Skip finished runs so we don't create logs/procs after restart.
                     continue
                 for worker_id in range(workers_per_value):
-                    worker_tasks.append((pname, pval, size_arg, worker_id))
+                    worker_tasks.append({
+                        "campaign": f"{pname}={pval}",
+                        "config": size_name,
+                        "size_name": size_name,
+                        "instance": None,
+                        "rep": worker_id,
+                        "param": pname,
+                        "value": pval,
+                        "size_arg": size_arg,
+                    })
 
     if not worker_tasks:
         print("No jobs to run.")
@@ -147,8 +192,11 @@ def main():
     runner = REPO_ROOT / "scripts" / "run_ablation.py"
     python = sys.executable
 
-    def launch_worker_task(task):
-        param_name, param_value, size_arg, worker_id = task
+    async def run_worker_task(task):
+        param_name = task["param"]
+        param_value = task["value"]
+        size_arg = task["size_arg"]
+        worker_id = task["rep"]
         val_str = str(param_value)
         safe_val_str = val_str.replace(os.sep, "_").replace(" ", "")
         # One log per (param, value, size); all workers append here (do not use --quiet
@@ -184,41 +232,90 @@ def main():
             str(worker_id),
             "--num-workers",
             str(workers_per_value),
-        ]
-        env = os.environ.copy()
+        ] + adaptive_reps.cli_args(args) + rep_stats.cli_args(args)
+        env = child_env.copy()
         env.setdefault("PYTHONUNBUFFERED", "1")
-        proc = subprocess.Popen(
-            cmd,
-            cwd=str(REPO_ROOT),
-            stdout=fh,
-            stderr=subprocess.STDOUT,
-            universal_newlines=True,
-            env=env,
-        )
-        return {"proc": proc, "fh": fh, "log_path": log_path}
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(REPO_ROOT),
+                stdout=fh,
+                stderr=asyncio.subprocess.STDOUT,
+                env=env,
+            )
+            ret = await proc.wait()
+        finally:
+            fh.close()
+        print(f"Worker task finished (exit={ret}): {log_path}", flush=True)
+        run_key = (param_name, param_value, task["size_name"])
+        remaining[run_key] -= 1
+        if args.refresh_reports and remaining[run_key] == 0:
+            schedule_refresh()
+        return ret
+
+    remaining = {}
+    for task in worker_tasks:
+        run_key = (task["param"], task["value"], task["size_name"])
+        remaining[run_key] = remaining.get(run_key, 0) + 1
+
+    refresh = {"task": None, "again": False}
+    refresh_cmds = [
+        [python, str(REPO_ROOT / "scripts" / "consolidate_ablation_summaries.py")],
+        [python, str(runner), "--consolidate", "--outdir", str(outdir), "--quiet"],
+    ]
+
+    async def refresh_reports():
+        # One refresh at a time; runs finishing meanwhile are folded into one more pass.
+        # The consolidation cache keeps each pass to the summaries that changed.
+        while True:
+            refresh["again"] = False
+            with open(log_dir / "refresh_reports.log", "a", encoding="utf-8", newline="\n") as fh:
+                for cmd in refresh_cmds:
+                    proc = await asyncio.create_subprocess_exec(
+                        *cmd, cwd=str(REPO_ROOT), stdout=fh, stderr=asyncio.subprocess.STDOUT)
+                    if await proc.wait() != 0:
+                        print(f"WARNING: report refresh step failed: {' '.join(cmd[1:])}", flush=True)
+            if not refresh["again"]:
+                break
+        refresh["task"] = None
+
+    def schedule_refresh():
+        if refresh["task"] is not None:
+            refresh["again"] = True
+            return
+        refresh["task"] = asyncio.ensure_future(refresh_reports())
 
     # Global worker scheduling: any finished worker takes the next task.
-    job_queue = worker_tasks[:]
-    running = []
-    while job_queue or running:
-        while job_queue and len(running) < max_jobs:
-            running.append(launch_worker_task(job_queue.pop(0)))
-
-        finished_indices = []
-        for i, item in enumerate(running):
-            ret = item["proc"].poll()
-            if ret is not None:
-                item["fh"].close()
-                finished_indices.append((i, ret))
-
-        for i, ret in reversed(finished_indices):
-            print(f"Worker task finished (exit={ret}): {running[i]['log_path']}")
-            running.pop(i)
-
-        if job_queue and len(running) >= max_jobs:
-            time.sleep(args.poll_seconds)
-        elif running:
-            time.sleep(args.poll_seconds)
+    scheduler = campaign_scheduler.CampaignScheduler(args.priority, max_concurrency=max_jobs)
+    scheduler.add_group("ablation", max_jobs)
+    for task in worker_tasks:
+        scheduler.submit(task, "ablation")
+
+    def report_error(task, _ret, exc):
+        if exc is not None:
+            print(f"Worker task {task['campaign']} size={task['size_arg']} failed to run: {exc}", flush=True)
+
+    child_env = os.environ.copy()
+    if args.distributed:
+        # children send their solver runs to the coordinator hosted below
+        child_env = job_queue.coordinator_env(args.distributed)
+
+    async def run_all():
+        if not args.distributed:
+            await scheduler.run(run_worker_task, on_result=report_error,
+                                control=campaign_scheduler.control_from_args(args))
+        else:
+            async with job_queue.Coordinator(args.distributed) as coordinator:
+                # one solve in flight per worker task: run as many tasks as agents have solvers
+                await scheduler.run(run_worker_task, on_result=report_error,
+                                    control=coordinator.capacity_control())
+        if refresh["task"] is not None:
+            await refresh["task"]
+
+    asyncio.run(run_all())
+    if args.no_consolidate:
+        print("All worker tasks done.")
+        return
 
     # Consolidate once at the end (avoid concurrent Excel writers).
     # run_ablation.py now delegates to scripts/build_ablation_results_excel.py
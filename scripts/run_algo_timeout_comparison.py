@@ -16,15 +16,27 @@ Outputs (default ``results/ablation/timeout``):
 
 Parallel mode:
   --workers-per-alg 4
-    Per puzzle size, each worker runs the full timeout grid for its algorithm.
-    Start 4 workers on ACO (alg 0) and 4 on CP-DCM-ACO (alg 2).
-    Workers use atomic per-instance claims (safe work-stealing), and once one
-    algorithm finishes, those worker slots can transfer to help the other
-    algorithm finish the same size phase.
+    Per puzzle size, every (algorithm, timeout, instance, rep) unit goes into one
+    ``campaign_scheduler.CampaignScheduler`` and runs on 8 persistent solver
+    processes: 4 slots for ACO (alg 0) and 4 for CP-DCM-ACO (alg 2). Units are
+    queued timeout by timeout; once one algorithm has no units left, its slots
+    move to the other algorithm for the rest of the size phase.
+
+Derived timeouts:
+  --derive-timeouts
+    The timeout only stops a solver run; it does not change the search. So a rep
+    run at the longest timeout of the size grid (e.g. 180 s for 25x25) with the
+    same seed also answers the shorter ones: solved at t <= T counts as solved at
+    T with the same time and cycles, anything else as a failure. Each rep runs
+    once at the longest timeout, and the shorter-timeout summary CSVs (same
+    schema) are derived from its progress rows as each instance completes,
+    instead of running them as separate matrices. With ``--seed`` the derived
+    summaries are what the separate runs would have recorded, up to timing noise
+    near the timeout.
 
 Logging (default ``logs/timeout_comparison/``):
-  timeout_orchestrator.log — parent process: phases, worker launches, Excel consolidation
-  timeout_alg0.log — ACO (merged from parallel worker sessions, or direct tee in serial mode)
+  timeout_orchestrator.log — parent process: phases, Excel consolidation
+  timeout_alg0.log — ACO reps (serial tee, or per-rep lines in parallel mode)
   timeout_alg2.log — CP-DCM-ACO (same)
 
   pip install openpyxl
@@ -33,14 +45,10 @@ Logging (default ``logs/timeout_comparison/``):
 from __future__ import annotations
 
 import argparse
-import csv
+import asyncio
 import json
 import math
-import os
-import shutil
-import subprocess
 import sys
-import time
 from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
@@ -49,9 +57,19 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+import campaign_scheduler  # noqa: E402
+import consolidation_cache  # noqa: E402
+import cpu_affinity  # noqa: E402
+import group_stats  # noqa: E402
+import job_queue  # noqa: E402
+import rep_store  # noqa: E402
+import result_cache  # noqa: E402
 from bench_utils import (  # noqa: E402
     SolverInterruptedError,
+    claim_cached_reps,
     default_binary,
+    install_stop_handlers,
+    rep_seed,
     run_solver,
     safe_mean,
     safe_std,
@@ -119,89 +137,6 @@ class _TeeStdout:
         return self._primary.isatty()
 
 
-def _append_session_to_alg_log(
-    log_dir: Path,
-    alg: int,
-    session_path: Path,
-    header: str,
-) -> None:
-    """Append one worker session file into the per-algorithm log, then remove the session."""
-    dest = log_dir / f'timeout_alg{alg}.log'
-    with open(dest, 'a', encoding='utf-8', newline='\n') as out:
-        out.write('\n')
-        out.write('=' * 72 + '\n')
-        out.write(f'[{_log_timestamp()}] {header}\n')
-        out.write('=' * 72 + '\n')
-        if session_path.exists():
-            with open(session_path, encoding='utf-8', errors='replace') as inc:
-                shutil.copyfileobj(inc, out)
-    try:
-        session_path.unlink()
-    except OSError:
-        pass
-
-
-def _try_claim_instance(
-    claim_dir: Path,
-    instance_name: str,
-    *,
-    worker_id: int,
-    num_workers: int,
-    stale_seconds: int = 12 * 60 * 60,
-) -> Path | None:
-    """
-    Atomically claim one instance using O_EXCL file creation.
-    Returns claim path on success, else None.
-    """
-    claim_dir.mkdir(parents=True, exist_ok=True)
-    claim_path = claim_dir / f'{instance_name}.claim'
-
-    def _create() -> bool:
-        try:
-            fd = os.open(str(claim_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-            try:
-                msg = (
-                    f'worker_id={worker_id}\n'
-                    f'num_workers={num_workers}\n'
-                    f'claimed_at={time.time():.6f}\n'
-                )
-                os.write(fd, msg.encode('utf-8', errors='replace'))
-            finally:
-                os.close(fd)
-            return True
-        except FileExistsError:
-            return False
-        except OSError:
-            return False
-
-    if _create():
-        return claim_path
-
-    # Reclaim stale claims from crashed workers.
-    try:
-        age = time.time() - claim_path.stat().st_mtime
-        if age > float(stale_seconds):
-            try:
-                claim_path.unlink()
-            except OSError:
-                return None
-            if _create():
-                return claim_path
-    except OSError:
-        return None
-
-    return None
-
-
-def _release_claim(claim_path: Path | None) -> None:
-    if claim_path is None:
-        return
-    try:
-        claim_path.unlink()
-    except OSError:
-        pass
-
-
 def load_best_config(path: Path) -> dict:
     """
     Return ``{ '9x9': cfg, '16x16': cfg, '25x25': cfg }`` with the same hyperparameters
@@ -237,6 +172,71 @@ def load_best_config(path: Path) -> dict:
     return {sz: dict(single) for sz in SIZE_CONFIGS}
 
 
+def _timeout_paths(outdir: Path, alg: int, timeout_sec: int, size_name: str):
+    """``(progress_file, summary_file)`` of one (algorithm, timeout, size) matrix."""
+    val_str = format_param_value('timeout', timeout_sec)
+    sub = outdir / f'alg_{alg}'
+    sub.mkdir(parents=True, exist_ok=True)
+    return sub / f'{val_str}_{size_name}_progress.csv', sub / f'{val_str}_{size_name}_summary.csv'
+
+
+def _timeout_summary_row(timeout_sec, size_name, instance, alg, alg_name, rep_map, reps):
+    """Summary CSV row (``SUMMARY_HEADERS``) of one instance from its per-rep results."""
+    successes = 0
+    times = []
+    cycles_solved = []
+    for _r, (succ, t, cyc) in sorted(rep_map.items()):
+        if succ:
+            successes += 1
+            times.append(t)
+            if not math.isnan(cyc):
+                cycles_solved.append(cyc)
+    succ_pct = (successes / float(reps)) * 100.0
+    tm = safe_mean(times)
+    ts = safe_std(times)
+    cm = safe_mean(cycles_solved)
+    cs = safe_std(cycles_solved)
+    return [
+        timeout_sec, size_name, instance,
+        alg, alg_name,
+        round(succ_pct, 2),
+        round(tm, 6) if not math.isnan(tm) else '',
+        round(ts, 6) if not math.isnan(ts) else '',
+        round(cm, 3) if not math.isnan(cm) else '',
+        round(cs, 3) if not math.isnan(cs) else '',
+    ]
+
+
+def _derive_rep_map(rep_map, timeout_sec):
+    """Per-rep results of a longer-timeout run as they would have been at ``timeout_sec``."""
+    derived = {}
+    for rep, (succ, t, cyc) in rep_map.items():
+        if succ and not math.isnan(t) and t <= timeout_sec:
+            derived[rep] = (True, t, cyc)
+        else:
+            derived[rep] = (False, math.nan, math.nan)
+    return derived
+
+
+def _append_derived_summaries(outdir, alg, alg_name, size_name, instance, rep_map, reps, timeouts):
+    """
+    Append the row of ``instance``, derived from its reps at a longer timeout, to
+    the summary of each timeout in ``timeouts`` that lacks it; return the timeouts
+    written.
+    """
+    written = []
+    for timeout_sec in timeouts:
+        _progress_file, summary_file = _timeout_paths(outdir, alg, timeout_sec, size_name)
+        if instance in read_completed_from_summary(summary_file):
+            continue
+        ensure_csv_header(summary_file, SUMMARY_HEADERS)
+        row = _timeout_summary_row(timeout_sec, size_name, instance, alg, alg_name,
+                                   _derive_rep_map(rep_map, timeout_sec), reps)
+        if append_csv_row(summary_file, row):
+            written.append(timeout_sec)
+    return written
+
+
 def run_timeout_job(
     binary,
     alg: int,
@@ -250,17 +250,20 @@ def run_timeout_job(
     vlog,
     worker_id: int = 0,
     num_workers: int = 1,
-    dynamic_claims: bool = False,
+    seed=None,
+    derive_timeouts=(),
+    only=None,
 ):
-    """One (algorithm, timeout, size) matrix; param_value column stores timeout for traceability."""
+    """One (algorithm, timeout, size) matrix; param_value column stores timeout for traceability.
+
+    With a base ``seed`` every timeout runs rep r of an instance on the same solver seed.
+    Each completed instance's row is also derived into the summaries of
+    ``derive_timeouts`` (shorter timeouts). ``only`` restricts the run to these
+    instance names.
+    """
     val_str = format_param_value('timeout', timeout_sec)
     tag = f'alg{alg} timeout={val_str}s [{size_name}]'
-
-    sub = outdir / f'alg_{alg}'
-    sub.mkdir(parents=True, exist_ok=True)
-
-    progress_file = sub / f'{val_str}_{size_name}_progress.csv'
-    summary_file = sub / f'{val_str}_{size_name}_summary.csv'
+    progress_file, summary_file = _timeout_paths(outdir, alg, timeout_sec, size_name)
     timeout = int(timeout_sec)
 
     instances_all = scan_instances(size_cfg['dir'])
@@ -271,18 +274,14 @@ def run_timeout_job(
     all_instance_names = {fp.name for fp in instances_all}
     num_workers = max(1, int(num_workers))
     worker_id = int(worker_id) % num_workers
-    dynamic_claims = bool(dynamic_claims and num_workers > 1)
-
-    if dynamic_claims:
-        instances = instances_all
-    else:
-        instances = [
-            fp for i, fp in enumerate(instances_all)
-            if (i % num_workers) == worker_id
-        ]
-        if not instances:
-            vlog(f'  Worker {worker_id}/{num_workers} has no instances')
-            return
+
+    instances = [
+        fp for i, fp in enumerate(instances_all)
+        if (i % num_workers) == worker_id and (only is None or fp.name in only)
+    ]
+    if not instances:
+        vlog(f'  Worker {worker_id}/{num_workers} has no instances')
+        return
 
     completed = read_completed_from_summary(summary_file)
     completed_overall = len(completed.intersection(all_instance_names))
@@ -301,38 +300,37 @@ def run_timeout_job(
     completed_in_subset = completed.intersection(subset_names)
     total = len(instances)
     if completed_in_subset:
-        mode = 'claim' if dynamic_claims else 'shard'
-        vlog(f'  [{tag}] Worker {worker_id}/{num_workers} ({mode}) resuming '
+        vlog(f'  [{tag}] Worker {worker_id}/{num_workers} resuming '
              f'{len(completed_in_subset)}/{total} instances')
 
-    claim_dir = sub / '.claims' / f'{val_str}_{size_name}'
-
     def _process_instance(fp: Path, idx_label: str):
         rep_map = progress.get(fp.name, {})
         done_reps = set(rep_map.keys())
 
-        successes = 0
-        times = []
-        cycles_solved = []
-        for _r, (succ, t, cyc) in sorted(rep_map.items()):
-            if succ:
-                successes += 1
-                times.append(t)
-                if not math.isnan(cyc):
-                    cycles_solved.append(cyc)
-
         status = f'RESUME {len(done_reps)}/{reps}' if done_reps else ''
         vlog(f'  [{tag}] {idx_label} {fp.name} {status}')
 
+        campaign = str(progress_file.resolve())
+        cached_reps = {}
+        if seed is None:
+            # unseeded reps are exchangeable: use cached results of this configuration first
+            missing = [rep for rep in range(1, reps + 1) if rep not in done_reps]
+            cached = claim_cached_reps(binary, fp, alg, timeout, extra_args, campaign, len(missing))
+            cached_reps = dict(zip(missing, cached))
+
         for rep in range(1, reps + 1):
             if rep in done_reps:
                 continue
-            try:
-                success, t, cyc, out = run_solver(
-                    binary, fp, alg, timeout, extra_args=extra_args)
-            except SolverInterruptedError:
-                vlog(f'    Rep {rep}/{reps}: INTERRUPTED; not recorded (will resume)')
-                break
+            if rep in cached_reps:
+                success, t, cyc, rseed = cached_reps[rep]
+            else:
+                rseed = rep_seed(fp.name, rep, seed)
+                try:
+                    success, t, cyc, out = run_solver(
+                        binary, fp, alg, timeout, extra_args=extra_args, seed=rseed, campaign=campaign)
+                except SolverInterruptedError:
+                    vlog(f'    Rep {rep}/{reps}: INTERRUPTED; not recorded (will resume)')
+                    break
 
             status_str = 'OK' if success else 'FAIL'
             t_str = f'{t:.4f}s' if not math.isnan(t) else 'N/A'
@@ -340,37 +338,20 @@ def run_timeout_job(
 
             prog_row = [fp.name, rep, 1 if success else 0,
                         '' if math.isnan(t) else t,
-                        '' if math.isnan(cyc) else cyc]
+                        '' if math.isnan(cyc) else cyc, rseed]
             append_csv_row(progress_file, prog_row)
 
             rep_map[rep] = (success, t, cyc)
             done_reps.add(rep)
-            if success:
-                successes += 1
-                times.append(t)
-                if not math.isnan(cyc):
-                    cycles_solved.append(cyc)
 
         if len(done_reps) < reps:
             vlog(f'    => partial ({len(done_reps)}/{reps})')
             progress[fp.name] = rep_map
             return
 
-        succ_pct = (successes / float(reps)) * 100.0
-        tm = safe_mean(times)
-        ts = safe_std(times)
-        cm = safe_mean(cycles_solved)
-        cs = safe_std(cycles_solved)
-
-        row = [
-            timeout_sec, size_name, fp.name,
-            alg, alg_name,
-            round(succ_pct, 2),
-            round(tm, 6) if not math.isnan(tm) else '',
-            round(ts, 6) if not math.isnan(ts) else '',
-            round(cm, 3) if not math.isnan(cm) else '',
-            round(cs, 3) if not math.isnan(cs) else '',
-        ]
+        # derived rows first: once this summary lists the instance its progress may be deleted
+        _append_derived_summaries(outdir, alg, alg_name, size_name, fp.name, rep_map, reps, derive_timeouts)
+        row = _timeout_summary_row(timeout_sec, size_name, fp.name, alg, alg_name, rep_map, reps)
         if append_csv_row(summary_file, row):
             completed.add(fp.name)
             completed_now = read_completed_from_summary(summary_file)
@@ -382,101 +363,37 @@ def run_timeout_job(
             vlog(f'    ERROR: could not write summary for {fp.name}')
         progress[fp.name] = rep_map
 
-    if dynamic_claims:
-        idle_loops = 0
-        while True:
-            completed_now = read_completed_from_summary(summary_file)
-            done_global = len(completed_now.intersection(all_instance_names))
-            if done_global >= len(instances_all):
-                break
-
-            claimed_fp = None
-            claimed_path = None
-            for idx, fp in enumerate(instances_all, 1):
-                if fp.name in completed_now:
-                    continue
-                cp = _try_claim_instance(
-                    claim_dir,
-                    fp.name,
-                    worker_id=worker_id,
-                    num_workers=num_workers,
-                )
-                if cp is not None:
-                    claimed_fp = fp
-                    claimed_path = cp
-                    try:
-                        _process_instance(fp, f'({idx}/{len(instances_all)}) [claim]')
-                    finally:
-                        _release_claim(claimed_path)
-                    idle_loops = 0
-                    break
-
-            if claimed_fp is None:
-                idle_loops += 1
-                if idle_loops == 1 or idle_loops % 20 == 0:
-                    vlog(
-                        f'  [{tag}] Worker {worker_id}/{num_workers} waiting for claimable '
-                        f'instances ({done_global}/{len(instances_all)} complete)'
-                    )
-                time.sleep(0.5)
-    else:
-        for idx, fp in enumerate(instances, 1):
-            if fp.name in completed:
-                continue
-            _process_instance(fp, f'({idx}/{total})')
+    for idx, fp in enumerate(instances, 1):
+        if fp.name in completed:
+            continue
+        _process_instance(fp, f'({idx}/{total})')
 
     delete_ablation_progress_if_summary_done(
         progress_file, summary_file, all_instance_names, vlog, tag)
 
 
-def wait_for_timeout_matrix_complete(
-    *,
-    outdir: Path,
-    alg: int,
-    timeout_sec: int,
-    size_name: str,
-    size_cfg: dict,
-    alg_name: str,
-    vlog,
-    poll_seconds: float = 2.0,
-) -> None:
-    """Block until summary for (alg, timeout, size) contains every instance."""
-    instances_all = scan_instances(size_cfg['dir'])
-    all_instance_names = {fp.name for fp in instances_all}
-    total = len(all_instance_names)
-    if total == 0:
-        return
+TIMEOUT_STATS = ('success_%', 'time_mean', 'time_std', 'cycles_mean', 'cycles_std')
 
-    val_str = format_param_value('timeout', timeout_sec)
-    summary_file = outdir / f'alg_{alg}' / f'{val_str}_{size_name}_summary.csv'
-
-    last_done = -1
-    last_log_ts = 0.0
-    while True:
-        completed = read_completed_from_summary(summary_file)
-        done = len(completed.intersection(all_instance_names))
-        if done >= total:
-            if last_done != done:
-                vlog(
-                    f'  [BARRIER] {alg_name} timeout={timeout_sec}s {size_name}: '
-                    f'global complete ({done}/{total}); proceeding.'
-                )
-            return
 
-        now = time.time()
-        if done != last_done or (now - last_log_ts) >= 30.0:
-            vlog(
-                f'  [BARRIER] {alg_name} timeout={timeout_sec}s {size_name}: '
-                f'waiting for global completion ({done}/{total})'
-            )
-            last_done = done
-            last_log_ts = now
-        time.sleep(max(0.2, float(poll_seconds)))
+def _timeout_summary_partial(csv_file: Path):
+    """Per-file aggregate of one timeout summary CSV (None when it has no rows)."""
+    cols = group_stats.read_csv(csv_file, keys=('instance',), values=TIMEOUT_STATS)
+    named = cols['instance'] != ''
+    if not named.any():
+        return None
+    # Defensive de-dup: keep last row per instance.
+    last = named.nonzero()[0][group_stats.GroupBy(cols['instance'][named]).last_rows()]
+    out = {'instances': len(last)}
+    for stat, key in zip(TIMEOUT_STATS, ('success_mean', 'time_mean_mean', 'time_std_mean',
+                                         'cycles_mean_mean', 'cycles_std_mean')):
+        out[key] = group_stats.nanmean(cols[stat][last])
+    return out
 
 
 def collect_timeout_aggregates(outdir: Path):
     """
     Aggregate summary CSVs into rows per (timeout, puzzle_size, algorithm).
+    Per-file aggregates of unchanged CSVs come from the consolidation cache.
     """
     rows_agg = []
     for alg_id, alg_name in ALGORITHMS:
@@ -493,85 +410,40 @@ def collect_timeout_aggregates(outdir: Path):
             if size_name not in SIZE_CONFIGS:
                 continue
 
-            by_instance = {}
             try:
-                with open(csv_file, 'r', newline='') as f:
-                    for row in csv.DictReader(f):
-                        inst = (row.get('instance') or '').strip()
-                        if inst:
-                            # Defensive de-dup: keep last row per instance.
-                            by_instance[inst] = row
+                partial = consolidation_cache.partial('timeout-summary', csv_file, _timeout_summary_partial)
             except Exception:
                 continue
-
-            if not by_instance:
+            if partial is None:
                 continue
 
-            succ_vals = []
-            tmean_vals = []
-            tstd_vals = []
-            cmean_vals = []
-            cstd_vals = []
-            for row in by_instance.values():
-                try:
-                    succ_vals.append(float(row.get('success_%') or 'nan'))
-                except Exception:
-                    succ_vals.append(float('nan'))
-                try:
-                    tmean_vals.append(float(row.get('time_mean') or 'nan'))
-                except Exception:
-                    tmean_vals.append(float('nan'))
-                try:
-                    tstd_vals.append(float(row.get('time_std') or 'nan'))
-                except Exception:
-                    tstd_vals.append(float('nan'))
-                try:
-                    cmean_vals.append(float(row.get('cycles_mean') or 'nan'))
-                except Exception:
-                    cmean_vals.append(float('nan'))
-                try:
-                    cstd_vals.append(float(row.get('cycles_std') or 'nan'))
-                except Exception:
-                    cstd_vals.append(float('nan'))
-
             rows_agg.append({
                 'timeout_s': timeout_part,
                 'puzzle_size': size_name,
                 'alg': alg_id,
                 'alg_name': alg_name,
-                'instances': len(succ_vals),
-                'success_mean': safe_mean(succ_vals),
-                'time_mean_mean': safe_mean(tmean_vals),
-                'time_std_mean': safe_mean(tstd_vals),
-                'cycles_mean_mean': safe_mean(cmean_vals),
-                'cycles_std_mean': safe_mean(cstd_vals),
+                **partial,
             })
 
     rows_agg.sort(key=lambda r: (SIZE_SORT.get(r['puzzle_size'], 99), r['timeout_s'], r['alg']))
     return rows_agg
 
 
-def _write_sheet_table(ws, row_idx, title, headers, rows, header_font, header_fill, thin_border):
-    ws.cell(row=row_idx, column=1, value=title).font = header_font
-    row_idx += 1
-    for c, h in enumerate(headers, 1):
-        cell = ws.cell(row=row_idx, column=c, value=h)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.border = thin_border
-    row_idx += 1
+def _write_sheet_table(sheet, title, headers, rows):
+    sheet.append([title], style='bold')
+    sheet.append(headers, style='header-fill')
     for r in rows:
-        for c, v in enumerate(r, 1):
-            cell = ws.cell(row=row_idx, column=c, value=v)
-            cell.border = thin_border
-        row_idx += 1
-    return row_idx + 1
+        sheet.append(r, style='cell')
+    sheet.skip()
+
+
+def _round5(value: float):
+    return round(value, 5) if not math.isnan(value) else ''
 
 
 def consolidate_timeout_excel(outdir: Path, excel_path: Path) -> bool:
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, PatternFill, Border, Side
+        import excel_export
     except ImportError:
         print('ERROR: openpyxl required. pip install openpyxl')
         return False
@@ -581,51 +453,41 @@ def consolidate_timeout_excel(outdir: Path, excel_path: Path) -> bool:
         print('No timeout comparison summaries found to consolidate.')
         return False
 
-    wb = Workbook()
-    wb.remove(wb.active)
-    header_font = Font(bold=True)
-    header_fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin'))
+    headers = [
+        'Timeout (s)', 'Algorithm ID', 'Algorithm',
+        'Instances', 'Mean success %', 'Mean time (s)',
+    ]
 
+    def write_size(size_rows):
+        def write(ws):
+            sheet = excel_export.SheetWriter(ws, freeze='A2')
+            sheet.append(headers, style='header-fill')
+            for r in size_rows:
+                sheet.append([
+                    r['timeout_s'], r['alg'], r['alg_name'],
+                    r['instances'],
+                    _round5(r['success_mean']),
+                    _round5(r['time_mean_mean']),
+                ], style='cell')
+            sheet.close()
+        return write
+
+    sheets = []
     for size_name in SIZE_CONFIGS:
         size_rows = [r for r in rows_agg if r['puzzle_size'] == size_name]
-        if not size_rows:
-            continue
-        title = f'Timeout cmp {size_name}'[:31]
-        ws = wb.create_sheet(title=title)
-        headers = [
-            'Timeout (s)', 'Algorithm ID', 'Algorithm',
-            'Instances', 'Mean success %', 'Mean time (s)',
-        ]
-        for c, h in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=c, value=h)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = thin_border
-        for r_idx, r in enumerate(size_rows, 2):
-            vals = [
-                r['timeout_s'], r['alg'], r['alg_name'],
-                r['instances'],
-                round(r['success_mean'], 5) if not math.isnan(r['success_mean']) else '',
-                round(r['time_mean_mean'], 5) if not math.isnan(r['time_mean_mean']) else '',
-            ]
-            for c, v in enumerate(vals, 1):
-                cell = ws.cell(row=r_idx, column=c, value=v)
-                cell.border = thin_border
-        ws.freeze_panes = 'A2'
-
-    excel_path.parent.mkdir(parents=True, exist_ok=True)
-    wb.save(str(excel_path))
+        if size_rows:
+            sheets.append((f'Timeout cmp {size_name}'[:31], write_size(size_rows)))
+
+    excel_export.save_workbook(excel_path, sheets)
     print(f'Saved: {excel_path}')
     return True
 
 
 def merge_timeout_into_ablation_workbook(outdir: Path, ablation_excel_path: Path) -> bool:
+    """Regenerate the 'Timeout results' sheet of the ablation workbook; its other
+    sheets are kept as they are (``excel_export.update_sheet``)."""
     try:
-        from openpyxl import Workbook, load_workbook
-        from openpyxl.styles import Font, PatternFill, Border, Side
+        import excel_export
     except ImportError:
         print('ERROR: openpyxl required. pip install openpyxl')
         return False
@@ -635,35 +497,16 @@ def merge_timeout_into_ablation_workbook(outdir: Path, ablation_excel_path: Path
         print('No timeout comparison summaries found to merge into ablation workbook.')
         return False
 
-    if ablation_excel_path.exists():
-        wb = load_workbook(str(ablation_excel_path))
-    else:
-        wb = Workbook()
-
-    if 'Timeout results' in wb.sheetnames:
-        del wb['Timeout results']
-    if 'Sheet' in wb.sheetnames and len(wb.sheetnames) == 1:
-        ws0 = wb['Sheet']
-        if ws0.max_row <= 1 and ws0.max_column <= 1 and ws0['A1'].value is None:
-            del wb['Sheet']
-
-    ws = wb.create_sheet(title='Timeout results')
-    header_font = Font(bold=True)
-    header_fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin'))
-
     aco_rows = []
     dcm_rows = []
     for r in rows_agg:
         out_row = [
             r['puzzle_size'], r['timeout_s'], r['instances'],
-            round(r['success_mean'], 5) if not math.isnan(r['success_mean']) else '',
-            round(r['time_mean_mean'], 5) if not math.isnan(r['time_mean_mean']) else '',
-            round(r['time_std_mean'], 5) if not math.isnan(r['time_std_mean']) else '',
-            round(r['cycles_mean_mean'], 5) if not math.isnan(r['cycles_mean_mean']) else '',
-            round(r['cycles_std_mean'], 5) if not math.isnan(r['cycles_std_mean']) else '',
+            _round5(r['success_mean']),
+            _round5(r['time_mean_mean']),
+            _round5(r['time_std_mean']),
+            _round5(r['cycles_mean_mean']),
+            _round5(r['cycles_std_mean']),
         ]
         if r['alg'] == 0:
             aco_rows.append(out_row)
@@ -675,14 +518,6 @@ def merge_timeout_into_ablation_workbook(outdir: Path, ablation_excel_path: Path
         'Mean success %', 'Mean time (s)', 'Mean time std (s)',
         'Mean cycles', 'Mean cycles std',
     ]
-    row_idx = 1
-    row_idx = _write_sheet_table(
-        ws, row_idx, 'ACO timeout results', table_headers, aco_rows,
-        header_font, header_fill, thin_border)
-    row_idx = _write_sheet_table(
-        ws, row_idx, 'CP-DCM-ACO timeout results', table_headers, dcm_rows,
-        header_font, header_fill, thin_border)
-
     consolidated_headers = [
         'param_name', 'param_value', 'puzzle_size', 'alg', 'alg_name',
         'instances', 'success_mean', 'time_mean_mean', 'time_std_mean',
@@ -697,258 +532,259 @@ def merge_timeout_into_ablation_workbook(outdir: Path, ablation_excel_path: Path
             r['alg'],
             r['alg_name'],
             r['instances'],
-            round(r['success_mean'], 5) if not math.isnan(r['success_mean']) else '',
-            round(r['time_mean_mean'], 5) if not math.isnan(r['time_mean_mean']) else '',
-            round(r['time_std_mean'], 5) if not math.isnan(r['time_std_mean']) else '',
-            round(r['cycles_mean_mean'], 5) if not math.isnan(r['cycles_mean_mean']) else '',
-            round(r['cycles_std_mean'], 5) if not math.isnan(r['cycles_std_mean']) else '',
+            _round5(r['success_mean']),
+            _round5(r['time_mean_mean']),
+            _round5(r['time_std_mean']),
+            _round5(r['cycles_mean_mean']),
+            _round5(r['cycles_std_mean']),
         ])
-    _write_sheet_table(
-        ws, row_idx, 'Consolidated timeout summary', consolidated_headers, consolidated_rows,
-        header_font, header_fill, thin_border)
 
-    for col_idx in range(1, len(consolidated_headers) + 1):
-        ws.column_dimensions[ws.cell(row=1, column=col_idx).column_letter].width = 18
-    ws.freeze_panes = 'A3'
+    def write(ws):
+        widths = {col_idx: 18 for col_idx in range(1, len(consolidated_headers) + 1)}
+        sheet = excel_export.SheetWriter(ws, widths=widths, freeze='A3')
+        _write_sheet_table(sheet, 'ACO timeout results', table_headers, aco_rows)
+        _write_sheet_table(sheet, 'CP-DCM-ACO timeout results', table_headers, dcm_rows)
+        _write_sheet_table(sheet, 'Consolidated timeout summary', consolidated_headers, consolidated_rows)
+        sheet.close()
 
-    ablation_excel_path.parent.mkdir(parents=True, exist_ok=True)
-    wb.save(str(ablation_excel_path))
+    excel_export.update_sheet(ablation_excel_path, 'Timeout results', write)
     print(f'Updated: {ablation_excel_path}')
     return True
 
 
-def run_parallel_timeout_shards(
-    args,
-    sizes,
-    algs,
-    log_dir: Path | None,
-):
+def run_pooled_timeout_grid(args, sizes, algs, log_dir: Path | None, vlog) -> None:
     """
-    Parent orchestration mode (one pass per puzzle size):
-    - Each selected algorithm starts with ``workers_per_alg`` workers.
-    - Workers use dynamic per-instance claims (work-stealing safe).
-    - If one algorithm finishes early, its worker slots are transferred to the
-      other algorithm to help finish remaining instances.
-    - Single-algorithm mode: ``workers_per_alg`` workers, ``num_workers`` = same.
+    Parallel mode (one pass per puzzle size): every (algorithm, timeout, instance,
+    rep) unit of the size is queued in one ``CampaignScheduler``, grouped by
+    algorithm with ``workers_per_alg`` slots each, and solved on persistent
+    solver processes; this process is the only CSV writer. Units are queued
+    timeout by timeout, so a timeout's matrix fills before the next one starts.
+    Once one algorithm has no units left, its slots move to the other.
+    With ``--derive-timeouts`` only the longest timeout is queued (plus instances
+    whose shorter-timeout rows can no longer be derived).
+    ``--control-file`` changes the total number of workers while reps run;
+    with ``--distributed`` the reps run on worker agents (``job_queue``) and the
+    number in flight follows their solver processes.
+
+    SIGTERM/SIGINT stop the run: no new reps start and running reps are not
+    recorded, so they run again on resume.
     """
     workers_per_alg = max(1, int(args.workers_per_alg))
     total_workers = workers_per_alg * max(1, len(algs))
-    script_path = Path(__file__).resolve()
-    best_config = str(Path(args.best_config))
-    outdir = str(Path(args.outdir))
-    binary = str(args.binary)
+    capacity = total_workers
+    control = campaign_scheduler.control_from_args(args)
+    binary = str(Path(args.binary).resolve())
+    outdir = Path(args.outdir)
+    per_size_cfg = None
+    if any(a == 2 for a, _ in algs):
+        per_size_cfg = load_best_config(Path(args.best_config))
 
     print(
-        f'[ORCHESTRATOR] Parallel timeout mode: {workers_per_alg} worker(s)/algorithm; '
-        f'dynamic claims enabled (safe work-stealing); transfer enabled.'
+        f'[ORCHESTRATOR] Parallel timeout mode: {total_workers} solver process(es), '
+        f'{workers_per_alg} slot(s)/algorithm; slots of a finished algorithm move to the other.'
     )
 
-    def _spawn_alltimeouts_worker(
-        *,
-        size_short: str,
-        size_name: str,
-        alg_id: int,
-        alg_name: str,
-        worker_id: int,
-        num_workers: int,
-        stage: str,
-    ) -> dict:
-        session_path: Path | None = None
-        if log_dir is not None:
-            log_dir.mkdir(parents=True, exist_ok=True)
-            sess_dir = log_dir / 'sessions'
-            sess_dir.mkdir(exist_ok=True)
-            safe_stage = stage.replace(' ', '_')
-            session_path = (
-                sess_dir / f'{size_short}_alg{alg_id}_w{worker_id}_{safe_stage}.log'
-            )
-
-        cmd = [
-            sys.executable,
-            str(script_path),
-            '--binary', binary,
-            '--best-config', best_config,
-            '--outdir', outdir,
-            '--reps', str(int(args.reps)),
-            '--size', size_short,
-            '--alg', str(int(alg_id)),
-            '--worker-id', str(int(worker_id)),
-            '--num-workers', str(int(num_workers)),
-            '--run-all-timeouts',
-            '--dynamic-claims',
-            '--no-consolidate',
-        ]
-        if args.timeout is not None:
-            cmd.extend(['--timeout', str(int(args.timeout))])
-        if log_dir is not None and session_path is not None:
-            cmd.extend(['--worker-session-log', str(session_path)])
-        if args.no_log_files:
-            cmd.append('--no-log-files')
-        if args.quiet:
-            cmd.append('--quiet')
-        elif args.verbose:
-            cmd.append('--verbose')
-        else:
-            cmd.append('--quiet')
-
-        print(
-            f'[ORCHESTRATOR] Spawn {alg_name} (alg={alg_id}) '
-            f'worker_id={worker_id} num_workers={num_workers} [{stage}] — {size_name}'
-        )
-        return {
-            'alg': alg_id,
-            'alg_name': alg_name,
-            'worker_id': worker_id,
-            'num_workers': num_workers,
-            'stage': stage,
-            'size_name': size_name,
-            'proc': subprocess.Popen(cmd, cwd=str(REPO_ROOT)),
-            'session_path': session_path,
-        }
-
-    def _finalize_worker(task: dict, failed: list[tuple[str, int, int]]) -> None:
-        rc = task['proc'].returncode
-        if rc is None:
-            rc = task['proc'].wait()
-        alg = task['alg']
-        alg_name = task['alg_name']
-        worker_id = task['worker_id']
-        stage = task['stage']
-        size_name = task['size_name']
-        session_path = task['session_path']
-        if log_dir is not None and session_path is not None:
-            _append_session_to_alg_log(
-                log_dir,
-                alg,
-                session_path,
-                f'Merged — {alg_name} (alg={alg}) worker_id={worker_id} '
-                f'num_workers={task["num_workers"]} [{stage}] | {size_name} '
-                f'all timeouts | exit_code={rc}',
-            )
-        if rc != 0:
-            failed.append((alg_name, worker_id, rc))
-
-    for size_name, _size_cfg in sizes.items():
-        size_short = SIZE_SHORT[size_name]
+    for size_name, size_cfg in sizes.items():
         timeouts = TIMEOUTS_PER_SIZE.get(size_name, [])
         if args.timeout is not None:
             if args.timeout not in timeouts:
                 raise SystemExit(
                     f'--timeout {args.timeout} not in grid for {size_name}: {timeouts}')
+            timeouts = [args.timeout]
 
-        print(
-            f'\n[ORCHESTRATOR] Size phase — puzzle={size_name} '
-            f'timeouts={timeouts if args.timeout is None else [args.timeout]}'
-        )
-
-        failed: list[tuple[str, int, int]] = []
-
-        if len(algs) == 1:
-            alg_id, alg_name = algs[0]
-            tasks = [
-                _spawn_alltimeouts_worker(
-                    size_short=size_short,
-                    size_name=size_name,
-                    alg_id=alg_id,
-                    alg_name=alg_name,
-                    worker_id=w,
-                    num_workers=workers_per_alg,
-                    stage='single_alg',
-                )
-                for w in range(workers_per_alg)
-            ]
-            for task in tasks:
-                task['proc'].wait()
-                _finalize_worker(task, failed)
-            if failed:
-                print('[ORCHESTRATOR] ERROR: some workers failed:', file=sys.stderr)
-                for alg_name_f, worker_id_f, rc in failed:
-                    print(f'  {alg_name_f} worker_id={worker_id_f}: exit {rc}', file=sys.stderr)
-                raise SystemExit(1)
-            print(f'[ORCHESTRATOR] Size phase complete — {size_name}')
+        print(f'\n[ORCHESTRATOR] Size phase — puzzle={size_name} timeouts={timeouts}')
+        instances_all = scan_instances(size_cfg['dir'])
+        if not instances_all:
+            vlog(f'  No instances in {size_cfg["dir"]}')
             continue
+        canon = [fp.name for fp in instances_all]
+        all_instance_names = set(canon)
 
-        if len(algs) != 2:
-            raise SystemExit('Parallel mode with transfer expects exactly 2 algorithms.')
-
-        alg0, alg0_name = algs[0]
-        alg2, alg2_name = algs[1]
-        if alg0 != 0 or alg2 != 2:
-            raise SystemExit('Parallel transfer layout expects ALGORITHMS = (0, ACO), (2, CP-DCM-ACO).')
-
-        running: list[dict] = []
-        transfer_spawned_for_receiver: set[int] = set()
-        for w in range(workers_per_alg):
-            running.append(_spawn_alltimeouts_worker(
-                size_short=size_short,
-                size_name=size_name,
-                alg_id=alg0,
-                alg_name=alg0_name,
-                worker_id=w,
-                num_workers=workers_per_alg,
-                stage='initial_aco',
-            ))
-        for w in range(workers_per_alg):
-            running.append(_spawn_alltimeouts_worker(
-                size_short=size_short,
-                size_name=size_name,
-                alg_id=alg2,
-                alg_name=alg2_name,
-                worker_id=w,
-                num_workers=workers_per_alg,
-                stage='initial_cp_dcm',
-            ))
-
-        while True:
-            for task in list(running):
-                if task['proc'].poll() is None:
-                    continue
-                running.remove(task)
-                _finalize_worker(task, failed)
-
-            if failed:
-                break
-
-            running_by_alg = {int(t['alg']) for t in running}
-            transfer_specs = [
-                (alg0, alg0_name, alg2, alg2_name),
-                (alg2, alg2_name, alg0, alg0_name),
-            ]
-            for donor_alg, donor_name, receiver_alg, receiver_name in transfer_specs:
-                donor_done = donor_alg not in running_by_alg
-                receiver_still_running = receiver_alg in running_by_alg
-                if (not donor_done) or (not receiver_still_running):
+        alg_logs = {}
+        if log_dir is not None:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            for alg, alg_name in algs:
+                fh = open(log_dir / f'timeout_alg{alg}.log', 'a', encoding='utf-8', buffering=1, newline='\n')
+                fh.write('\n' + '=' * 72 + '\n')
+                fh.write(f'[{_log_timestamp()}] PHASE — puzzle={size_name} | {alg_name} (alg={alg}) | '
+                         f'parallel, {workers_per_alg} slot(s)\n')
+                fh.write('=' * 72 + '\n')
+                alg_logs[alg] = fh
+
+        def alg_log(alg, msg):
+            if alg in alg_logs:
+                alg_logs[alg].write(msg + '\n')
+            vlog(msg)
+
+        matrices = {}
+        scheduler = campaign_scheduler.CampaignScheduler(args.priority, max_concurrency=total_workers)
+
+        def finish_matrix(m):
+            sort_summary_csv_if_complete(m['summary_file'], canon)
+            delete_ablation_progress_if_summary_done(
+                m['progress_file'], m['summary_file'], all_instance_names, vlog, m['tag'])
+
+        def record(m, inst, rep, success, t, cyc, rseed):
+            append_csv_row(m['progress_file'], [
+                inst, rep, 1 if success else 0,
+                '' if math.isnan(t) else t,
+                '' if math.isnan(cyc) else cyc, rseed])
+            m['progress'].setdefault(inst, {})[rep] = (success, t, cyc)
+            complete_instance(m, inst)
+
+        def complete_instance(m, inst):
+            rep_map = m['progress'].get(inst, {})
+            if len(rep_map) < args.reps or inst in m['completed']:
+                return
+            # derived rows first: once this summary lists the instance its progress may be deleted
+            for dt in _append_derived_summaries(outdir, m['alg'], m['alg_name'], size_name, inst,
+                                                rep_map, args.reps, m['derive']):
+                dm = matrices.get((m['alg'], dt))
+                if dm is None:
                     continue
-                if receiver_alg in transfer_spawned_for_receiver:
+                dm['completed'].add(inst)
+                if all_instance_names <= dm['completed']:
+                    finish_matrix(dm)
+            row = _timeout_summary_row(
+                m['timeout'], size_name, inst, m['alg'], m['alg_name'], rep_map, args.reps)
+            if not append_csv_row(m['summary_file'], row):
+                alg_log(m['alg'], f'    ERROR: could not write summary for {inst}')
+                return
+            m['completed'].add(inst)
+            alg_log(m['alg'], f'  [{m["tag"]}] {inst} complete: success%={row[5]}')
+            if all_instance_names <= m['completed']:
+                finish_matrix(m)
+
+        for alg, alg_name in algs:
+            scheduler.add_group(alg, workers_per_alg)
+            extra_args: list = []
+            if alg != 0:
+                assert per_size_cfg is not None
+                extra_args, _ = build_solver_args_from_full_config(per_size_cfg[size_name])
+            # --derive-timeouts: instances still to run at the longest timeout get
+            # their shorter-timeout rows from those reps instead of own runs
+            t_max = max(timeouts)
+            derived_pending = set()
+            if args.derive_timeouts:
+                _, max_summary = _timeout_paths(outdir, alg, t_max, size_name)
+                derived_pending = all_instance_names - read_completed_from_summary(max_summary)
+            for t in timeouts:
+                val_str = format_param_value('timeout', t)
+                progress_file, summary_file = _timeout_paths(outdir, alg, t, size_name)
+                m = {
+                    'alg': alg,
+                    'alg_name': alg_name,
+                    'timeout': t,
+                    'tag': f'alg{alg} timeout={val_str}s [{size_name}]',
+                    'progress_file': progress_file,
+                    'summary_file': summary_file,
+                    'completed': read_completed_from_summary(summary_file) & all_instance_names,
+                    'derive': [d for d in timeouts if d < t] if args.derive_timeouts and t == t_max else [],
+                }
+                if m['completed'] == all_instance_names:
+                    finish_matrix(m)
+                    vlog(f'  [{m["tag"]}] Already complete. Skipping.')
                     continue
-
-                transfer_spawned_for_receiver.add(receiver_alg)
-                print(
-                    f'[ORCHESTRATOR] All {donor_name} (alg={donor_alg}) workers finished; '
-                    f'transferring worker IDs {workers_per_alg}..{total_workers - 1} '
-                    f'to {receiver_name} (alg={receiver_alg}).'
+                ensure_csv_header(summary_file, SUMMARY_HEADERS)
+                ensure_csv_header(progress_file, PROGRESS_HEADERS)
+                m['progress'] = read_progress(progress_file)
+                matrices[(alg, t)] = m
+                campaign = str(progress_file.resolve())
+                for fp in instances_all:
+                    if fp.name in m['completed'] or (t != t_max and fp.name in derived_pending):
+                        continue
+                    rep_map = m['progress'].setdefault(fp.name, {})
+                    missing = [rep for rep in range(1, args.reps + 1) if rep not in rep_map]
+                    if not missing:
+                        complete_instance(m, fp.name)
+                        continue
+                    if args.seed is None and missing:
+                        # unseeded reps are exchangeable: use cached results of this configuration first
+                        cached = claim_cached_reps(binary, fp, alg, t, extra_args, campaign, len(missing))
+                        for rep, (success, tm, cyc, rseed) in zip(missing, cached):
+                            record(m, fp.name, rep, success, tm, cyc, rseed)
+                        missing = missing[len(cached):]
+                    for rep in missing:
+                        scheduler.submit({
+                            'campaign': campaign,
+                            'config': ' '.join(str(a) for a in extra_args),
+                            'instance': fp.name,
+                            'instance_path': str(fp),
+                            'rep': rep,
+                            'alg': alg,
+                            'timeout': t,
+                            'extra_args': extra_args,
+                            'seed': rep_seed(fp.name, rep, args.seed),
+                            'matrix': (alg, t),
+                        }, alg)
+
+        if capacity != total_workers:
+            scheduler.resize(capacity)
+        queued = scheduler.pending()
+        print(f'[ORCHESTRATOR] {queued} rep-run(s) queued for {size_name}.')
+        errors = []
+        stop_signal = None
+
+        def handle_completed(job, r, exc):
+            m = matrices[job['matrix']]
+            if isinstance(exc, SolverInterruptedError):
+                alg_log(job['alg'], f'    [{m["tag"]}] {job["instance"]} rep {job["rep"]}: '
+                                    f'INTERRUPTED; not recorded (will resume)')
+                return
+            if exc is not None:
+                errors.append((job, exc))
+                print(f'ERROR [{m["tag"]}] {job["instance"]} rep {job["rep"]}: {exc}', file=sys.stderr, flush=True)
+                return
+            success, t, cyc, _out = r
+            t_str = f'{t:.4f}s' if not math.isnan(t) else 'N/A'
+            alg_log(job['alg'], f'    [{m["tag"]}] {job["instance"]} rep {job["rep"]}/{args.reps}: '
+                                f'{"OK" if success else "FAIL"} (time={t_str})')
+            record(m, job['instance'], job['rep'], success, t, cyc, job['seed'])
+
+        def report_transfer(from_alg, to_alg, slots, cap_now, reason):
+            print(f'[ORCHESTRATOR] alg={from_alg} {reason}; moved {slots} slot(s) to alg={to_alg} '
+                  f'(now {cap_now}).', flush=True)
+
+        async def run_size():
+            stop = asyncio.Event()
+            async with job_queue.open_pool(args, binary, capacity) as solvers:
+                def on_stop(signum):
+                    nonlocal stop_signal
+                    stop_signal = signum
+                    stop.set()
+                    solvers.interrupt()
+
+                def on_resize(n):
+                    nonlocal capacity
+                    print(f'[ORCHESTRATOR] Capacity: {capacity} -> {n} solver process(es).', flush=True)
+                    capacity = n
+                    solvers.resize(n)
+
+                install_stop_handlers(on_stop)
+                await scheduler.run(
+                    lambda job: solvers.run_solver(
+                        Path(job['instance_path']), job['alg'], job['timeout'],
+                        extra_args=job['extra_args'], seed=job['seed'], campaign=job['campaign']),
+                    on_result=handle_completed,
+                    on_transfer=report_transfer,
+                    stop=stop,
+                    control=job_queue.pool_control(solvers, args) if args.distributed else control,
+                    on_resize=on_resize,
                 )
-                for w in range(workers_per_alg, total_workers):
-                    running.append(_spawn_alltimeouts_worker(
-                        size_short=size_short,
-                        size_name=size_name,
-                        alg_id=receiver_alg,
-                        alg_name=receiver_name,
-                        worker_id=w,
-                        num_workers=total_workers,
-                        stage=f'transfer_alg{receiver_alg}_after_alg{donor_alg}',
-                    ))
-
-            if not running:
-                break
-            time.sleep(0.2)
-
-        if failed:
-            print('[ORCHESTRATOR] ERROR: some workers failed:', file=sys.stderr)
-            for alg_name_f, worker_id_f, rc in failed:
-                print(f'  {alg_name_f} worker_id={worker_id_f}: exit {rc}', file=sys.stderr)
-            raise SystemExit(1)
 
+        try:
+            if queued:
+                asyncio.run(run_size())
+        finally:
+            for fh in alg_logs.values():
+                fh.close()
+
+        if stop_signal is not None:
+            print(f'[ORCHESTRATOR] Stopped by signal {stop_signal}; re-run with the same arguments to resume.')
+            raise SystemExit(128 + stop_signal)
+        if errors:
+            print(f'[ORCHESTRATOR] ERROR: {len(errors)} rep-run(s) failed in {size_name}.', file=sys.stderr)
+            raise SystemExit(1)
         print(f'[ORCHESTRATOR] Size phase complete — {size_name}')
 
 
@@ -965,11 +801,14 @@ def main():
                     help='Single puzzle size (default: all)')
     ap.add_argument('--timeout', type=int, default=None,
                     help='Single timeout value (must belong to that size grid)')
+    ap.add_argument('--derive-timeouts', action='store_true',
+                    help='Run each rep once at the longest timeout of the size grid and derive the '
+                         'shorter-timeout summaries from its solve times')
     ap.add_argument('--alg', type=int, default=None, choices=[0, 2],
                     help='Run only this algorithm ID (default: both)')
     ap.add_argument('--workers-per-alg', type=int, default=1,
-                    help='When >1, parallel parent runs all timeouts per size; '
-                         'N workers per algorithm with safe work-stealing + transfer')
+                    help='When >1, run all timeouts per size on a shared solver pool: '
+                         'N slots per algorithm, moved to the other algorithm once one finishes')
     ap.add_argument('--consolidate', action='store_true',
                     help='Only build timeout_comparison.xlsx from existing CSVs')
     ap.add_argument('--no-consolidate', action='store_true',
@@ -980,11 +819,14 @@ def main():
                     help='Ablation workbook to update with timeout tables')
     ap.add_argument('--worker-id', type=int, default=0)
     ap.add_argument('--num-workers', type=int, default=1)
-    ap.add_argument(
-        '--dynamic-claims',
-        action='store_true',
-        help='Use atomic per-instance claims instead of static modulo sharding',
-    )
+    ap.add_argument('--seed', type=int, default=None,
+                    help='Base seed for per-(instance, rep) solver seeds (default: random; '
+                         'seeds are recorded in the progress CSVs)')
+    result_cache.add_cli_options(ap)
+    rep_store.add_cli_options(ap)
+    consolidation_cache.add_cli_options(ap)
+    campaign_scheduler.add_cli_options(ap)
+    job_queue.add_cli_options(ap)
     ap.add_argument('--verbose', action='store_true', default=True)
     ap.add_argument('--quiet', action='store_true')
     ap.add_argument(
@@ -998,17 +840,15 @@ def main():
         action='store_true',
         help='Do not write per-algorithm / orchestrator log files (stdout only)',
     )
-    ap.add_argument(
-        '--worker-session-log',
-        default=None,
-        help=argparse.SUPPRESS,
-    )
-    ap.add_argument(
-        '--run-all-timeouts',
-        action='store_true',
-        help=argparse.SUPPRESS,
-    )
     args = ap.parse_args()
+    if args.derive_timeouts and args.timeout is not None:
+        ap.error('--derive-timeouts derives the whole timeout grid; drop --timeout')
+    if args.distributed and args.num_workers != 1:
+        ap.error('--distributed runs the pooled grid; drop --num-workers')
+    result_cache.enable_from_args(args)
+    rep_store.enable_from_args(args)
+    consolidation_cache.enable_from_args(args)
+    campaign_scheduler.enable_from_args(args)
 
     outdir = Path(args.outdir)
     excel_path = Path(args.excel_path)
@@ -1018,7 +858,6 @@ def main():
     _orig_stdout = sys.stdout
     _orch_log_f = None
     _alg_log_f = None
-    _worker_sess_f = None
 
     log_dir: Path | None = None if args.no_log_files else Path(args.log_dir)
 
@@ -1053,21 +892,10 @@ def main():
         _alg_log_f.flush()
         sys.stdout = _TeeStdout(_orig_stdout, _alg_log_f)
 
-    parallel_parent = args.workers_per_alg > 1 and args.num_workers == 1
-    worker_session = args.worker_session_log
+    parallel_parent = (args.workers_per_alg > 1 or bool(args.distributed)) and args.num_workers == 1
 
     try:
-        if worker_session:
-            sp = Path(worker_session)
-            sp.parent.mkdir(parents=True, exist_ok=True)
-            _worker_sess_f = open(sp, 'w', encoding='utf-8', buffering=1, newline='\n')
-            _worker_sess_f.write(
-                f'[{_log_timestamp()}] Worker process — alg={args.alg} '
-                f'worker_id={args.worker_id} num_workers={args.num_workers}\n'
-            )
-            _worker_sess_f.flush()
-            sys.stdout = _TeeStdout(_orig_stdout, _worker_sess_f)
-        elif log_dir is not None and (parallel_parent or args.consolidate):
+        if log_dir is not None and (parallel_parent or args.consolidate):
             log_dir.mkdir(parents=True, exist_ok=True)
             _orch_log_f = open(
                 log_dir / 'timeout_orchestrator.log',
@@ -1105,71 +933,15 @@ def main():
         algs = ALGORITHMS if args.alg is None else tuple(
             (a, n) for a, n in ALGORITHMS if a == args.alg)
 
+        cpu_affinity.record_layout(outdir)
+
         best_path = Path(args.best_config)
         per_size_cfg = None
         if any(a == 2 for a, _ in algs):
             per_size_cfg = load_best_config(best_path)
 
-        # Parallel child: run every timeout for this size in one process (orchestrator spawns us).
-        if getattr(args, 'run_all_timeouts', False):
-            if args.size is None:
-                raise SystemExit('ERROR: internal --run-all-timeouts requires --size')
-            if args.alg is None:
-                raise SystemExit('ERROR: internal --run-all-timeouts requires --alg')
-            size_name = size_map[args.size]
-            size_cfg = SIZE_CONFIGS[size_name]
-            timeouts_list = list(TIMEOUTS_PER_SIZE.get(size_name, []))
-            if args.timeout is not None:
-                if args.timeout not in timeouts_list:
-                    raise SystemExit(
-                        f'--timeout {args.timeout} not in grid for {size_name}: {timeouts_list}')
-                timeouts_list = [args.timeout]
-            alg_map = {a: n for a, n in ALGORITHMS}
-            if args.alg not in alg_map:
-                raise SystemExit(f'ERROR: unknown --alg {args.alg}')
-            alg_name = alg_map[args.alg]
-            for idx_t, t in enumerate(timeouts_list):
-                if args.alg == 0:
-                    extra_args: list = []
-                    vlog(
-                        f'[ACO alg=0] {size_name} timeout={t}s: binary defaults '
-                        f'(worker {args.worker_id}/{args.num_workers})'
-                    )
-                else:
-                    assert per_size_cfg is not None
-                    cfg = per_size_cfg[size_name]
-                    extra_args, _ = build_solver_args_from_full_config(cfg)
-                    vlog(
-                        f'[CP-DCM-ACO alg=2] {size_name} timeout={t}s '
-                        f'(worker {args.worker_id}/{args.num_workers}) config: {cfg}'
-                    )
-                vlog(
-                    f'\n[RUN] {alg_name} (alg={args.alg}) timeout={t}s puzzle={size_name} — '
-                    f'starting instances…'
-                )
-                run_timeout_job(
-                    binary, args.alg, alg_name, t, size_name, size_cfg,
-                    extra_args, args.reps, outdir, vlog,
-                    worker_id=args.worker_id,
-                    num_workers=args.num_workers,
-                    dynamic_claims=args.dynamic_claims,
-                )
-                # Strict timeout ordering across workers:
-                # do not start next timeout until this timeout matrix is globally complete.
-                if idx_t + 1 < len(timeouts_list):
-                    wait_for_timeout_matrix_complete(
-                        outdir=outdir,
-                        alg=args.alg,
-                        timeout_sec=t,
-                        size_name=size_name,
-                        size_cfg=size_cfg,
-                        alg_name=alg_name,
-                        vlog=vlog,
-                    )
-            return
-
         if parallel_parent:
-            run_parallel_timeout_shards(args, sizes, algs, log_dir)
+            run_pooled_timeout_grid(args, sizes, algs, log_dir, vlog)
             if not args.no_consolidate:
                 vlog(
                     f'\n[{_log_timestamp()}] [ORCHESTRATOR] Consolidating timeout '
@@ -1200,7 +972,16 @@ def main():
                     cfg = per_size_cfg[size_name]
                     extra_args, _ = build_solver_args_from_full_config(cfg)
                     vlog(f'[CP-DCM-ACO alg=2] {size_name} config: {cfg}')
-                for t in timeouts:
+                order = timeouts
+                if args.derive_timeouts:
+                    # longest first; shorter timeouts only run instances it finished
+                    # without leaving derived rows (progress deleted by an earlier run)
+                    order = sorted(timeouts, reverse=True)
+                for t in order:
+                    only = None
+                    if args.derive_timeouts and t != order[0]:
+                        _, max_summary = _timeout_paths(outdir, alg, order[0], size_name)
+                        only = read_completed_from_summary(max_summary)
                     vlog(
                         f'\n[RUN] {alg_name} (alg={alg}) timeout={t}s puzzle={size_name} — '
                         f'starting instances…'
@@ -1210,13 +991,15 @@ def main():
                         extra_args, args.reps, outdir, vlog,
                         worker_id=args.worker_id,
                         num_workers=args.num_workers,
-                        dynamic_claims=args.dynamic_claims,
+                        seed=args.seed,
+                        derive_timeouts=order[1:] if args.derive_timeouts and t == order[0] else (),
+                        only=only,
                     )
 
         if not args.no_consolidate:
             _close_alg_log()
             sys.stdout = _orig_stdout
-            if log_dir is not None and not worker_session:
+            if log_dir is not None:
                 log_dir.mkdir(parents=True, exist_ok=True)
                 _orch_log_f = open(
                     log_dir / 'timeout_orchestrator.log',
@@ -1235,7 +1018,7 @@ def main():
 
     finally:
         sys.stdout = _orig_stdout
-        for fh in (_worker_sess_f, _alg_log_f, _orch_log_f):
+        for fh in (_alg_log_f, _orch_log_f):
             if fh is not None:
                 try:
                     fh.close()
@@ -10,7 +10,10 @@ Execution model (defaults):
 - For each size: finish requested runs, then move to next size
 - Size order: 9x9 -> 16x16 -> 25x25
 - For each size: start alg 0 and alg 2 in parallel
-- Each algorithm uses pool workers (default: 4)
+- Each algorithm uses pool workers (default: 4); with transfer (the default)
+  each pool gets a capacity control file, and when one algorithm finishes the
+  orchestrator writes the combined worker count into the other's, which grows
+  in place without stopping its running solves
 - After CP comparison phase, run extra DCM-ACO 9-ants phase:
   alg 2 only, nAnts=3, numACS=2 (thus 3 colonies = 2 ACS + 1 MMAS),
   reps=1, runs 1..5, same size order.
@@ -26,11 +29,18 @@ from __future__ import annotations
 import argparse
 import csv
 import math
+import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
 
+import campaign_scheduler
+import group_stats
+import rep_store
+
 
 SIZES = [
     ("9x9", "scripts/run_9x9.py"),
@@ -67,6 +77,7 @@ def _build_cmd(
     extra_solver_args: list[str] | None,
     binary: str | None,
     verbose: bool,
+    control_file: Path | None = None,
 ) -> list[str]:
     cmd = [
         python_exe,
@@ -88,10 +99,15 @@ def _build_cmd(
         cmd.extend(["--binary", binary])
     if verbose:
         cmd.append("--verbose")
+    if control_file is not None:
+        cmd.extend(["--control-file", str(control_file)])
     return cmd
 
 
-def _terminate(proc: subprocess.Popen, timeout_s: float = 5.0) -> None:
+def _terminate(proc: subprocess.Popen, timeout_s: float = 30.0) -> None:
+    """SIGTERM, then SIGKILL after ``timeout_s``. On SIGTERM the benchmark pool
+    stops its running reps early and records them as interrupted before exiting,
+    so they are rerun (not counted as failures) when the campaign resumes."""
     if proc.poll() is not None:
         return
     proc.terminate()
@@ -119,8 +135,14 @@ def _run_size_phase(
     verbose: bool,
     dry_run: bool,
 ) -> int:
+    # With transfer, each algorithm pool is started with a capacity control file;
+    # when one finishes, its workers are added to a running one through that file
+    # (the pool grows in place, running solves continue).
+    transfer_allowed = bool(enable_transfer and len(algs) == 2)
+    control_dir = None
+    if transfer_allowed:
+        control_dir = Path(tempfile.gettempdir()) / f"sudaco-cp-{os.getpid()}-run{run_idx}-{size_name}"
     cmds = []
-    cmds_by_alg: dict[int, tuple[str, list[str]]] = {}
     for alg, alg_name in algs:
         cmd = _build_cmd(
             python_exe=python_exe,
@@ -133,9 +155,9 @@ def _run_size_phase(
             extra_solver_args=extra_solver_args,
             binary=binary,
             verbose=verbose,
+            control_file=control_dir / f"alg{alg}.workers" if control_dir is not None else None,
         )
         cmds.append((alg, alg_name, cmd))
-        cmds_by_alg[alg] = (alg_name, cmd)
 
     print(
         f"[{_now()}] [RUN {run_idx}] [SIZE {size_name}] "
@@ -148,16 +170,14 @@ def _run_size_phase(
     if dry_run:
         return 0
 
-    transfer_allowed = bool(enable_transfer and len(algs) == 2)
-    transfer_done = False
-    transfer_added_workers = max(1, int(pool_workers))
-
     procs: dict[int, tuple[str, subprocess.Popen]] = {}
+    workers = {}
     for alg, alg_name, cmd in cmds:
         procs[alg] = (
             alg_name,
             subprocess.Popen(cmd, cwd=str(repo_root)),
         )
+        workers[alg] = int(pool_workers)
 
     first_failure: tuple[int, str, int] | None = None
     try:
@@ -178,36 +198,17 @@ def _run_size_phase(
 
             for alg in completed:
                 procs.pop(alg, None)
-
-            if transfer_allowed and not transfer_done and first_failure is None and len(procs) == 1:
-                # One algorithm finished successfully; transfer its worker slots by restarting
-                # the remaining algorithm with a larger pool size and resume from progress CSVs.
-                remaining_alg = next(iter(procs.keys()))
-                remaining_name, remaining_proc = procs[remaining_alg]
-                _terminate(remaining_proc)
-                procs.pop(remaining_alg, None)
-
-                new_workers = int(pool_workers) + transfer_added_workers
-                _name, base_cmd = cmds_by_alg[remaining_alg]
-                new_cmd = list(base_cmd)
-                try:
-                    idx = new_cmd.index("--pool-workers")
-                    new_cmd[idx + 1] = str(new_workers)
-                except (ValueError, IndexError):
-                    # Fallback: if flag is missing for any reason, append it.
-                    new_cmd.extend(["--pool-workers", str(new_workers)])
-
-                print(
-                    f"[{_now()}] [RUN {run_idx}] [SIZE {size_name}] transfer: "
-                    f"restarting {remaining_name} with --pool-workers {new_workers}",
-                    flush=True,
-                )
-                procs[remaining_alg] = (
-                    remaining_name,
-                    subprocess.Popen(new_cmd, cwd=str(repo_root)),
-                )
-                transfer_done = True
-                continue
+                if control_dir is not None and first_failure is None and procs:
+                    to_alg = next(iter(procs))
+                    moved = workers.pop(alg)
+                    workers[to_alg] += moved
+                    campaign_scheduler.write_capacity(control_dir / f"alg{to_alg}.workers", workers[to_alg])
+                    print(
+                        f"[{_now()}] [RUN {run_idx}] [SIZE {size_name}] "
+                        f"moved {moved} worker(s) to {procs[to_alg][0]} "
+                        f"(now {workers[to_alg]}; running solves continue)",
+                        flush=True,
+                    )
 
             if first_failure is not None:
                 # Stop peers if one process failed.
@@ -222,7 +223,11 @@ def _run_size_phase(
         print(f"[{_now()}] Interrupted. Terminating running processes...", flush=True)
         for _, proc in procs.values():
             _terminate(proc)
+        procs.clear()  # all waited on: the control directory can go
         raise
+    finally:
+        if control_dir is not None and not procs:
+            shutil.rmtree(control_dir, ignore_errors=True)
 
     if first_failure is not None:
         _alg, alg_name, rc = first_failure
@@ -248,35 +253,6 @@ def _dcm9_outdir(size_name: str) -> str:
     return str(Path("results") / size_name / "dcm_9ants")
 
 
-def _safe_mean(values: list[float]) -> float:
-    nums = [v for v in values if v is not None and not math.isnan(v)]
-    if not nums:
-        return math.nan
-    return sum(nums) / float(len(nums))
-
-
-def _safe_std(values: list[float]) -> float:
-    nums = [v for v in values if v is not None and not math.isnan(v)]
-    n = len(nums)
-    if n < 2:
-        return math.nan
-    m = _safe_mean(nums)
-    var = sum((x - m) ** 2 for x in nums) / float(n - 1)
-    return math.sqrt(var)
-
-
-def _parse_float(value: str | None) -> float:
-    if value is None:
-        return math.nan
-    s = str(value).strip()
-    if not s:
-        return math.nan
-    try:
-        return float(s)
-    except Exception:
-        return math.nan
-
-
 def _run_file_for(outdir: Path, size_name: str, alg_name: str, run_idx: int) -> Path:
     if int(run_idx) == 1:
         return outdir / f"results_{size_name}_{alg_name}.csv"
@@ -289,36 +265,32 @@ def _load_run_metrics(
 ) -> dict | None:
     if not csv_path.exists():
         return None
-    succ_by_instance: dict[str, float] = {}
-    tmean = []
-    cycmean = []
     try:
         with open(csv_path, "r", newline="") as f:
-            for row in csv.DictReader(f):
-                inst = str(row.get("instance") or "").strip()
-                sv = _parse_float(row.get("success_%"))
-                if inst:
-                    succ_by_instance[inst] = sv
-                tmean.append(_parse_float(row.get("time_mean")))
-                cycmean.append(_parse_float(row.get("cycles_mean")))
+            rows = rep_store.summary_rows(csv_path, csv.DictReader(f))
+            cols = group_stats.columns(rows, ("instance",), ("success_%", "time_mean", "cycles_mean"))
     except Exception:
         return None
-    if not succ_by_instance and not tmean and not cycmean:
+    if not len(cols["instance"]):
         return None
+    # Success per instance (the last row of an instance counts); time and cycles over all rows.
+    named = (cols["instance"] != "").nonzero()[0]
+    instances = group_stats.GroupBy(cols["instance"][named]) if len(named) else None
+    succ_by_instance = cols["success_%"][named[instances.last_rows()]] if instances is not None else []
     # Determine whether this run has full instance coverage.
     is_complete = True
     if expected_instance_names:
-        is_complete = expected_instance_names.issubset(set(succ_by_instance.keys()))
+        seen = {label for (label,) in instances.labels} if instances is not None else set()
+        is_complete = expected_instance_names.issubset(seen)
 
     # Success rate for the run is based on rows recorded in that run file.
     # A failed instance row (success_% = 0) is naturally counted in this mean.
-    run_success = _safe_mean(list(succ_by_instance.values()))
     return {
-        "success": run_success,
-        "time_mean": _safe_mean(tmean),
-        # Per-run time std = stddev of per-instance time_mean values in that run CSV.
-        "time_std": _safe_std(tmean),
-        "cycles_mean": _safe_mean(cycmean),
+        "success": group_stats.nanmean(succ_by_instance),
+        "time_mean": group_stats.nanmean(cols["time_mean"]),
+        # Per-run time std = sample stddev of per-instance time_mean values in that run CSV.
+        "time_std": group_stats.nanstd(cols["time_mean"], ddof=1),
+        "cycles_mean": group_stats.nanmean(cols["cycles_mean"]),
         "is_complete": is_complete,
     }
 
@@ -392,14 +364,13 @@ def _aggregate_alg_over_runs(
             "run_rows": run_rows,
         }
 
-    clean_s = [v for v in run_success if not math.isnan(v)]
-    best_s = max(clean_s) if clean_s else math.nan
-    worst_s = min(clean_s) if clean_s else math.nan
-    avg_s = _safe_mean(run_success)
-    time_m = _safe_mean(run_time)
+    best_s = group_stats.nanmax(run_success)
+    worst_s = group_stats.nanmin(run_success)
+    avg_s = group_stats.nanmean(run_success)
+    time_m = group_stats.nanmean(run_time)
     # Requested aggregation: average each run's time_std across runs.
-    time_s = _safe_mean(run_time_std)
-    cyc_m = _safe_mean(run_cycles)
+    time_s = group_stats.nanmean(run_time_std)
+    cyc_m = group_stats.nanmean(run_cycles)
     return {
         "files_found": found_files,
         "runs_used": len(run_success),
@@ -410,7 +381,7 @@ def _aggregate_alg_over_runs(
         "time_mean": time_m,
         "time_std": time_s,
         "cycles_mean": cyc_m,
-        "time_mean_std_across_runs": _safe_std(run_time),
+        "time_mean_std_across_runs": group_stats.nanstd(run_time, ddof=1),
         "run_rows": run_rows,
     }
 
@@ -426,9 +397,9 @@ def _fmt(value: float, ndigits: int = 4):
     return round(float(value), int(ndigits))
 
 
-def _write_sheet_tables(ws, title: str, rows_by_size: list[tuple[str, list[list]]]) -> None:
-    ws.cell(row=1, column=1, value=title)
-    r = 3
+def _write_sheet_tables(sheet, title: str, rows_by_size: list[tuple[str, list[list]]]) -> None:
+    sheet.append([title])
+    sheet.skip()
     headers = [
         "Algorithm",
         "Best success %",
@@ -439,20 +410,16 @@ def _write_sheet_tables(ws, title: str, rows_by_size: list[tuple[str, list[list]
         "Cycles mean",
     ]
     for size_name, rows in rows_by_size:
-        ws.cell(row=r, column=1, value=f"Puzzle size: {size_name}")
-        r += 1
-        for c, h in enumerate(headers, start=1):
-            ws.cell(row=r, column=c, value=h)
-        r += 1
+        sheet.append([f"Puzzle size: {size_name}"])
+        sheet.append(headers)
         for row_vals in rows:
-            for c, v in enumerate(row_vals, start=1):
-                ws.cell(row=r, column=c, value=v)
-            r += 1
-        r += 1
+            sheet.append(row_vals)
+        sheet.skip()
 
 
-def _write_run_details_sheet(ws, rows: list[list]) -> None:
-    ws.cell(row=1, column=1, value="Per-run metrics (from each run CSV)")
+def _write_run_details_sheet(sheet, rows: list[list]) -> None:
+    sheet.append(["Per-run metrics (from each run CSV)"])
+    sheet.skip()
     headers = [
         "Phase",
         "Puzzle size",
@@ -465,13 +432,9 @@ def _write_run_details_sheet(ws, rows: list[list]) -> None:
         "Time std (run std of instance means, s)",
         "Cycles mean (run mean)",
     ]
-    for c, h in enumerate(headers, start=1):
-        ws.cell(row=3, column=c, value=h)
-    r = 4
+    sheet.append(headers)
     for row_vals in rows:
-        for c, v in enumerate(row_vals, start=1):
-            ws.cell(row=r, column=c, value=v)
-        r += 1
+        sheet.append(row_vals)
 
 
 def consolidate_excel(
@@ -483,7 +446,7 @@ def consolidate_excel(
     excel_path: Path,
 ) -> bool:
     try:
-        from openpyxl import Workbook
+        import excel_export
     except ImportError:
         print("WARNING: openpyxl not installed; skipping Excel consolidation.")
         return False
@@ -578,18 +541,20 @@ def consolidate_excel(
             ],
         ]))
 
-    wb = Workbook()
-    ws_main = wb.active
-    ws_main.title = "main experiment"
-    _write_sheet_tables(ws_main, "Main Experiment Summary", main_rows_by_size)
-
-    ws_red = wb.create_sheet(title="reduced ant")
-    _write_sheet_tables(ws_red, "Reduced Ant Summary", reduced_rows_by_size)
-    ws_runs = wb.create_sheet(title="run details")
-    _write_run_details_sheet(ws_runs, run_detail_rows)
-
-    excel_path.parent.mkdir(parents=True, exist_ok=True)
-    wb.save(str(excel_path))
+    def sheet_writer(write_rows):
+        def write(ws):
+            sheet = excel_export.SheetWriter(ws)
+            write_rows(sheet)
+            sheet.close()
+        return write
+
+    excel_export.save_workbook(excel_path, [
+        ("main experiment", sheet_writer(
+            lambda sheet: _write_sheet_tables(sheet, "Main Experiment Summary", main_rows_by_size))),
+        ("reduced ant", sheet_writer(
+            lambda sheet: _write_sheet_tables(sheet, "Reduced Ant Summary", reduced_rows_by_size))),
+        ("run details", sheet_writer(lambda sheet: _write_run_details_sheet(sheet, run_detail_rows))),
+    ])
     print(f"[{_now()}] Consolidated Excel saved: {excel_path}", flush=True)
     return True
 
@@ -657,7 +622,8 @@ def main() -> int:
         action="store_true",
         help=(
             "Disable cross-alg worker transfer. By default, when both algs are selected "
-            "and one finishes first, the other is restarted with additional pool workers."
+            "the pool of the one that finishes first is added to the other's at runtime "
+            "(no restart, running solves continue)."
         ),
     )
     ap.add_argument(
@@ -681,7 +647,11 @@ def main() -> int:
         help="Build Excel from existing CSV results only (no benchmark runs)",
     )
     ap.add_argument("--verbose", action="store_true", help="Pass --verbose to child scripts")
+    campaign_scheduler.add_cli_options(ap, priority=False)
+    rep_store.add_cli_options(ap)
     args = ap.parse_args()
+    campaign_scheduler.enable_from_args(args)
+    rep_store.enable_from_args(args)
 
     if args.run_start < 1:
         ap.error("--run-start must be >= 1")
@@ -0,0 +1,184 @@
+"""
+Expected solver run times, estimated from the results already on disk.
+
+``campaign_scheduler``'s ``longest`` priority starts the units expected to run
+longest first, so a campaign's slow puzzles (25×25 reps near the timeout) do not
+start last and leave most workers idle at the end.
+
+The estimate for one rep comes from earlier runs of the same instance and
+algorithm: summary CSVs (``results_*.csv``, ``best_config_results_*.csv``:
+``success_%`` and ``time_mean`` of the solved reps) and progress CSVs (one row
+per rep). With success rate ``p`` and mean solve time ``t``, a rep with timeout
+``T`` is expected to take ``p * min(t, T) + (1 - p) * T``. An instance without
+history takes the estimate of its puzzle size, else the full timeout.
+
+    import run_history
+    hist = run_history.default_history()
+    hist.expected('inst25x25_40_10.txt', alg=2, timeout=120, size='25x25')
+"""
+
+from __future__ import annotations
+
+import csv
+import functools
+import math
+import re
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+SUMMARY_GLOB = '*results_*.csv'
+PROGRESS_GLOB = '*progress*.csv'
+
+_SIZE_RE = re.compile(r'^\d+x\d+$')
+
+
+def size_of_path(path) -> str | None:
+    """``'9x9'``/``'16x16'``/... from the nearest directory named like one, else None."""
+    for part in reversed(Path(path).parent.parts):
+        if _SIZE_RE.match(part):
+            return part
+    return None
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class _Stats:
+    """Runs of one key: summed success rate and summed success-weighted time."""
+
+    __slots__ = ('runs', 'success', 'time')
+
+    def __init__(self):
+        self.runs = 0.0
+        self.success = 0.0
+        self.time = 0.0
+
+    def add(self, p: float, t: float) -> None:
+        self.runs += 1.0
+        self.success += p
+        if p > 0:
+            self.time += p * t
+
+    def expected(self, timeout: float | None) -> float | None:
+        if self.runs <= 0:
+            return None
+        p = self.success / self.runs
+        t = self.time / self.success if self.success > 0 else None
+        if timeout is None:
+            return t
+        timeout = float(timeout)
+        return p * min(t, timeout) + (1.0 - p) * timeout if t is not None else timeout
+
+
+class RunHistory:
+    """Success rates and solve times of past runs per (instance, alg) and per (size, alg).
+    A ``fallback`` history answers for what this one has never seen (e.g. the
+    runs of one configuration, falling back to all runs)."""
+
+    def __init__(self, fallback: RunHistory | None = None):
+        self._by_instance: dict[tuple, _Stats] = {}
+        self._by_size: dict[tuple, _Stats] = {}
+        self.fallback = fallback
+
+    def __len__(self) -> int:
+        return sum(1 for key in self._by_instance if key[1] is not None)
+
+    def add(self, instance: str, alg, success_rate: float, time_mean: float, size: str | None = None) -> None:
+        """One past run of ``instance``: fraction of reps solved and their mean time."""
+        if math.isnan(success_rate):
+            return
+        p = min(1.0, max(0.0, success_rate))
+        if p > 0 and math.isnan(time_mean):
+            return
+        alg = None if alg is None else str(alg)
+        keys = [(self._by_instance, (instance, alg)), (self._by_instance, (instance, None))]
+        if size is not None:
+            keys += [(self._by_size, (size, alg)), (self._by_size, (size, None))]
+        for table, key in keys:
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = _Stats()
+            stats.add(p, time_mean)
+
+    def load_summary(self, path: Path) -> None:
+        size = size_of_path(path)
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                inst = (row.get('instance') or '').strip()
+                if not inst:
+                    continue
+                self.add(inst, row.get('alg'), _float(row.get('success_%')) / 100.0,
+                         _float(row.get('time_mean')), row.get('puzzle_size') or size)
+
+    def load_progress(self, path: Path) -> None:
+        """Per-rep rows, folded into one run per (instance, alg); interrupted reps are skipped."""
+        from bench_utils import progress_row_interrupted
+        size = size_of_path(path)
+        reps: dict[tuple, list] = {}
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                inst = (row.get('instance') or '').strip()
+                if not inst or progress_row_interrupted(row):
+                    continue
+                acc = reps.setdefault((inst, row.get('alg')), [0, 0, 0.0])
+                acc[0] += 1
+                if (row.get('success') or '').strip() in ('1', 'true', 'True'):
+                    t = _float(row.get('time'))
+                    if not math.isnan(t):
+                        acc[1] += 1
+                        acc[2] += t
+        for (inst, alg), (n, solved, total) in reps.items():
+            self.add(inst, alg, solved / n, total / solved if solved else math.nan, size)
+
+    def load_file(self, path) -> None:
+        """One summary or progress CSV (by its name); a missing or unreadable file is skipped."""
+        path = Path(path)
+        loader = self.load_progress if 'progress' in path.name else self.load_summary
+        try:
+            loader(path)
+        except (OSError, csv.Error, UnicodeDecodeError):
+            pass
+
+    def load_tree(self, root) -> None:
+        """Every summary and progress CSV under ``root``; unreadable files are skipped."""
+        root = Path(root)
+        if not root.is_dir():
+            return
+        for pattern, loader in ((SUMMARY_GLOB, self.load_summary), (PROGRESS_GLOB, self.load_progress)):
+            for path in sorted(root.rglob(pattern)):
+                try:
+                    loader(path)
+                except (OSError, csv.Error, UnicodeDecodeError):
+                    continue
+
+    def expected(self, instance: str | None, alg=None, timeout: float | None = None,
+                 size: str | None = None) -> float | None:
+        """Expected seconds for one rep, or None when neither history nor a timeout is known."""
+        alg = None if alg is None else str(alg)
+        candidates = [(self._by_instance, (instance, alg)), (self._by_instance, (instance, None)),
+                      (self._by_size, (size, alg)), (self._by_size, (size, None))]
+        for table, key in candidates:
+            stats = table.get(key)
+            if stats is not None:
+                return stats.expected(timeout)
+        if self.fallback is not None:
+            return self.fallback.expected(instance, alg, timeout, size)
+        return None if timeout is None else float(timeout)
+
+
+@functools.lru_cache(maxsize=8)
+def load_history(*roots) -> RunHistory:
+    hist = RunHistory()
+    for root in roots:
+        hist.load_tree(root)
+    return hist
+
+
+def default_history() -> RunHistory:
+    """History of everything under ``results/`` (read once per process)."""
+    return load_history(str(REPO_ROOT / 'results'))
@@ -0,0 +1,236 @@
+"""
+ctypes binding for the native solver library (``make libsudaco.so``).
+
+Runs the same solve as ``sudokusolver`` and the WebAssembly module, but inside
+the Python process, so a benchmark worker does not spawn a solver child per
+rep. The call releases the GIL and the solver's CP timers are per thread, so
+several threads (e.g. a ThreadPoolExecutor) can solve at once.
+
+    import sudaco_native
+    res = sudaco_native.solve(puzzle_string, 2, timeout=5, nAnts=3)
+    res['success'], res['time'], res['iterations']
+
+The library is looked up in ``$SUDACO_LIB`` and then at the repository root.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import functools
+import json
+import math
+import os
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Must match SUDACO_ABI_VERSION in src/native_interface.cpp.
+ABI_VERSION = 2
+
+# solve() keyword arguments and their defaults. Non-positive values take the
+# solver defaults, as in solvermain / wasm_interface.
+SOLVE_DEFAULTS = {
+    'timeout': 10.0,
+    'nAnts': 0,
+    'numColonies': 0,
+    'numACS': 0,
+    'q0': 0.9,
+    'rho': 0.9,
+    'evap': 0.0,
+    'convThresh': 0.0,
+    'entropyThreshold': 0.0,
+    'xi': 0.1,
+    'seed': None,
+}
+
+# solvermain option name -> solve() keyword. Keys are matched exactly as
+# solvermain's Arguments does (case-sensitive, so only ``--entropythreshold``
+# reaches the solver), keeping native and subprocess runs identical.
+_CLI_PARAMS = {
+    'timeout': 'timeout',
+    'nAnts': 'nAnts',
+    'ants': 'nAnts',
+    'numColonies': 'numColonies',
+    'numACS': 'numACS',
+    'q0': 'q0',
+    'rho': 'rho',
+    'evap': 'evap',
+    'convThresh': 'convThresh',
+    'entropythreshold': 'entropyThreshold',
+    'xi': 'xi',
+    'seed': 'seed',
+}
+
+_libs: dict[str, ctypes.CDLL] = {}
+_libs_lock = threading.Lock()
+
+
+def default_library() -> Path:
+    env = os.environ.get('SUDACO_LIB')
+    if env:
+        return Path(env)
+    name = 'sudaco.dll' if os.name == 'nt' else 'libsudaco.so'
+    return REPO_ROOT / name
+
+
+def load(path: str | Path | None = None) -> ctypes.CDLL:
+    """Load (once per path) and return the solver library."""
+    lib_path = str(Path(path) if path is not None else default_library())
+    with _libs_lock:
+        lib = _libs.get(lib_path)
+        if lib is not None:
+            return lib
+        lib = ctypes.CDLL(lib_path)
+        lib.sudaco_abi_version.restype = ctypes.c_int
+        lib.sudaco_abi_version.argtypes = []
+        version = lib.sudaco_abi_version()
+        if version != ABI_VERSION:
+            raise OSError(f'{lib_path}: ABI version {version}, expected {ABI_VERSION} (rebuild libsudaco)')
+        # c_void_p rather than c_char_p so we keep the pointer to hand back to sudaco_free
+        lib.sudaco_solve_json.restype = ctypes.c_void_p
+        lib.sudaco_solve_json.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            ctypes.c_float, ctypes.c_float, ctypes.c_float, ctypes.c_float,
+            ctypes.c_float, ctypes.c_float, ctypes.c_float,
+            ctypes.c_longlong,
+        ]
+        lib.sudaco_free.restype = None
+        lib.sudaco_free.argtypes = [ctypes.c_void_p]
+        lib.sudaco_interrupt.restype = None
+        lib.sudaco_interrupt.argtypes = [ctypes.c_int]
+        _libs[lib_path] = lib
+        return lib
+
+
+def interrupt(stop: bool = True, library: str | Path | None = None) -> None:
+    """Make every solve running in the library stop at its next deadline check and
+    return its partial result (``interrupted``: true); ``stop=False`` re-arms it."""
+    load(library).sudaco_interrupt(1 if stop else 0)
+
+
+def available(path: str | Path | None = None) -> bool:
+    try:
+        load(path)
+    except OSError:
+        return False
+    return True
+
+
+def solve(puzzle: str, alg: int = 2, *, library: str | Path | None = None, **params) -> dict:
+    """Solve a one-line puzzle string and return the solver's JSON result as a dict.
+
+    Keys: success, solution, time, cellsFilled, iterations, cp_initial, cp_ant,
+    cp_calls, cp_total, seed, interrupted and, for alg 2, dcm_aco, cooperative_game,
+    pheromone_fusion, public_path. Invalid input gives success False and error.
+    """
+    unknown = set(params) - set(SOLVE_DEFAULTS)
+    if unknown:
+        raise TypeError(f'unknown solver parameter(s): {", ".join(sorted(unknown))}')
+    p = dict(SOLVE_DEFAULTS)
+    p.update(params)
+    seed = -1 if p['seed'] is None else int(p['seed'])
+    lib = load(library)
+    ptr = lib.sudaco_solve_json(
+        puzzle.encode('ascii'),
+        int(alg), int(p['nAnts']), int(p['numColonies']), int(p['numACS']),
+        float(p['q0']), float(p['rho']), float(p['evap']), float(p['convThresh']),
+        float(p['entropyThreshold']), float(p['timeout']), float(p['xi']),
+        seed,
+    )
+    try:
+        return json.loads(ctypes.string_at(ptr).decode('ascii'))
+    finally:
+        lib.sudaco_free(ptr)
+
+
+@functools.lru_cache(maxsize=256)
+def puzzle_from_file(file_path: str) -> str:
+    """Read an instance file into a one-line puzzle string (as ReadFile in solvermain.cpp)."""
+    nums = [int(tok) for tok in Path(file_path).read_text().split()]
+    if len(nums) < 2:
+        return ''
+    first, values = nums[0], nums[2:]
+    if len(values) == first ** 4:
+        units = first * first
+    elif len(values) == first * first:
+        units = first
+    else:
+        return ''
+    if units not in (9, 16, 25):
+        return ''
+    chars = []
+    for val in values[:units * units]:
+        if val == -1:
+            chars.append('.')
+        elif units == 9:
+            chars.append(chr(ord('1') + val - 1))
+        elif units == 16:
+            chars.append(chr(ord('0') + val - 1) if val < 11 else chr(ord('a') + val - 11))
+        else:
+            chars.append(chr(ord('a') + val - 1))
+    return ''.join(chars)
+
+
+def params_from_args(extra_args) -> dict:
+    """Translate solver CLI options (``['--nAnts', '3', ...]``) into solve() keywords."""
+    params = {}
+    tokens = [str(a) for a in (extra_args or [])]
+    for i, tok in enumerate(tokens):
+        if not tok.startswith('--') or len(tok) <= 2:
+            continue
+        key = _CLI_PARAMS.get(tok[2:])
+        if key is None or i + 1 >= len(tokens) or tokens[i + 1].startswith('--'):
+            continue
+        value = tokens[i + 1]
+        params[key] = int(value) if key == 'seed' else float(value)
+    return params
+
+
+def run_solver(file_path, alg, timeout, extra_args=None, library=None, seed=None, campaign=None):
+    """In-process counterpart of ``bench_utils.run_solver``: ``(success, elapsed, cycles, out)``.
+
+    Uses the result cache like ``bench_utils.run_solver``, keyed on the library
+    instead of the solver binary, and holds a machine-wide solver slot while
+    solving (``campaign_scheduler.solver_slot``), bound to its CPUs with
+    ``--pin``. A solve cut short by :func:`interrupt` raises
+    ``bench_utils.SolverInterruptedError`` carrying the partial result.
+    """
+    import campaign_scheduler
+    import cpu_affinity
+    import rep_store
+    import result_cache
+    cache = result_cache.active()
+    lib_path = Path(library) if library is not None else default_library()
+    config = None
+    if cache is not None:
+        try:
+            config = result_cache.config_key(lib_path, file_path, alg, timeout, extra_args)
+        except OSError:
+            cache = None
+    if cache is not None:
+        res = cache.get(config, seed)
+        if res is not None:
+            return rep_store.keep((bool(res['success']), float(res['time']), int(res['iterations']), json.dumps(res)),
+                                  file_path, alg, timeout, extra_args, seed, campaign)
+    puzzle = puzzle_from_file(str(file_path))
+    if not puzzle:
+        return False, math.nan, math.nan, f'could not read puzzle: {file_path}'
+    params = params_from_args(extra_args)
+    params['timeout'] = float(timeout)
+    if seed is not None:
+        params['seed'] = int(seed)
+    with campaign_scheduler.solver_slot() as cpus, cpu_affinity.pinned(cpus):  # solves on this thread
+        res = solve(puzzle, int(alg), library=library, **params)
+    if 'error' in res:
+        return False, math.nan, math.nan, json.dumps(res)
+    if res.get('interrupted'):
+        from bench_utils import SolverInterruptedError
+        raise SolverInterruptedError(
+            f"Solve interrupted after {res['time']} s ({res['cellsFilled']} cells filled) for file {file_path}.",
+            record=res)
+    if cache is not None:
+        cache.put(config, res, campaign)
+    return rep_store.keep((bool(res['success']), float(res['time']), int(res['iterations']), json.dumps(res)),
+                          file_path, alg, timeout, extra_args, seed, campaign)
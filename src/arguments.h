@@ -3,6 +3,7 @@
 #include <string>
 #include <sstream>
 #include <cstring>
+#include <vector>
 using namespace std;
 //
 // very simple command line argument handler
@@ -12,11 +13,11 @@ class Arguments
 {
 	map< string, string> args;
 
-	bool IsArg( char *token )
+	bool IsArg( const char *token )
 	{
 		return ( strlen(token) > 2 && token[0] == '-' && token[1] == '-' );
 	}
-	void ProcessArgs( int argc, char *argv[] )
+	void ProcessArgs( int argc, const char * const argv[] )
 	{
 		for ( int i = 1; i < argc; i++ )
 		{
@@ -42,6 +43,45 @@ public:
 	{
 		ProcessArgs( argc, argv );
 	}
+	// parse a single command line, e.g. one job line read in --serve mode.
+	// tokens are split on whitespace; double quotes group a token containing spaces
+	Arguments( const string &line )
+	{
+		vector<string> tokens(1); // slot 0 plays the part of argv[0]
+		string token;
+		bool inQuotes = false, haveToken = false;
+		for ( size_t i = 0; i < line.length(); i++ )
+		{
+			char c = line[i];
+			if ( c == '"' )
+			{
+				inQuotes = !inQuotes;
+				haveToken = true;
+			}
+			else if ( !inQuotes && ( c == ' ' || c == '\t' || c == '\r' || c == '\n' ) )
+			{
+				if ( haveToken )
+					tokens.push_back(token);
+				token.clear();
+				haveToken = false;
+			}
+			else
+			{
+				token += c;
+				haveToken = true;
+			}
+		}
+		if ( haveToken )
+			tokens.push_back(token);
+		vector<const char*> argv;
+		for ( size_t i = 0; i < tokens.size(); i++ )
+			argv.push_back(tokens[i].c_str());
+		ProcessArgs( (int)argv.size(), argv.data() );
+	}
+	void SetArg( const string &arg, const string &value )
+	{
+		args[arg] = value;
+	}
 	template<class T> T GetArg(const string &arg, const T& defaultValue ) 
 	{
 		T retVal = defaultValue;
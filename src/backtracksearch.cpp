@@ -4,20 +4,36 @@
 //
 #include "backtracksearch.h"
 #include "constraintpropagation.h"
+#include <algorithm>
 
 void BacktrackSearch::StepSolution(const Board &puzzle)
 {
-	// deal with timeout
+	// deal with timeout (or a stop request, handled the same way)
 	if (timedOut)
 		return;
+	if (SolverStopRequested())
+	{
+		timedOut = true;
+		return;
+	}
 	stepCount++;
-	if ( stepCount%5000 == 0 )
+	if ( stepCount >= nextTimeCheck )
 	{
-		if ( solutionTimer.Elapsed() > timeOut )
+		float elapsed = solutionTimer.Elapsed();
+		if ( elapsed > timeOut )
 		{
 			timedOut = true;
 			return;
 		}
+		// space the checks by the measured step rate, so they come about every
+		// checkPeriod seconds whether a step takes microseconds (9x9) or
+		// milliseconds (board copies and propagation on 25x25)
+		float checkPeriod = (std::min)(0.01f, timeOut * 0.01f);
+		int stride = maxCheckStride;
+		if ( elapsed > 0.0f )
+			stride = (int)(stepCount * checkPeriod / elapsed);
+		stride = (std::max)(1, (std::min)(stride, maxCheckStride));
+		nextTimeCheck = stepCount + stride;
 	}
 	// find the cell with the least number of possibilities (minimum remaining values heuristic)
 	int nextCell = -1;
@@ -44,7 +60,7 @@ void BacktrackSearch::StepSolution(const Board &puzzle)
 	ValueSet choice = ValueSet(puzzle.GetNumUnits(), 1);
 	for (int i = 0; i < puzzle.GetNumUnits(); i++)
 	{
-		if (solved)
+		if (solved || timedOut)
 			return;
 		if ( puzzle.GetCell(nextCell).Contains(choice))
 		{
@@ -77,6 +93,8 @@ bool BacktrackSearch::Solve(const Board& puzzle, float maxTime)
 	solved = false;
 	timedOut = false;
 	timeOut = maxTime;
+	stepCount = 0;
+	nextTimeCheck = 1;
 	solutionTimer.Reset();
 	StepSolution(puzzle);
 	solTime = solutionTimer.Elapsed();
@@ -14,8 +14,10 @@ private:
 	int stepCount;
 	bool timedOut;
 	float timeOut;
+	int nextTimeCheck; // step at which the timer is next read
+	static const int maxCheckStride = 5000;
 public:
-BacktrackSearch() : solTime(0.0f), stepCount(0), timedOut(false) {}
+BacktrackSearch() : solTime(0.0f), stepCount(0), timedOut(false), timeOut(0.0f), nextTimeCheck(1) {}
 	virtual bool Solve(const Board& puzzle, float maxTime);
 	virtual float GetSolutionTime() { return solTime; }
 	virtual const Board& GetSolution() { return solution; }
@@ -44,9 +44,11 @@ public:
 private:
 	ValueSet *cells = nullptr;
 
-	int order;   // order of puzzle
-	int numUnits; // number of units (rows, columns, blocks)
-	int numCells; // number of cells
-	int numFixedCells; // number of cells with uniquely determined value
-	int numInfeasible; // number of cells with no possibilities.
+	// zero for a default-constructed board, so copying one that was never
+	// filled (a solver stopped before finding anything) yields an empty board
+	int order = 0;   // order of puzzle
+	int numUnits = 0; // number of units (rows, columns, blocks)
+	int numCells = 0; // number of cells
+	int numFixedCells = 0; // number of cells with uniquely determined value
+	int numInfeasible = 0; // number of cells with no possibilities.
 };
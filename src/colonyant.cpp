@@ -26,7 +26,7 @@ void ColonyAnt::StepSolution()
     {
         // make a choice from the options
         ValueSet choice = ValueSet(sol.GetNumUnits(), 1);
-        if (parent->random() < parent->Getq0(colonyIndex))
+        if (parent->random(colonyIndex) < parent->Getq0(colonyIndex))
         {
             // greedy selection
             ValueSet best;
@@ -66,7 +66,7 @@ void ColonyAnt::StepSolution()
                 }
                 choice <<= 1;
             }
-            float rouletteVal = totPher * parent->random();
+            float rouletteVal = totPher * parent->random(colonyIndex);
 
             for (int i = 0; i < numChoices; i++)
             {
@@ -14,10 +14,12 @@ static void AtomicAddFloat(std::atomic<float>& target, float value)
 	while (!target.compare_exchange_weak(current, current + value));
 }
 
-static std::atomic<float> g_initialCPTime{0.0f};
-static std::atomic<float> g_antCPTime{0.0f};
-static std::atomic<int> g_cpCallCount{0};
-static bool g_inInitialCP = false;
+// per thread, so solves running concurrently in one process (native library)
+// keep separate accounting
+static thread_local std::atomic<float> g_initialCPTime{0.0f};
+static thread_local std::atomic<float> g_antCPTime{0.0f};
+static thread_local std::atomic<int> g_cpCallCount{0};
+static thread_local bool g_inInitialCP = false;
 
 void ResetCPTiming()
 {
@@ -103,6 +103,7 @@ bool MultiColonyAntSystem::Solve(const Board &puzzle, float maxTime)
     }
 
     std::uniform_int_distribution<int> startDist(0, puzzle.CellCount() - 1);
+    const int deadlineStride = puzzle.GetNumUnits();
 
     while (!solved)
     {
@@ -115,10 +116,11 @@ bool MultiColonyAntSystem::Solve(const Board &puzzle, float maxTime)
         for (int c = 0; c < numColonies; ++c)
         {
             for (auto *a : colonies[c].ants)
-                a->InitSolution(puzzle, startDist(randGen));
+                a->InitSolution(puzzle, startDist(colonyRandGen[c]));
         }
 
         // construct solutions cell by cell
+        bool outOfTime = false;
         for (int i = 0; i < puzzle.CellCount(); i++)
         {
             for (int c = 0; c < numColonies; ++c)
@@ -126,7 +128,18 @@ bool MultiColonyAntSystem::Solve(const Board &puzzle, float maxTime)
                 for (auto *a : colonies[c].ants)
                     a->StepSolution();
             }
+            // cheap deadline check once per row of cells: one iteration of all
+            // colonies on a 25x25 puzzle can take a large part of the budget.
+            // The first iteration always completes so there is a best solution to report
+            if (iter > 0 && (i % deadlineStride) == deadlineStride - 1 &&
+                (SolverStopRequested() || solutionTimer.Elapsed() > maxTime))
+            {
+                outOfTime = true;
+                break;
+            }
         }
+        if (outOfTime)
+            break;
 
         // per-colony: evaluate bests and track global best
         for (int c = 0; c < numColonies; ++c)
@@ -279,7 +292,7 @@ bool MultiColonyAntSystem::Solve(const Board &puzzle, float maxTime)
         if ((iter % 100) == 0)
         {
             float elapsed = solutionTimer.Elapsed();
-            if (elapsed > maxTime)
+            if (elapsed > maxTime || SolverStopRequested())
                 break;
         }
     }
@@ -50,7 +50,9 @@ class MultiColonyAntSystem : public SudokuSolver
     float solTime;
     float dcmAcoTime;  // Time spent in main DCM-ACO algorithm work
     int iterationCount;
-    std::mt19937 randGen;
+    // one generator per colony, derived from a single seed, so a colony's draws
+    // do not depend on how many numbers the other colonies consumed
+    std::vector<std::mt19937> colonyRandGen;
     std::uniform_real_distribution<float> randomDist;
     
     // Timing for multi-colony operations
@@ -99,7 +101,7 @@ public:
         colonies.resize(numColonies);
         randomDist = std::uniform_real_distribution<float>(0.0f, 1.0f);
         std::random_device rd;
-        randGen = std::mt19937(rd());
+        SetSeed(rd());
     }
 
     ~MultiColonyAntSystem()
@@ -116,6 +118,16 @@ public:
     virtual float GetSolutionTime() { return solTime; }
     virtual const Board &GetSolution() { return globalBestSol; }
     virtual int GetIterationCount() { return iterationCount; }
+    virtual void SetSeed(unsigned int seed)
+    {
+        colonyRandGen.resize(numColonies);
+        for (int c = 0; c < numColonies; ++c)
+        {
+            std::seed_seq seq{seed, (unsigned int)c};
+            colonyRandGen[c].seed(seq);
+        }
+        randomDist.reset();
+    }
     void SetProgressCallback(std::function<void(int, const Board&, int)> callback) { progressCallback = std::move(callback); }
     
     // Timing getters for multi-colony operations
@@ -128,7 +140,7 @@ public:
     inline float Getq0() { return q0; }
     inline float Getq0(int colony) { return (colony >= 0 && colony < (int)colonyQ0.size()) ? colonyQ0[colony] : q0; }
     inline float GetRho(int colony) { return (colony >= 0 && colony < (int)colonyRho.size()) ? colonyRho[colony] : rho; }
-    inline float random() { return randomDist(randGen); }
+    inline float random(int colony) { return randomDist(colonyRandGen[colony]); }
     inline float Pher(int colony, int iCell, int iValue) { return colonies[colony].pher[iCell][iValue]; }
     void LocalPheromoneUpdate(int colony, int iCell, int iChoice)
     {
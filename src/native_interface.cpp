@@ -0,0 +1,114 @@
+#include <string>
+#include <cstring>
+#include <cstdlib>
+#include <iostream>
+#include <mutex>
+#include <streambuf>
+#include "solverjson.h"
+#include "sudokusolver.h"
+
+//
+// C ABI of the native solver library (libsudaco.so / sudaco.dll), the desktop
+// counterpart of wasm_interface.cpp. Loaded from Python by scripts/sudaco_native.py.
+//
+// Solves run on the calling thread; the constraint propagation timers are
+// thread local, so several threads may solve at once.
+//
+
+#if defined(_WIN32)
+#define SUDACO_API __declspec(dllexport)
+#else
+#define SUDACO_API __attribute__((visibility("default")))
+#endif
+
+// bump whenever an exported signature changes
+#define SUDACO_ABI_VERSION 2
+
+namespace {
+
+// swallows the "Number of cycles" chatter solvers write to cout, as solvermain
+// does for its reps, so in-process solves do not write to the host's stdout
+class NullBuffer : public std::streambuf
+{
+protected:
+    int overflow( int c ) { return traits_type::not_eof(c); }
+};
+
+// cout stays redirected while any thread is solving; the first solve to start
+// swaps the buffer and the last one to finish restores it
+class QuietCout
+{
+public:
+    QuietCout()
+    {
+        std::lock_guard<std::mutex> lock(mutex());
+        if ( depth()++ == 0 )
+            saved() = std::cout.rdbuf(&nullBuffer());
+    }
+    ~QuietCout()
+    {
+        std::lock_guard<std::mutex> lock(mutex());
+        if ( --depth() == 0 )
+            std::cout.rdbuf(saved());
+    }
+
+private:
+    static std::mutex& mutex() { static std::mutex m; return m; }
+    static int& depth() { static int d = 0; return d; }
+    static std::streambuf*& saved() { static std::streambuf* b = nullptr; return b; }
+    static NullBuffer& nullBuffer() { static NullBuffer b; return b; }
+};
+
+} // namespace
+
+extern "C" {
+
+SUDACO_API int sudaco_abi_version()
+{
+    return SUDACO_ABI_VERSION;
+}
+
+// Solve one puzzle string (as for solvermain --puzzle) and return the JSON
+// result from RunSolverJson. Non-positive parameters take the solvermain
+// defaults; seed < 0 seeds from std::random_device. Release the result with
+// sudaco_free.
+SUDACO_API char* sudaco_solve_json(
+    const char* puzzleString,
+    int algorithm,
+    int nAnts,
+    int numColonies,
+    int numACS,
+    float q0,
+    float rho,
+    float evap,
+    float convThresh,
+    float entropyThresh,
+    float timeout,
+    float xi,
+    long long seed
+)
+{
+    QuietCout quiet;
+    std::string result = RunSolverJson(
+        puzzleString, algorithm, nAnts, numColonies, numACS,
+        q0, rho, evap, convThresh, entropyThresh, timeout, xi, seed
+    );
+    char* output = (char*)malloc(result.length() + 1);
+    strcpy(output, result.c_str());
+    return output;
+}
+
+// Ask running solves (on any thread) to stop at their next deadline check and
+// return their best solution so far, reported with "interrupted": true; stop = 0
+// clears the request so the library can solve again.
+SUDACO_API void sudaco_interrupt(int stop)
+{
+    SolverStopRequested() = stop ? 1 : 0;
+}
+
+SUDACO_API void sudaco_free(char* result)
+{
+    free(result);
+}
+
+} // extern "C"
@@ -0,0 +1,193 @@
+#include "solverjson.h"
+#include <sstream>
+#include <iomanip>
+#include <limits>
+#include <cmath>
+#include <random>
+#include "sudokusolver.h"
+#include "backtracksearch.h"
+#include "sudokuantsystem.h"
+#include "multicolonyantsystem.h"
+#include "constraintpropagation.h"
+
+std::string EscapeJson(const std::string& str) {
+    std::ostringstream o;
+    for (auto c : str) {
+        if (c == '"' || c == '\\') {
+            o << '\\';
+        }
+        o << c;
+    }
+    return o.str();
+}
+
+std::string CompactSolution(const Board& board) {
+    std::string alphabet;
+    if (board.GetNumUnits() == 9) {
+        alphabet = "123456789";
+    } else if (board.GetNumUnits() == 16) {
+        alphabet = "0123456789abcdef";
+    } else {
+        alphabet = "abcdefghijklmnopqrstuvwxy";
+    }
+    std::string compact(board.CellCount(), '.');
+    for (int i = 0; i < board.CellCount(); i++) {
+        const ValueSet& cell = board.GetCell(i);
+        if (cell.Fixed() && cell.Index() < (int)alphabet.length()) {
+            compact[i] = alphabet[cell.Index()];
+        }
+    }
+    return compact;
+}
+
+std::string RunSolverJson(
+    const char* puzzleString,
+    int algorithm,
+    int nAnts,
+    int numColonies,
+    int numACS,
+    float q0,
+    float rho,
+    float evap,
+    float convThresh,
+    float entropyThresh,
+    float timeout,
+    float xi,
+    long long seed,
+    std::function<void(int, const Board&, int)> progressCallback
+) {
+    try {
+        if (puzzleString == nullptr) {
+            return "{\"success\":false,\"error\":\"no puzzle specified\"}";
+        }
+
+        // Reset CP timing before building the board so the initial CP is counted (matches solvermain)
+        ResetCPTiming();
+
+        // Create board from puzzle string
+        Board board{std::string(puzzleString)};
+        if (board.CellCount() == 0) {
+            return "{\"success\":false,\"error\":\"wrong number of cells for a sudoku board\"}";
+        }
+
+        // Mirror solvermain defaults/safety fallbacks when values are not sensible.
+        if (algorithm == 2) {
+            if (nAnts <= 0) {
+                nAnts = 3;
+            }
+            if (numACS <= 0) {
+                numACS = 6;
+            }
+            if (numColonies <= 0) {
+                numColonies = numACS + 1;
+            }
+            if (evap <= 0.0f) {
+                evap = 0.0125f;
+            }
+            if (convThresh <= 0.0f) {
+                convThresh = 0.8f;
+            }
+            if (entropyThresh <= 0.0f) {
+                const float entropyPctDefault = 92.5f;
+                entropyThresh = static_cast<float>(
+                    std::log2(static_cast<double>(nAnts)) * (entropyPctDefault / 100.0f)
+                );
+            }
+        } else if (algorithm == 0) {
+            if (nAnts <= 0) {
+                nAnts = 10;
+            }
+            if (evap <= 0.0f) {
+                evap = 0.005f;
+            }
+        }
+
+        // Create solver based on algorithm type (match solvermain constructors)
+        SudokuSolver* solver = nullptr;
+
+        if (algorithm == 0) {
+            // Ant Colony System (ACS) - single colony, with xi
+            solver = new SudokuAntSystem(nAnts, q0, rho, 1.0f / board.CellCount(), evap, xi);
+        } else if (algorithm == 2) {
+            // Multi-Colony DCM-ACO, with xi
+            auto* mcas = new MultiColonyAntSystem(
+                nAnts, q0, rho, 1.0f / board.CellCount(), evap,
+                numColonies, numACS, convThresh, entropyThresh, xi
+            );
+            if (progressCallback) {
+                mcas->SetProgressCallback(progressCallback);
+            }
+            solver = mcas;
+        } else {
+            // Backtracking search (algorithm 1 and anything unknown)
+            solver = new BacktrackSearch();
+        }
+        // always seed explicitly so the result can report (and replay) the seed
+        if (seed < 0) {
+            std::random_device rd;
+            seed = rd();
+        }
+        solver->SetSeed(static_cast<unsigned int>(seed));
+
+        // Solve the puzzle
+        bool success = solver->Solve(board, timeout);
+        // copy-construct: Board's assignment is a shallow copy, which would double free
+        // once the solver is deleted
+        Board solution(solver->GetSolution());
+        float solTime = solver->GetSolutionTime();
+        int iterations = solver->GetIterationCount();
+
+        // Keep solvermain parity: if solved but invalid, treat as failure.
+        if (success && !board.CheckSolution(solution)) {
+            success = false;
+        }
+
+        // CP timing (matches solvermain: add initial CP to total time)
+        float initialCPTime = GetInitialCPTime();
+        float antCPTime = GetAntCPTime();
+        int cpCallCount = GetCPCallCount();
+        solTime += initialCPTime;
+
+        std::string cleanSolution = CompactSolution(solution);
+
+        // Build JSON response (include timing fields to match solvermain output)
+        std::ostringstream jsonStream;
+        jsonStream << std::setprecision(std::numeric_limits<float>::max_digits10);
+        jsonStream << "{";
+        jsonStream << "\"success\":" << (success ? "true" : "false") << ",";
+        jsonStream << "\"solution\":\"" << EscapeJson(cleanSolution) << "\",";
+        jsonStream << "\"time\":" << solTime << ",";
+        jsonStream << "\"cellsFilled\":" << solution.FixedCellCount() << ",";
+        jsonStream << "\"iterations\":" << iterations << ",";
+        jsonStream << "\"cp_initial\":" << initialCPTime << ",";
+        jsonStream << "\"cp_ant\":" << antCPTime << ",";
+        jsonStream << "\"cp_calls\":" << cpCallCount << ",";
+        jsonStream << "\"cp_total\":" << (initialCPTime + antCPTime) << ",";
+        jsonStream << "\"seed\":" << seed << ",";
+        jsonStream << "\"interrupted\":" << (!success && SolverStopRequested() ? "true" : "false");
+
+        // DCM-ACO timing (algorithm 2 only, matches solvermain)
+        if (algorithm == 2) {
+            MultiColonyAntSystem* mcas = dynamic_cast<MultiColonyAntSystem*>(solver);
+            if (mcas) {
+                jsonStream << ",\"dcm_aco\":" << mcas->GetDCMAcoTime();
+                jsonStream << ",\"cooperative_game\":" << mcas->GetCooperativeGameTime();
+                jsonStream << ",\"pheromone_fusion\":" << mcas->GetPheromoneFusionTime();
+                jsonStream << ",\"public_path\":" << mcas->GetPublicPathRecommendationTime();
+            }
+        }
+        jsonStream << "}";
+
+        // Clean up solver
+        delete solver;
+
+        return jsonStream.str();
+
+    } catch (const std::exception& e) {
+        // Return error as JSON
+        return std::string("{\"success\":false,\"error\":\"") + EscapeJson(e.what()) + "\"}";
+    } catch (...) {
+        // Return generic error
+        return "{\"success\":false,\"error\":\"Unknown error occurred\"}";
+    }
+}
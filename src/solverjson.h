@@ -0,0 +1,37 @@
+#pragma once
+#include <string>
+#include <functional>
+#include "board.h"
+
+//
+// one-call "solve this puzzle string, give me a JSON result" entry point shared by
+// the WebAssembly module (wasm_interface.cpp) and the native library
+// (native_interface.cpp)
+//
+
+// solution in the one-line puzzle alphabet, '.' for unfixed cells
+std::string CompactSolution(const Board &board);
+
+std::string EscapeJson(const std::string &str);
+
+// Solve puzzleString and return a JSON object with success, solution, time,
+// cellsFilled, iterations, the cp_* timings, the seed used, whether a stop
+// request (SolverStopRequested) cut the solve short and, for algorithm 2, the DCM
+// phase timers. Non-positive parameters fall back to the solvermain
+// defaults. A negative seed draws one from std::random_device.
+std::string RunSolverJson(
+    const char* puzzleString,
+    int algorithm,
+    int nAnts,
+    int numColonies,
+    int numACS,
+    float q0,
+    float rho,
+    float evap,
+    float convThresh,
+    float entropyThresh,
+    float timeout,
+    float xi,
+    long long seed,
+    std::function<void(int, const Board&, int)> progressCallback = nullptr
+);
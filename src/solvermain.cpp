@@ -5,12 +5,26 @@
 #include "board.h"
 #include "arguments.h"
 #include "constraintpropagation.h"
+#include "solverjson.h"
 #include <iostream>
 #include <fstream>
 #include <string>
 #include <vector>
 #include <iomanip>
+#include <sstream>
 #include <cmath>
+#include <cstdint>
+#include <cstring>
+#include <cstdlib>
+#include <random>
+#include <algorithm>
+#include <csignal>
+#ifdef _WIN32
+#include <io.h>
+#include <fcntl.h>
+#else
+#include <dirent.h>
+#endif
 using namespace std;
 
 string ReadFile( string fileName )
@@ -97,10 +111,12 @@ string ReadFile( string fileName )
 	}
 }
 
-int main( int argc, char *argv[] )
+// marker written after each job's output in --serve mode so the caller knows
+// where one result ends and the next begins
+static const char *SERVE_END_MARKER = "@@end";
+
+string LoadPuzzle( Arguments &a )
 {
-	// solve, then spit out 0 for success, 1 for fail, followed by time in seconds
-	Arguments a( argc, argv );
 	string puzzleString;
 	if ( a.GetArg("blank", 0 ) && a.GetArg("order", 0 ))
 	{
@@ -118,17 +134,13 @@ int main( int argc, char *argv[] )
 			string fileName = a.GetArg(string("file"),string());
 			puzzleString = ReadFile(fileName);
 		}
-		if ( puzzleString.length() == 0 )
-		{
-			cerr << "no puzzle specified" << endl;
-			exit(0);
-		}
 	}
-	ResetCPTiming();
-	Board board(puzzleString);
+	return puzzleString;
+}
 
+SudokuSolver *CreateSolver( Arguments &a, int cellCount )
+{
     int algorithm = a.GetArg("alg", 0);
-    int timeOutSecs = a.GetArg("timeout", 10);
     // Keep alg0 defaults unchanged; apply best config defaults only to alg2.
     int nAntsDefault = (algorithm == 2 ? 3 : 10);
     int nAnts = a.GetArg("nAnts", a.GetArg("ants", nAntsDefault));
@@ -144,31 +156,256 @@ int main( int argc, char *argv[] )
     float entropyPctDefault = 92.5f;
     float entropyThresholdDefault = static_cast<float>(log2(static_cast<double>(nAnts)) * (entropyPctDefault / 100.0f));
     float entropyThreshold = a.GetArg("entropythreshold", entropyThresholdDefault);  // threshold for pheromone fusion
-    bool blank = a.GetArg("blank", false );
-    bool verbose = a.GetArg("verbose", 0);
-    bool showInitial = a.GetArg("showinitial", 0);
-    bool success;
 
-	float solTime;
-	Board solution;
-    SudokuSolver *solver;
-	
     if ( algorithm == 0 )
     {
         // Single-colony Ant Colony System
-        solver = new SudokuAntSystem( nAnts, q0, rho, 1.0f/board.CellCount(), evap, xi);
+        return new SudokuAntSystem( nAnts, q0, rho, 1.0f/cellCount, evap, xi);
     }
     else if ( algorithm == 2 )
     {
         // Multi-colony ACO (ants count is per colony)
-        solver = new MultiColonyAntSystem(nAnts, q0, rho, 1.0f/board.CellCount(), evap,
-                                          numColonies, numACS, convThresh, entropyThreshold, xi);
-    }
-    else
-    {
-        solver = new BacktrackSearch();
+        return new MultiColonyAntSystem(nAnts, q0, rho, 1.0f/cellCount, evap,
+                                        numColonies, numACS, convThresh, entropyThreshold, xi);
     }
+    return new BacktrackSearch();
+}
+
+// swallows the "Number of cycles" chatter solvers write to cout, so structured
+// and per-rep output stays one record per run
+class NullBuffer : public streambuf
+{
+protected:
+	int overflow( int c ) { return traits_type::not_eof(c); }
+};
+
+// outcome of one solve, as written by --reps and --format json/binary
+struct RunResult
+{
+	int rep;
+	bool success;
+	float time;
+	int cycles;
+	float cpInitial;
+	float cpAnt;
+	int cpCalls;
+	// DCM-ACO phase timers, zero for the other algorithms
+	float dcmAco;
+	float cooperativeGame;
+	float pheromoneFusion;
+	float publicPath;
+	string solution; // compact solution string, filled for --solution
+	unsigned int seed;
+	int cellsFilled; // fixed cells in the best solution found
+	bool interrupted; // stopped early by SIGTERM/SIGINT without solving
+	string instance; // puzzle name in multi-puzzle runs (--list, --dir, --stdin)
+};
+
+// 64-bit FNV-1a, for --solution hash
+uint64_t HashString( const string &s )
+{
+	uint64_t h = 14695981039346656037ULL;
+	for ( size_t i = 0; i < s.length(); i++ )
+	{
+		h ^= (unsigned char)s[i];
+		h *= 1099511628211ULL;
+	}
+	return h;
+}
+
+// seed for rep (counting from 1): the rep-th entry of --seeds s1,s2,..., else
+// --seed S + rep - 1, else a fresh std::random_device draw. Every run is seeded
+// explicitly so the seed can be reported and the run replayed.
+unsigned int RepSeed( Arguments &a, int rep )
+{
+	string seeds = a.GetArg(string("seeds"), string());
+	if ( seeds.length() > 0 )
+	{
+		istringstream in(seeds);
+		string tok;
+		for ( int i = 1; getline(in, tok, ','); i++ )
+		{
+			if ( i == rep )
+				return (unsigned int)strtoul(tok.c_str(), nullptr, 10);
+		}
+	}
+	if ( a.GetArg(string("seed"), string()).length() > 0 )
+		return a.GetArg("seed", 0u) + (unsigned int)(rep - 1);
+	random_device rd;
+	return rd();
+}
+
+// solve the (already constrained) board once on a fresh solver, seeded with RepSeed
+void SolveRep( Arguments &a, Board &board, int rep, float initialCPTime, RunResult &res )
+{
+	float timeOutSecs = a.GetArg("timeout", 10.0f);
+	bool keepSolution = a.GetArg(string("solution"), string()).length() > 0;
+
+	ResetCPTiming();
+	SudokuSolver *solver = CreateSolver(a, board.CellCount());
+	res.seed = RepSeed(a, rep);
+	solver->SetSeed(res.seed);
+
+	NullBuffer nullBuffer;
+	streambuf *coutBuffer = cout.rdbuf(&nullBuffer);
+	bool success = solver->Solve(board, (float)timeOutSecs );
+	cout.rdbuf(coutBuffer);
 
+	Board solution(solver->GetSolution());
+	if ( success )
+		success = board.CheckSolution(solution);
+
+	res.rep = rep;
+	res.success = success;
+	res.cellsFilled = solution.FixedCellCount();
+	res.interrupted = !success && SolverStopRequested() != 0;
+	res.time = solver->GetSolutionTime() + initialCPTime;
+	res.cycles = solver->GetIterationCount();
+	res.cpInitial = initialCPTime;
+	res.cpAnt = GetAntCPTime();
+	res.cpCalls = GetCPCallCount();
+	res.dcmAco = res.cooperativeGame = res.pheromoneFusion = res.publicPath = 0.0f;
+	if ( MultiColonyAntSystem* mcas = dynamic_cast<MultiColonyAntSystem*>(solver) )
+	{
+		res.dcmAco = mcas->GetDCMAcoTime();
+		res.cooperativeGame = mcas->GetCooperativeGameTime();
+		res.pheromoneFusion = mcas->GetPheromoneFusionTime();
+		res.publicPath = mcas->GetPublicPathRecommendationTime();
+	}
+	res.solution = keepSolution ? CompactSolution(solution) : string();
+	delete solver;
+}
+
+// --reps N (text): one line per rep
+//   rep <index> <success 1/0> <time> <cycles> <cp_initial> <cp_ant> <cp_calls> <seed> [interrupted]
+// time includes the initial CP time, as in the single-run output.
+void WriteRepLine( const RunResult &res )
+{
+	cout << "rep " << res.rep << " " << (res.success ? 1 : 0) << " " << res.time << " " << res.cycles << " "
+	     << res.cpInitial << " " << res.cpAnt << " " << res.cpCalls << " " << res.seed
+	     << (res.interrupted ? " interrupted" : "") << endl;
+}
+
+// --format json: one object per line with a fixed set of keys. --solution adds
+// "solution" (compact string), --solution hash adds "solution_hash" instead.
+// Multi-puzzle runs lead with "instance".
+void WriteJsonRecord( const RunResult &res, const string &solutionMode )
+{
+	ostringstream json;
+	json << setprecision(9);
+	json << "{";
+	if ( res.instance.length() > 0 )
+		json << "\"instance\":\"" << EscapeJson(res.instance) << "\",";
+	json << "\"rep\":" << res.rep
+	     << ",\"success\":" << (res.success ? "true" : "false")
+	     << ",\"time\":" << res.time
+	     << ",\"cycles\":" << res.cycles
+	     << ",\"cp_initial\":" << res.cpInitial
+	     << ",\"cp_ant\":" << res.cpAnt
+	     << ",\"cp_calls\":" << res.cpCalls
+	     << ",\"cp_total\":" << (res.cpInitial + res.cpAnt)
+	     << ",\"dcm_aco\":" << res.dcmAco
+	     << ",\"cooperative_game\":" << res.cooperativeGame
+	     << ",\"pheromone_fusion\":" << res.pheromoneFusion
+	     << ",\"public_path\":" << res.publicPath
+	     << ",\"seed\":" << res.seed
+	     << ",\"cells_filled\":" << res.cellsFilled
+	     << ",\"interrupted\":" << (res.interrupted ? "true" : "false");
+	if ( solutionMode == "hash" )
+		json << ",\"solution_hash\":\"" << hex << setw(16) << setfill('0') << HashString(res.solution) << "\"";
+	else if ( solutionMode.length() > 0 )
+		json << ",\"solution\":\"" << res.solution << "\"";
+	json << "}";
+	cout << json.str() << endl;
+}
+
+// --format binary: one 56-byte little-endian record per run, i.e. Python
+// struct '<iBBHiifffffffQI':
+//   rep, success, interrupted, cells_filled, cycles, cp_calls, time, cp_initial,
+//   cp_ant, dcm_aco, cooperative_game, pheromone_fusion, public_path,
+//   solution_hash, seed
+// solution_hash is the FNV-1a hash of the compact solution with --solution, else 0.
+template<class T> void AppendBytes( string &buf, const T &value )
+{
+	buf.append(reinterpret_cast<const char*>(&value), sizeof(T));
+}
+
+void WriteBinaryRecord( const RunResult &res )
+{
+	string buf;
+	AppendBytes(buf, (int32_t)res.rep);
+	AppendBytes(buf, (uint8_t)(res.success ? 1 : 0));
+	AppendBytes(buf, (uint8_t)(res.interrupted ? 1 : 0));
+	AppendBytes(buf, (uint16_t)res.cellsFilled);
+	AppendBytes(buf, (int32_t)res.cycles);
+	AppendBytes(buf, (int32_t)res.cpCalls);
+	AppendBytes(buf, res.time);
+	AppendBytes(buf, res.cpInitial);
+	AppendBytes(buf, res.cpAnt);
+	AppendBytes(buf, res.dcmAco);
+	AppendBytes(buf, res.cooperativeGame);
+	AppendBytes(buf, res.pheromoneFusion);
+	AppendBytes(buf, res.publicPath);
+	AppendBytes(buf, (uint64_t)(res.solution.length() > 0 ? HashString(res.solution) : 0));
+	AppendBytes(buf, (uint32_t)res.seed);
+	cout.write(buf.data(), buf.size());
+	cout.flush();
+}
+
+// --reps N and/or --format json|binary: solve the board (parsed and initially
+// constrained once) N times, writing one record per rep
+void RunReps( Arguments &a, Board &board, int reps, const string &format, const string &instance = string() )
+{
+	// initial CP ran once, in the Board constructor
+	float initialCPTime = GetInitialCPTime();
+	string solutionMode = a.GetArg(string("solution"), string());
+	if ( solutionMode == "1" )
+		solutionMode = "string";
+#ifdef _WIN32
+	if ( format == "binary" )
+		_setmode(_fileno(stdout), _O_BINARY);
+#endif
+	for ( int rep = 1; rep <= reps; rep++ )
+	{
+		RunResult res;
+		res.instance = instance;
+		SolveRep(a, board, rep, initialCPTime, res);
+		if ( format == "json" )
+			WriteJsonRecord(res, solutionMode);
+		else if ( format == "binary" )
+			WriteBinaryRecord(res);
+		else
+			WriteRepLine(res);
+		// stopped by a signal: the interrupted rep is reported, later reps are not run
+		if ( SolverStopRequested() )
+			break;
+	}
+}
+
+void RunSolver( Arguments &a, const string &puzzleString )
+{
+	// solve, then spit out 0 for success, 1 for fail, followed by time in seconds
+	ResetCPTiming();
+	Board board(puzzleString);
+
+	int reps = a.GetArg("reps", 0);
+	string format = a.GetArg(string("format"), string("text"));
+	if ( reps > 0 || format == "json" || format == "binary" )
+	{
+		RunReps(a, board, reps > 0 ? reps : 1, format);
+		return;
+	}
+
+    int algorithm = a.GetArg("alg", 0);
+    float timeOutSecs = a.GetArg("timeout", 10.0f);
+    bool verbose = a.GetArg("verbose", 0);
+    bool showInitial = a.GetArg("showinitial", 0);
+    bool success;
+
+	float solTime;
+    SudokuSolver *solver = CreateSolver(a, board.CellCount());
+	unsigned int seed = RepSeed(a, 1);
+	solver->SetSeed(seed);
 	
 	if ( showInitial )
 	{
@@ -178,7 +415,9 @@ int main( int argc, char *argv[] )
 	}
 	
 	success = solver->Solve(board, (float)timeOutSecs );
-	solution = solver->GetSolution();
+	// copy-construct: Board's assignment is a shallow copy, which would double free
+	// once the solver is deleted
+	Board solution(solver->GetSolution());
 	solTime = solver->GetSolutionTime();
 
 	float initialCPTime = GetInitialCPTime();
@@ -197,6 +436,7 @@ int main( int argc, char *argv[] )
 
 		success = false;
 	}
+	bool interrupted = !success && SolverStopRequested() != 0;
 	if ( !verbose )
 	{
 		cout << !success << endl << solTime << endl;
@@ -205,6 +445,9 @@ int main( int argc, char *argv[] )
 		cout << "cp_ant: " << antCPTime << endl;
 		cout << "cp_calls: " << cpCallCount << endl;
 		cout << "cp_total: " << (initialCPTime + antCPTime) << endl;
+		cout << "seed: " << seed << endl;
+		if ( interrupted )
+			cout << "interrupted: 1" << endl;
 		if ( algorithm == 2 )
 		{
 			MultiColonyAntSystem* mcas = dynamic_cast<MultiColonyAntSystem*>(solver);
@@ -235,6 +478,9 @@ int main( int argc, char *argv[] )
 		cout << "cp_ant: " << antCPTime << endl;
 		cout << "cp_calls: " << cpCallCount << endl;
 		cout << "cp_total: " << (initialCPTime + antCPTime) << endl;
+		cout << "seed: " << seed << endl;
+		if ( interrupted )
+			cout << "interrupted: 1" << endl;
 		if ( algorithm == 2 )
 		{
 			if ( MultiColonyAntSystem* mcas = dynamic_cast<MultiColonyAntSystem*>(solver) )
@@ -246,4 +492,261 @@ int main( int argc, char *argv[] )
 			}
 		}
 	}
+	delete solver;
+}
+
+// *.txt instance files in dir, sorted by name
+vector<string> ListInstanceFiles( const string &dir )
+{
+	vector<string> names;
+#ifdef _WIN32
+	struct _finddata_t entry;
+	intptr_t handle = _findfirst((dir + "\\*.txt").c_str(), &entry);
+	if ( handle != -1 )
+	{
+		do
+		{
+			if ( !(entry.attrib & _A_SUBDIR) )
+				names.push_back(entry.name);
+		} while ( _findnext(handle, &entry) == 0 );
+		_findclose(handle);
+	}
+#else
+	DIR *d = opendir(dir.c_str());
+	if ( d != nullptr )
+	{
+		while ( struct dirent *entry = readdir(d) )
+		{
+			string name(entry->d_name);
+			if ( name.length() > 4 && name.compare(name.length() - 4, 4, ".txt") == 0 )
+				names.push_back(name);
+		}
+		closedir(d);
+	}
+#endif
+	sort(names.begin(), names.end());
+	return names;
+}
+
+// one puzzle of a multi-puzzle run that could not be solved at all: one record
+// with rep 0 (json: plus "error"; text: "puzzle <name> error <message>")
+void WritePuzzleError( const string &name, const string &message, const string &format )
+{
+	if ( format == "json" )
+	{
+		cout << "{\"instance\":\"" << EscapeJson(name) << "\",\"rep\":0,\"success\":false,\"error\":\""
+		     << EscapeJson(message) << "\"}" << endl;
+	}
+	else if ( format == "binary" )
+	{
+		RunResult res;
+		res.rep = 0;
+		res.success = false;
+		res.cycles = res.cpCalls = 0;
+		res.time = res.cpInitial = res.cpAnt = 0.0f;
+		res.dcmAco = res.cooperativeGame = res.pheromoneFusion = res.publicPath = 0.0f;
+		res.seed = 0;
+		res.cellsFilled = 0;
+		res.interrupted = false;
+		WriteBinaryRecord(res);
+	}
+	else
+	{
+		cout << "puzzle " << name << " error " << message << endl;
+	}
+}
+
+// solve one entry of a multi-puzzle run with the shared options in a. seedField,
+// when given, overrides the seeding for this puzzle: a comma-separated list is
+// taken as --seeds, a single value as --seed.
+void RunListedPuzzle( const Arguments &a, const string &name, const string &puzzleString,
+                      const string &seedField, int reps, const string &format )
+{
+	if ( puzzleString.length() == 0 )
+	{
+		WritePuzzleError(name, "could not read puzzle", format);
+		return;
+	}
+	Arguments job(a);
+	if ( seedField.length() > 0 )
+	{
+		bool isList = seedField.find(',') != string::npos;
+		job.SetArg("seeds", isList ? seedField : string());
+		job.SetArg("seed", isList ? string() : seedField);
+	}
+	ResetCPTiming();
+	Board board(puzzleString);
+	if ( board.CellCount() == 0 )
+	{
+		WritePuzzleError(name, "wrong number of cells for a sudoku board", format);
+		return;
+	}
+	if ( format != "json" && format != "binary" )
+		cout << "puzzle " << name << endl;
+	RunReps(job, board, reps, format, name);
+}
+
+// split an input line into its entry and the optional seed field after it. The
+// seed field is a trailing token of digits and commas, so entries (file paths)
+// may contain spaces.
+void SplitEntry( const string &line, string &entry, string &seedField )
+{
+	const char *space = " \t\r\n";
+	seedField.clear();
+	size_t first = line.find_first_not_of(space);
+	if ( first == string::npos )
+	{
+		entry.clear();
+		return;
+	}
+	entry = line.substr(first, line.find_last_not_of(space) - first + 1);
+	size_t split = entry.find_last_of(space);
+	if ( split != string::npos && entry.find_first_not_of("0123456789,", split + 1) == string::npos )
+	{
+		seedField = entry.substr(split + 1);
+		entry = entry.substr(0, entry.find_last_not_of(space, split) + 1);
+	}
+}
+
+// multi-puzzle mode: solve many puzzles in order with one configuration, streaming
+// --reps records per puzzle as each completes (json records carry "instance";
+// text writes "puzzle <name>" before its rep lines; binary records come in input
+// order, reps per puzzle). Sources:
+//   --list FILE   one instance file per line ("-" reads the list from stdin)
+//   --dir DIR     every *.txt file in DIR, by name
+//   --stdin       one puzzle string per line on stdin, named by line number
+// A list or stdin line may carry a seed field after the entry (see RunListedPuzzle).
+void RunPuzzles( Arguments &a )
+{
+	int reps = a.GetArg("reps", 1);
+	if ( reps < 1 )
+		reps = 1;
+	string format = a.GetArg(string("format"), string("text"));
+#ifdef _WIN32
+	if ( format == "binary" )
+		_setmode(_fileno(stdout), _O_BINARY);
+#endif
+	string dir = a.GetArg(string("dir"), string());
+	string list = a.GetArg(string("list"), string());
+	if ( dir.length() > 0 )
+	{
+		vector<string> names = ListInstanceFiles(dir);
+		for ( size_t i = 0; i < names.size() && !SolverStopRequested(); i++ )
+			RunListedPuzzle(a, names[i], ReadFile(dir + "/" + names[i]), string(), reps, format);
+		return;
+	}
+
+	ifstream listFile;
+	bool fromStdin = list.length() == 0 || list == "-";
+	if ( !fromStdin )
+	{
+		listFile.open(list);
+		if ( !listFile.is_open() )
+		{
+			cerr << "could not open list file: " << list << endl;
+			return;
+		}
+	}
+	istream &in = fromStdin ? cin : listFile;
+	bool puzzleStrings = list.length() == 0; // --stdin
+	string line, entry, seedField;
+	int lineNumber = 0;
+	while ( !SolverStopRequested() && getline(in, line) )
+	{
+		lineNumber++;
+		SplitEntry(line, entry, seedField);
+		if ( entry.length() == 0 || entry[0] == '#' )
+			continue;
+		if ( puzzleStrings )
+		{
+			ostringstream name;
+			name << lineNumber;
+			RunListedPuzzle(a, name.str(), entry, seedField, reps, format);
+		}
+		else
+		{
+			RunListedPuzzle(a, entry, ReadFile(entry), seedField, reps, format);
+		}
+	}
+}
+
+// persistent worker: read one job per line from stdin (same --key value options
+// as the command line), solve it and write the usual output followed by
+// SERVE_END_MARKER. Saves a process start per repetition for the benchmark harness.
+void Serve()
+{
+	string line;
+	while ( getline(cin, line) )
+	{
+		if ( line.find_first_not_of(" \t\r") == string::npos )
+			continue;
+		Arguments job(line);
+		string puzzleString = LoadPuzzle(job);
+		if ( puzzleString.length() == 0 )
+			cout << "no puzzle specified" << endl;
+		else
+			RunSolver(job, puzzleString);
+		// the output stream is left in fixed mode by RunSolver
+		cout.unsetf(ios_base::floatfield);
+		cout << setprecision(6);
+		cout << SERVE_END_MARKER << endl;
+		if ( SolverStopRequested() )
+			break;
+	}
+}
+
+extern "C" void OnStopSignal( int sig )
+{
+	SolverStopRequested() = sig;
+}
+
+// SIGTERM/SIGINT stop the running solve at its next deadline check instead of
+// killing the process, so the partial result (best fill, cycles, elapsed time,
+// "interrupted") is still written; nothing new is started afterwards. Not
+// restarting interrupted reads lets an idle --serve worker exit too.
+void InstallStopHandlers()
+{
+#ifdef _WIN32
+	signal(SIGTERM, OnStopSignal);
+	signal(SIGINT, OnStopSignal);
+#else
+	struct sigaction action;
+	memset(&action, 0, sizeof(action));
+	action.sa_handler = OnStopSignal;
+	sigemptyset(&action.sa_mask);
+	action.sa_flags = 0; // no SA_RESTART
+	sigaction(SIGTERM, &action, nullptr);
+	sigaction(SIGINT, &action, nullptr);
+#endif
+}
+
+// exit status after a stop signal follows the shell convention, 128 + signal
+int ExitStatus()
+{
+	return SolverStopRequested() ? 128 + SolverStopRequested() : 0;
+}
+
+int main( int argc, char *argv[] )
+{
+	Arguments a( argc, argv );
+	InstallStopHandlers();
+	if ( a.GetArg("serve", 0) )
+	{
+		Serve();
+		return ExitStatus();
+	}
+	if ( a.GetArg(string("list"), string()).length() > 0 || a.GetArg(string("dir"), string()).length() > 0 ||
+	     a.GetArg("stdin", 0) )
+	{
+		RunPuzzles(a);
+		return ExitStatus();
+	}
+	string puzzleString = LoadPuzzle(a);
+	if ( puzzleString.length() == 0 )
+	{
+		cerr << "no puzzle specified" << endl;
+		exit(0);
+	}
+	RunSolver(a, puzzleString);
+	return ExitStatus();
 }
@@ -49,6 +49,7 @@ bool SudokuAntSystem::Solve(const Board& puzzle, float maxTime )
 	bestPher = 0.0f;
 	int curBestAnt = 0;
 	InitPheromone( puzzle.CellCount(), puzzle.GetNumUnits() );
+	const int deadlineStride = puzzle.GetNumUnits();
 	while (!solved)
 	{
 		// start each ant on a different square
@@ -58,6 +59,7 @@ bool SudokuAntSystem::Solve(const Board& puzzle, float maxTime )
 			a->InitSolution(puzzle, dist(randGen));
 		}
 		// fill cells one at a time
+		bool outOfTime = false;
 		for (int i = 0; i < puzzle.CellCount(); i++)
 		{
 			// step each ant in turn
@@ -65,7 +67,18 @@ bool SudokuAntSystem::Solve(const Board& puzzle, float maxTime )
 			{
 				a->StepSolution();
 			}
+			// cheap deadline check once per row of cells, so a slow construction
+			// (large puzzles, many ants) cannot overrun the budget by a whole iteration.
+			// The first iteration always completes so there is a best solution to report
+			if (iter > 0 && (i % deadlineStride) == deadlineStride - 1 &&
+				(SolverStopRequested() || solutionTimer.Elapsed() > maxTime))
+			{
+				outOfTime = true;
+				break;
+			}
 		}
+		if (outOfTime)
+			break;
 		// update pheromone
 		int iBest = 0;
 		int bestVal = 0;
@@ -97,7 +110,7 @@ bool SudokuAntSystem::Solve(const Board& puzzle, float maxTime )
 		if ((iter % 100) == 0)
 		{
 			float elapsed = solutionTimer.Elapsed();
-			if ( elapsed > maxTime)
+			if ( elapsed > maxTime || SolverStopRequested() )
 			{
 				break;
 			}
@@ -51,6 +51,7 @@ public:
 	virtual float GetSolutionTime() { return solTime; }
 	virtual const Board& GetSolution() { return bestSol; }
 	virtual int GetIterationCount() { return iterationCount; }
+	virtual void SetSeed(unsigned int seed) { randGen.seed(seed); randomDist.reset(); }
 	// helpers for ants
 	inline float Getq0() { return q0; }
 	inline float random() { return randomDist(randGen); }
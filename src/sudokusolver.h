@@ -1,6 +1,16 @@
 #pragma once
+#include <csignal>
 #include "board.h"
 
+// set asynchronously (solvermain stores the signal number from its SIGTERM/SIGINT
+// handler) to make a running Solve stop at its next deadline check and return
+// the best solution so far, as on a timeout
+inline volatile std::sig_atomic_t &SolverStopRequested()
+{
+	static volatile std::sig_atomic_t stop = 0;
+	return stop;
+}
+
 // pure virtual interface shared between backtrack search and sudoku ant system
 class SudokuSolver
 {
@@ -10,4 +20,6 @@ public:
 	virtual float GetSolutionTime() = 0;
 	virtual const Board& GetSolution() = 0;
 	virtual int GetIterationCount() = 0;
+	// reseed the random number generator for reproducible runs (deterministic solvers ignore it)
+	virtual void SetSeed(unsigned int seed) {}
 };